@@ -38,8 +38,40 @@ import os
 import sys
 import subprocess
 import json
+import argparse
+import time
+import heapq
+import bisect
+import concurrent.futures
+import multiprocessing
+from collections import OrderedDict, deque
 from pathlib import Path
 
+# NumPy is optional - it enables the batched (vectorized) systems
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    np = None
+    HAS_NUMPY = False
+
+from worldgen import nether_terrain
+
+# --- Offline Pre-generation (command line) ---
+# python pycraft_nether.py --pregenerate NAME [--seed N] [--chunks FIRST LAST] [--workers N]
+# generates a world straight into saves/NAME.world without opening a window (see pregenerate_world).
+PREGENERATE_ARGS = None
+if "--pregenerate" in sys.argv:
+    pregenerate_parser = argparse.ArgumentParser(description="Pre-generate a nether world save without opening a window.")
+    pregenerate_parser.add_argument("--pregenerate", metavar="NAME", required=True, help="world name to write to saves/NAME.world")
+    pregenerate_parser.add_argument("--seed", type=int, default=None, help="world seed (random if omitted, or the interrupted run's seed when resuming)")
+    pregenerate_parser.add_argument("--chunks", type=int, nargs=2, default=[-2, 2], metavar=("FIRST", "LAST"), help="inclusive chunk range (default: -2 2)")
+    pregenerate_parser.add_argument("--workers", type=int, default=None, help="chunk generation worker processes")
+    PREGENERATE_ARGS = pregenerate_parser.parse_known_args()[0]
+    # No window: pygame still needs a display for the textures, so use the dummy drivers
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+
 # --- Menu System Constants ---
 MENU_STATE_MAIN = "main_menu"
 MENU_STATE_USERNAME = "username_input"
@@ -138,6 +170,8 @@ GRID_HEIGHT = WORLD_HEIGHT_BLOCKS
 # Chunk tracking
 LOADED_CHUNKS = {}  # Dictionary: chunk_x -> chunk_data
 CURRENT_CHUNK_RANGE = [-2, 2]  # Initially load chunks -2 to 2 (5 chunks)
+CHUNK_EXPANSION_LIMIT = 8  # Chunks the world may grow on each side past the range it was created or loaded with
+CHUNK_RANGE_LIMITS = [-2 - CHUNK_EXPANSION_LIMIT, 2 + CHUNK_EXPANSION_LIMIT]  # Furthest chunks streaming may load
 
 # --- Block ID Constants ---
 AIR_ID = 0
@@ -225,6 +259,14 @@ IRON_GOLEM_EGG_ID = 341
 # Include all water types: source water, swamp water, all flow levels, and lava
 FLUID_BLOCKS = {WATER_ID, SWAMP_WATER_ID, LAVA_ID, 170, 171, 172, 173, 174, 175, 176, 177, 178, 179}
 
+# Blocks that catch fire from nearby lava (wood, planks, nylium, crafting table)
+FLAMMABLE_BLOCKS = {18, 6, 8, 83, 84, 34, 35, 105, 106, 124, 125, 129, 92}
+# Blocks the player can pass through while crouching
+# Oak (6,18), Birch (83,84), Cactus (21), Dark Oak (32), Spruce (34), Jungle Wood (124)
+CROUCH_PASSABLE_BLOCKS = {6, 18, 21, 32, 34, 83, 84, 124}
+# Blocks affected by gravity: Sand (19) and Gravel (26)
+FALLING_BLOCK_IDS = {19, 26}
+
 # --- Water Flow Levels (for gradual flow weakening) ---
 # Water flow: 5 (source) -> 170 (level 1) -> 171 (level 2) -> 172 (level 3) -> 173 (level 4) -> 174 (level 5, stops)
 # Swamp water: 31 (source) -> 175 (level 1) -> 176 (level 2) -> 177 (level 3) -> 178 (level 4) -> 179 (level 5, stops)
@@ -536,6 +578,219 @@ BLOCK_TYPES = {
     341: {"name": "Iron Golem Egg", "color": (180, 180, 180), "mineable": False, "solid": False, "spawn_egg": "IronGolem"},
 }
 
+# --- Block Property Tables ---
+# Dense per-property lists indexed by block ID, compiled once from BLOCK_TYPES and the
+# block sets above. Hot paths index these directly instead of BLOCK_TYPES.get(id, {}).get(...).
+BLOCK_TABLE_SIZE = 1024  # Covers every block/item ID (unknown IDs read as False/None)
+
+def compile_block_table(predicate):
+    """Builds a dense list of predicate(block_id, block_data) for every ID in the table."""
+    return [predicate(block_id, BLOCK_TYPES.get(block_id, {})) for block_id in range(BLOCK_TABLE_SIZE)]
+
+BLOCK_SOLID = compile_block_table(lambda block_id, data: block_id != 0 and data.get("solid", False))
+BLOCK_FLUID = compile_block_table(lambda block_id, data: block_id in FLUID_BLOCKS)
+BLOCK_FLAMMABLE = compile_block_table(lambda block_id, data: block_id in FLAMMABLE_BLOCKS)
+BLOCK_CROUCH_PASSABLE = compile_block_table(lambda block_id, data: block_id in CROUCH_PASSABLE_BLOCKS)
+BLOCK_EMITS_LIGHT = compile_block_table(lambda block_id, data: data.get("emits_light", False))
+BLOCK_FALLS = compile_block_table(lambda block_id, data: block_id in FALLING_BLOCK_IDS)
+BLOCK_COLOR = compile_block_table(lambda block_id, data: data.get("color"))
+
+# NumPy copies of the tables for the vectorized systems
+if HAS_NUMPY:
+    BLOCK_SOLID_ARRAY = np.array(BLOCK_SOLID, dtype=bool)
+    BLOCK_FLUID_ARRAY = np.array(BLOCK_FLUID, dtype=bool)
+else:
+    BLOCK_SOLID_ARRAY = None
+    BLOCK_FLUID_ARRAY = None
+
+def get_solidity_mask(world_map):
+    """Returns a (rows, cols) NumPy bool array that is True where the world has a solid block."""
+    block_ids = np.asarray(world_map, dtype=np.int64)
+    return BLOCK_SOLID_ARRAY[np.clip(block_ids, 0, BLOCK_TABLE_SIZE - 1)]
+
+# --- Tile Collision ---
+# The one tile-collision engine for every entity kind (player, mobs, villagers, penguins).
+# Bodies move one axis at a time, x then y. Each axis move is a swept AABB test: it walks
+# every tile column (or row) the leading edge crosses, in travel order, and stops flush
+# against the first one holding a solid block. A fall at vel_y 10 or a knockback larger than
+# a tile therefore cannot tunnel, and no fixed sub-step size is needed. Solidity comes from
+# a block property table (BLOCK_SOLID unless the caller passes another one).
+# Cells outside the world count as open. The vertical probe starts TILE_PROBE_INSET pixels
+# inside the left edge so bodies slip into one-block gaps without pixel-perfect alignment.
+TILE_PROBE_INSET = 1
+BLOCK_SOLID_CROUCHING = compile_block_table(lambda block_id, data: BLOCK_SOLID[block_id] and not BLOCK_CROUCH_PASSABLE[block_id])
+
+def sweep_x(world_map, rect, dx, solid=BLOCK_SOLID):
+    """Moves rect horizontally by dx, stopping flush at the first solid tile column crossed.
+    
+    Returns the column that blocked the move, or None if the full move was made.
+    """
+    if dx == 0:
+        return None
+    world_rows = min(GRID_HEIGHT, len(world_map))
+    world_cols = len(world_map[0])
+    top_row = max(0, rect.top // BLOCK_SIZE)
+    bottom_row = min(world_rows - 1, (rect.bottom - 1) // BLOCK_SIZE)
+    if dx > 0:
+        cols = range((rect.right - 1) // BLOCK_SIZE + 1, math.ceil((rect.right + dx) / BLOCK_SIZE))
+    else:
+        cols = range(rect.left // BLOCK_SIZE - 1, math.floor((rect.left + dx) / BLOCK_SIZE) - 1, -1)
+    for col in cols:
+        if not 0 <= col < world_cols:
+            continue
+        for row in range(top_row, bottom_row + 1):
+            if solid[world_map[row][col]]:
+                if dx > 0:
+                    rect.right = col * BLOCK_SIZE
+                else:
+                    rect.left = (col + 1) * BLOCK_SIZE
+                return col
+    rect.x += dx
+    return None
+
+def sweep_y(world_map, rect, dy, solid=BLOCK_SOLID):
+    """Moves rect vertically by dy, stopping flush at the first solid tile row crossed.
+    
+    Returns the row that blocked the move, or None if the full move was made.
+    """
+    if dy == 0:
+        return None
+    world_rows = min(GRID_HEIGHT, len(world_map))
+    world_cols = len(world_map[0])
+    left_col = max(0, (rect.left + TILE_PROBE_INSET) // BLOCK_SIZE)
+    right_col = min(world_cols - 1, (rect.right - 1) // BLOCK_SIZE)
+    if dy > 0:
+        rows = range((rect.bottom - 1) // BLOCK_SIZE + 1, math.ceil((rect.bottom + dy) / BLOCK_SIZE))
+    else:
+        rows = range(rect.top // BLOCK_SIZE - 1, math.floor((rect.top + dy) / BLOCK_SIZE) - 1, -1)
+    for row in rows:
+        if not 0 <= row < world_rows:
+            continue
+        row_blocks = world_map[row]
+        for col in range(left_col, right_col + 1):
+            if solid[row_blocks[col]]:
+                if dy > 0:
+                    rect.bottom = row * BLOCK_SIZE
+                else:
+                    rect.top = (row + 1) * BLOCK_SIZE
+                return row
+    rect.y += dy
+    return None
+
+def sample_solid(world_map, rows, cols, valid, solid_lookup=None):
+    """Looks up solidity for arrays of (row, col) cells; cells where valid is False count as open."""
+    if solid_lookup is None:
+        solid_lookup = BLOCK_SOLID_ARRAY
+    block_ids = np.zeros(rows.shape, dtype=np.int64)
+    sample_rows = rows[valid].tolist()
+    sample_cols = cols[valid].tolist()
+    block_ids[valid] = [world_map[r][c] for r, c in zip(sample_rows, sample_cols)]
+    block_ids = np.clip(block_ids, 0, len(solid_lookup) - 1)
+    return solid_lookup[block_ids] & valid
+
+def round_rect_coord(values):
+    """Rounds like pygame.Rect does when assigned a float (half away from zero)."""
+    return np.where(values >= 0, np.floor(values + 0.5), np.ceil(values - 0.5))
+
+def sweep_axis_arrays(world_map, lead, dist, span_start, span_end, solid_lookup, world_rows, world_cols, horizontal):
+    """Vectorized sweep along one axis.
+    
+    lead is the body's near edge on the swept axis (right/bottom when dist > 0, left/top
+    otherwise) and span_start..span_end (inclusive) the tiles it covers on the other axis.
+    Returns (hit, hit_tile) arrays: whether each body was blocked and by which tile index.
+    """
+    positive = dist > 0
+    first = np.where(positive, np.floor((lead - 1) / BLOCK_SIZE) + 1, np.floor(lead / BLOCK_SIZE) - 1).astype(np.int64)
+    last = np.where(positive, np.ceil((lead + dist) / BLOCK_SIZE) - 1, np.floor((lead + dist) / BLOCK_SIZE)).astype(np.int64)
+    step = np.where(positive, 1, -1)
+    count = np.where(dist == 0, 0, np.maximum(0, (last - first) * step + 1))
+    hit = np.zeros(lead.shape, dtype=bool)
+    hit_tile = np.zeros(lead.shape, dtype=np.int64)
+    steps = int(count.max()) if count.size else 0
+    if steps == 0:
+        return hit, hit_tile
+    
+    span = span_end - span_start + 1
+    k = np.arange(steps)[None, :, None]
+    j = np.arange(max(1, int(span.max())))[None, None, :]
+    swept = first[:, None, None] + step[:, None, None] * k
+    across = span_start[:, None, None] + j
+    swept, across = np.broadcast_arrays(swept, across)
+    rows, cols = (across, swept) if horizontal else (swept, across)
+    valid = ((k < count[:, None, None]) & (j < span[:, None, None]) &
+             (rows >= 0) & (rows < world_rows) & (cols >= 0) & (cols < world_cols))
+    tile_hit = sample_solid(world_map, rows, cols, valid, solid_lookup).any(axis=2)
+    hit = tile_hit.any(axis=1)
+    hit_tile = first + step * np.argmax(tile_hit, axis=1)
+    return hit, hit_tile
+
+def sweep_arrays(world_map, x, y, w, h, vel_x, vel_y, solid_lookup=None):
+    """Batch form of sweep_x then sweep_y for arrays of bodies (NumPy).
+    
+    Returns (x, y, vel_x, vel_y, hit_x, hit_y); blocked axes have their velocity zeroed.
+    """
+    if solid_lookup is None:
+        solid_lookup = BLOCK_SOLID_ARRAY
+    world_rows = min(GRID_HEIGHT, len(world_map))
+    world_cols = len(world_map[0]) if world_map else 0
+    
+    # Horizontal: sweep the leading column edge across the rows the body covers
+    lead = np.where(vel_x > 0, x + w, x)
+    top_row = np.floor(y / BLOCK_SIZE).astype(np.int64)
+    bottom_row = np.floor((y + h - 1) / BLOCK_SIZE).astype(np.int64)
+    hit_x, hit_col = sweep_axis_arrays(world_map, lead, vel_x, top_row, bottom_row, solid_lookup,
+                                       world_rows, world_cols, horizontal=True)
+    x = np.where(hit_x, np.where(vel_x > 0, hit_col * BLOCK_SIZE - w, (hit_col + 1) * BLOCK_SIZE), round_rect_coord(x + vel_x))
+    vel_x = np.where(hit_x, 0, vel_x)
+    
+    # Vertical: sweep the leading row edge across the (inset) columns the body covers
+    lead = np.where(vel_y > 0, y + h, y)
+    left_col = np.floor((x + TILE_PROBE_INSET) / BLOCK_SIZE).astype(np.int64)
+    right_col = np.floor((x + w - 1) / BLOCK_SIZE).astype(np.int64)
+    hit_y, hit_row = sweep_axis_arrays(world_map, lead, vel_y, left_col, right_col, solid_lookup,
+                                       world_rows, world_cols, horizontal=False)
+    y = np.where(hit_y, np.where(vel_y > 0, hit_row * BLOCK_SIZE - h, (hit_row + 1) * BLOCK_SIZE), round_rect_coord(y + vel_y))
+    vel_y = np.where(hit_y, 0, vel_y)
+    return x, y, vel_x, vel_y, hit_x, hit_y
+
+def sweep_bodies(world_map, bodies, solid=BLOCK_SOLID):
+    """Moves many bodies by their vel_x/vel_y against the tiles, x then y, in one call.
+    
+    Blocked axes have their velocity zeroed. Returns a list of (hit_x, hit_y) flags per body.
+    Uses sweep_arrays when NumPy is available and sweep_x/sweep_y otherwise.
+    """
+    count = len(bodies)
+    if count == 0:
+        return []
+    if not HAS_NUMPY:
+        results = []
+        for body in bodies:
+            hit_x = sweep_x(world_map, body.rect, body.vel_x, solid) is not None
+            if hit_x:
+                body.vel_x = 0
+            hit_y = sweep_y(world_map, body.rect, body.vel_y, solid) is not None
+            if hit_y:
+                body.vel_y = 0
+            results.append((hit_x, hit_y))
+        return results
+    
+    solid_lookup = BLOCK_SOLID_ARRAY if solid is BLOCK_SOLID else np.array(solid, dtype=bool)
+    x = np.fromiter((b.rect.x for b in bodies), dtype=np.float64, count=count)
+    y = np.fromiter((b.rect.y for b in bodies), dtype=np.float64, count=count)
+    w = np.fromiter((b.rect.width for b in bodies), dtype=np.float64, count=count)
+    h = np.fromiter((b.rect.height for b in bodies), dtype=np.float64, count=count)
+    vel_x = np.fromiter((b.vel_x for b in bodies), dtype=np.float64, count=count)
+    vel_y = np.fromiter((b.vel_y for b in bodies), dtype=np.float64, count=count)
+    x, y, vel_x, vel_y, hit_x, hit_y = sweep_arrays(world_map, x, y, w, h, vel_x, vel_y, solid_lookup)
+    xs, ys = x.astype(np.int64).tolist(), y.astype(np.int64).tolist()
+    vxs, vys = vel_x.tolist(), vel_y.tolist()
+    for i, body in enumerate(bodies):
+        body.rect.x = xs[i]
+        body.rect.y = ys[i]
+        body.vel_x = vxs[i]
+        body.vel_y = vys[i]
+    return list(zip(hit_x.tolist(), hit_y.tolist()))
+
 
 # --- Crafting Recipes (No change) ---
 CRAFTING_RECIPES = {
@@ -682,6 +937,315 @@ CRAFTING_TABLE_RECIPES = {
     frozenset([(189, 4)]): (218, 1),
 }
 
+# --- Recipe Compiler ---
+# Recipes are compiled once into dicts keyed by a normalized form of the grid, so matching a
+# crafting grid is a dict lookup however many recipes exist. Ingredients are item ids or tag
+# names from RECIPE_TAGS. A grid is looked up by its item ids first and then with every tagged
+# item replaced by its tag; so a recipe's own item-id ingredients must not be tag members.
+# - Shapeless recipes (the 2x2 grid, which counts amounts): frozenset of (ingredient, amount).
+# - Shaped recipes (the 3x3 table): (rows, cols, cells) of the pattern trimmed to its non-empty
+#   bounding box, so it matches anywhere in the grid. Mirrored patterns are added as well.
+RECIPE_TAGS = {
+    "plank_types": (8, 105, 106, 125, 129),  # Oak, Birch, Spruce, Jungle, Bamboo planks
+    "wool_types": (7, 65, 66, 67, 68, 69, 70, 71, 72, 73, 74, 75, 76, 77, 78, 79, 80),  # All wool colors
+}
+ITEM_RECIPE_TAGS = {item_id: tag for tag, item_ids in RECIPE_TAGS.items() for item_id in item_ids}
+
+# Shaped 3x3 crafting table recipes: (pattern rows, symbol -> ingredient, (output id, count))
+CRAFTING_TABLE_SHAPED_RECIPES = [
+    (["P", "P"], {"P": "plank_types"}, (10, 4)),  # Sticks
+    (["PPP", " S ", " S "], {"P": "plank_types", "S": 10}, (9, 1)),  # Wooden Pickaxe
+    (["I I", " I "], {"I": 108}, (181, 1)),  # Bucket
+    (["WWW", "PPP"], {"W": "wool_types", "P": "plank_types"}, (226, 1)),  # Bed
+]
+
+def normalize_shaped_grid(cells, width):
+    """Returns the (rows, cols, cells) key of a row-major grid trimmed to its non-empty cells, or None if it is empty."""
+    rows = [cells[i:i + width] for i in range(0, len(cells), width)]
+    used_rows = [r for r, row in enumerate(rows) if any(row)]
+    used_cols = [c for c in range(width) if any(row[c] for row in rows)]
+    if not used_rows:
+        return None
+    top, bottom = used_rows[0], used_rows[-1] + 1
+    left, right = used_cols[0], used_cols[-1] + 1
+    trimmed = tuple(cell for row in rows[top:bottom] for cell in row[left:right])
+    return bottom - top, right - left, trimmed
+
+def tag_recipe_key(items):
+    """Replaces every item id that belongs to a recipe tag with the tag name."""
+    return tuple(ITEM_RECIPE_TAGS.get(item, item) for item in items)
+
+def compile_shaped_recipes(recipes):
+    """Compiles (pattern, key, output) recipes into a normalized grid key -> output dict."""
+    index = {}
+    for pattern, symbols, output in recipes:
+        width = max(len(row) for row in pattern)
+        rows = [row.ljust(width) for row in pattern]
+        for variant in (rows, [row[::-1] for row in rows]):
+            cells = [0 if symbol == " " else symbols[symbol] for row in variant for symbol in row]
+            index[normalize_shaped_grid(cells, width)] = output
+    return index
+
+def compile_shapeless_recipes(recipes):
+    """Compiles (ingredient amounts, output) recipes into a frozenset((ingredient, amount)) -> output dict."""
+    return {frozenset(ingredients): output for ingredients, output in recipes}
+
+def match_shaped_recipe(index, item_ids, width):
+    """Returns the output of the shaped recipe a row-major grid of item ids matches, or None."""
+    key = normalize_shaped_grid(list(item_ids), width)
+    if key is None:
+        return None
+    output = index.get(key)
+    if output is None:
+        rows, cols, cells = key
+        output = index.get((rows, cols, tag_recipe_key(cells)))
+    return output
+
+def match_shapeless_recipe(index, contents):
+    """Returns the output of the shapeless recipe whose ingredients exactly equal contents (item id -> amount), or None."""
+    output = index.get(frozenset(contents.items()))
+    if output is None:
+        tagged = {}
+        for item_id, amount in contents.items():
+            ingredient = ITEM_RECIPE_TAGS.get(item_id, item_id)
+            tagged[ingredient] = tagged.get(ingredient, 0) + amount
+        output = index.get(frozenset(tagged.items()))
+    return output
+
+CRAFTING_RECIPE_INDEX = compile_shapeless_recipes(CRAFTING_RECIPES.items())
+CRAFTING_TABLE_RECIPE_INDEX = compile_shaped_recipes(CRAFTING_TABLE_SHAPED_RECIPES)
+
+# --- Recipe Book ---
+# Lists the recipes the player's hotbar and inventory hold enough ingredients for. Each player
+# keeps a multiset of held item counts (and of tag totals), updated from the change events of
+# the player's ItemContainer, and an inverted index from ingredient to recipes, so a count
+# change only rechecks the recipes using that item.
+RECIPE_BOOK_RECIPES = (
+    [("inventory", dict(ingredients), output) for ingredients, output in CRAFTING_RECIPES.items()] +
+    [("crafting_table", {symbols[symbol]: "".join(pattern).count(symbol) for symbol in symbols}, output)
+     for pattern, symbols, output in CRAFTING_TABLE_SHAPED_RECIPES]
+)
+
+class RecipeBook:
+    """The recipes a player can craft from the items they hold, kept current as counts change."""
+
+    def __init__(self, recipes=RECIPE_BOOK_RECIPES):
+        self.recipes = recipes  # (station, {ingredient: amount}, (output id, count))
+        self.by_ingredient = {}  # ingredient -> indexes of the recipes that use it
+        for index, (station, ingredients, output) in enumerate(recipes):
+            for ingredient in ingredients:
+                self.by_ingredient.setdefault(ingredient, []).append(index)
+        self.counts = {}  # item id or tag name -> amount held
+        self.craftable = set()  # indexes of recipes with every ingredient held
+
+    def add(self, item_id, amount):
+        """Changes the held count of an item by amount and rechecks the recipes that use it."""
+        if item_id == 0 or amount == 0:
+            return
+        affected = []
+        for ingredient in (item_id, ITEM_RECIPE_TAGS.get(item_id)):
+            if ingredient is None:
+                continue
+            count = self.counts.get(ingredient, 0) + amount
+            if count > 0:
+                self.counts[ingredient] = count
+            else:
+                self.counts.pop(ingredient, None)
+            affected.extend(self.by_ingredient.get(ingredient, ()))
+        for index in affected:
+            if (index in self.craftable) == (amount > 0):
+                continue  # More of an item cannot make a recipe uncraftable, nor less make one craftable
+            ingredients = self.recipes[index][1]
+            if all(self.counts.get(ingredient, 0) >= needed for ingredient, needed in ingredients.items()):
+                self.craftable.add(index)
+            else:
+                self.craftable.discard(index)
+
+    def craftable_outputs(self, station):
+        """Returns the outputs of the craftable recipes for a station, in recipe order."""
+        return [self.recipes[index][2] for index in sorted(self.craftable) if self.recipes[index][0] == station]
+
+# --- Item Containers ---
+# An ItemContainer owns a run of (item id, count) slots split into sections; the player's is the
+# 9-slot hotbar followed by the 27-slot inventory. Besides the slots it keeps an item id -> slots
+# index, a total count per item and a min-heap of free slots, so adding or removing an item only
+# touches the slots that hold it (and the lowest free slot) instead of scanning all of them.
+# Sections are list subclasses, so existing code reads them and assigns single slots as before;
+# every assignment goes through set_slot, which keeps the indexes current and tells listeners.
+# Sections pickle as plain lists, so saves do not depend on these classes.
+MAX_STACK_SIZE = 64
+
+class ContainerSlots(list):
+    """One section of an ItemContainer's slots."""
+
+    def __init__(self, container, offset, size):
+        super().__init__([(0, 0)] * size)
+        self.container = container
+        self.offset = offset  # Container slot number of this section's first slot
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            raise TypeError("container slots are assigned one at a time")
+        if index < 0:
+            index += len(self)
+        self.container.set_slot(self.offset + index, value)
+
+    def __reduce_ex__(self, protocol):
+        return list, (list(self),)
+
+class ItemContainer:
+    """Item slots with an item id -> slots index, per-item totals and a free-slot heap."""
+
+    def __init__(self, *section_sizes):
+        self.sections = []
+        self.slot_sections = []  # Container slot number -> (section, index in section)
+        for size in section_sizes:
+            section = ContainerSlots(self, len(self.slot_sections), size)
+            self.sections.append(section)
+            self.slot_sections.extend((section, i) for i in range(size))
+        self.item_slots = {}  # item id -> set of slot numbers holding it
+        self.totals = {}  # item id -> total count held
+        self.free_slots = list(range(len(self.slot_sections)))  # Min-heap; entries for refilled slots are skipped lazily
+        self.listeners = []  # Called as listener(slot, old, new) after a slot changes
+
+    def get(self, slot):
+        """Returns the (item id, count) in a slot."""
+        section, index = self.slot_sections[slot]
+        return list.__getitem__(section, index)
+
+    def set_slot(self, slot, value):
+        """Puts (item id, count) in a slot, updating the indexes and notifying listeners."""
+        section, index = self.slot_sections[slot]
+        old = list.__getitem__(section, index)
+        if old == value:
+            return
+        list.__setitem__(section, index, value)
+        item_id, count = old
+        if item_id == value[0] and item_id != 0 and count > 0 and value[1] > 0:
+            # Same item, new count: only the total changes
+            self.totals[item_id] += value[1] - count
+            for listener in self.listeners:
+                listener(slot, old, value)
+            return
+        if item_id != 0 and count > 0:
+            slots = self.item_slots[item_id]
+            slots.discard(slot)
+            if not slots:
+                del self.item_slots[item_id]
+            self.totals[item_id] -= count
+            if self.totals[item_id] <= 0:
+                del self.totals[item_id]
+        item_id, count = value
+        if item_id != 0 and count > 0:
+            self.item_slots.setdefault(item_id, set()).add(slot)
+            self.totals[item_id] = self.totals.get(item_id, 0) + count
+        else:
+            if len(self.free_slots) > 4 * len(self.slot_sections):
+                self.free_slots = [s for s in range(len(self.slot_sections)) if self.is_empty(s)]
+                heapq.heapify(self.free_slots)
+            else:
+                heapq.heappush(self.free_slots, slot)
+        for listener in self.listeners:
+            listener(slot, old, value)
+
+    def load(self, section_number, values):
+        """Replaces a section's contents with a list of (item id, count), e.g. from a save."""
+        section = self.sections[section_number]
+        for i in range(len(section)):
+            self.set_slot(section.offset + i, tuple(values[i]) if i < len(values) else (0, 0))
+
+    def is_empty(self, slot):
+        item_id, count = self.get(slot)
+        return item_id == 0 or count <= 0
+
+    def count(self, item_id):
+        """Returns how many of an item the container holds."""
+        return self.totals.get(item_id, 0)
+
+    def find(self, item_id):
+        """Returns the lowest slot holding an item, or None."""
+        slots = self.item_slots.get(item_id)
+        return min(slots) if slots else None
+
+    def take_free_slot(self):
+        """Pops the lowest empty slot off the free-slot heap, or returns None when the container is full."""
+        while self.free_slots:
+            slot = heapq.heappop(self.free_slots)
+            if self.is_empty(slot):
+                return slot
+        return None
+
+    def add(self, item_id, amount):
+        """Adds an item, topping up its stacks (lowest slot first) before starting new ones. Returns the amount that did not fit."""
+        if item_id == 0 or amount <= 0:
+            return 0
+        slots = self.item_slots.get(item_id, ())
+        for slot in (sorted(slots) if len(slots) > 1 else tuple(slots)):
+            count = self.get(slot)[1]
+            if count < MAX_STACK_SIZE:
+                added = min(amount, MAX_STACK_SIZE - count)
+                self.set_slot(slot, (item_id, count + added))
+                amount -= added
+                if amount <= 0:
+                    return 0
+        while amount > 0:
+            slot = self.take_free_slot()
+            if slot is None:
+                break
+            added = min(amount, MAX_STACK_SIZE)
+            self.set_slot(slot, (item_id, added))
+            amount -= added
+        return amount
+
+    def remove(self, item_id, amount):
+        """Removes up to amount of an item, lowest slot first. Returns the amount removed."""
+        removed = 0
+        for slot in sorted(self.item_slots.get(item_id, ())):
+            count = self.get(slot)[1]
+            taken = min(amount - removed, count)
+            self.set_slot(slot, (item_id, count - taken) if taken < count else (0, 0))
+            removed += taken
+            if removed >= amount:
+                break
+        return removed
+
+    def add_many(self, items):
+        """Adds (item id, amount) pairs. Returns the pairs (with leftover amounts) that did not fit."""
+        leftovers = []
+        for item_id, amount in items:
+            leftover = self.add(item_id, amount)
+            if leftover:
+                leftovers.append((item_id, leftover))
+        return leftovers
+
+    def remove_many(self, items):
+        """Removes (item id, amount) pairs only if every one is held in full. Returns whether they were removed."""
+        needed = {}
+        for item_id, amount in items:
+            needed[item_id] = needed.get(item_id, 0) + amount
+        if any(self.count(item_id) < amount for item_id, amount in needed.items()):
+            return False
+        for item_id, amount in needed.items():
+            self.remove(item_id, amount)
+        return True
+
+    def transfer(self, target, item_id, amount):
+        """Moves up to amount of an item into another container. Returns the amount moved."""
+        moved = self.remove(item_id, amount)
+        leftover = target.add(item_id, moved)
+        if leftover:
+            self.add(item_id, leftover)
+        return moved - leftover
+
+    def clear(self):
+        """Empties the container. Returns the (slot, item id, count) that were in it, in slot order."""
+        contents = []
+        for slot in sorted(slot for slots in self.item_slots.values() for slot in slots):
+            item_id, count = self.get(slot)
+            contents.append((slot, item_id, count))
+            self.set_slot(slot, (0, 0))
+        return contents
+
 # --- Smelting Recipes ---
 SMELTING_RECIPES = {
     51: 87,  # Beef → Cooked Beef
@@ -734,7 +1298,12 @@ def save_world(world_name, world_map, player, mobs, time_of_day, loaded_chunks):
         'player_tool_durability': player.tool_durability,
         'time_of_day': time_of_day,
         'loaded_chunks': loaded_chunks,
-        'mobs': [(type(mob).__name__, mob.rect.x, mob.rect.y, mob.health) for mob in mobs],
+        'mobs': serialize_entities(mobs),
+        'world_seed': WORLD_SEED,
+        'structures': STRUCTURES.to_save(),
+        'block_entities': save_block_entities(),
+        'biome_map': BIOME_MAP,
+        'chunk_range': list(CURRENT_CHUNK_RANGE),
         'game_mode': CURRENT_GAME_MODE,
         'creative_mode': player.creative_mode,
         'can_fly': player.can_fly
@@ -757,34 +1326,97 @@ def load_world(world_name):
     
     return save_data
 
-def reconstruct_mobs(mob_data_list):
-    """Reconstruct mob objects from saved tuples."""
-    reconstructed_mobs = pygame.sprite.Group()
-    
-    # Map mob class names to their classes
-    mob_classes = {
-        'Zombie': Zombie,
-        'Skeleton': Skeleton,
-        'Spider': Spider,
-        'Creeper': Creeper,
-        'Turtle': Turtle,
-        'Cod': Cod,
-        'Salmon': Salmon,
-        'ZombieNautilus': ZombieNautilus,
-        'ZombieHorse': ZombieHorse,
-        'ZombieCamel': ZombieCamel,
-        'Drowned': Drowned
-    }
+# --- Entity Serialization ---
+# Saves store mobs columnarly: {'version': N, 'chunks': {chunk_index: {class_name: {field: [values]}}}}.
+# Version 1 saves were a list of (class_name, x, y, health) tuples.
+ENTITY_SCHEMA_VERSION = 2
+ENTITY_PROTOTYPES = {}  # (class, variant values) -> constructed instance that restored mobs are cloned from
+
+def get_entity_prototype(cls, variant):
+    """Returns the cached prototype for a class and variant, constructing it (and its textures) on first use."""
+    key = (cls, variant)
+    prototype = ENTITY_PROTOTYPES.get(key)
+    if prototype is None:
+        kwargs = {name: value for name, value in zip(cls.variant_fields, variant) if value is not None}
+        prototype = cls(0, 0, **kwargs)
+        ENTITY_PROTOTYPES[key] = prototype
+    return prototype
+
+def clone_entity(prototype, x, y):
+    """Creates a new entity from a prototype's state without running its constructor."""
+    cls = type(prototype)
+    mob = cls.__new__(cls)
+    pygame.sprite.Sprite.__init__(mob)
+    state = mob.__dict__
+    for name, value in prototype.__dict__.items():
+        if name == '_Sprite__g':
+            continue
+        if isinstance(value, (list, dict, set, pygame.Rect)):
+            value = value.copy()  # Textures are shared, mutable state is not
+        state[name] = value
+    mob.rect.topleft = (x, y)
+    return mob
+
+def serialize_entities(mobs):
+    """Packs mobs into per-chunk, per-class columns of their declared fields."""
+    chunks = {}
+    for mob in mobs:
+        cls = type(mob)
+        if get_mob_class(cls.__name__) is not cls:
+            continue  # Not a registered entity type
+        fields = cls.variant_fields + cls.persistent_fields
+        chunk = chunks.setdefault(get_mob_chunk(mob.rect.centerx), {})
+        columns = chunk.get(cls.__name__)
+        if columns is None:
+            columns = chunk[cls.__name__] = {name: [] for name in ('x', 'y') + fields}
+        columns['x'].append(mob.rect.x)
+        columns['y'].append(mob.rect.y)
+        for name in fields:
+            columns[name].append(getattr(mob, name, None))
+    return {'version': ENTITY_SCHEMA_VERSION, 'chunks': chunks}
+
+def reconstruct_mobs(mob_data):
+    """Rebuilds a mob group from saved entity data (columnar, or version 1 tuples)."""
+    reconstructed_mobs = MobGroup()
+    
+    # Version 1: list of (class_name, x, y, health) tuples
+    if isinstance(mob_data, list):
+        mob_data = upgrade_entity_tuples(mob_data)
+    
+    version = mob_data.get('version', 1)
+    if version > ENTITY_SCHEMA_VERSION:
+        print(f"⚠️ Entity data is version {version}, newer than {ENTITY_SCHEMA_VERSION}; loading known fields only")
+    
+    for chunk in mob_data.get('chunks', {}).values():
+        for class_name, columns in chunk.items():
+            cls = get_mob_class(class_name)
+            if cls is None:
+                continue
+            xs = columns.get('x', [])
+            count = len(xs)
+            variant_columns = [columns.get(name, [None] * count) for name in cls.variant_fields]
+            field_columns = [(name, columns[name]) for name in cls.persistent_fields if name in columns]
+            for i in range(count):
+                variant = tuple(column[i] for column in variant_columns)
+                mob = clone_entity(get_entity_prototype(cls, variant), xs[i], columns['y'][i])
+                for name, column in field_columns:
+                    if column[i] is not None:
+                        setattr(mob, name, column[i])
+                reconstructed_mobs.add(mob)
     
+    return reconstructed_mobs
+
+def upgrade_entity_tuples(mob_data_list):
+    """Converts version 1 (class_name, x, y, health) tuples into version 1 columnar entity data."""
+    chunks = {}
     for mob_info in mob_data_list:
         if isinstance(mob_info, tuple) and len(mob_info) >= 4:
             mob_type, x, y, health = mob_info[:4]
-            if mob_type in mob_classes:
-                mob = mob_classes[mob_type](x, y)
-                mob.health = health
-                reconstructed_mobs.add(mob)
-    
-    return reconstructed_mobs
+            columns = chunks.setdefault(get_mob_chunk(x), {}).setdefault(mob_type, {'x': [], 'y': [], 'health': []})
+            columns['x'].append(x)
+            columns['y'].append(y)
+            columns['health'].append(health)
+    return {'version': 1, 'chunks': chunks}
 
 def delete_world(world_name):
     """Delete a saved world."""
@@ -864,7 +1496,7 @@ def draw_button(screen, text, x, y, width, height, color, hover_color, text_colo
     pygame.draw.rect(screen, (255, 255, 255), button_rect, 3, border_radius=10)
     
     # Draw text
-    text_surface = FONT_BIG.render(text, True, text_color)
+    text_surface = render_text(FONT_BIG, text, True, text_color)
     text_rect = text_surface.get_rect(center=button_rect.center)
     screen.blit(text_surface, text_rect)
     
@@ -875,9 +1507,9 @@ def draw_main_menu(screen, background):
     screen.blit(background, (0, 0))
     
     # Title
-    title_font = pygame.font.Font(None, 72)
-    title = title_font.render("PyCraft Alpha 3", True, (255, 255, 255))
-    title_shadow = title_font.render("PyCraft Alpha 3", True, (0, 0, 0))
+    title_font = get_font(72)
+    title = render_text(title_font, "PyCraft Alpha 3", True, (255, 255, 255))
+    title_shadow = render_text(title_font, "PyCraft Alpha 3", True, (0, 0, 0))
     screen.blit(title_shadow, (SCREEN_WIDTH // 2 - title.get_width() // 2 + 3, 83))
     screen.blit(title, (SCREEN_WIDTH // 2 - title.get_width() // 2, 80))
     
@@ -902,14 +1534,14 @@ def draw_username_input_menu(screen, background, username_input, selected_skin="
     screen.blit(background, (0, 0))
     
     # Title
-    title_font = pygame.font.Font(None, 72)
-    title = title_font.render("Welcome to PyCraft!", True, (255, 255, 255))
-    title_shadow = title_font.render("Welcome to PyCraft!", True, (0, 0, 0))
+    title_font = get_font(72)
+    title = render_text(title_font, "Welcome to PyCraft!", True, (255, 255, 255))
+    title_shadow = render_text(title_font, "Welcome to PyCraft!", True, (0, 0, 0))
     screen.blit(title_shadow, (SCREEN_WIDTH // 2 - title.get_width() // 2 + 3, 63))
     screen.blit(title, (SCREEN_WIDTH // 2 - title.get_width() // 2, 60))
     
     # Instructions
-    instructions = FONT_BIG.render("Enter your username:", True, (255, 255, 255))
+    instructions = render_text(FONT_BIG, "Enter your username:", True, (255, 255, 255))
     screen.blit(instructions, (SCREEN_WIDTH // 2 - instructions.get_width() // 2, 140))
     
     # Input box
@@ -918,11 +1550,11 @@ def draw_username_input_menu(screen, background, username_input, selected_skin="
     pygame.draw.rect(screen, (100, 100, 100), input_rect, 3, border_radius=5)
     
     # Display current input
-    input_text = FONT_BIG.render(username_input if username_input else "|", True, (0, 0, 0))
+    input_text = render_text(FONT_BIG, username_input if username_input else "|", True, (0, 0, 0))
     screen.blit(input_text, (input_rect.x + 15, input_rect.y + 12))
     
     # Skin selection label
-    skin_label = FONT_BIG.render("Choose your skin:", True, (255, 255, 255))
+    skin_label = render_text(FONT_BIG, "Choose your skin:", True, (255, 255, 255))
     screen.blit(skin_label, (SCREEN_WIDTH // 2 - skin_label.get_width() // 2, 250))
     
     # Draw skin previews (3 rows of 3)
@@ -975,7 +1607,7 @@ def draw_username_input_menu(screen, background, username_input, selected_skin="
         screen.blit(preview, (preview_x, preview_y))
         
         # Draw name below preview
-        name_text = FONT_SMALL.render(skin_name, True, (255, 255, 255))
+        name_text = render_text(FONT_SMALL, skin_name, True, (255, 255, 255))
         name_x = x + (100 - name_text.get_width()) // 2
         screen.blit(name_text, (name_x, y + 52))
         
@@ -996,7 +1628,7 @@ def draw_world_select_menu(screen, background):
     screen.blit(background, (0, 0))
     
     # Title
-    title = FONT_BIG.render("Select World", True, (255, 255, 255))
+    title = render_text(FONT_BIG, "Select World", True, (255, 255, 255))
     screen.blit(title, (SCREEN_WIDTH // 2 - title.get_width() // 2, 50))
     
     # Get saved worlds
@@ -1049,11 +1681,11 @@ def draw_create_world_menu(screen, background, world_name_input, game_mode):
     screen.blit(background, (0, 0))
     
     # Title
-    title = FONT_BIG.render("Create New World", True, (255, 255, 255))
+    title = render_text(FONT_BIG, "Create New World", True, (255, 255, 255))
     screen.blit(title, (SCREEN_WIDTH // 2 - title.get_width() // 2, 50))
     
     # Instructions
-    instructions = FONT_SMALL.render("Enter world name and press Create", True, (200, 200, 200))
+    instructions = render_text(FONT_SMALL, "Enter world name and press Create", True, (200, 200, 200))
     screen.blit(instructions, (SCREEN_WIDTH // 2 - instructions.get_width() // 2, 120))
     
     # Input box
@@ -1062,11 +1694,11 @@ def draw_create_world_menu(screen, background, world_name_input, game_mode):
     pygame.draw.rect(screen, (100, 100, 100), input_rect, 3, border_radius=5)
     
     # Display current input
-    input_text = FONT_BIG.render(world_name_input, True, (0, 0, 0))
+    input_text = render_text(FONT_BIG, world_name_input, True, (0, 0, 0))
     screen.blit(input_text, (input_rect.x + 10, input_rect.y + 12))
     
     # Game Mode Label
-    mode_label = FONT_SMALL.render("Game Mode:", True, (255, 255, 255))
+    mode_label = render_text(FONT_SMALL, "Game Mode:", True, (255, 255, 255))
     screen.blit(mode_label, (SCREEN_WIDTH // 2 - 200, 235))
     
     # Survival button
@@ -1089,9 +1721,9 @@ def draw_create_world_menu(screen, background, world_name_input, game_mode):
     
     # Mode description
     if game_mode == GAME_MODE_SURVIVAL:
-        desc = FONT_SMALL.render("Search for resources, health & hunger matter", True, (200, 200, 200))
+        desc = render_text(FONT_SMALL, "Search for resources, health & hunger matter", True, (200, 200, 200))
     else:
-        desc = FONT_SMALL.render("Unlimited resources, flying, no damage", True, (200, 200, 200))
+        desc = render_text(FONT_SMALL, "Unlimited resources, flying, no damage", True, (200, 200, 200))
     screen.blit(desc, (SCREEN_WIDTH // 2 - desc.get_width() // 2, 330))
     
     # Create button
@@ -1110,6 +1742,23 @@ def draw_create_world_menu(screen, background, world_name_input, game_mode):
     
     return create_rect, cancel_rect, survival_rect, creative_rect
 
+def draw_world_creation_progress(screen, background, done, total):
+    """Draw the progress bar shown while a new world's chunks are generated."""
+    screen.blit(background, (0, 0))
+    
+    title = render_text(FONT_BIG, "Generating World...", True, (255, 255, 255))
+    screen.blit(title, (SCREEN_WIDTH // 2 - title.get_width() // 2, SCREEN_HEIGHT // 2 - 80))
+    
+    bar_rect = pygame.Rect(SCREEN_WIDTH // 2 - 200, SCREEN_HEIGHT // 2 - 15, 400, 30)
+    pygame.draw.rect(screen, (40, 40, 40), bar_rect, border_radius=5)
+    if total > 0 and done > 0:
+        filled_rect = pygame.Rect(bar_rect.x, bar_rect.y, bar_rect.width * done // total, bar_rect.height)
+        pygame.draw.rect(screen, (70, 130, 70), filled_rect, border_radius=5)
+    pygame.draw.rect(screen, (200, 200, 200), bar_rect, 3, border_radius=5)
+    
+    status = render_text(FONT_SMALL, f"Chunk {done} / {total}", True, (200, 200, 200))
+    screen.blit(status, (SCREEN_WIDTH // 2 - status.get_width() // 2, bar_rect.bottom + 15))
+
 def draw_pause_menu(screen):
     """Draw the pause menu overlay."""
     # Semi-transparent overlay
@@ -1119,8 +1768,8 @@ def draw_pause_menu(screen):
     screen.blit(overlay, (0, 0))
     
     # Paused text
-    pause_font = pygame.font.Font(None, 64)
-    pause_text = pause_font.render("Game Paused", True, (255, 255, 255))
+    pause_font = get_font(64)
+    pause_text = render_text(pause_font, "Game Paused", True, (255, 255, 255))
     screen.blit(pause_text, (SCREEN_WIDTH // 2 - pause_text.get_width() // 2, 80))
     
     # Back to Game button
@@ -1172,13 +1821,13 @@ def draw_death_screen(screen):
     screen.blit(overlay, (0, 0))
     
     # "You Died!" title
-    death_font = pygame.font.Font(None, 96)
-    death_text = death_font.render("You Died!", True, (255, 50, 50))
+    death_font = get_font(96)
+    death_text = render_text(death_font, "You Died!", True, (255, 50, 50))
     screen.blit(death_text, (SCREEN_WIDTH // 2 - death_text.get_width() // 2, 150))
     
     # Score/stats (optional)
-    stats_font = pygame.font.Font(None, 36)
-    stats_text = stats_font.render("Score: 0", True, (255, 255, 255))  # Placeholder for future score system
+    stats_font = get_font(36)
+    stats_text = render_text(stats_font, "Score: 0", True, (255, 255, 255))  # Placeholder for future score system
     screen.blit(stats_text, (SCREEN_WIDTH // 2 - stats_text.get_width() // 2, 250))
     
     # Respawn button
@@ -1197,6 +1846,64 @@ def draw_death_screen(screen):
     
     return respawn_rect, title_rect
 
+# --- Menu Redraw Tracking ---
+# Menus are static between inputs, so they are only redrawn when an input event arrives,
+# the menu/screen size changes, or the mouse moves onto a different button.
+MENU_DIRTY = True  # Set by input events, forces a full redraw
+MENU_REDRAW_KEY = None  # (menu state, screen size) of the last full redraw
+MENU_HOVER_INDEX = -1  # Index of the hovered button in MENU_HOT_RECTS
+MENU_HOT_RECTS = []  # Button rects of the menu currently on screen
+
+def poll_menu_events():
+    """Returns pending events and marks the menu dirty if any of them is an input event."""
+    global MENU_DIRTY
+    events = pygame.event.get()
+    for event in events:
+        if event.type != pygame.MOUSEMOTION:
+            MENU_DIRTY = True
+    return events
+
+def get_menu_redraw_mode(menu_state):
+    """Returns "full", "hover" or None depending on what changed since the menu was last drawn."""
+    global MENU_DIRTY, MENU_REDRAW_KEY, MENU_HOVER_INDEX
+    redraw_key = (menu_state, SCREEN_WIDTH, SCREEN_HEIGHT)
+    
+    hover_index = -1
+    mouse_pos = pygame.mouse.get_pos()
+    for i, rect in enumerate(MENU_HOT_RECTS):
+        if rect.collidepoint(mouse_pos):
+            hover_index = i
+            break
+    
+    if MENU_DIRTY or redraw_key != MENU_REDRAW_KEY:
+        mode = "full"
+    elif hover_index != MENU_HOVER_INDEX:
+        mode = "hover"
+    else:
+        return None
+    
+    MENU_DIRTY = False
+    MENU_REDRAW_KEY = redraw_key
+    MENU_HOVER_INDEX = hover_index
+    return mode
+
+def show_world_creation_progress(done, total):
+    """generate_world progress callback: draws the progress bar and keeps the window responsive."""
+    global MENU_DIRTY
+    pygame.event.pump()
+    draw_world_creation_progress(screen, menu_background, done, total)
+    pygame.display.flip()
+    MENU_DIRTY = True  # The menu under the bar needs a full redraw afterwards
+
+def present_menu(mode, hot_rects):
+    """Pushes a redrawn menu to the display (only the button rects when just the hover changed)."""
+    global MENU_HOT_RECTS
+    if mode == "full":
+        pygame.display.flip()
+    elif mode == "hover":
+        pygame.display.update(MENU_HOT_RECTS + hot_rects)
+    MENU_HOT_RECTS = list(hot_rects)
+
 # --- Pygame Initialization ---
 pygame.init()
 screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.RESIZABLE)
@@ -1204,9 +1911,251 @@ pygame.display.set_caption("Simple Pycraft Clone (Scrolling World with Enemies a
 clock = pygame.time.Clock()
 
 pygame.font.init()
-FONT_SMALL = pygame.font.Font(None, 16)
-FONT_BIG = pygame.font.Font(None, 24)
-FONT = pygame.font.Font(None, 20)  # Medium font for achievements
+
+# --- Font Registry & Text Cache ---
+FONT_REGISTRY = {}  # size -> pygame.font.Font (one instance per size)
+TEXT_SURFACE_CACHE = OrderedDict()  # (font, text, antialias, color, background) -> rendered surface
+TEXT_SURFACE_CACHE_SIZE = 512
+
+def get_font(size):
+    """Returns the shared default font for the given size, creating it on first use."""
+    font = FONT_REGISTRY.get(size)
+    if font is None:
+        font = pygame.font.Font(None, size)
+        FONT_REGISTRY[size] = font
+    return font
+
+def render_text(font, text, antialias, color, background=None):
+    """Cached drop-in for font.render(); returns the same surface for repeated text."""
+    key = (font, text, antialias, tuple(color), tuple(background) if background is not None else None)
+    surface = TEXT_SURFACE_CACHE.get(key)
+    if surface is not None:
+        TEXT_SURFACE_CACHE.move_to_end(key)
+        return surface
+    
+    if background is None:
+        surface = font.render(text, antialias, color)
+    else:
+        surface = font.render(text, antialias, color, background)
+    TEXT_SURFACE_CACHE[key] = surface
+    if len(TEXT_SURFACE_CACHE) > TEXT_SURFACE_CACHE_SIZE:
+        TEXT_SURFACE_CACHE.popitem(last=False)  # Evict least recently used
+    return surface
+
+FONT_SMALL = get_font(16)
+FONT_BIG = get_font(24)
+FONT = get_font(20)  # Medium font for achievements
+
+# --- Adaptive Quality Governor ---
+# Measures how long each frame takes to process (excluding the clock.tick sleep) and steps
+# quality down when the frame budget is exceeded, and back up once there is headroom again.
+ADAPTIVE_QUALITY = True
+TARGET_FRAME_MS = 1000 / FPS  # 16.6 ms at 60 FPS
+QUALITY_DOWNGRADE_RATIO = 1.05  # Smoothed frame time above budget * ratio -> lower quality
+QUALITY_UPGRADE_RATIO = 0.70  # Smoothed frame time below budget * ratio -> raise quality
+QUALITY_DOWNGRADE_FRAMES = 45  # Frames over budget before stepping down (~0.75 s)
+QUALITY_UPGRADE_FRAMES = 240  # Frames under budget before stepping up (~4 s)
+
+QUALITY_LEVELS = [
+    # sprint_render_blocks: extra render distance while sprinting
+    # particle_density: fraction of fire/mob particles drawn
+    # far_mob_ai_interval: multiplier on how rarely distant mobs think (see AI Level of Detail)
+    # fluid_tick_interval: frames between water/lava/falling block updates
+    {"name": "High", "sprint_render_blocks": 10, "particle_density": 1.0, "far_mob_ai_interval": 1, "fluid_tick_interval": 10},
+    {"name": "Medium", "sprint_render_blocks": 6, "particle_density": 0.6, "far_mob_ai_interval": 2, "fluid_tick_interval": 15},
+    {"name": "Low", "sprint_render_blocks": 3, "particle_density": 0.3, "far_mob_ai_interval": 4, "fluid_tick_interval": 20},
+    {"name": "Minimal", "sprint_render_blocks": 0, "particle_density": 0.0, "far_mob_ai_interval": 8, "fluid_tick_interval": 30},
+]
+QUALITY_LEVEL = 0
+QUALITY = QUALITY_LEVELS[QUALITY_LEVEL]
+FRAME_TIME_AVG_MS = 0.0  # Exponential moving average of frame processing time
+QUALITY_OVER_BUDGET_FRAMES = 0
+QUALITY_UNDER_BUDGET_FRAMES = 0
+
+def set_quality_level(level):
+    """Switches to the given quality level (0 = highest)."""
+    global QUALITY_LEVEL, QUALITY
+    level = max(0, min(len(QUALITY_LEVELS) - 1, level))
+    if level != QUALITY_LEVEL:
+        print(f"⚙️ Quality {QUALITY['name']} -> {QUALITY_LEVELS[level]['name']} (frame time {FRAME_TIME_AVG_MS:.1f} ms)")
+    QUALITY_LEVEL = level
+    QUALITY = QUALITY_LEVELS[level]
+
+def update_quality_governor(frame_ms):
+    """Feeds one frame's processing time into the governor and adjusts quality with hysteresis."""
+    global FRAME_TIME_AVG_MS, QUALITY_OVER_BUDGET_FRAMES, QUALITY_UNDER_BUDGET_FRAMES
+    FRAME_TIME_AVG_MS = frame_ms if FRAME_TIME_AVG_MS == 0 else FRAME_TIME_AVG_MS * 0.9 + frame_ms * 0.1
+    if not ADAPTIVE_QUALITY:
+        return
+    
+    if FRAME_TIME_AVG_MS > TARGET_FRAME_MS * QUALITY_DOWNGRADE_RATIO:
+        QUALITY_OVER_BUDGET_FRAMES += 1
+        QUALITY_UNDER_BUDGET_FRAMES = 0
+    elif FRAME_TIME_AVG_MS < TARGET_FRAME_MS * QUALITY_UPGRADE_RATIO:
+        QUALITY_UNDER_BUDGET_FRAMES += 1
+        QUALITY_OVER_BUDGET_FRAMES = 0
+    else:
+        # Inside the hysteresis band - keep the current level
+        QUALITY_OVER_BUDGET_FRAMES = 0
+        QUALITY_UNDER_BUDGET_FRAMES = 0
+    
+    if QUALITY_OVER_BUDGET_FRAMES >= QUALITY_DOWNGRADE_FRAMES:
+        set_quality_level(QUALITY_LEVEL + 1)
+        QUALITY_OVER_BUDGET_FRAMES = 0
+    elif QUALITY_UNDER_BUDGET_FRAMES >= QUALITY_UPGRADE_FRAMES:
+        set_quality_level(QUALITY_LEVEL - 1)
+        QUALITY_UNDER_BUDGET_FRAMES = 0
+
+# --- Frame Profiler ---
+# F3 toggles the profiler and its overlay. The game loop marks the end of each subsystem with
+# profile_lap(name), which charges the time since the previous mark (or profile_begin_frame) to
+# that name, so the laps of one frame add up to the frame. While the profiler is off every call
+# returns after one flag check. Each name keeps its last PROFILER_WINDOW samples for the overlay's
+# average, p95 and max; whole frames also go into a 1 ms-bucket histogram that F4 writes out.
+PROFILER_ENABLED = False
+PROFILER_REQUESTED = False  # Applied at the next frame start, so every frame is profiled whole
+PROFILER_WINDOW = 120  # Samples kept per subsystem (2 s at 60 FPS)
+PROFILER_HISTOGRAM_BUCKETS = 100  # 1 ms buckets; the last one also counts slower frames
+PROFILER_OVERLAY_REFRESH = 15  # Frames between overlay text updates (keeps it readable)
+FRAME_HISTOGRAM_FILE = Path("frame_times.csv")
+PROFILER_SAMPLES = {}  # name -> deque of recent durations in ns, in loop order
+PROFILER_FRAME_HISTOGRAM = [0] * PROFILER_HISTOGRAM_BUCKETS
+PROFILER_FRAME_START = 0
+PROFILER_LAST_MARK = 0
+PROFILER_OVERLAY_LINES = []  # (name, avg, p95, max) rows last shown
+PROFILER_OVERLAY_AGE = 0
+PROFILER_OVERLAY_SURFACE = None  # Overlay panel, redrawn on each refresh
+
+def set_profiler_enabled(enabled):
+    """Turns frame profiling on or off from the next frame."""
+    global PROFILER_REQUESTED
+    PROFILER_REQUESTED = enabled
+
+def record_profile_sample(name, duration_ns):
+    """Adds one duration to a subsystem's rolling window."""
+    samples = PROFILER_SAMPLES.get(name)
+    if samples is None:
+        samples = PROFILER_SAMPLES[name] = deque(maxlen=PROFILER_WINDOW)
+    samples.append(duration_ns)
+
+def profile_begin_frame():
+    """Marks the start of a frame."""
+    global PROFILER_ENABLED, PROFILER_FRAME_START, PROFILER_LAST_MARK, PROFILER_OVERLAY_AGE, PROFILER_OVERLAY_SURFACE
+    if PROFILER_REQUESTED != PROFILER_ENABLED:
+        # Start each profiling session from fresh samples
+        PROFILER_ENABLED = PROFILER_REQUESTED
+        PROFILER_SAMPLES.clear()
+        PROFILER_OVERLAY_LINES.clear()
+        PROFILER_OVERLAY_AGE = 0
+        PROFILER_OVERLAY_SURFACE = None
+    if PROFILER_ENABLED:
+        PROFILER_FRAME_START = PROFILER_LAST_MARK = time.perf_counter_ns()
+
+def profile_lap(name):
+    """Charges the time since the previous mark to a subsystem."""
+    global PROFILER_LAST_MARK
+    if PROFILER_ENABLED:
+        now = time.perf_counter_ns()
+        record_profile_sample(name, now - PROFILER_LAST_MARK)
+        PROFILER_LAST_MARK = now
+
+def profile_end_frame():
+    """Records the whole frame's time and adds it to the histogram."""
+    if PROFILER_ENABLED:
+        frame_ns = time.perf_counter_ns() - PROFILER_FRAME_START
+        record_profile_sample("frame", frame_ns)
+        PROFILER_FRAME_HISTOGRAM[min(frame_ns // 1000000, PROFILER_HISTOGRAM_BUCKETS - 1)] += 1
+
+def get_profile_stats(samples):
+    """Returns (average, p95, max) of a sample window in milliseconds."""
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return sum(ordered) / len(ordered) / 1e6, p95 / 1e6, ordered[-1] / 1e6
+
+def export_frame_histogram(path=FRAME_HISTOGRAM_FILE):
+    """Writes the frame-time histogram as frame_ms,frames CSV rows."""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("frame_ms,frames\n")
+        for bucket, frames in enumerate(PROFILER_FRAME_HISTOGRAM):
+            label = f"{bucket}+" if bucket == PROFILER_HISTOGRAM_BUCKETS - 1 else str(bucket)
+            f.write(f"{label},{frames}\n")
+    print(f"📊 Frame-time histogram ({sum(PROFILER_FRAME_HISTOGRAM)} frames) written to {path}")
+
+def draw_profiler_overlay(screen):
+    """Draws the F3 overlay: per-subsystem timings and entity, item and chunk counts."""
+    global PROFILER_OVERLAY_AGE, PROFILER_OVERLAY_SURFACE
+    if not PROFILER_ENABLED:
+        return
+    PROFILER_OVERLAY_AGE -= 1
+    if PROFILER_OVERLAY_AGE <= 0 and PROFILER_SAMPLES:
+        PROFILER_OVERLAY_AGE = PROFILER_OVERLAY_REFRESH
+        PROFILER_OVERLAY_LINES[:] = [(name,) + get_profile_stats(samples) for name, samples in PROFILER_SAMPLES.items()]
+        PROFILER_OVERLAY_SURFACE = None
+    
+    if PROFILER_OVERLAY_SURFACE is None:
+        # The numbers change on every refresh, so they are rendered once into the panel
+        # (with font.render, not render_text, which would fill its cache with them)
+        rows = [("ms", "avg", "p95", "max")]
+        rows += [(name, f"{avg:.2f}", f"{p95:.2f}", f"{peak:.2f}") for name, avg, p95, peak in PROFILER_OVERLAY_LINES]
+        column_x = (0, 110, 160, 210)
+        panel_width = 260
+        line_height = FONT_SMALL.get_height()
+        footer = [
+            f"Entities: {len(MOBS)}  Items: {len(DROPPED_ITEMS)}",
+            f"Chunks: {len(LOADED_CHUNKS)}  Block entities: {len(BLOCK_ENTITIES)}",
+            "F4: export frame-time histogram",
+        ]
+        panel = pygame.Surface((panel_width, (len(rows) + len(footer)) * line_height + 10), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 180))
+        y = 5
+        for row in rows:
+            for x, text in zip(column_x, row):
+                panel.blit(FONT_SMALL.render(text, True, (255, 255, 255)), (5 + x, y))
+            y += line_height
+        for text in footer:
+            panel.blit(FONT_SMALL.render(text, True, (255, 255, 0)), (5, y))
+            y += line_height
+        PROFILER_OVERLAY_SURFACE = panel
+    
+    screen.blit(PROFILER_OVERLAY_SURFACE, (SCREEN_WIDTH - PROFILER_OVERLAY_SURFACE.get_width() - 10, 10))
+
+# --- AI Level of Detail ---
+# Mobs run their ai_move decision logic at a rate that depends on their distance to the player;
+# physics still runs every tick and keeps the last decision's velocity in between. Each mob has a
+# fixed phase so a band's thinks are spread across frames, and non-near thinks are capped per frame
+# (mobs over the cap think on the next frame instead).
+NEAR_MOB_DISTANCE = BLOCK_SIZE * 16  # Mobs closer than this think every tick
+FAR_MOB_DISTANCE = BLOCK_SIZE * 32  # Mobs further than this think rarely
+MEDIUM_MOB_THINK_INTERVAL = 4  # Ticks between thinks in the medium band
+FAR_MOB_THINK_INTERVAL = 16  # Ticks between thinks in the far band (times QUALITY["far_mob_ai_interval"])
+AI_THINK_BUDGET = 48  # Max medium/far mob thinks per frame
+AI_TICK = 0
+
+def schedule_mob_ai(mobs, player):
+    """Sets mob.ai_think_due for every mob for this tick based on its distance band."""
+    global AI_TICK
+    AI_TICK += 1
+    budget = AI_THINK_BUDGET
+    near_sq = NEAR_MOB_DISTANCE * NEAR_MOB_DISTANCE
+    far_sq = FAR_MOB_DISTANCE * FAR_MOB_DISTANCE
+    far_interval = FAR_MOB_THINK_INTERVAL * QUALITY["far_mob_ai_interval"]
+    player_x, player_y = player.rect.center
+    for mob in mobs:
+        dx = mob.rect.centerx - player_x
+        dy = mob.rect.centery - player_y
+        dist_sq = dx * dx + dy * dy
+        if dist_sq <= near_sq or not getattr(mob, "ai_lod", False):
+            mob.ai_think_due = True
+            continue
+        interval = MEDIUM_MOB_THINK_INTERVAL if dist_sq <= far_sq else far_interval
+        due = mob.ai_overdue or (AI_TICK + (id(mob) >> 4)) % interval == 0
+        if due and budget > 0:
+            budget -= 1
+            mob.ai_think_due = True
+            mob.ai_overdue = False
+        else:
+            mob.ai_think_due = False
+            mob.ai_overdue = due
 
 # Load menu background image
 menu_background = load_background_image()
@@ -1483,6 +2432,50 @@ try:
 except Exception as e:
     print(f"Error loading textures: {e}")
 
+# --- Scaled Sprite Cache ---
+# LRU cache of scaled block/item surfaces keyed by (item_id, width, height, texture mode)
+SCALED_SPRITE_CACHE = OrderedDict()
+SCALED_SPRITE_CACHE_SIZE = 1024
+
+def get_scaled_sprite(block_id, width, height, use_textures=None):
+    """Returns a cached surface for block_id scaled to width x height (None if unknown).
+    
+    Args:
+        block_id: The block/item ID to look up
+        width: Target width in pixels
+        height: Target height in pixels
+        use_textures: Texture mode to use (defaults to USE_EXPERIMENTAL_TEXTURES)
+    """
+    if use_textures is None:
+        use_textures = USE_EXPERIMENTAL_TEXTURES
+    key = (block_id, width, height, use_textures)
+    
+    sprite = SCALED_SPRITE_CACHE.get(key)
+    if sprite is not None:
+        SCALED_SPRITE_CACHE.move_to_end(key)
+        return sprite
+    
+    if width <= 0 or height <= 0:
+        return None
+    if use_textures and block_id in BLOCK_TEXTURES:
+        sprite = pygame.transform.scale(BLOCK_TEXTURES[block_id], (width, height))
+    elif block_id in BLOCK_TYPES:
+        # Solid color for blocks without textures
+        sprite = pygame.Surface((width, height))
+        sprite.fill(BLOCK_TYPES[block_id]["color"])
+    else:
+        return None
+    
+    SCALED_SPRITE_CACHE[key] = sprite
+    if len(SCALED_SPRITE_CACHE) > SCALED_SPRITE_CACHE_SIZE:
+        SCALED_SPRITE_CACHE.popitem(last=False)  # Evict least recently used
+    return sprite
+
+def clear_sprite_cache():
+    """Drops all cached scaled sprites (call when the texture mode changes)."""
+    SCALED_SPRITE_CACHE.clear()
+    ENTITY_PROTOTYPES.clear()
+
 def draw_block_sprite(surface, rect, block_id):
     """Helper function to draw a block sprite with texture support.
     
@@ -1491,14 +2484,9 @@ def draw_block_sprite(surface, rect, block_id):
         rect: pygame.Rect defining where to draw
         block_id: The block ID to draw
     """
-    if USE_EXPERIMENTAL_TEXTURES and block_id in BLOCK_TEXTURES:
-        # Scale texture to fit rect
-        texture_scaled = pygame.transform.scale(BLOCK_TEXTURES[block_id], (rect.width, rect.height))
-        surface.blit(texture_scaled, rect.topleft)
-    elif block_id in BLOCK_TYPES:
-        # Draw solid color for blocks without textures
-        block_color = BLOCK_TYPES[block_id]["color"]
-        pygame.draw.rect(surface, block_color, rect)
+    sprite = get_scaled_sprite(block_id, rect.width, rect.height)
+    if sprite is not None:
+        surface.blit(sprite, rect.topleft)
 
 def draw_item_tooltip(screen, item_id, mouse_x, mouse_y):
     """Draw a tooltip showing the item name near the mouse cursor.
@@ -1509,7 +2497,7 @@ def draw_item_tooltip(screen, item_id, mouse_x, mouse_y):
         mouse_x, mouse_y: Mouse cursor position
     """
     if item_id != 0 and item_id in BLOCK_TYPES:
-        tooltip_text = FONT_SMALL.render(BLOCK_TYPES[item_id]["name"], True, (255, 255, 255))
+        tooltip_text = render_text(FONT_SMALL, BLOCK_TYPES[item_id]["name"], True, (255, 255, 255))
         tooltip_x = mouse_x + 15
         tooltip_y = mouse_y + 15
         
@@ -1533,32 +2521,488 @@ CRAFTING_SLOT_RECTS = []
 INVENTORY_SLOT_RECTS = []  # For inventory menu click detection
 HELD_ITEM = (0, 0)  # For dragging items in inventory: (item_id, count) 
 
-# Furnace GUI State
+# Furnace GUI State (the furnace's slots and progress live in its FurnaceEntity)
 FURNACE_OPEN = False
 FURNACE_POS = (0, 0)  # World position of furnace being used
-FURNACE_INPUT = (0, 0)  # (item_id, count) in input slot
-FURNACE_FUEL = (0, 0)  # (item_id, count) in fuel slot
-FURNACE_OUTPUT = (0, 0)  # (item_id, count) in output slot
-FURNACE_PROGRESS = 0  # Smelting progress (0-100)
-FURNACE_FUEL_TIME = 0  # Remaining fuel burn time
 
 # Crafting Table GUI State
 CRAFTING_TABLE_OPEN = False
 CRAFTING_TABLE_POS = (0, 0)  # World position of crafting table
-CRAFTING_TABLE_GRID = [(0, 0) for _ in range(9)]  # 9 slots for 3x3 grid
+CRAFTING_TABLE_GRID = [(0, 0) for _ in range(9)]  # 9 slots for 3x3 grid (taken from the table's entity while open)
 CRAFTING_TABLE_OUTPUT = (0, 0)  # Output slot
 
+# --- Dropped Item Group ---
+# Dropped items only ever move vertically, so their chunk and column never change after spawning.
+DROPPED_ITEMS_PER_CHUNK = 128  # Oldest items in a chunk are evicted beyond this
+DROPPED_ITEM_MAX_STACK = 64
+DROPPED_ITEM_MERGE_RADIUS = BLOCK_SIZE  # Same-id items this close (in pixels) merge into one stack
+
+class DroppedItemGroup(pygame.sprite.Group):
+    """Sprite group for dropped items: merges nearby stacks, caps items per chunk and skips sleeping items."""
+    def __init__(self):
+        super().__init__()
+        self.chunk_items = {}  # chunk_index -> {item: None}, oldest first
+        self.column_items = {}  # block column -> set of items (merge lookups)
+        self.sleeping_by_cell = {}  # (row, col) of the supporting block -> set of sleeping items
+    
+    def add(self, *sprites):
+        """Adds items, merging each into a nearby stack of the same id when possible."""
+        for item in sprites:
+            if not isinstance(item, DroppedItem):
+                super().add(item)
+                continue
+            if self.has_internal(item):
+                continue
+            if self.merge_into_neighbor(item):
+                item.release()
+                continue
+            
+            # Evict the oldest items once the chunk is full
+            chunk = self.chunk_items.get(item.chunk_index)
+            while chunk and len(chunk) >= DROPPED_ITEMS_PER_CHUNK:
+                next(iter(chunk)).kill()
+            super().add(item)
+    
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite)
+        if isinstance(sprite, DroppedItem):
+            self.chunk_items.setdefault(sprite.chunk_index, {})[sprite] = None
+            self.column_items.setdefault(sprite.column, set()).add(sprite)
+    
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        if isinstance(sprite, DroppedItem):
+            chunk = self.chunk_items.get(sprite.chunk_index)
+            if chunk is not None:
+                chunk.pop(sprite, None)
+            column = self.column_items.get(sprite.column)
+            if column is not None:
+                column.discard(sprite)
+            self.wake(sprite)
+    
+    def merge_into_neighbor(self, item, sleeping_only=False):
+        """Adds item's amount to a nearby stack of the same id. Returns True if it was merged."""
+        for column in range(item.column - 1, item.column + 2):
+            for other in self.column_items.get(column, ()):
+                if other is item or other.item_id != item.item_id:
+                    continue
+                if sleeping_only and not other.sleeping:
+                    continue
+                if other.amount + item.amount > DROPPED_ITEM_MAX_STACK:
+                    continue
+                if (abs(other.rect.centerx - item.rect.centerx) <= DROPPED_ITEM_MERGE_RADIUS and
+                        abs(other.rect.centery - item.rect.centery) <= DROPPED_ITEM_MERGE_RADIUS):
+                    other.amount += item.amount
+                    other.lifetime = max(other.lifetime, item.lifetime)
+                    return True
+        return False
+    
+    def sleep(self, item, row, col):
+        """Stops running physics for an item resting on block (row, col)."""
+        item.sleeping = True
+        item.rest_cell = (row, col)
+        self.sleeping_by_cell.setdefault((row, col), set()).add(item)
+    
+    def wake(self, item):
+        """Resumes physics for a sleeping item."""
+        if item.rest_cell is not None:
+            sleepers = self.sleeping_by_cell.get(item.rest_cell)
+            if sleepers is not None:
+                sleepers.discard(item)
+                if not sleepers:
+                    del self.sleeping_by_cell[item.rest_cell]
+        item.sleeping = False
+        item.rest_cell = None
+    
+    def wake_cell(self, row, col):
+        """Wakes every item resting on block (row, col)."""
+        for item in list(self.sleeping_by_cell.get((row, col), ())):
+            self.wake(item)
+    
+    def wake_section(self, section_key):
+        """Wakes every sleeping item resting in a section (or the whole world if None)."""
+        for cell in list(self.sleeping_by_cell):
+            if section_contains(section_key, cell[0], cell[1]):
+                for item in list(self.sleeping_by_cell[cell]):
+                    self.wake(item)
+    
+    def update(self):
+        """Ages every item and runs physics for the awake ones."""
+        for item in self.sprites():
+            if not self.has_internal(item):
+                continue  # Merged or evicted earlier in this update
+            item.lifetime -= 1
+            if item.lifetime <= 0:
+                item.kill()
+            elif not item.sleeping:
+                item.update()
+
 # Sprite groups
-DROPPED_ITEMS = pygame.sprite.Group()
+DROPPED_ITEMS = DroppedItemGroup()
 SPLASH_POTIONS = pygame.sprite.Group()
 ARROWS = pygame.sprite.Group()
 TRIDENTS = pygame.sprite.Group()
 ENDER_PEARLS = pygame.sprite.Group()
 LIGHT_SOURCES = set()
 SAPLING_GROWTH = {}
-STRONGHOLD_LOCATIONS = []  # List of (x, y) tuples for stronghold positions
 EYE_OF_ENDER_PROJECTILES = pygame.sprite.Group()  # Eyes of ender thrown by player 
 
+# --- Block Mutation API ---
+# Runtime edits to WORLD_MAP go through set_block/set_blocks so that caches can follow them.
+# Edits are grouped by section (one chunk wide, SECTION_HEIGHT rows tall) and every listener
+# receives one event per affected section: listener(section_key, changes) where
+# section_key = (chunk_index, section_index) and changes = [(row, col, old_id, new_id), ...].
+# changes is None when the edits are unknown (rescan the section); a section_key of None
+# means the whole world was replaced or reshaped and must be rebuilt.
+SECTION_HEIGHT = 16
+BLOCK_CHANGE_LISTENERS = []
+
+def subscribe_block_changes(listener):
+    """Registers a callback for coalesced block change events."""
+    if listener not in BLOCK_CHANGE_LISTENERS:
+        BLOCK_CHANGE_LISTENERS.append(listener)
+
+def unsubscribe_block_changes(listener):
+    """Removes a previously registered block change callback."""
+    if listener in BLOCK_CHANGE_LISTENERS:
+        BLOCK_CHANGE_LISTENERS.remove(listener)
+
+def get_section_key(row, col):
+    """Returns the (chunk_index, section_index) key of a block position."""
+    return (col // CHUNK_SIZE, row // SECTION_HEIGHT)
+
+def set_blocks(edits):
+    """Applies an iterable of (row, col, block_id) edits and emits one event per touched section.
+    
+    Out-of-bounds and no-op edits are skipped. Returns the number of blocks changed.
+    """
+    sections = {}
+    world_width = len(WORLD_MAP[0]) if WORLD_MAP else 0
+    for row, col, block_id in edits:
+        if not (0 <= row < GRID_HEIGHT and 0 <= col < world_width):
+            continue
+        old_id = WORLD_MAP[row][col]
+        if old_id == block_id:
+            continue
+        WORLD_MAP[row][col] = block_id
+        key = (col // CHUNK_SIZE, row // SECTION_HEIGHT)
+        if key in sections:
+            sections[key].append((row, col, old_id, block_id))
+        else:
+            sections[key] = [(row, col, old_id, block_id)]
+    
+    for key, changes in sections.items():
+        for listener in BLOCK_CHANGE_LISTENERS:
+            listener(key, changes)
+    return sum(len(changes) for changes in sections.values())
+
+def set_block(row, col, block_id):
+    """Sets a single block. Returns True if the block changed."""
+    return set_blocks(((row, col, block_id),)) > 0
+
+def notify_region_changed(min_row, max_row, min_col, max_col):
+    """Emits change events (with changes=None) for every section overlapping the region.
+    
+    Used after code that writes WORLD_MAP directly, e.g. tree generation.
+    """
+    for chunk_index in range(max(0, min_col) // CHUNK_SIZE, max(0, max_col) // CHUNK_SIZE + 1):
+        for section_index in range(max(0, min_row) // SECTION_HEIGHT, max(0, max_row) // SECTION_HEIGHT + 1):
+            for listener in BLOCK_CHANGE_LISTENERS:
+                listener((chunk_index, section_index), None)
+
+def notify_world_replaced():
+    """Tells every listener that WORLD_MAP was replaced or reshaped (new world, load, chunk expansion)."""
+    for listener in BLOCK_CHANGE_LISTENERS:
+        listener(None, None)
+
+def get_section_bounds(section_key):
+    """Returns (min_row, max_row, min_col, max_col) of a section, or of the whole world if None."""
+    world_width = len(WORLD_MAP[0]) if WORLD_MAP else 0
+    if section_key is None:
+        return 0, GRID_HEIGHT, 0, world_width
+    chunk_index, section_index = section_key
+    min_row = section_index * SECTION_HEIGHT
+    min_col = chunk_index * CHUNK_SIZE
+    return min_row, min(GRID_HEIGHT, min_row + SECTION_HEIGHT), min_col, min(world_width, min_col + CHUNK_SIZE)
+
+def rescan_section(section_key, predicate):
+    """Returns the (row, col) cells in a section (or the whole world if None) whose block matches predicate."""
+    min_row, max_row, min_col, max_col = get_section_bounds(section_key)
+    cells = []
+    for row in range(min_row, max_row):
+        world_row = WORLD_MAP[row]
+        for col in range(min_col, max_col):
+            if predicate(world_row[col]):
+                cells.append((row, col))
+    return cells
+
+def section_contains(section_key, row, col):
+    """Returns True if (row, col) lies in the given section (None = whole world)."""
+    return section_key is None or get_section_key(row, col) == section_key
+
+# Fire index: (row, col) of every fire block, so fire ticking doesn't scan the map
+FIRE_BLOCK_INDEX = set()
+
+def on_blocks_changed_fire_index(section_key, changes):
+    """Keeps FIRE_BLOCK_INDEX in sync with block changes."""
+    if changes is None:
+        FIRE_BLOCK_INDEX.difference_update([cell for cell in FIRE_BLOCK_INDEX if section_contains(section_key, *cell)])
+        FIRE_BLOCK_INDEX.update(rescan_section(section_key, lambda block_id: block_id == FIRE_ID))
+        return
+    for row, col, old_id, new_id in changes:
+        if new_id == FIRE_ID:
+            FIRE_BLOCK_INDEX.add((row, col))
+        else:
+            FIRE_BLOCK_INDEX.discard((row, col))
+
+def on_blocks_changed_light_sources(section_key, changes):
+    """Keeps LIGHT_SOURCES ((col, row) of light emitting blocks) in sync with block changes."""
+    if changes is None:
+        LIGHT_SOURCES.difference_update([cell for cell in LIGHT_SOURCES if section_contains(section_key, cell[1], cell[0])])
+        LIGHT_SOURCES.update((col, row) for row, col in rescan_section(section_key, lambda block_id: BLOCK_EMITS_LIGHT[block_id]))
+        return
+    for row, col, old_id, new_id in changes:
+        if BLOCK_EMITS_LIGHT[new_id]:
+            LIGHT_SOURCES.add((col, row))
+        else:
+            LIGHT_SOURCES.discard((col, row))
+
+subscribe_block_changes(on_blocks_changed_fire_index)
+subscribe_block_changes(on_blocks_changed_light_sources)
+
+# --- Block Entities ---
+# Blocks with state of their own (furnaces, crafting tables; chests later) keep it in a block
+# entity, stored in BLOCK_ENTITIES under (absolute column, row) so keys survive chunk expansion.
+# Entities are not polled every frame. Each records the tick it was last brought up to date, and
+# advance(tick) catches it up in one go from the elapsed ticks (a furnace jumps between refuels
+# and finished items). Code that reads an entity gets it through get_block_entity, which
+# advances it first. tick_block_entities also wakes entities from a heap at the tick of their
+# next state change (next_change_tick), so far-away furnaces finish items on time without being
+# polled. Breaking the block drops the entity's contents. Saves group entities by chunk.
+BLOCK_ENTITY_TICK = 0
+BLOCK_ENTITIES = {}  # (absolute column, row) -> entity
+BLOCK_ENTITY_SCHEDULE = []  # Min-heap of (wake tick, position); entries whose tick no longer matches are skipped
+BLOCK_ENTITY_TYPES = {}  # block id -> entity class
+
+def register_block_entity(cls):
+    """Registers a block entity class for its block id."""
+    BLOCK_ENTITY_TYPES[cls.block_id] = cls
+    return cls
+
+class BlockEntity:
+    """Per-block state. state_fields name the attributes that saves store."""
+    block_id = 0
+    state_fields = ()
+
+    def __init__(self, position):
+        self.position = position  # (absolute column, row)
+        self.last_tick = BLOCK_ENTITY_TICK
+        self.wake_tick = None
+
+    def advance(self, tick):
+        """Brings the entity's state up to tick."""
+        self.last_tick = tick
+
+    def next_change_tick(self):
+        """Returns the tick of the entity's next state change, or None while it is idle."""
+        return None
+
+    def contents(self):
+        """Returns the (item_id, count) stacks the entity holds."""
+        return []
+
+    def to_save(self):
+        return {'block_id': self.block_id, 'position': self.position,
+                'state': {name: getattr(self, name) for name in self.state_fields}}
+
+@register_block_entity
+class FurnaceEntity(BlockEntity):
+    block_id = 16
+    state_fields = ("input", "fuel", "output", "progress", "fuel_time")
+
+    def __init__(self, position):
+        super().__init__(position)
+        self.input = (0, 0)  # (item_id, count) in input slot
+        self.fuel = (0, 0)  # (item_id, count) in fuel slot
+        self.output = (0, 0)  # (item_id, count) in output slot
+        self.progress = 0  # Smelting progress (0-100)
+        self.fuel_time = 0  # Remaining fuel burn time
+
+    def step(self):
+        """Runs one furnace tick."""
+        # Check if we have fuel burning
+        if self.fuel_time > 0:
+            self.fuel_time -= 1
+        
+        # Check if we can start smelting
+        if self.input[0] != 0 and self.input[0] in SMELTING_RECIPES:
+            # Need fuel to smelt
+            if self.fuel_time <= 0 and self.fuel[0] != 0 and self.fuel[0] in FUEL_ITEMS:
+                # Consume 1 fuel
+                fuel_id = self.fuel[0]
+                self.fuel = (fuel_id, self.fuel[1] - 1) if self.fuel[1] > 1 else (0, 0)
+                self.fuel_time = FUEL_ITEMS[fuel_id]
+            
+            # Smelt if we have fuel burning
+            if self.fuel_time > 0:
+                self.progress += 2  # Progress speed (100 / 50 = 2 per frame for ~1 second smelting)
+                if self.progress >= 100:
+                    self.finish_item()
+        else:
+            # No valid input, reset progress
+            self.progress = 0
+
+    def finish_item(self):
+        """Turns one input item into its smelted output."""
+        output_id = SMELTING_RECIPES[self.input[0]]
+        self.input = (self.input[0], self.input[1] - 1) if self.input[1] > 1 else (0, 0)
+        
+        # Add to output
+        if self.output[0] == 0 or self.output[0] == output_id:
+            self.output = (output_id, self.output[1] + 1)
+        
+        # Achievement trigger - smelted iron ore
+        if output_id == 108:  # Iron Ingot
+            if 'player' in globals():
+                unlock_achievement("acquire_hardware", player)
+        
+        self.progress = 0
+
+    def advance(self, tick):
+        """Catches the furnace up to tick. Same result as calling step() once per elapsed tick,
+        but it only steps single ticks when fuel runs out, and jumps over the rest."""
+        remaining = tick - self.last_tick
+        self.last_tick = tick
+        while remaining > 0:
+            if self.input[0] not in SMELTING_RECIPES:
+                self.fuel_time = max(0, self.fuel_time - remaining)
+                self.progress = 0
+                return
+            if self.fuel_time <= 1:
+                if self.fuel[0] not in FUEL_ITEMS:
+                    self.fuel_time = 0
+                    return  # Out of fuel: idle until some is added
+                self.step()
+                remaining -= 1
+                continue
+            # Burning with fuel to spare: skip to the next finished item or refuel
+            steps = min(remaining, self.fuel_time - 1, (101 - self.progress) // 2)
+            self.fuel_time -= steps
+            self.progress += 2 * steps
+            remaining -= steps
+            if self.progress >= 100:
+                self.finish_item()
+
+    def next_change_tick(self):
+        if self.input[0] not in SMELTING_RECIPES:
+            return None
+        if self.fuel_time > 1:
+            return self.last_tick + min(self.fuel_time, (101 - self.progress) // 2)
+        return self.last_tick + 1 if self.fuel[0] in FUEL_ITEMS else None
+
+    def contents(self):
+        return [self.input, self.fuel, self.output]
+
+@register_block_entity
+class CraftingTableEntity(BlockEntity):
+    block_id = 92
+    state_fields = ("grid",)
+
+    def __init__(self, position):
+        super().__init__(position)
+        self.grid = [(0, 0) for _ in range(9)]  # Items left in the 3x3 grid
+
+    def contents(self):
+        return list(self.grid)
+
+def schedule_block_entity(entity):
+    """Queues an entity to be woken at its next state change."""
+    wake_tick = entity.next_change_tick()
+    if wake_tick is not None and wake_tick != entity.wake_tick:
+        heapq.heappush(BLOCK_ENTITY_SCHEDULE, (wake_tick, entity.position))
+    entity.wake_tick = wake_tick
+
+def get_block_entity(col, row, create=True):
+    """Returns the up-to-date entity of the block at a WORLD_MAP position, creating it on first
+    access if the block has an entity type; None if the block has none."""
+    position = (to_absolute_col(col), row)
+    entity = BLOCK_ENTITIES.get(position)
+    if entity is None:
+        if not create or not (0 <= row < GRID_HEIGHT and 0 <= col < GRID_WIDTH):
+            return None
+        cls = BLOCK_ENTITY_TYPES.get(WORLD_MAP[row][col])
+        if cls is None:
+            return None
+        entity = BLOCK_ENTITIES[position] = cls(position)
+    entity.advance(BLOCK_ENTITY_TICK)
+    schedule_block_entity(entity)
+    return entity
+
+def tick_block_entities():
+    """Advances the block entity clock by one tick and updates the entities due on it."""
+    global BLOCK_ENTITY_TICK
+    BLOCK_ENTITY_TICK += 1
+    while BLOCK_ENTITY_SCHEDULE and BLOCK_ENTITY_SCHEDULE[0][0] <= BLOCK_ENTITY_TICK:
+        wake_tick, position = heapq.heappop(BLOCK_ENTITY_SCHEDULE)
+        entity = BLOCK_ENTITIES.get(position)
+        if entity is not None and entity.wake_tick == wake_tick:
+            entity.wake_tick = None
+            entity.advance(BLOCK_ENTITY_TICK)
+            schedule_block_entity(entity)
+
+def remove_block_entity(col, row):
+    """Removes the entity of a WORLD_MAP position, dropping what it held and closing its GUI if open."""
+    position = (to_absolute_col(col), row)
+    entity = BLOCK_ENTITIES.pop(position, None)
+    if entity is None:
+        return
+    if CRAFTING_TABLE_OPEN and position == (to_absolute_col(CRAFTING_TABLE_POS[0]), CRAFTING_TABLE_POS[1]):
+        close_crafting_table_gui()
+    if FURNACE_OPEN and position == (to_absolute_col(FURNACE_POS[0]), FURNACE_POS[1]):
+        close_furnace_gui()
+    entity.advance(BLOCK_ENTITY_TICK)
+    for item_id, count in entity.contents():
+        if item_id != 0 and count > 0:
+            spawn_dropped_item(col * BLOCK_SIZE + BLOCK_SIZE // 2, row * BLOCK_SIZE + BLOCK_SIZE // 2, item_id, count)
+
+def on_blocks_changed_block_entities(section_key, changes):
+    """Removes the entities of blocks that were broken or replaced."""
+    if changes is None:
+        return
+    for row, col, old_id, new_id in changes:
+        if old_id in BLOCK_ENTITY_TYPES:
+            remove_block_entity(col, row)
+
+def clear_block_entities():
+    """Forgets every block entity (new world or load)."""
+    BLOCK_ENTITIES.clear()
+    BLOCK_ENTITY_SCHEDULE.clear()
+
+def save_block_entities():
+    """Returns the block entities as {chunk_index: [entity save dicts]}."""
+    chunks = {}
+    for entity in BLOCK_ENTITIES.values():
+        entity.advance(BLOCK_ENTITY_TICK)
+        chunks.setdefault(entity.position[0] // CHUNK_SIZE, []).append(entity.to_save())
+    return chunks
+
+def load_block_entities(chunks):
+    """Replaces the block entities with ones from save_block_entities() data."""
+    clear_block_entities()
+    for records in chunks.values():
+        for record in records:
+            cls = BLOCK_ENTITY_TYPES.get(record['block_id'])
+            if cls is None:
+                continue
+            entity = cls(tuple(record['position']))
+            for name, value in record['state'].items():
+                if name in cls.state_fields:
+                    setattr(entity, name, value)
+            BLOCK_ENTITIES[entity.position] = entity
+            schedule_block_entity(entity)
+
+subscribe_block_changes(on_blocks_changed_block_entities)
+
 
 # --- World Decoration Functions (remain the same) ---
 def add_trees(world, height_map, biome_map):
@@ -1653,6 +3097,81 @@ def generate_tree(world, col, row, biome_type):
             if 0 <= r < GRID_HEIGHT:
                 world[r][col] = WOOD_ID
 
+# --- Structure Registry ---
+# Every generated structure is recorded with its bounding box, type and metadata (spawned
+# villagers, loot, ...). Records are dicts: {'type', 'left', 'top', 'right', 'bottom', 'metadata'}.
+# Right and bottom are exclusive. Columns are absolute (see TERRAIN_ORIGIN_CHUNK), so records
+# stay valid when chunks are added to the left of the world. The registry indexes records by
+# the chunks they overlap, and keeps a sorted list of centre columns per type for
+# nearest-structure queries.
+STRUCTURE_TYPES = ("village", "desert_temple", "igloo", "witch_hut", "shipwreck", "taiga_tower", "stronghold")
+
+def to_absolute_col(col):
+    """Converts a WORLD_MAP column index to an absolute world column."""
+    return col + CURRENT_CHUNK_RANGE[0] * CHUNK_SIZE
+
+def from_absolute_col(col):
+    """Converts an absolute world column to a WORLD_MAP column index."""
+    return col - CURRENT_CHUNK_RANGE[0] * CHUNK_SIZE
+
+class StructureRegistry:
+    """The generated structures of the current world, indexed by chunk and by type."""
+    def __init__(self):
+        self.structures = []
+        self.by_chunk = {}  # chunk index -> records overlapping that chunk
+        self.centers = {}  # structure type -> sorted [(centre column, record index)]
+    
+    def add(self, structure_type, left, top, right, bottom, **metadata):
+        """Records a structure covering absolute columns [left, right) and rows [top, bottom)."""
+        record = {'type': structure_type, 'left': left, 'top': top, 'right': right, 'bottom': bottom, 'metadata': metadata}
+        index = len(self.structures)
+        self.structures.append(record)
+        for chunk in range(left // CHUNK_SIZE, (right - 1) // CHUNK_SIZE + 1):
+            self.by_chunk.setdefault(chunk, []).append(record)
+        bisect.insort(self.centers.setdefault(structure_type, []), ((left + right) // 2, index))
+        return record
+    
+    def clear(self):
+        """Forgets every structure (a new world is being generated or loaded)."""
+        self.structures.clear()
+        self.by_chunk.clear()
+        self.centers.clear()
+    
+    def in_chunk(self, chunk):
+        """Returns the records overlapping a chunk, e.g. to rebuild it after it was evicted."""
+        return self.by_chunk.get(chunk, [])
+    
+    def at(self, col, row, structure_type=None):
+        """Returns the structure (of structure_type, if given) whose box contains an absolute column and row, or None."""
+        for record in self.in_chunk(col // CHUNK_SIZE):
+            if structure_type is not None and record['type'] != structure_type:
+                continue
+            if record['left'] <= col < record['right'] and record['top'] <= row < record['bottom']:
+                return record
+        return None
+    
+    def nearest(self, structure_type, col):
+        """Returns the structure of a type whose centre column is closest to an absolute column, or None."""
+        centers = self.centers.get(structure_type)
+        if not centers:
+            return None
+        i = bisect.bisect_left(centers, (col, -1))
+        candidates = centers[max(i - 1, 0):i + 1]
+        center, index = min(candidates, key=lambda entry: abs(entry[0] - col))
+        return self.structures[index]
+    
+    def to_save(self):
+        """Returns the records as plain data for a save file."""
+        return [dict(record) for record in self.structures]
+    
+    def load(self, saved_structures):
+        """Replaces the registry's contents with records from a save file."""
+        self.clear()
+        for record in saved_structures:
+            self.add(record['type'], record['left'], record['top'], record['right'], record['bottom'], **record['metadata'])
+
+STRUCTURES = StructureRegistry()
+
 # --- STRUCTURE GENERATION FUNCTIONS ---
 
 def generate_plains_village(world, height_map, col_start):
@@ -2354,8 +3873,8 @@ def save_overworld_state(player, mobs, world_map, filename="overworld_save.pkl")
         'world_map': world_map,
         'time_of_day': TIME_OF_DAY,
         'time_phase': TIME_PHASE,
-        # Store simplified mob data (just positions and types)
-        'mobs': [(type(mob).__name__, mob.rect.x, mob.rect.y, mob.health) for mob in mobs]
+        # Columnar entity data (see serialize_entities)
+        'mobs': serialize_entities(mobs)
     }
 
     if filename is None:
@@ -2418,156 +3937,116 @@ def convert_nether_to_overworld_coords(nether_x, nether_y):
     return nether_x * 8, nether_y * 8
 
 
-# --- Main World Generation Function (with Biome Logic) ---
-def generate_world():
-    """Generates a simple 2D world map, lakes, mobs, and structures across 5 biomes. (FIXED MOB SPAWNING)"""
-    global MOBS, WORLD_MAP, STRUCTURE_NOTIFICATIONS
+# --- Terrain Generation ---
+# The per-chunk terrain (noise, height and biome maps, strata, ores and pockets) is in
+# worldgen/nether_terrain.py, which the chunk job worker processes import without the game.
+# Heights and biomes are sampled by absolute column: chunk c covers columns
+# [c * CHUNK_SIZE, (c + 1) * CHUNK_SIZE), and generate_world's column 0 is the left edge of
+# TERRAIN_ORIGIN_CHUNK (the first chunk of the initial CURRENT_CHUNK_RANGE).
+TERRAIN_ORIGIN_CHUNK = -2
 
-    world = []
-    
-    # 1. Fill with Sky/Air
-    for _ in range(GRID_HEIGHT):
-        world.append([AIR_ID] * GRID_WIDTH)
+WORLD_SEED = 0
 
-    base_level = GRID_HEIGHT // 2
-    
-    # --- Generate Height Map ---
-    height_map = [0] * GRID_WIDTH
-    amplitude = 4 
-    frequency = 0.05 
-    random_offset = random.uniform(0, 10) 
+def set_world_seed(seed):
+    """Sets the seed the chunk terrain jobs generate from."""
+    global WORLD_SEED
+    WORLD_SEED = seed
 
-    for col in range(GRID_WIDTH):
-        wave_height = math.sin(col * frequency + random_offset) * amplitude
-        noise = random.uniform(-1, 1) * 0.5 
-        final_height = base_level + int(wave_height + noise)
-        final_height = max(1, min(GRID_HEIGHT - 3, final_height))
-        height_map[col] = final_height
-    
-    # --- Determine Biome Regions (Nether Biomes) ---
-    biome_map = [] 
-    
-    all_biomes = [CRIMSON_FOREST_BIOME, NETHER_WASTES_BIOME, SOUL_SAND_VALLEY_BIOME, BASALT_DELTAS_BIOME, WARPED_FOREST_BIOME, CRIMSON_FOREST_BIOME_2, WARPED_FOREST_BIOME_2, CRIMSON_FOREST_BIOME_3, BASALT_DELTAS_BIOME_2, NETHER_WASTES_BIOME_2, LAVA_OCEAN_BIOME, BASALT_MOUNTAIN_BIOME]
-    current_biome = random.choice(all_biomes)  
-    biome_length = random.randint(100, 140)  # Half-chunk size biomes (128 +/- variation)
-    col_counter = 0
-    
-    for col in range(GRID_WIDTH):
-        if col_counter >= biome_length:
-            # Nether biome weights: Crimson, Wastes, Soul Sand, Basalt, Warped, Crimson2, Warped2, Crimson3, Basalt2, Wastes2, Lava Ocean, Basalt Mountain
-            biome_weights = [1.5, 1.2, 0.8, 1, 1.5, 1, 1, 0.8, 0.6, 0.8, 1, 0.7]  # Forests and wastes most common
-            current_biome = random.choices(all_biomes, weights=biome_weights)[0]
-            
-            # Debug print for special biomes
-            if current_biome in [CRIMSON_FOREST_BIOME, CRIMSON_FOREST_BIOME_2, CRIMSON_FOREST_BIOME_3]:
-                print(f"🔴 CRIMSON FOREST starting at column {col}")
-            elif current_biome in [WARPED_FOREST_BIOME, WARPED_FOREST_BIOME_2]:
-                print(f"🔵 WARPED FOREST starting at column {col}")
-            
-            # Biome length variations
-            if current_biome in [CRIMSON_FOREST_BIOME, CRIMSON_FOREST_BIOME_2, CRIMSON_FOREST_BIOME_3, WARPED_FOREST_BIOME, WARPED_FOREST_BIOME_2]:
-                biome_length = random.randint(110, 160)  # Larger forests
-            elif current_biome == LAVA_OCEAN_BIOME:
-                biome_length = random.randint(200, 400)  # Large lava oceans
-                print(f"🌋 LAVA OCEAN starting at column {col}, length will be {biome_length} blocks")
-            elif current_biome in [BASALT_MOUNTAIN_BIOME]:
-                biome_length = random.randint(150, 250)  # Large basalt peaks
-                print(f"⛰️ BASALT MOUNTAINS starting at column {col}, length will be {biome_length} blocks")
-            else:
-                biome_length = random.randint(100, 140)  # ~Half chunk for others
-            col_counter = 0
-        
-        biome_map.append(current_biome)
-        col_counter += 1
-        
-    # --- Populate World with Blocks ---
-    for col in range(GRID_WIDTH):
-        ground_level = height_map[col]
-        biome_type = biome_map[col]
-        
-        # Define surface blocks based on nether biome type
-        if biome_type in [NETHER_WASTES_BIOME, NETHER_WASTES_BIOME_2]:
-            surface_block_id = GRASS_ID  # Netherrack
-            subsurface_block_id = GRASS_ID
-            deep_block_id = GRASS_ID
-        elif biome_type == SOUL_SAND_VALLEY_BIOME:
-            surface_block_id = SAND_ID  # Soul Sand
-            subsurface_block_id = SAND_ID
-            deep_block_id = STONE_ID  # Basalt
-        elif biome_type in [BASALT_DELTAS_BIOME, BASALT_DELTAS_BIOME_2, BASALT_MOUNTAIN_BIOME]:
-            surface_block_id = STONE_ID  # Basalt
-            subsurface_block_id = STONE_ID
-            deep_block_id = STONE_ID
-            if biome_type == BASALT_MOUNTAIN_BIOME:
-                mountain_height = int(20 + 25 * abs(math.sin(col * 0.1)) * (1 + 0.5 * math.cos(col * 0.05)))
-                ground_level = max(base_level - mountain_height, 10)
-        elif biome_type in [CRIMSON_FOREST_BIOME, CRIMSON_FOREST_BIOME_2, CRIMSON_FOREST_BIOME_3]:
-            surface_block_id = 6  # Crimson Nylium
-            subsurface_block_id = GRASS_ID
-            deep_block_id = GRASS_ID
-        elif biome_type in [WARPED_FOREST_BIOME, WARPED_FOREST_BIOME_2]:
-            surface_block_id = 30  # Warped Nylium (use MUD_ID as placeholder)
-            subsurface_block_id = GRASS_ID
-            deep_block_id = GRASS_ID
-        elif biome_type == LAVA_OCEAN_BIOME:
-            ground_level = min(base_level + 20, GRID_HEIGHT - 10)
-            surface_block_id = STONE_ID
-            subsurface_block_id = STONE_ID
-            deep_block_id = STONE_ID
-        else:
-            surface_block_id = GRASS_ID
-            subsurface_block_id = GRASS_ID
-            deep_block_id = GRASS_ID
-        
-        
-        for row in range(ground_level, GRID_HEIGHT):
-            if row == GRID_HEIGHT - 1:
-                world[row][col] = BEDROCK_ID
-            elif row == ground_level:
-                world[row][col] = surface_block_id
-            elif row <= ground_level + 2:
-                world[row][col] = subsurface_block_id
-            elif row <= ground_level + 5:
-                # Nether: Use netherrack deep down
-                if biome_type == SOUL_SAND_VALLEY_BIOME:
-                    world[row][col] = SAND_ID 
-                else:
-                    world[row][col] = deep_block_id
-            else:
-                # --- NETHER Ore and Cave Generation ---
-                depth_below_surface = row - ground_level
-                r = random.random()
-                
-                # Base block: Netherrack or Basalt based on biome
-                if biome_type in [BASALT_DELTAS_BIOME, BASALT_DELTAS_BIOME_2, BASALT_MOUNTAIN_BIOME]:
-                    block_id = STONE_ID  # Basalt
-                else:
-                    block_id = GRASS_ID  # Netherrack
-                
-                # Nether Gold Ore (common, 12+ blocks deep)
-                if r < 0.11 and depth_below_surface >= 12:
-                    block_id = 11  # Nether Gold Ore
-                
-                # Ancient Debris (very rare, 20+ blocks deep)
-                elif r < 0.125 and depth_below_surface >= 20:
-                    block_id = 12  # Ancient Debris
-                
-                # Magma blocks (uncommon, underground)
-                elif r < 0.17 and depth_below_surface >= 10:
-                    block_id = ICE_ID  # Magma Block
-                
-                # Blackstone (uncommon, underground)
-                elif r < 0.20 and depth_below_surface >= 10:
-                    block_id = COBBLESTONE_ID  # Blackstone
-                
-                # Nether caves (air/lava pockets)
-                elif r < 0.24 and depth_below_surface >= 8:
-                    # 50% chance for lava, 50% for air
-                    block_id = 31 if random.random() < 0.5 else AIR_ID  # Lava or Air
-                
-                world[row][col] = block_id
-        
-        # NETHER: No water filling (already handled lava oceans above)
+set_world_seed(random.getrandbits(32))
+
+def fill_rect(grid, top, bottom, left, right, block_id):
+    """Sets rows [top, bottom) x columns [left, right) of a grid to block_id as slices, clipped to the grid.
+    Works on both NumPy grids and lists of row lists.
+    """
+    top = max(top, 0)
+    bottom = min(bottom, len(grid))
+    left = max(left, 0)
+    right = min(right, len(grid[0]))
+    if top >= bottom or left >= right:
+        return
+    if isinstance(grid, list):
+        span = [block_id] * (right - left)
+        for row in range(top, bottom):
+            grid[row][left:right] = span
+    else:
+        grid[top:bottom, left:right] = block_id
+
+# --- Chunk Generation Jobs ---
+# A new world's terrain is generated as one nether_terrain.generate_chunk_terrain job per chunk.
+# A job depends only on the world seed and the chunk index, so the jobs run in any order on a
+# pool of worker processes and always give the same chunk. Features that cross chunk edges
+# (caves, strongholds, lakes, decoration, mobs) are then added by generate_world over the
+# assembled grid as a single seam pass in this process.
+# Workers are started with "spawn" (forking this process would copy pygame's display and
+# threads) and run worldgen/nether_terrain.py as their main module, not this script.
+WORLDGEN_WORKERS = min(8, os.cpu_count() or 1)
+if PREGENERATE_ARGS is not None and PREGENERATE_ARGS.workers:
+    WORLDGEN_WORKERS = PREGENERATE_ARGS.workers
+WORLDGEN_EXECUTOR = None  # Created on first use
+
+def generate_chunk_terrain(chunk_id):
+    """Generates one chunk's terrain in this process. Returns (height_map, biome_map, grid) for its CHUNK_SIZE columns."""
+    return nether_terrain.generate_chunk_terrain(WORLD_SEED, chunk_id)
+
+def run_chunk_jobs(chunk_ids, progress=None, results=None):
+    """Runs the terrain job of every chunk on the worker processes and returns the results in chunk order.
+    progress(done, total) is called in this process while the jobs run (e.g. to draw a progress bar).
+    results (chunk id -> job result) is filled in as jobs finish; chunks already in it are not regenerated.
+    """
+    global WORLDGEN_EXECUTOR
+    if WORLDGEN_EXECUTOR is None:
+        WORLDGEN_EXECUTOR = concurrent.futures.ProcessPoolExecutor(max_workers=WORLDGEN_WORKERS,
+                                                                   mp_context=multiprocessing.get_context("spawn"))
+    if results is None:
+        results = {}
+    # submit starts the worker processes as they are needed
+    with nether_terrain.worker_main_module():
+        futures = {WORLDGEN_EXECUTOR.submit(nether_terrain.generate_chunk_terrain, WORLD_SEED, chunk_id): chunk_id
+                   for chunk_id in chunk_ids if chunk_id not in results}
+    pending = set(futures)
+    while pending:
+        if progress is not None:
+            progress(len(chunk_ids) - len(pending), len(chunk_ids))
+        finished, pending = concurrent.futures.wait(pending, timeout=0.05, return_when=concurrent.futures.FIRST_COMPLETED)
+        for future in finished:
+            results[futures[future]] = future.result()
+    if progress is not None:
+        progress(len(chunk_ids), len(chunk_ids))
+    return [results[chunk_id] for chunk_id in chunk_ids]
+
+def assemble_chunks(grids):
+    """Joins chunk grids side by side, left to right, into one grid."""
+    if not isinstance(grids[0], list):
+        return np.hstack(grids)
+    return [sum((grid[row] for grid in grids), []) for row in range(GRID_HEIGHT)]
+
+# --- Main World Generation Function (with Biome Logic) ---
+def generate_world(progress=None, seed=None, chunk_range=None, chunk_results=None):
+    """Generates a simple 2D world map, lakes, mobs, and structures across 5 biomes. (FIXED MOB SPAWNING)
+    progress(done, total) is called while the chunk terrain jobs run (see run_chunk_jobs).
+    The same seed and chunk_range (inclusive (first, last) chunks, TERRAIN_ORIGIN_CHUNK onwards
+    by default) always give the same world. chunk_results caches finished terrain jobs."""
+    global MOBS, WORLD_MAP, STRUCTURE_NOTIFICATIONS, GRID_WIDTH
+
+    STRUCTURES.clear()
+    clear_block_entities()
+    
+    # --- Chunk Terrain (height map, biome map, strata, ores and pockets) ---
+    if seed is None:
+        seed = random.getrandbits(32)
+    set_world_seed(seed)
+    if chunk_range is None:
+        chunk_range = (TERRAIN_ORIGIN_CHUNK, TERRAIN_ORIGIN_CHUNK + GRID_WIDTH // CHUNK_SIZE - 1)
+    first_col = chunk_range[0] * CHUNK_SIZE
+    chunks = run_chunk_jobs(range(chunk_range[0], chunk_range[1] + 1), progress, chunk_results)
+    height_map = [height for chunk_heights, _, _ in chunks for height in chunk_heights]
+    biome_map = [biome_type for _, chunk_biomes, _ in chunks for biome_type in chunk_biomes]
+    world = assemble_chunks([grid for _, _, grid in chunks])
+    GRID_WIDTH = len(height_map)
+    
+    # --- Seam pass: everything below may cross chunk edges ---
+    # It draws from `random`, so seed that from the world seed too (reseeded from the OS at the end)
+    random.seed(seed)
     
     # --- CAVE SYSTEM GENERATION ---
     # Generate connected cave tunnels with surface openings
@@ -2582,14 +4061,8 @@ def generate_world():
         
         # Create cave entrance (vertical shaft down 5-10 blocks)
         entrance_depth = random.randint(5, 10)
-        for shaft_offset in range(entrance_depth):
-            entrance_row = cave_start_row + shaft_offset
-            if entrance_row < GRID_HEIGHT - 5:
-                # 2-3 blocks wide entrance
-                for width_offset in range(-1, 2):
-                    entrance_col = cave_start_col + width_offset
-                    if 0 <= entrance_col < GRID_WIDTH:
-                        world[entrance_row][entrance_col] = AIR_ID
+        fill_rect(world, cave_start_row, min(cave_start_row + entrance_depth, GRID_HEIGHT - 5),
+                  cave_start_col - 1, cave_start_col + 2, AIR_ID)  # 3 blocks wide
         
         # Generate winding cave tunnel from entrance
         current_col = cave_start_col
@@ -2601,13 +4074,8 @@ def generate_world():
         
         for step in range(cave_length):
             # Carve out cave tunnel (3x3 area)
-            for dr in range(-1, 2):
-                for dc in range(-1, 2):
-                    tunnel_row = current_row + dr
-                    tunnel_col = current_col + dc
-                    
-                    if 0 <= tunnel_row < GRID_HEIGHT - 2 and 0 <= tunnel_col < GRID_WIDTH:
-                        world[tunnel_row][tunnel_col] = AIR_ID
+            fill_rect(world, current_row - 1, min(current_row + 2, GRID_HEIGHT - 2),
+                      current_col - 1, current_col + 2, AIR_ID)
             
             # Move cave forward
             current_col += direction
@@ -2638,7 +4106,6 @@ def generate_world():
     # --- STRONGHOLD GENERATION ---
     # Generate 1-3 strongholds at bedrock level (y = GRID_HEIGHT - 5)
     stronghold_count = random.randint(1, 3)
-    STRONGHOLD_LOCATIONS = []  # Store stronghold positions for eye of ender
     
     for _ in range(stronghold_count):
         stronghold_col = random.randint(100, GRID_WIDTH - 100)
@@ -2648,69 +4115,51 @@ def generate_world():
         stronghold_width = 40
         stronghold_height = 15
         
-        # Store location for eye of ender tracking
-        STRONGHOLD_LOCATIONS.append((stronghold_col, stronghold_row))
+        left = stronghold_col - stronghold_width // 2
+        right = stronghold_col + stronghold_width // 2
+        top = stronghold_row - stronghold_height
+        
+        # Register it for eye of ender tracking (walls and floor included)
+        STRUCTURES.add("stronghold", first_col + left, top, first_col + right + 1, stronghold_row + 1,
+                       center=(first_col + stronghold_col, stronghold_row))
         
         # Carve out main chamber
-        for row in range(stronghold_row - stronghold_height, stronghold_row):
-            for col in range(stronghold_col - stronghold_width // 2, stronghold_col + stronghold_width // 2):
-                if 0 <= row < GRID_HEIGHT - 2 and 0 <= col < GRID_WIDTH:
-                    world[row][col] = AIR_ID
+        fill_rect(world, top, min(stronghold_row, GRID_HEIGHT - 2), left, right, AIR_ID)
         
         # Stone brick walls
-        for row in range(stronghold_row - stronghold_height, stronghold_row):
-            # Left wall
-            if 0 <= stronghold_col - stronghold_width // 2 < GRID_WIDTH:
-                world[row][stronghold_col - stronghold_width // 2] = 16  # Stone brick
-            # Right wall
-            if 0 <= stronghold_col + stronghold_width // 2 < GRID_WIDTH:
-                world[row][stronghold_col + stronghold_width // 2] = 16
+        fill_rect(world, top, stronghold_row, left, left + 1, 16)  # Stone brick
+        fill_rect(world, top, stronghold_row, right, right + 1, 16)
         
         # Floor and ceiling
-        for col in range(stronghold_col - stronghold_width // 2, stronghold_col + stronghold_width // 2):
-            if 0 <= col < GRID_WIDTH:
-                # Floor
-                if stronghold_row < GRID_HEIGHT:
-                    world[stronghold_row][col] = 16
-                # Ceiling
-                if stronghold_row - stronghold_height >= 0:
-                    world[stronghold_row - stronghold_height][col] = 16
+        fill_rect(world, stronghold_row, stronghold_row + 1, left, right, 16)
+        fill_rect(world, top, top + 1, left, right, 16)
         
         # Portal room in center (End Portal frame)
         portal_room_size = 8
-        for row in range(stronghold_row - 6, stronghold_row - 2):
-            for col in range(stronghold_col - portal_room_size // 2, stronghold_col + portal_room_size // 2):
-                if 0 <= row < GRID_HEIGHT and 0 <= col < GRID_WIDTH:
-                    world[row][col] = AIR_ID
+        fill_rect(world, stronghold_row - 6, stronghold_row - 2,
+                  stronghold_col - portal_room_size // 2, stronghold_col + portal_room_size // 2, AIR_ID)
         
         # End portal frame (obsidian square with lava in middle)
-        for col in range(stronghold_col - 3, stronghold_col + 4):
-            if 0 <= col < GRID_WIDTH:
-                # Top and bottom of frame
-                world[stronghold_row - 4][col] = OBSIDIAN_ID
-                world[stronghold_row - 2][col] = OBSIDIAN_ID
-        
-        for row in range(stronghold_row - 4, stronghold_row - 1):
-            # Left and right of frame
-            if stronghold_col - 3 >= 0:
-                world[row][stronghold_col - 3] = OBSIDIAN_ID
-            if stronghold_col + 3 < GRID_WIDTH:
-                world[row][stronghold_col + 3] = OBSIDIAN_ID
+        fill_rect(world, stronghold_row - 4, stronghold_row - 3, stronghold_col - 3, stronghold_col + 4, OBSIDIAN_ID)
+        fill_rect(world, stronghold_row - 2, stronghold_row - 1, stronghold_col - 3, stronghold_col + 4, OBSIDIAN_ID)
+        fill_rect(world, stronghold_row - 4, stronghold_row - 1, stronghold_col - 3, stronghold_col - 2, OBSIDIAN_ID)
+        fill_rect(world, stronghold_row - 4, stronghold_row - 1, stronghold_col + 3, stronghold_col + 4, OBSIDIAN_ID)
         
         # Lava pool in center of portal (becomes End Portal when eyes placed)
-        world[stronghold_row - 3][stronghold_col] = LAVA_ID
-        world[stronghold_row - 3][stronghold_col - 1] = LAVA_ID
-        world[stronghold_row - 3][stronghold_col + 1] = LAVA_ID
+        fill_rect(world, stronghold_row - 3, stronghold_row - 2, stronghold_col - 1, stronghold_col + 2, LAVA_ID)
         
         # Add torches for lighting
-        for col in range(stronghold_col - stronghold_width // 2 + 3, stronghold_col + stronghold_width // 2, 5):
-            if 0 <= col < GRID_WIDTH and stronghold_row - 3 >= 0:
-                world[stronghold_row - 3][col] = 15  # Torch
+        for col in range(left + 3, right, 5):
+            fill_rect(world, stronghold_row - 3, stronghold_row - 2, col, col + 1, 15)  # Torch
         
         print(f"🏰 STRONGHOLD GENERATED at ({stronghold_col}, {stronghold_row}) - Eye of Ender will point here!")
     
+    # The later passes (lakes, decoration, spawning) work on the world as row lists
+    if not isinstance(world, list):
+        world = world.tolist()
+    
     # --- MOB/LAKE VARIABLES ---
-    mobs = pygame.sprite.Group() 
+    mobs = MobGroup()
     zombies_spawned = 0 
     narwhals_spawned = 0 
     turtles_to_spawn = []  # Store turtles to add after lake generation
@@ -3015,38 +4464,45 @@ def generate_world():
         print(f"🔥 Generated {lava_pools_generated} lava blocks in underground pools")
 
     MOBS = mobs
+    random.seed()
     return world, mobs, biome_map
 
 def get_chunk_id(world_x):
     """Convert world X coordinate to chunk ID."""
     return world_x // CHUNK_SIZE
 
+def set_chunk_range(chunk_range):
+    """Sets the (first, last) chunks WORLD_MAP holds, for a world that was just created or loaded.
+    Streaming may then grow it by up to CHUNK_EXPANSION_LIMIT chunks on each side."""
+    global CURRENT_CHUNK_RANGE, CHUNK_RANGE_LIMITS
+    CURRENT_CHUNK_RANGE = [chunk_range[0], chunk_range[1]]
+    CHUNK_RANGE_LIMITS = [chunk_range[0] - CHUNK_EXPANSION_LIMIT, chunk_range[1] + CHUNK_EXPANSION_LIMIT]
+
 def check_and_load_chunks(player_col):
     """Check if player is near chunk boundaries and load new chunks if needed."""
     global WORLD_MAP, BIOME_MAP, GRID_WIDTH, CURRENT_CHUNK_RANGE
     
-    player_chunk = get_chunk_id(player_col)
+    # Absolute chunk, the same numbering as CURRENT_CHUNK_RANGE
+    player_chunk = to_absolute_col(player_col) // CHUNK_SIZE
     
     # Check if we need to expand the loaded chunk range
     min_chunk = CURRENT_CHUNK_RANGE[0]
     max_chunk = CURRENT_CHUNK_RANGE[1]
     
-    chunks_to_load = []
+    chunks_to_load = []  # (chunk_id, prepend)
     shift_player_right = False
     
     # Player approaching left boundary - load chunk to the left
-    if player_chunk <= min_chunk + 1 and min_chunk > -10:  # Limit to prevent infinite expansion
-        chunks_to_load.append(min_chunk - 1)
-        CURRENT_CHUNK_RANGE[0] -= 1
+    if player_chunk <= min_chunk + 1 and min_chunk > CHUNK_RANGE_LIMITS[0]:  # Limit to prevent infinite expansion
+        chunks_to_load.append((min_chunk - 1, True))
         shift_player_right = True  # Need to shift player when adding to left
         print(f"🔄 Loading chunk {min_chunk - 1} (left expansion)")
     elif player_chunk <= min_chunk + 1:
         print(f"⚠️ Cannot expand left - already at limit (min_chunk={min_chunk})")
     
     # Player approaching right boundary - load chunk to the right
-    if player_chunk >= max_chunk - 1 and max_chunk < 10:  # Limit to prevent infinite expansion
-        chunks_to_load.append(max_chunk + 1)
-        CURRENT_CHUNK_RANGE[1] += 1
+    if player_chunk >= max_chunk - 1 and max_chunk < CHUNK_RANGE_LIMITS[1]:  # Limit to prevent infinite expansion
+        chunks_to_load.append((max_chunk + 1, False))
         print(f"🔄 Loading chunk {max_chunk + 1} (right expansion)")
     elif player_chunk >= max_chunk - 1:
         print(f"⚠️ Cannot expand right - already at limit (max_chunk={max_chunk})")
@@ -3054,9 +4510,18 @@ def check_and_load_chunks(player_col):
     # Generate and append new chunks if needed
     if chunks_to_load:
         print(f"⏸️ Pausing game to generate {len(chunks_to_load)} chunk(s)...")
-        for chunk_id in chunks_to_load:
-            generate_new_chunk(chunk_id)
+        for chunk_id, prepend in chunks_to_load:
+            generate_new_chunk(chunk_id, prepend)
+            if prepend:
+                CURRENT_CHUNK_RANGE[0] = chunk_id
+            else:
+                CURRENT_CHUNK_RANGE[1] = chunk_id
+        # WORLD_MAP must hold exactly the chunks of CURRENT_CHUNK_RANGE, or to_absolute_col is off
+        expected_width = (CURRENT_CHUNK_RANGE[1] - CURRENT_CHUNK_RANGE[0] + 1) * CHUNK_SIZE
+        if GRID_WIDTH != expected_width:
+            print(f"⚠️ World is {GRID_WIDTH} blocks wide but chunks {CURRENT_CHUNK_RANGE} need {expected_width}")
         print(f"✅ World updated: {GRID_WIDTH} blocks wide, {len(BIOME_MAP)} biomes")
+        notify_world_replaced()
         # Force a small delay to ensure all systems sync
         pygame.time.wait(10)
         
@@ -3065,221 +4530,38 @@ def check_and_load_chunks(player_col):
     
     return False
 
-def generate_new_chunk(chunk_id):
-    """Generate a new chunk and append it to the world."""
+def generate_new_chunk(chunk_id, prepend):
+    """Generate a new chunk and add it to the world, before column 0 if prepend, else after the last column."""
     global WORLD_MAP, BIOME_MAP, GRID_WIDTH, MOBS
     
     print(f"  ⛏️ Generating chunk {chunk_id} at columns {chunk_id * CHUNK_SIZE} to {(chunk_id + 1) * CHUNK_SIZE - 1}")
     
+    # Same terrain job as generate_world and the pre-generator, so the chunk only depends on the seed
+    new_height_data, new_biome_data, chunk_grid = generate_chunk_terrain(chunk_id)
+    if not isinstance(chunk_grid, list):
+        chunk_grid = chunk_grid.tolist()
+    
     # Determine if we're expanding left or right
-    if chunk_id < 0:
+    if prepend:
         # Expanding left - insert at beginning
-        # First, prepend empty columns
         for row in range(GRID_HEIGHT):
-            WORLD_MAP[row] = [AIR_ID] * CHUNK_SIZE + WORLD_MAP[row]
+            WORLD_MAP[row] = chunk_grid[row] + WORLD_MAP[row]
         
         # Update GRID_WIDTH immediately
         GRID_WIDTH = len(WORLD_MAP[0])
         
-        # Generate terrain using the same logic as initial world generation
-        base_level = GRID_HEIGHT // 2
-        
-        # If expanding left next to existing terrain, match the height
-        if GRID_WIDTH > CHUNK_SIZE:
-            # Find ground level at column CHUNK_SIZE (first column of old world)
-            for row in range(GRID_HEIGHT):
-                if WORLD_MAP[row][CHUNK_SIZE] != AIR_ID:
-                    base_level = row
-                    break
-        
-        new_biome_data = []
-        
-        # Create nether biome pattern for the new chunk
-        current_biome = random.choice([CRIMSON_FOREST_BIOME, NETHER_WASTES_BIOME, SOUL_SAND_VALLEY_BIOME, BASALT_DELTAS_BIOME, WARPED_FOREST_BIOME])
-        biome_length = random.randint(100, 140)
-        col_counter = 0
-        
-        for col_offset in range(CHUNK_SIZE):
-            col = col_offset
-            
-            # Change biome if needed
-            if col_counter >= biome_length:
-                biome_weights = [1.5, 1.2, 0.8, 1, 1.5, 1, 1, 0.8, 0.6, 0.8, 1, 0.7]  # Forests and wastes most common
-                all_biomes = [CRIMSON_FOREST_BIOME, NETHER_WASTES_BIOME, SOUL_SAND_VALLEY_BIOME, BASALT_DELTAS_BIOME, WARPED_FOREST_BIOME, CRIMSON_FOREST_BIOME_2, WARPED_FOREST_BIOME_2, CRIMSON_FOREST_BIOME_3, BASALT_DELTAS_BIOME_2, NETHER_WASTES_BIOME_2, LAVA_OCEAN_BIOME, BASALT_MOUNTAIN_BIOME]
-                current_biome = random.choices(all_biomes, weights=biome_weights)[0]
-                if current_biome == LAVA_OCEAN_BIOME:
-                    biome_length = random.randint(200, 400)
-                else:
-                    biome_length = random.randint(100, 140)
-                col_counter = 0
-            
-            new_biome_data.append(current_biome)
-            col_counter += 1
-            
-            # Generate height
-            wave_height = math.sin((chunk_id * CHUNK_SIZE + col_offset) * 0.05) * 4
-            noise = random.uniform(-1, 1) * 0.5
-            final_height = base_level + int(wave_height + noise)
-            final_height = max(1, min(GRID_HEIGHT - 3, final_height))
-            
-            # Determine surface block type based on nether biome
-            if current_biome in [NETHER_WASTES_BIOME, NETHER_WASTES_BIOME_2]:
-                surface_block = GRASS_ID  # Netherrack
-                subsurface_block = GRASS_ID
-            elif current_biome == SOUL_SAND_VALLEY_BIOME:
-                surface_block = SAND_ID  # Soul Sand
-                subsurface_block = STONE_ID  # Basalt
-            elif current_biome in [BASALT_DELTAS_BIOME, BASALT_DELTAS_BIOME_2]:
-                surface_block = STONE_ID  # Basalt
-                subsurface_block = STONE_ID
-            elif current_biome == BASALT_MOUNTAIN_BIOME:
-                # Tall basalt mountains
-                mountain_height = int(20 + 25 * abs(math.sin((chunk_id * CHUNK_SIZE + col_offset) * 0.1)) * (1 + 0.5 * math.cos((chunk_id * CHUNK_SIZE + col_offset) * 0.05)))
-                final_height = max(base_level - mountain_height, 10)
-                surface_block = STONE_ID
-                subsurface_block = STONE_ID
-            elif current_biome in [CRIMSON_FOREST_BIOME, CRIMSON_FOREST_BIOME_2, CRIMSON_FOREST_BIOME_3]:
-                surface_block = LEAVES_ID  # Crimson Nylium
-                subsurface_block = GRASS_ID  # Netherrack
-            elif current_biome == LAVA_OCEAN_BIOME:
-                surface_block = STONE_ID  # Basalt
-                subsurface_block = STONE_ID
-                # Lava ocean floor goes deeper
-                final_height = min(base_level + 20, GRID_HEIGHT - 10)
-            else:  # Warped forests
-                surface_block = MUD_ID  # Warped Nylium
-                subsurface_block = GRASS_ID  # Netherrack
-            
-            # Fill column with terrain
-            for row in range(GRID_HEIGHT):
-                if row < final_height:
-                    WORLD_MAP[row][col] = AIR_ID
-                elif row == final_height:
-                    WORLD_MAP[row][col] = surface_block
-                elif row < final_height + 3:
-                    WORLD_MAP[row][col] = subsurface_block
-                elif row < GRID_HEIGHT - 1:
-                    WORLD_MAP[row][col] = STONE_ID
-                else:
-                    WORLD_MAP[row][col] = BEDROCK_ID
-            
-            # Fill ocean biomes with water from surface to deep floor
-            if current_biome == LAVA_OCEAN_BIOME:
-                surface_level = base_level  # Normal surface
-                for row in range(surface_level, final_height):
-                    if WORLD_MAP[row][col] == AIR_ID:
-                        WORLD_MAP[row][col] = WATER_ID
-        
         # Prepend biome data
         BIOME_MAP = new_biome_data + BIOME_MAP
         
     else:
         # Expanding right - append at end
         start_col = GRID_WIDTH
-        
-        # Append empty columns
         for row in range(GRID_HEIGHT):
-            WORLD_MAP[row].extend([AIR_ID] * CHUNK_SIZE)
+            WORLD_MAP[row].extend(chunk_grid[row])
         
         # Update GRID_WIDTH immediately
         GRID_WIDTH = len(WORLD_MAP[0])
         
-        # Generate terrain
-        base_level = GRID_HEIGHT // 2
-        
-        # Get the last column's height to blend smoothly
-        if len(BIOME_MAP) > 0 and start_col > 0:
-            # Find the ground level of the last existing column
-            last_ground_level = GRID_HEIGHT // 2
-            for row in range(GRID_HEIGHT):
-                if WORLD_MAP[row][start_col - 1] != AIR_ID:
-                    last_ground_level = row
-                    break
-            base_level = last_ground_level  # Start new chunk at same height
-        
-        new_biome_data = []
-        
-        # Continue from last biome or start new pattern
-        if len(BIOME_MAP) > 0:
-            current_biome = BIOME_MAP[-1]  # Continue from last biome
-            biome_length = random.randint(50, 100)  # Remaining length
-        else:
-            current_biome = NETHER_WASTES_BIOME
-            biome_length = random.randint(100, 140)
-        
-        col_counter = 0
-        
-        for col_offset in range(CHUNK_SIZE):
-            col = start_col + col_offset
-            
-            # Change biome if needed
-            if col_counter >= biome_length:
-                biome_weights = [1.5, 1.2, 0.8, 1, 1.5, 1, 1, 0.8, 0.6, 0.8, 1, 0.7]  # Forests and wastes most common
-                all_biomes = [CRIMSON_FOREST_BIOME, NETHER_WASTES_BIOME, SOUL_SAND_VALLEY_BIOME, BASALT_DELTAS_BIOME, WARPED_FOREST_BIOME, CRIMSON_FOREST_BIOME_2, WARPED_FOREST_BIOME_2, CRIMSON_FOREST_BIOME_3, BASALT_DELTAS_BIOME_2, NETHER_WASTES_BIOME_2, LAVA_OCEAN_BIOME, BASALT_MOUNTAIN_BIOME]
-                current_biome = random.choices(all_biomes, weights=biome_weights)[0]
-                if current_biome == LAVA_OCEAN_BIOME:
-                    biome_length = random.randint(500, 1000)
-                else:
-                    biome_length = random.randint(100, 140)
-                col_counter = 0
-            
-            new_biome_data.append(current_biome)
-            col_counter += 1
-            
-            # Generate height
-            wave_height = math.sin(col * 0.05) * 4
-            noise = random.uniform(-1, 1) * 0.5
-            final_height = base_level + int(wave_height + noise)
-            final_height = max(1, min(GRID_HEIGHT - 3, final_height))
-            
-            # Determine surface block type based on NETHER biome (RIGHT-SIDE EXPANSION)
-            if current_biome in [NETHER_WASTES_BIOME, NETHER_WASTES_BIOME_2]:
-                surface_block = GRASS_ID  # Netherrack
-                subsurface_block = GRASS_ID
-            elif current_biome == SOUL_SAND_VALLEY_BIOME:
-                surface_block = SAND_ID  # Soul Sand
-                subsurface_block = STONE_ID  # Basalt
-            elif current_biome in [BASALT_DELTAS_BIOME, BASALT_DELTAS_BIOME_2]:
-                surface_block = STONE_ID  # Basalt
-                subsurface_block = STONE_ID
-            elif current_biome == BASALT_MOUNTAIN_BIOME:
-                # Tall basalt mountains
-                mountain_height = int(20 + 25 * abs(math.sin(col * 0.1)) * (1 + 0.5 * math.cos(col * 0.05)))
-                final_height = max(base_level - mountain_height, 10)
-                surface_block = STONE_ID
-                subsurface_block = STONE_ID
-            elif current_biome in [CRIMSON_FOREST_BIOME, CRIMSON_FOREST_BIOME_2, CRIMSON_FOREST_BIOME_3]:
-                surface_block = LEAVES_ID  # Crimson Nylium
-                subsurface_block = GRASS_ID  # Netherrack
-            elif current_biome == LAVA_OCEAN_BIOME:
-                surface_block = STONE_ID  # Basalt
-                subsurface_block = STONE_ID
-                # Lava ocean floor goes deeper
-                final_height = min(base_level + 20, GRID_HEIGHT - 10)
-            else:  # Warped forests
-                surface_block = MUD_ID  # Warped Nylium
-                subsurface_block = GRASS_ID  # Netherrack
-            
-            # Fill column with terrain
-            for row in range(GRID_HEIGHT):
-                if row < final_height:
-                    WORLD_MAP[row][col] = AIR_ID
-                elif row == final_height:
-                    WORLD_MAP[row][col] = surface_block
-                elif row < final_height + 3:
-                    WORLD_MAP[row][col] = subsurface_block
-                elif row < GRID_HEIGHT - 1:
-                    WORLD_MAP[row][col] = GRASS_ID  # Netherrack underground
-                else:
-                    WORLD_MAP[row][col] = BEDROCK_ID
-            
-            # Fill lava ocean biomes with lava from surface to deep floor
-            if current_biome == LAVA_OCEAN_BIOME:
-                surface_level = base_level  # Normal surface
-                for row in range(surface_level, final_height):
-                    if WORLD_MAP[row][col] == AIR_ID:
-                        WORLD_MAP[row][col] = 31  # Lava
-        
         # Append biome data
         BIOME_MAP.extend(new_biome_data)
         
@@ -3317,6 +4599,11 @@ def generate_new_chunk(chunk_id):
                     # Land mobs spawn on ground
                     spawn_y = (ground_row - 2) * BLOCK_SIZE
                 
+                # Respect the passive/aquatic caps for this chunk
+                category = "aquatic" if biome_type == LAVA_OCEAN_BIOME else "passive"
+                if not can_spawn_mob(category, spawn_x):
+                    continue
+                
                 if biome_type == NETHER_WASTES_BIOME:
                     if random.random() < 0.5:
                         MOBS.add(Cow(spawn_x, spawn_y))
@@ -3368,57 +4655,85 @@ def generate_new_chunk(chunk_id):
     print(f"  ✅ Chunk generated. New world width: {GRID_WIDTH} blocks ({GRID_WIDTH // CHUNK_SIZE} chunks)")
  
 # --- DroppedItem Class ---
+DROPPED_ITEM_POOL = []  # Killed DroppedItems waiting to be reused by spawn_dropped_item
+DROPPED_ITEM_POOL_SIZE = 256
+DROPPED_ITEM_IMAGES = {}  # item_id -> shared dropped item surface
+
+def get_dropped_item_image(item_id):
+    """Returns the (cached) small surface used to draw a dropped item."""
+    image = DROPPED_ITEM_IMAGES.get(item_id)
+    if image is not None:
+        return image
+    
+    # Create small visual representation (1/2 block size)
+    size = BLOCK_SIZE // 2
+    image = pygame.Surface([size, size])
+    image.fill((0, 0, 0, 0))
+    image.set_colorkey((0, 0, 0))
+    
+    # Draw item with detailed rendering
+    if item_id in BLOCK_TYPES:
+        # Use texture if available
+        if item_id in BLOCK_TEXTURES:
+            # Scale texture to dropped item size (cached, shared by all drops of this item)
+            texture_scaled = get_scaled_sprite(item_id, size - 4, size - 4, use_textures=True)
+            image.blit(texture_scaled, (2, 2))
+            # Border
+            pygame.draw.rect(image, (0, 0, 0), (2, 2, size - 4, size - 4), 2)
+        else:
+            color = BLOCK_TYPES[item_id]["color"]
+            
+            # Main item body with gradient effect
+            pygame.draw.rect(image, color, (3, 3, size - 6, size - 6))
+            
+            # Add highlight for 3D effect
+            lighter = tuple(min(255, c + 40) for c in color)
+            pygame.draw.rect(image, lighter, (4, 4, size - 10, 3))
+            
+            # Add shadow for depth
+            darker = tuple(max(0, c - 40) for c in color)
+            pygame.draw.rect(image, darker, (4, size - 7, size - 8, 3))
+            
+            # Border
+            pygame.draw.rect(image, (0, 0, 0), (2, 2, size - 4, size - 4), 2)
+    
+    DROPPED_ITEM_IMAGES[item_id] = image
+    return image
+
 class DroppedItem(pygame.sprite.Sprite):
     """Represents an item dropped on the ground that can be picked up."""
     def __init__(self, x, y, item_id, amount=1):
         super().__init__()
+        self.reset(x, y, item_id, amount)
+    
+    def reset(self, x, y, item_id, amount=1):
+        """(Re)initializes the item so pooled instances can be reused."""
         self.item_id = item_id
         self.amount = amount
-        
-        # Create small visual representation (1/2 block size)
-        size = BLOCK_SIZE // 2
-        self.image = pygame.Surface([size, size])
-        self.image.fill((0, 0, 0, 0))
-        self.image.set_colorkey((0, 0, 0))
-        
-        # Draw item with detailed rendering
-        if item_id in BLOCK_TYPES:
-            # Use texture if available
-            if item_id in BLOCK_TEXTURES:
-                # Scale texture to dropped item size
-                texture_scaled = pygame.transform.scale(BLOCK_TEXTURES[item_id], (size - 4, size - 4))
-                self.image.blit(texture_scaled, (2, 2))
-                # Border
-                pygame.draw.rect(self.image, (0, 0, 0), (2, 2, size - 4, size - 4), 2)
-            else:
-                color = BLOCK_TYPES[item_id]["color"]
-                
-                # Main item body with gradient effect
-                pygame.draw.rect(self.image, color, (3, 3, size - 6, size - 6))
-                
-                # Add highlight for 3D effect
-                lighter = tuple(min(255, c + 40) for c in color)
-                pygame.draw.rect(self.image, lighter, (4, 4, size - 10, 3))
-                
-                # Add shadow for depth
-                darker = tuple(max(0, c - 40) for c in color)
-                pygame.draw.rect(self.image, darker, (4, size - 7, size - 8, 3))
-                
-                # Border
-                pygame.draw.rect(self.image, (0, 0, 0), (2, 2, size - 4, size - 4), 2)
-        
+        self.image = get_dropped_item_image(item_id)
         self.rect = self.image.get_rect(topleft=(x, y))
         self.vel_y = 0
         self.gravity = 0.5
         self.lifetime = FPS * 300  # 5 minutes before despawn
+        self.chunk_index = self.rect.centerx // (CHUNK_SIZE * BLOCK_SIZE)
+        self.column = self.rect.centerx // BLOCK_SIZE
+        self.sleeping = False
+        self.rest_cell = None
+        self.pooled = False
+    
+    def release(self):
+        """Returns the item to the pool for reuse."""
+        if not self.pooled and len(DROPPED_ITEM_POOL) < DROPPED_ITEM_POOL_SIZE:
+            self.pooled = True
+            DROPPED_ITEM_POOL.append(self)
+    
+    def kill(self):
+        """Removes the item from all groups and returns it to the pool."""
+        super().kill()
+        self.release()
         
     def update(self):
-        """Apply gravity and collision."""
-        self.lifetime -= 1
-        if self.lifetime <= 0:
-            self.kill()
-            return
-        
+        """Apply gravity and collision. Falls asleep once resting on a solid block."""
         # Apply gravity
         self.vel_y += self.gravity
         self.vel_y = min(self.vel_y, 10)
@@ -3433,9 +4748,41 @@ class DroppedItem(pygame.sprite.Sprite):
         world_width = len(WORLD_MAP[0]) if WORLD_MAP else GRID_WIDTH
         
         if 0 <= row < GRID_HEIGHT and 0 <= col < world_width:
-            if WORLD_MAP[row][col] != 0 and BLOCK_TYPES.get(WORLD_MAP[row][col], {}).get("solid", False):
+            if BLOCK_SOLID[WORLD_MAP[row][col]]:
                 self.rect.bottom = row * BLOCK_SIZE
                 self.vel_y = 0
+                
+                # Resting: stack onto a sleeping neighbor, otherwise sleep until the block changes
+                if DROPPED_ITEMS.has_internal(self):
+                    if DROPPED_ITEMS.merge_into_neighbor(self, sleeping_only=True):
+                        self.kill()
+                    else:
+                        DROPPED_ITEMS.sleep(self, row, col)
+
+def spawn_dropped_item(x, y, item_id, amount=1):
+    """Drops an item stack into the world, reusing a pooled DroppedItem when available.
+    
+    Returns the item, or None if nothing was dropped (amount <= 0 or merged into a nearby stack).
+    """
+    if amount <= 0:
+        return None
+    if DROPPED_ITEM_POOL:
+        item = DROPPED_ITEM_POOL.pop()
+        item.reset(x, y, item_id, amount)
+    else:
+        item = DroppedItem(x, y, item_id, amount)
+    DROPPED_ITEMS.add(item)
+    return item if DROPPED_ITEMS.has_internal(item) else None
+
+def on_blocks_changed_dropped_items(section_key, changes):
+    """Wakes sleeping dropped items whose supporting block changed."""
+    if changes is None:
+        DROPPED_ITEMS.wake_section(section_key)
+        return
+    for row, col, old_id, new_id in changes:
+        DROPPED_ITEMS.wake_cell(row, col)
+
+subscribe_block_changes(on_blocks_changed_dropped_items)
 
 # Helper function to get wool ID from color
 def get_wool_id_from_color(color):
@@ -3602,11 +4949,13 @@ class Player(pygame.sprite.Sprite):
         self.mount = None  # Reference to the horse being ridden
 
         # --- Inventory and Hotbar ---
-        # Hotbar and inventory are now SEPARATE storage systems
-        # Hotbar: 9 slots, each can hold an item ID and count (stored as tuples: (item_id, count))
-        self.hotbar_slots = [(0, 0)] * 9  # Empty hotbar (populated on world creation)
-        # Inventory: 27 slots (3 rows x 9 columns), separate from hotbar
-        self.inventory = [(0, 0)] * 27  # Empty inventory
+        # One ItemContainer holds both: container slots 0-8 are the hotbar and 9-35 the inventory
+        # (3 rows x 9 columns). hotbar_slots and inventory are its two sections, each a list of
+        # (item_id, count) tuples (empty until populated on world creation)
+        self.items = ItemContainer(9, 27)
+        self.recipe_book = RecipeBook()  # Held item counts and the recipes they can make
+        self.hotbar_version = 0  # Bumped on every hotbar change (HUD cache key)
+        self.items.listeners.append(self.on_items_changed)
         self.active_slot = 0
         self.held_block = self.hotbar_slots[self.active_slot][0]
         
@@ -3653,6 +5002,36 @@ class Player(pygame.sprite.Sprite):
         self.charge_hit_mobs = set()  # Track which mobs were hit during this charge
         # -----------------------------------------------------------
 
+    @property
+    def hotbar_slots(self):
+        """The 9 hotbar slots, section 0 of self.items."""
+        return self.items.sections[0]
+
+    @hotbar_slots.setter
+    def hotbar_slots(self, slots):
+        self.items.load(0, slots)
+
+    @property
+    def inventory(self):
+        """The 27 inventory slots, section 1 of self.items."""
+        return self.items.sections[1]
+
+    @inventory.setter
+    def inventory(self, slots):
+        self.items.load(1, slots)
+
+    def on_items_changed(self, slot, old, new):
+        """Container listener: keeps the recipe book counts and the hotbar version current."""
+        old_count = old[1] if old[0] != 0 and old[1] > 0 else 0
+        new_count = new[1] if new[0] != 0 and new[1] > 0 else 0
+        if old[0] == new[0]:
+            self.recipe_book.add(new[0], new_count - old_count)
+        else:
+            self.recipe_book.add(old[0], -old_count)
+            self.recipe_book.add(new[0], new_count)
+        if slot < 9:
+            self.hotbar_version += 1
+
     def switch_active_slot(self, slot_index):
         """Switches the active hotbar slot."""
         if 0 <= slot_index <= 8:
@@ -3660,51 +5039,9 @@ class Player(pygame.sprite.Sprite):
             self.held_block = self.hotbar_slots[self.active_slot][0]
             
     def add_to_inventory(self, block_id, amount=1):
-        """Adds a block to inventory - tries hotbar first, then main inventory."""
-        remaining = amount
-        
-        # Try to add to existing stacks in hotbar first
-        for i in range(9):
-            item_id, count = self.hotbar_slots[i]
-            if item_id == block_id and count < 64:
-                add_amount = min(remaining, 64 - count)
-                self.hotbar_slots[i] = (item_id, count + add_amount)
-                remaining -= add_amount
-                if remaining <= 0:
-                    self.held_block = self.hotbar_slots[self.active_slot][0]
-                    return
-        
-        # Try to add to existing stacks in inventory
-        for i in range(27):
-            item_id, count = self.inventory[i]
-            if item_id == block_id and count < 64:
-                add_amount = min(remaining, 64 - count)
-                self.inventory[i] = (item_id, count + add_amount)
-                remaining -= add_amount
-                if remaining <= 0:
-                    return
-        
-        # Create new stacks in hotbar empty slots
-        for i in range(9):
-            item_id, count = self.hotbar_slots[i]
-            if item_id == 0 and remaining > 0:
-                add_amount = min(remaining, 64)
-                self.hotbar_slots[i] = (block_id, add_amount)
-                remaining -= add_amount
-                self.held_block = self.hotbar_slots[self.active_slot][0]
-                if remaining <= 0:
-                    return
-        
-        # Create new stacks in inventory empty slots
-        for i in range(27):
-            item_id, count = self.inventory[i]
-            if item_id == 0 and remaining > 0:
-                add_amount = min(remaining, 64)
-                self.inventory[i] = (block_id, add_amount)
-                remaining -= add_amount
-                if remaining <= 0:
-                    return
-
+        """Adds a block to inventory - tops up existing stacks, then fills free slots, hotbar first."""
+        self.items.add(block_id, amount)
+        self.held_block = self.hotbar_slots[self.active_slot][0]
 
     def consume_item(self, block_id, amount=1):
         """Consumes a block from hotbar and inventory. In creative mode, items are infinite."""
@@ -3712,39 +5049,9 @@ class Player(pygame.sprite.Sprite):
         if self.creative_mode:
             return True
         
-        remaining = amount
-        
-        # First consume from hotbar
-        for i in range(9):
-            item_id, count = self.hotbar_slots[i]
-            if item_id == block_id:
-                consume_amount = min(remaining, count)
-                new_count = count - consume_amount
-                if new_count <= 0:
-                    self.hotbar_slots[i] = (0, 0)
-                else:
-                    self.hotbar_slots[i] = (item_id, new_count)
-                remaining -= consume_amount
-                if remaining <= 0:
-                    self.held_block = self.hotbar_slots[self.active_slot][0]
-                    return True
-        
-        # Then consume from inventory
-        for i in range(27):
-            item_id, count = self.inventory[i]
-            if item_id == block_id:
-                consume_amount = min(remaining, count)
-                new_count = count - consume_amount
-                if new_count <= 0:
-                    self.inventory[i] = (0, 0)
-                else:
-                    self.inventory[i] = (item_id, new_count)
-                remaining -= consume_amount
-                if remaining <= 0:
-                    return True
-        
+        removed = self.items.remove(block_id, amount)
         self.held_block = self.hotbar_slots[self.active_slot][0]
-        return remaining < amount
+        return removed > 0
 
     def take_damage(self, amount, all_mobs=None, attacker=None):
         """Applies damage with cooldown and starts the flash timer. Adds knockback."""
@@ -3817,7 +5124,7 @@ class Player(pygame.sprite.Sprite):
         in_water = False
         
         if 0 <= center_row < GRID_HEIGHT and 0 <= center_col < GRID_WIDTH:
-            if WORLD_MAP[center_row][center_col] in FLUID_BLOCKS:
+            if BLOCK_FLUID[WORLD_MAP[center_row][center_col]]:
                 in_water = True
         
         # Rotate player to horizontal when swimming
@@ -3944,7 +5251,7 @@ class Player(pygame.sprite.Sprite):
             # Check for fluids (swimming in water and lava)
             if 0 <= center_row < GRID_HEIGHT and 0 <= center_col < len(WORLD_MAP[0]):
                 block_id = WORLD_MAP[center_row][center_col]
-                if block_id in FLUID_BLOCKS:  # Water types and lava
+                if BLOCK_FLUID[block_id]:  # Water types and lava
                     in_water = True
                 if block_id == LADDER_ID or block_id == VINES_ID:
                     on_ladder = True
@@ -3994,10 +5301,7 @@ class Player(pygame.sprite.Sprite):
                 self.max_fall_vel = 0
                 self.is_falling = False
 
-            self.rect.x += self.vel_x
             self.collide_x()
-            
-            self.rect.y += self.vel_y
             self.collide_y()
             
             self.rect.left = max(0, self.rect.left)
@@ -4160,7 +5464,7 @@ class Player(pygame.sprite.Sprite):
         world_width = len(WORLD_MAP[0]) if WORLD_MAP else GRID_WIDTH
         
         if 0 <= center_row < GRID_HEIGHT and 0 <= center_col < world_width:
-            in_water = WORLD_MAP[center_row][center_col] in FLUID_BLOCKS  # Water types and lava
+            in_water = BLOCK_FLUID[WORLD_MAP[center_row][center_col]]  # Water types and lava
         
         if in_water:
             # Swimming up in water - gentler, more natural flow
@@ -4174,13 +5478,13 @@ class Player(pygame.sprite.Sprite):
             if 0 <= left_col < world_width and 0 <= center_row < GRID_HEIGHT:
                 left_block = WORLD_MAP[center_row][left_col]
                 # Check if left side has lower water or is air (water flows left)
-                if left_block == AIR_ID or (left_block not in FLUID_BLOCKS):
+                if left_block == AIR_ID or (not BLOCK_FLUID[left_block]):
                     self.vel_x -= 1.5  # Push left toward lower water
             
             if 0 <= right_col < world_width and 0 <= center_row < GRID_HEIGHT:
                 right_block = WORLD_MAP[center_row][right_col]
                 # Check if right side has lower water or is air (water flows right)
-                if right_block == AIR_ID or (right_block not in FLUID_BLOCKS):
+                if right_block == AIR_ID or (not BLOCK_FLUID[right_block]):
                     self.vel_x += 1.5  # Push right toward lower water
             
             # Check if head is above water (can jump out)
@@ -4208,7 +5512,7 @@ class Player(pygame.sprite.Sprite):
                 # FIXED: Check if block is solid instead of just non-air
                 if 0 <= row < GRID_HEIGHT and 0 <= col < world_width:
                     block_id = WORLD_MAP[row][col]
-                    if block_id != 0 and BLOCK_TYPES.get(block_id, {}).get("solid", False):
+                    if BLOCK_SOLID[block_id]:
                         on_ground = True
                         break
                     
@@ -4222,99 +5526,48 @@ class Player(pygame.sprite.Sprite):
                     self.vel_y = -7  # Normal jump exactly 1 block high
 
     def collide_x(self):
-        """Handles collision with blocks in the X direction."""
-        if self.vel_x == 0:
-            return
-
-        if self.vel_x > 0: 
-            target_col = math.floor((self.rect.right + self.vel_x) / BLOCK_SIZE)
-        else:
-            target_col = math.floor((self.rect.left + self.vel_x) / BLOCK_SIZE)
-            
-        top_row = math.floor(self.rect.top / BLOCK_SIZE)
-        bottom_row = math.floor((self.rect.bottom - 1) / BLOCK_SIZE)
-
-        for row in range(top_row, bottom_row + 1):
-            if 0 <= row < GRID_HEIGHT and 0 <= target_col < len(WORLD_MAP[0]):
-                block_id = WORLD_MAP[row][target_col]
-                
-                # Check if crouching allows passing through certain blocks
-                # Oak (6,18), Birch (83,84), Cactus (21), Dark Oak (32), Spruce (34), Jungle Wood (124)
-                if self.is_crouching and block_id in [6, 18, 21, 32, 34, 83, 84, 124]:
-                    continue  # Pass through when crouching
-                
-                # FIXED: Check if block is solid instead of just non-air
-                if block_id != 0 and BLOCK_TYPES.get(block_id, {}).get("solid", False):
-                    if self.vel_x > 0:
-                        self.rect.right = target_col * BLOCK_SIZE
-                    elif self.vel_x < 0:
-                        self.rect.left = (target_col + 1) * BLOCK_SIZE
-                    self.vel_x = 0
-                    return
+        """Moves the player by vel_x, stopping at solid blocks (crouching passes through crouch-passable ones)."""
+        solid = BLOCK_SOLID_CROUCHING if self.is_crouching else BLOCK_SOLID
+        if sweep_x(WORLD_MAP, self.rect, self.vel_x, solid) is not None:
+            self.vel_x = 0
     
     def collide_y(self):
-        """Handles collision with blocks in the Y direction (gravity and jumping)."""
+        """Moves the player by vel_y with block collision (gravity and jumping), applying fall damage on landing."""
         if self.vel_y == 0:
             return
-        # Determine the target Y position based on movement direction
         is_falling = self.vel_y > 0
-        if is_falling: 
-            target_y = self.rect.bottom + self.vel_y
-        else: 
-            target_y = self.rect.top + self.vel_y
-        # Check collision points (left and right edges of the player)
-        for x_offset in [self.rect.left + 1, self.rect.right - 1]:
-            col = math.floor(x_offset / BLOCK_SIZE)
-            row = math.floor(target_y / BLOCK_SIZE)
-            
-            if 0 <= row < GRID_HEIGHT and 0 <= col < len(WORLD_MAP[0]):
-                block_id = WORLD_MAP[row][col]
+        solid = BLOCK_SOLID_CROUCHING if self.is_crouching else BLOCK_SOLID
+        if sweep_y(WORLD_MAP, self.rect, self.vel_y, solid) is None:
+            return
+        
+        # --- Collision with block found ---
+        if is_falling:
+            # 1. Calculate and apply fall damage based on distance
+            if self.is_falling:
+                # Check if player is in water - water negates fall damage
+                center_col = self.rect.centerx // BLOCK_SIZE
+                center_row = self.rect.centery // BLOCK_SIZE
+                in_water = False
                 
-                # Check if crouching allows passing through certain blocks
-                # Oak (6,18), Birch (83,84), Cactus (21), Dark Oak (32), Spruce (34), Jungle Wood (124)
-                if self.is_crouching and block_id in [6, 18, 21, 32, 34, 83, 84, 124]:
-                    continue  # Pass through when crouching
+                if 0 <= center_row < GRID_HEIGHT and 0 <= center_col < GRID_WIDTH:
+                    in_water = WORLD_MAP[center_row][center_col] in ALL_WATER_BLOCKS
                 
-                # FIXED: Check if block is solid instead of just non-air
-                if block_id != 0 and BLOCK_TYPES.get(block_id, {}).get("solid", False):
-                    # --- Collision with block found ---
-                    
-                    if is_falling:
-                        # 1. Calculate and apply fall damage based on distance
-                        if self.is_falling:
-                            # Check if player is in water - water negates fall damage
-                            center_col = self.rect.centerx // BLOCK_SIZE
-                            center_row = self.rect.centery // BLOCK_SIZE
-                            in_water = False
-                            
-                            if 0 <= center_row < GRID_HEIGHT and 0 <= center_col < GRID_WIDTH:
-                                in_water = WORLD_MAP[center_row][center_col] in ALL_WATER_BLOCKS
-                            
-                            # Only apply fall damage if not in water
-                            if not in_water:
-                                fall_distance = (self.rect.y - self.fall_start_y) / BLOCK_SIZE
-                                safe_fall_blocks = 5
-                                if fall_distance > safe_fall_blocks:
-                                    # 2 damage (1 heart) per block after 5 blocks
-                                    excess_blocks = fall_distance - safe_fall_blocks
-                                    damage = max(2, int(excess_blocks * 2))
-                                    self.take_damage(damage)
-                                    print(f"💥 Took {damage} fall damage! (fell {fall_distance:.1f} blocks)")
-                            
-                            # Reset fall tracking
-                            self.is_falling = False
-                            
-                        # 2. Resolve collision from above
-                        self.max_fall_vel = 0 # Reset fall velocity tracking
-                        self.rect.bottom = row * BLOCK_SIZE
-                        
-                    else: # Hitting a block while jumping/moving up
-                        # 1. Resolve collision from below
-                        self.max_fall_vel = 0 # Cannot fall while moving up
-                        self.rect.top = (row + 1) * BLOCK_SIZE
-                        
-                    self.vel_y = 0
-                    break
+                # Only apply fall damage if not in water
+                if not in_water:
+                    fall_distance = (self.rect.y - self.fall_start_y) / BLOCK_SIZE
+                    safe_fall_blocks = 5
+                    if fall_distance > safe_fall_blocks:
+                        # 2 damage (1 heart) per block after 5 blocks
+                        excess_blocks = fall_distance - safe_fall_blocks
+                        damage = max(2, int(excess_blocks * 2))
+                        self.take_damage(damage)
+                        print(f"💥 Took {damage} fall damage! (fell {fall_distance:.1f} blocks)")
+                
+                # Reset fall tracking
+                self.is_falling = False
+
+        self.max_fall_vel = 0  # Landed, or bumped a ceiling while moving up
+        self.vel_y = 0
 
     def handle_input(self, keys):
         """Sets the player's horizontal velocity and handles hotbar switching/crafting/inventory toggle."""
@@ -4444,7 +5697,7 @@ class Player(pygame.sprite.Sprite):
         center_row = self.rect.centery // BLOCK_SIZE
         in_water = False
         if 0 <= center_row < GRID_HEIGHT and 0 <= center_col < GRID_WIDTH:
-            if WORLD_MAP[center_row][center_col] in FLUID_BLOCKS:  # Water types and lava
+            if BLOCK_FLUID[WORLD_MAP[center_row][center_col]]:  # Water types and lava
                 in_water = True
         
         # Flippers (ID 59) equipped as boots make you swim faster
@@ -4468,6 +5721,97 @@ class Player(pygame.sprite.Sprite):
             if keys[getattr(pygame, f'K_{i+1}')]:
                 self.switch_active_slot(i)
 
+# --- Entity Registry ---
+# Entity classes declare tags (class attribute `tags`); groups keep a live member set per tag
+ENTITY_TAGS = ("hostile", "passive", "burns_in_sun", "aquatic", "tameable", "meat")
+MOB_REGISTRY = {}  # class name -> entity class (spawn eggs, save loading, texture reloads)
+
+def register_mob(cls):
+    """Registers an entity class under its class name."""
+    MOB_REGISTRY[cls.__name__] = cls
+    return cls
+
+def get_mob_class(name):
+    """Returns the registered entity class for a class name, or None."""
+    return MOB_REGISTRY.get(name)
+
+def get_mob_category(mob):
+    """Returns the spawn-cap category of a mob: hostile, aquatic or passive."""
+    tags = getattr(mob, 'tags', ())
+    if "hostile" in tags:
+        return "hostile"
+    if "aquatic" in tags:
+        return "aquatic"
+    return "passive"
+
+def get_mob_chunk(x):
+    """Returns the chunk index containing a world x pixel position."""
+    return int(x) // (CHUNK_SIZE * BLOCK_SIZE)
+
+class MobGroup(pygame.sprite.Group):
+    """Sprite group for mobs that maintains a live set of members for each entity tag."""
+    def __init__(self, *sprites):
+        self.tagged = {tag: set() for tag in ENTITY_TAGS}
+        self.census = {}  # (chunk_index, category) -> mob count, used by the spawn caps
+        self.census_keys = {}  # mob -> (chunk_index, category) it is counted under
+        self.category_counts = {}  # category -> mob count
+        super().__init__(*sprites)
+    
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite)
+        for tag in getattr(sprite, 'tags', ()):
+            self.tagged.setdefault(tag, set()).add(sprite)
+        category = get_mob_category(sprite)
+        key = (get_mob_chunk(sprite.rect.centerx), category)
+        self.census_keys[sprite] = key
+        self.census[key] = self.census.get(key, 0) + 1
+        self.category_counts[category] = self.category_counts.get(category, 0) + 1
+    
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        for tag in getattr(sprite, 'tags', ()):
+            members = self.tagged.get(tag)
+            if members is not None:
+                members.discard(sprite)
+        key = self.census_keys.pop(sprite, None)
+        if key is not None:
+            self.census[key] -= 1
+            self.category_counts[key[1]] -= 1
+    
+    def __len__(self):
+        # Group.__len__ copies the sprite list just to count it
+        return len(self.spritedict)
+    
+    def rebin(self, mob):
+        """Moves a mob to the census entry for the chunk it has wandered into."""
+        key = self.census_keys.get(mob)
+        if key is None:
+            return
+        chunk = get_mob_chunk(mob.rect.centerx)
+        if chunk != key[0]:
+            self.census[key] -= 1
+            new_key = (chunk, key[1])
+            self.census_keys[mob] = new_key
+            self.census[new_key] = self.census.get(new_key, 0) + 1
+    
+    def has_room(self, category, x):
+        """Returns True if another mob of a category may spawn at world x without passing a cap."""
+        if len(self) >= MOB_CAP:
+            return False
+        if self.category_counts.get(category, 0) >= MOB_CATEGORY_CAPS[category]:
+            return False
+        return self.census.get((get_mob_chunk(x), category), 0) < MOB_CHUNK_CAPS[category]
+    
+    def with_tag(self, tag):
+        """Returns a snapshot list of the members carrying a tag (safe to kill while iterating)."""
+        return list(self.tagged.get(tag, ()))
+
+def mobs_with_tag(mobs, tag):
+    """Returns the mobs carrying a tag, using the group's live tag set when available."""
+    if isinstance(mobs, MobGroup):
+        return mobs.with_tag(tag)
+    return [mob for mob in mobs if tag in getattr(mob, 'tags', ())]
+
 class Mob(pygame.sprite.Sprite):
     """Base class for all non-player entities (Mobs)."""
     def __init__(self, x, y, width, height, color):
@@ -4490,6 +5834,37 @@ class Mob(pygame.sprite.Sprite):
         self.no_fall_damage = False  # Set to True for mobs that shouldn't take fall damage
         self.damage_flash_timer = 0  # Timer for hurt visual effect
         self.hurt_texture = None  # Store hurt texture if available
+    
+    # Mobs that act on their own post-physics state inside update() opt out of the batched stage
+    batch_physics = True
+    
+    # AI level of detail: ai_move only runs when the scheduler marks the mob as due this tick.
+    # Mobs whose update() depends on ai_move's return value opt out with ai_lod = False.
+    ai_lod = True
+    ai_think_due = True
+    ai_overdue = False
+    
+    # Entity registry tags (see ENTITY_TAGS); subclasses declare their own
+    tags = frozenset()
+    
+    # Save schema: variant_fields are constructor arguments that select textures,
+    # persistent_fields are restored onto the instance after cloning (see serialize_entities)
+    variant_fields = ()
+    persistent_fields = ("health", "max_health")
+    
+    def __init_subclass__(cls, **kwargs):
+        """Registers each subclass and wraps its ai_move so it is skipped on ticks the AI scheduler leaves it out."""
+        super().__init_subclass__(**kwargs)
+        register_mob(cls)
+        ai_move = cls.__dict__.get('ai_move')
+        if ai_move is not None:
+            def scheduled_ai_move(self, *args, **kwargs):
+                if not self.ai_think_due:
+                    return None  # Keep the last decision (velocity) until the next think
+                return ai_move(self, *args, **kwargs)
+            scheduled_ai_move.__name__ = ai_move.__name__
+            scheduled_ai_move.__doc__ = ai_move.__doc__
+            cls.ai_move = scheduled_ai_move
         
     def take_damage(self, damage, all_mobs=None):
         self.health -= damage
@@ -4505,12 +5880,10 @@ class Mob(pygame.sprite.Sprite):
             distance = math.sqrt((self.rect.centerx - player.rect.centerx)**2 + (self.rect.centery - player.rect.centery)**2)
             if distance < 100 * BLOCK_SIZE:
                 # Hostile mobs give 5 XP, passive mobs give 1-3 XP
-                hostile_mobs = ["Zombie", "Skeleton", "Creeper", "Spider", "CaveSpider", "Drowned", 
-                               "ZombieCamel", "Parched", "Slime", "Witch", "Shark", "ZombieNautilus", 
-                               "ZombieHorse", "Bear"]
+                is_hostile = "hostile" in self.tags
                 mob_type = self.__class__.__name__
                 
-                if mob_type in hostile_mobs:
+                if is_hostile:
                     xp_amount = 5
                 else:
                     xp_amount = random.randint(1, 3)
@@ -4519,7 +5892,7 @@ class Mob(pygame.sprite.Sprite):
                 print(f"💫 +{xp_amount} XP from {mob_type}")
                 
                 # Update monster hunter achievement
-                if mob_type in hostile_mobs:
+                if is_hostile:
                     if "monster_hunter" in ACHIEVEMENTS:
                         ach = ACHIEVEMENTS["monster_hunter"]
                         if not ach["unlocked"]:
@@ -4544,7 +5917,7 @@ class Mob(pygame.sprite.Sprite):
                     drop_id = cooked_drops[drop_id]
             
             if drop_id != 0:
-                DROPPED_ITEMS.add(DroppedItem(self.rect.centerx, self.rect.bottom - 10, drop_id, 1))
+                spawn_dropped_item(self.rect.centerx, self.rect.bottom - 10, drop_id, 1)
         
         # Remove the mob sprite from all groups
         self.kill()
@@ -4570,17 +5943,23 @@ class Mob(pygame.sprite.Sprite):
         if self.damage_flash_timer > 0:
             self.damage_flash_timer -= 1
         
+        # Gravity, movement and collision run later for all mobs at once (see run_batched_mob_physics)
+        if MOB_PHYSICS_DEFERRED and self.batch_physics:
+            PENDING_MOB_PHYSICS.append(self)
+            return
+        
         # Apply gravity
         self.vel_y += self.gravity
         self.vel_y = min(self.vel_y, 10)
 
         # Apply movement
-        self.rect.x += self.vel_x
         self.collide_x()
-        
-        self.rect.y += self.vel_y
         self.collide_y()
         
+        self.check_environment_damage(world_map)
+    
+    def check_environment_damage(self, world_map):
+        """Applies suffocation and drowning damage for the mob's current position."""
         # Check for suffocation from gravel/sand blocks above head
         center_x = int(self.rect.centerx // BLOCK_SIZE)
         head_y = int((self.rect.top + 2) // BLOCK_SIZE)  # Check just above head
@@ -4588,7 +5967,7 @@ class Mob(pygame.sprite.Sprite):
         if 0 <= head_y < len(world_map) and 0 <= center_x < len(world_map[0]):
             block_above = world_map[head_y][center_x]
             # Gravel (26) or Sand (19) causes suffocation damage
-            if block_above == 26 or block_above == 19:
+            if BLOCK_FALLS[block_above]:
                 # Take 1 damage every half second (30 frames at 60 FPS)
                 if not hasattr(self, 'suffocation_timer'):
                     self.suffocation_timer = 0
@@ -4609,7 +5988,7 @@ class Mob(pygame.sprite.Sprite):
             head_y = int(self.rect.top // BLOCK_SIZE)
             
             if 0 <= head_y < len(world_map) and 0 <= center_x < len(world_map[0]):
-                if world_map[head_y][center_x] in FLUID_BLOCKS:
+                if BLOCK_FLUID[world_map[head_y][center_x]]:
                     self.drowning_timer += 1
                     # 10 second grace period (600 frames), then take damage every second
                     if self.drowning_timer > FPS * 10 and self.drowning_timer % FPS == 0:
@@ -4618,66 +5997,246 @@ class Mob(pygame.sprite.Sprite):
                     self.drowning_timer = 0
             else:
                 self.drowning_timer = 0
+    
+    def steer_with_flow_field(self, speed):
+        """Sets vel_x (and jumps or climbs) from the shared flow field toward the player.
         
-    def collide_x(self):
-        """Handles horizontal collision with solid blocks."""
-        if self.vel_x == 0:
-            return
-            
-        target_col = math.floor((self.rect.left + self.vel_x) / BLOCK_SIZE) if self.vel_x < 0 else math.floor((self.rect.right + self.vel_x) / BLOCK_SIZE)
+        Returns False when the mob is not on the field, so the caller can fall back to direct chasing.
+        """
+        step = sample_flow_field(self)
+        if step is None:
+            # Mid-jump or mid-fall: keep heading the way the field last pointed
+            last_step = getattr(self, 'nav_step', None)
+            if last_step is None or self.is_on_ground:
+                return False
+            self.vel_x = last_step[0] * speed
+            return True
         
-        top_row = math.floor(self.rect.top / BLOCK_SIZE)
-        bottom_row = math.floor((self.rect.bottom - 1) / BLOCK_SIZE)
-
-        for row in range(top_row, bottom_row + 1):
-            if 0 <= row < GRID_HEIGHT and 0 <= target_col < len(WORLD_MAP[0]):
-                block_id = WORLD_MAP[row][target_col]
-                # FIXED: Check if block is solid instead of just non-air
-                if block_id != 0 and BLOCK_TYPES.get(block_id, {}).get("solid", False):
-                    if self.vel_x > 0:
-                        self.rect.right = target_col * BLOCK_SIZE
-                    elif self.vel_x < 0:
-                        self.rect.left = (target_col + 1) * BLOCK_SIZE
-                    self.vel_x = 0
-                    return
+        self.nav_step = step
+        step_col, step_row = step
+        if step == (0, 0):
+            return False  # Standing on the target cell
+        self.vel_x = step_col * speed
+        if step_row < 0:
+            if step_col == 0:
+                self.vel_y = -NAV_CLIMB_SPEED  # Ladder or water column
+            elif self.is_on_ground:
+                self.vel_y = -NAV_JUMP_VELOCITY  # One block step up
+        return True
+        
+    def collide_x(self):
+        """Moves the mob by vel_x, stopping at solid blocks (see sweep_x)."""
+        if sweep_x(WORLD_MAP, self.rect, self.vel_x) is not None:
+            self.vel_x = 0
     
     def collide_y(self):
-        """Handles vertical collision with solid blocks (ground detection)."""
+        """Moves the mob by vel_y, landing on or bumping into solid blocks (ground detection)."""
         if self.vel_y == 0:
             return
-
         is_falling = self.vel_y > 0
-        
+        hit = sweep_y(WORLD_MAP, self.rect, self.vel_y) is not None
         if is_falling:
-            target_y = self.rect.bottom + self.vel_y
-        else: 
-            target_y = self.rect.top + self.vel_y
+            self.is_on_ground = hit
+        if hit:
+            self.vel_y = 0
 
-        # Check collision points
-        for x_offset in [self.rect.left + 1, self.rect.right - 1]:
-            col = math.floor(x_offset / BLOCK_SIZE)
-            row = math.floor(target_y / BLOCK_SIZE)
-            
-            if 0 <= row < GRID_HEIGHT and 0 <= col < len(WORLD_MAP[0]):
-                block_id = WORLD_MAP[row][col]
-                
-                # FIXED: Check if block is solid instead of just non-air
-                if block_id != 0 and BLOCK_TYPES.get(block_id, {}).get("solid", False):
-                    if is_falling:
-                        self.rect.bottom = row * BLOCK_SIZE
-                        self.is_on_ground = True
-                    else:
-                        self.rect.top = (row + 1) * BLOCK_SIZE
-                    self.vel_y = 0
-                    return
-                elif is_falling:
-                     self.is_on_ground = False
-            
-        if is_falling:
-            self.is_on_ground = False
+# --- Batched Mob Physics ---
+# With NumPy available, the main loop defers gravity/movement/tile collision of every Mob that
+# uses the base physics, then integrates and resolves them together as arrays (structure of arrays).
+BATCH_MOB_PHYSICS = HAS_NUMPY
+MOB_PHYSICS_DEFERRED = False  # True while the main loop is collecting mobs for the batch
+PENDING_MOB_PHYSICS = []
+
+def run_batched_mob_physics(world_map):
+    """Integrates gravity and resolves tile collisions for all pending mobs in one pass.
+    
+    Mirrors Mob.update/collide_x/collide_y through the shared sweep_arrays engine.
+    """
+    mobs = PENDING_MOB_PHYSICS[:]
+    PENDING_MOB_PHYSICS.clear()
+    count = len(mobs)
+    if count == 0:
+        return
+    
+    # Gather sprite state into arrays
+    x = np.fromiter((m.rect.x for m in mobs), dtype=np.float64, count=count)
+    y = np.fromiter((m.rect.y for m in mobs), dtype=np.float64, count=count)
+    w = np.fromiter((m.rect.width for m in mobs), dtype=np.float64, count=count)
+    h = np.fromiter((m.rect.height for m in mobs), dtype=np.float64, count=count)
+    vel_x = np.fromiter((m.vel_x for m in mobs), dtype=np.float64, count=count)
+    vel_y = np.fromiter((m.vel_y for m in mobs), dtype=np.float64, count=count)
+    gravity = np.fromiter((m.gravity for m in mobs), dtype=np.float64, count=count)
+    on_ground = np.fromiter((m.is_on_ground for m in mobs), dtype=bool, count=count)
+    
+    # Apply gravity
+    vel_y = np.minimum(vel_y + gravity, 10)
+    
+    # Movement and tile collision (x then y, see sweep_arrays)
+    falling = vel_y > 0
+    moving_y = vel_y != 0
+    x, y, vel_x, vel_y, hit_x, hit_y = sweep_arrays(world_map, x, y, w, h, vel_x, vel_y)
+    # Landing sets on_ground, falling without a hit clears it, rising leaves it unchanged
+    on_ground = np.where(moving_y & falling, hit_y, on_ground)
+    
+    # Write results back to the sprites
+    xs, ys = x.astype(np.int64).tolist(), y.astype(np.int64).tolist()
+    vxs, vys, grounded = vel_x.tolist(), vel_y.tolist(), on_ground.tolist()
+    for i, mob in enumerate(mobs):
+        mob.rect.x = xs[i]
+        mob.rect.y = ys[i]
+        mob.vel_x = vxs[i]
+        mob.vel_y = vys[i]
+        mob.is_on_ground = grounded[i]
+    
+    for mob in mobs:
+        if mob.alive():
+            mob.check_environment_damage(world_map)
+
+# --- Navigation (Flow Field) ---
+# Hostile mobs share one flow field toward the player instead of steering independently.
+# Nodes are cells a 2-block-tall mob can occupy: feet on solid ground, on a ladder or in water.
+# Dijkstra runs outward from the player's cell over reversed moves (walk, one block step up,
+# drops of up to NAV_MAX_DROP blocks, climbing ladders, swimming), and NAV_FLOW stores for
+# every node the next cell to move to, so a mob samples its step in O(1).
+NAV_FIELD_RADIUS = 24  # Columns either side of the player
+NAV_FIELD_HEIGHT = 16  # Rows above and below the player
+NAV_UPDATE_INTERVAL = 15  # Minimum ticks between rebuilds
+NAV_MAX_DROP = 3  # Blocks a mob will drop down
+NAV_SWIM_COST = 3  # Entering water costs more than walking
+NAV_JUMP_VELOCITY = 8  # Clears one block at mob gravity (0.5)
+NAV_CLIMB_SPEED = 3
+NAV_PASSABLE = compile_block_table(lambda block_id, data: block_id != LAVA_ID and not BLOCK_SOLID[block_id])
+NAV_WATER = compile_block_table(lambda block_id, data: block_id in ALL_WATER_BLOCKS)
+
+NAV_FLOW = {}  # (row, col) -> (next_row, next_col)
+NAV_TARGET = None  # (row, col) the field leads to
+NAV_BOUNDS = None  # (min_row, max_row, min_col, max_col) of the current field
+NAV_DIRTY = True
+NAV_TICKS_SINCE_BUILD = 0
+
+def nav_passable(world_map, row, col):
+    """Returns True if a mob's body can occupy the cell (in bounds, not solid, not lava)."""
+    return 0 <= row < GRID_HEIGHT and 0 <= col < len(world_map[0]) and NAV_PASSABLE[world_map[row][col]]
+
+def collect_nav_nodes(world_map, min_row, max_row, min_col, max_col):
+    """Returns {(row, col): entry_cost} for every cell in the bounds a mob can stand, climb or swim in."""
+    nodes = {}
+    world_width = len(world_map[0])
+    for row in range(max(1, min_row), min(GRID_HEIGHT, max_row + 1)):
+        above = world_map[row - 1]
+        here = world_map[row]
+        below = world_map[row + 1] if row + 1 < GRID_HEIGHT else None
+        for col in range(max(0, min_col), min(world_width, max_col + 1)):
+            block_id = here[col]
+            if not NAV_PASSABLE[block_id] or not NAV_PASSABLE[above[col]]:
+                continue
+            if NAV_WATER[block_id]:
+                nodes[(row, col)] = NAV_SWIM_COST
+            elif block_id == LADDER_ID or (below is not None and BLOCK_SOLID[below[col]]):
+                nodes[(row, col)] = 1
+    return nodes
+
+def nav_predecessors(world_map, nodes, row, col):
+    """Yields nodes a mob can move from to reach (row, col) in one step."""
+    climbable = world_map[row][col] == LADDER_ID or NAV_WATER[world_map[row][col]]
+    # Climbing or swimming down into this cell / up out of the cell below
+    if climbable and (row - 1, col) in nodes:
+        yield (row - 1, col)
+    below = (row + 1, col)
+    if below in nodes and (world_map[below[0]][col] == LADDER_ID or NAV_WATER[world_map[below[0]][col]]):
+        yield below
+    
+    for side in (col - 1, col + 1):
+        # Walking (or swimming) sideways
+        if (row, side) in nodes:
+            yield (row, side)
+        # Jumping up one block from the lower side needs head room above the take-off cell
+        if (row + 1, side) in nodes and nav_passable(world_map, row - 1, side):
+            yield (row + 1, side)
+        # Walking off a ledge on the higher side and falling down this column
+        for drop in range(1, NAV_MAX_DROP + 1):
+            if not nav_passable(world_map, row - drop - 1, col):
+                break
+            if (row - drop, side) in nodes:
+                yield (row - drop, side)
+
+def build_flow_field(world_map, target_row, target_col):
+    """Builds NAV_FLOW around (target_row, target_col) with Dijkstra over reversed moves."""
+    global NAV_FLOW, NAV_TARGET, NAV_BOUNDS
+    bounds = (target_row - NAV_FIELD_HEIGHT, target_row + NAV_FIELD_HEIGHT,
+              target_col - NAV_FIELD_RADIUS, target_col + NAV_FIELD_RADIUS)
+    nodes = collect_nav_nodes(world_map, *bounds)
+    target = (target_row, target_col)
+    flow = {}
+    if target in nodes:
+        flow[target] = target
+        costs = {target: 0}
+        frontier = [(0, target)]
+        while frontier:
+            cost, node = heapq.heappop(frontier)
+            if cost > costs[node]:
+                continue
+            step_cost = cost + nodes[node]
+            for previous in nav_predecessors(world_map, nodes, node[0], node[1]):
+                if step_cost < costs.get(previous, step_cost + 1):
+                    costs[previous] = step_cost
+                    flow[previous] = node
+                    heapq.heappush(frontier, (step_cost, previous))
+    NAV_FLOW = flow
+    NAV_TARGET = target
+    NAV_BOUNDS = bounds
+
+def find_nav_target(world_map, player):
+    """Returns the node cell under the player (searching a few rows down while airborne), or None."""
+    col = player.rect.centerx // BLOCK_SIZE
+    row = (player.rect.bottom - 1) // BLOCK_SIZE
+    for check_row in range(row, min(GRID_HEIGHT - 1, row + NAV_MAX_DROP + 1)):
+        if not nav_passable(world_map, check_row, col):
+            return None
+        if BLOCK_SOLID[world_map[check_row + 1][col]] or NAV_WATER[world_map[check_row][col]]:
+            return (check_row, col)
+    return None
+
+def update_flow_field(world_map, player):
+    """Rebuilds the flow field when the player changed cell or nearby blocks changed, at most every NAV_UPDATE_INTERVAL ticks."""
+    global NAV_DIRTY, NAV_TICKS_SINCE_BUILD
+    NAV_TICKS_SINCE_BUILD += 1
+    if NAV_TICKS_SINCE_BUILD < NAV_UPDATE_INTERVAL:
+        return
+    target = find_nav_target(world_map, player)
+    if target is None or (target == NAV_TARGET and not NAV_DIRTY):
+        return
+    build_flow_field(world_map, target[0], target[1])
+    NAV_DIRTY = False
+    NAV_TICKS_SINCE_BUILD = 0
+
+def sample_flow_field(mob):
+    """Returns the (column_step, row_step) the field suggests for a mob, or None if it is off the field."""
+    col = mob.rect.centerx // BLOCK_SIZE
+    row = (mob.rect.bottom - 1) // BLOCK_SIZE
+    next_cell = NAV_FLOW.get((row, col))
+    if next_cell is None:
+        return None
+    return (next_cell[1] - col, next_cell[0] - row)
+
+def on_blocks_changed_navigation(section_key, changes):
+    """Marks the flow field dirty when blocks inside it change."""
+    global NAV_DIRTY
+    if NAV_BOUNDS is None or changes is None:
+        NAV_DIRTY = True
+        return
+    min_row, max_row, min_col, max_col = NAV_BOUNDS
+    for row, col, old_id, new_id in changes:
+        if min_row - 1 <= row <= max_row + 1 and min_col <= col <= max_col:
+            NAV_DIRTY = True
+            return
+
+subscribe_block_changes(on_blocks_changed_navigation)
 
 class Sheep(Mob):
     """A passive mob that wanders randomly and drops wool."""
+    tags = frozenset({"passive", "meat"})
+    variant_fields = ("wool_color",)
     # Minecraft sheep colors (16 wool colors)
     SHEEP_COLORS = {
         'white': (255, 255, 255),
@@ -4698,15 +6257,15 @@ class Sheep(Mob):
         'pink': (243, 139, 170)
     }
     
-    def __init__(self, x, y):
+    def __init__(self, x, y, wool_color=None):
         super().__init__(x, y, BLOCK_SIZE, BLOCK_SIZE, (255, 255, 255)) 
         self.health = 8
         self.max_health = 8
         self.speed = 1.5
         self.drop_id = 7 # Wool
         
-        # Choose random wool color
-        self.wool_color = random.choice(list(self.SHEEP_COLORS.values()))
+        # Choose random wool color (restored saves pass the saved one)
+        self.wool_color = wool_color or random.choice(list(self.SHEEP_COLORS.values()))
         
         # AI state
         self.move_timer = 0
@@ -4803,16 +6362,17 @@ class Sheep(Mob):
         if 'DROPPED_ITEMS' in globals():
             # Drop colored wool matching sheep's color
             wool_id = get_wool_id_from_color(self.wool_color)
-            DROPPED_ITEMS.add(DroppedItem(self.rect.centerx - 5, self.rect.bottom - 10, wool_id, 1))
+            spawn_dropped_item(self.rect.centerx - 5, self.rect.bottom - 10, wool_id, 1)
             
             # Drop mutton (ID 50) or cooked mutton (ID 88) if on fire
             mutton_id = 88 if (hasattr(self, 'on_fire') and self.on_fire) else 50
-            DROPPED_ITEMS.add(DroppedItem(self.rect.centerx + 5, self.rect.bottom - 10, mutton_id, 1))
+            spawn_dropped_item(self.rect.centerx + 5, self.rect.bottom - 10, mutton_id, 1)
         
         self.kill()
 
 class Goat(Mob):
     """A mountain mob that rams players with knockback."""
+    tags = frozenset({"passive"})
     def __init__(self, x, y):
         super().__init__(x, y, BLOCK_SIZE * 1.2, BLOCK_SIZE * 1.4, (200, 200, 200))
         self.health = 10
@@ -4932,6 +6492,7 @@ class Goat(Mob):
 
 class Cow(Mob):
     """A passive mob that wanders and drops leather."""
+    tags = frozenset({"passive", "meat"})
     def __init__(self, x, y):
         super().__init__(x, y, BLOCK_SIZE * 2.5, BLOCK_SIZE * 1.5, (139, 69, 19)) # Brown - BIGGER
         self.health = 10
@@ -5050,9 +6611,9 @@ class Cow(Mob):
         if 'DROPPED_ITEMS' in globals():
             # Drop beef (ID 51) or cooked beef (ID 87) if on fire
             beef_id = 87 if (hasattr(self, 'on_fire') and self.on_fire) else 51
-            DROPPED_ITEMS.add(DroppedItem(self.rect.centerx, self.rect.bottom - 10, beef_id, random.randint(1, 2)))
+            spawn_dropped_item(self.rect.centerx, self.rect.bottom - 10, beef_id, random.randint(1, 2))
             if random.random() < 0.5:  # 50% chance for leather
-                DROPPED_ITEMS.add(DroppedItem(self.rect.centerx + 10, self.rect.bottom - 10, 14, 1))  # Leather (ID 14)
+                spawn_dropped_item(self.rect.centerx + 10, self.rect.bottom - 10, 14, 1)  # Leather (ID 14)
                 # Trigger cow tipper achievement
                 if 'player' in globals():
                     unlock_achievement("cow_tipper", player)
@@ -5060,6 +6621,7 @@ class Cow(Mob):
 
 class Camel(Mob):
     """A passive desert mob that wanders in sandy areas."""
+    tags = frozenset({"passive"})
     def __init__(self, x, y):
         super().__init__(x, y, BLOCK_SIZE * 2, BLOCK_SIZE * 2, (193, 154, 107)) # Tan/sandy color - made bigger
         self.health = 20
@@ -5148,7 +6710,7 @@ class Camel(Mob):
         if self.rider:
             self.dismount()
         if 'DROPPED_ITEMS' in globals():
-            DROPPED_ITEMS.add(DroppedItem(self.rect.centerx, self.rect.bottom - 10, 14, 1))  # Leather (ID 14)
+            spawn_dropped_item(self.rect.centerx, self.rect.bottom - 10, 14, 1)  # Leather (ID 14)
         self.kill()
                 
     def update(self, WORLD_MAP, player, MOBS):
@@ -5169,6 +6731,7 @@ class Camel(Mob):
 
 class Chicken(Mob):
     """A small passive mob that drops feathers."""
+    tags = frozenset({"passive", "meat"})
     def __init__(self, x, y):
         super().__init__(x, y, BLOCK_SIZE * 0.6, BLOCK_SIZE * 0.6, (255, 255, 255))
         self.health = 4
@@ -5279,12 +6842,16 @@ class Chicken(Mob):
         if 'DROPPED_ITEMS' in globals():
             # Drop chicken (ID 81) or cooked chicken (ID 89) if on fire
             chicken_id = 89 if (hasattr(self, 'on_fire') and self.on_fire) else 81
-            DROPPED_ITEMS.add(DroppedItem(self.rect.centerx, self.rect.bottom - 10, chicken_id, random.randint(1, 2)))
+            spawn_dropped_item(self.rect.centerx, self.rect.bottom - 10, chicken_id, random.randint(1, 2))
         self.kill()
 
 
 class Bird(Mob):
     """A flying passive mob that flies around and perches on trees. Color varies by biome."""
+    tags = frozenset({"passive"})
+    variant_fields = ("variant",)
+    batch_physics = False  # Restores its flight velocity right after physics
+    
     def __init__(self, x, y, variant="blue"):
         super().__init__(x, y, BLOCK_SIZE * 0.5, BLOCK_SIZE * 0.5, (100, 150, 255))
         self.health = 3
@@ -5516,13 +7083,14 @@ class Bird(Mob):
     def die(self, all_mobs=None):
         """Drops bird meat and feather when killed."""
         if 'DROPPED_ITEMS' in globals():
-            DROPPED_ITEMS.add(DroppedItem(self.rect.centerx, self.rect.bottom - 10, 154, 1))  # Bird meat
-            DROPPED_ITEMS.add(DroppedItem(self.rect.centerx + 5, self.rect.bottom - 10, 146, 1))  # Feather
+            spawn_dropped_item(self.rect.centerx, self.rect.bottom - 10, 154, 1)  # Bird meat
+            spawn_dropped_item(self.rect.centerx + 5, self.rect.bottom - 10, 146, 1)  # Feather
         self.kill()
 
 
 class Pig(Mob):
     """A small passive mob about the size of a sheep that drops pork."""
+    tags = frozenset({"passive", "meat"})
     def __init__(self, x, y):
         super().__init__(x, y, BLOCK_SIZE, BLOCK_SIZE, (255, 192, 203))
         self.health = 10
@@ -5628,12 +7196,13 @@ class Pig(Mob):
         if 'DROPPED_ITEMS' in globals():
             # Drop pork (ID 82) or cooked pork (ID 90) if on fire
             pork_id = 90 if (hasattr(self, 'on_fire') and self.on_fire) else 82
-            DROPPED_ITEMS.add(DroppedItem(self.rect.centerx, self.rect.bottom - 10, pork_id, random.randint(1, 3)))
+            spawn_dropped_item(self.rect.centerx, self.rect.bottom - 10, pork_id, random.randint(1, 3))
         self.kill()
 
 
 class Cod(Mob):
     """A brown fish that swims in oceans and drops cod."""
+    tags = frozenset({"passive", "aquatic"})
     def __init__(self, x, y):
         super().__init__(x, y, BLOCK_SIZE * 1, BLOCK_SIZE * 0.5, (120, 90, 60))  # 1 block long, half block tall brown fish
         self.health = 3
@@ -5725,12 +7294,13 @@ class Cod(Mob):
     def die(self, all_mobs=None):
         """Drops cod."""
         if 'DROPPED_ITEMS' in globals():
-            DROPPED_ITEMS.add(DroppedItem(self.rect.centerx, self.rect.bottom - 10, 156, 1))  # Cod
+            spawn_dropped_item(self.rect.centerx, self.rect.bottom - 10, 156, 1)  # Cod
         self.kill()
 
 
 class Salmon(Mob):
     """A red fish that swims in oceans and drops salmon."""
+    tags = frozenset({"passive", "aquatic"})
     def __init__(self, x, y):
         super().__init__(x, y, BLOCK_SIZE * 1.5, BLOCK_SIZE * 0.4, (220, 80, 60))  # 1.5 blocks long, thinner
         self.health = 3
@@ -5805,12 +7375,14 @@ class Salmon(Mob):
     def die(self, all_mobs=None):
         """Drops salmon."""
         if 'DROPPED_ITEMS' in globals():
-            DROPPED_ITEMS.add(DroppedItem(self.rect.centerx, self.rect.bottom - 10, 158, 1))  # Salmon
+            spawn_dropped_item(self.rect.centerx, self.rect.bottom - 10, 158, 1)  # Salmon
         self.kill()
 
 
 class TropicalFish(Mob):
     """A colorful fish in 16 sheep colors, comes in 2 sizes, drops tropical fish meat."""
+    tags = frozenset({"passive", "aquatic"})
+    variant_fields = ("is_large", "color_id")
     # Reuse sheep colors for tropical fish
     FISH_COLORS = {
         0: (255, 255, 255),   # White
@@ -5831,10 +7403,12 @@ class TropicalFish(Mob):
         15: (0, 0, 0),        # Black
     }
     
-    def __init__(self, x, y, is_large=False):
+    def __init__(self, x, y, is_large=False, color_id=None):
         # Small rabbit-sized (0.5 blocks) or 1 block sized
         size = BLOCK_SIZE * 1.0 if is_large else BLOCK_SIZE * 0.5
-        color_id = random.randint(0, 15)
+        # Random color (restored saves pass the saved one)
+        if color_id is None:
+            color_id = random.randint(0, 15)
         super().__init__(x, y, size, size * 0.5, self.FISH_COLORS[color_id])
         self.health = 2
         self.max_health = 2
@@ -5891,12 +7465,13 @@ class TropicalFish(Mob):
     def die(self, all_mobs=None):
         """Drops tropical fish meat."""
         if 'DROPPED_ITEMS' in globals():
-            DROPPED_ITEMS.add(DroppedItem(self.rect.centerx, self.rect.bottom - 10, 165, 1))  # Tropical Fish Meat
+            spawn_dropped_item(self.rect.centerx, self.rect.bottom - 10, 165, 1)  # Tropical Fish Meat
         self.kill()
 
 
 class Dolphin(Mob):
     """A friendly 4-block ocean creature that can lead players to shipwrecks when fed fish."""
+    tags = frozenset({"passive", "aquatic"})
     def __init__(self, x, y):
         super().__init__(x, y, BLOCK_SIZE * 4, BLOCK_SIZE * 1.5, (100, 180, 255))  # Light blue
         self.health = 10
@@ -5969,6 +7544,7 @@ class Dolphin(Mob):
 
 class Shark(Mob):
     """An 8-block aggressive ocean predator similar to lions, 40 HP."""
+    tags = frozenset({"hostile", "aquatic"})
     def __init__(self, x, y):
         super().__init__(x, y, BLOCK_SIZE * 8, BLOCK_SIZE * 2.5, (100, 100, 120))  # Gray
         self.health = 40
@@ -6074,12 +7650,13 @@ class Shark(Mob):
     def die(self, all_mobs=None):
         """Drops tropical fish meat."""
         if 'DROPPED_ITEMS' in globals():
-            DROPPED_ITEMS.add(DroppedItem(self.rect.centerx, self.rect.bottom - 10, 165, 1))
+            spawn_dropped_item(self.rect.centerx, self.rect.bottom - 10, 165, 1)
         self.kill()
 
 
 class Whale(Mob):
     """A massive 20-block peaceful ocean creature with 200 HP, elephant-like behavior."""
+    tags = frozenset({"passive", "aquatic"})
     def __init__(self, x, y):
         super().__init__(x, y, BLOCK_SIZE * 20, BLOCK_SIZE * 6, (80, 100, 140))  # Blue-gray
         self.health = 200
@@ -6118,6 +7695,7 @@ class Whale(Mob):
 
 class Nautilus(Mob):
     """A peaceful ocean creature that looks like a red/orange squid. Can be ridden by drowned."""
+    tags = frozenset({"passive", "aquatic"})
     def __init__(self, x, y):
         super().__init__(x, y, BLOCK_SIZE * 2, BLOCK_SIZE * 2, (230, 100, 80))  # Red/orange body
         self.health = 15
@@ -6203,6 +7781,7 @@ class Nautilus(Mob):
 
 class ZombieNautilus(Mob):
     """A hostile nautilus with a zombie rider - spawns in ocean biomes at night."""
+    tags = frozenset({"hostile", "burns_in_sun"})
     def __init__(self, x, y):
         super().__init__(x, y, BLOCK_SIZE * 2.2, BLOCK_SIZE * 2.5, (150, 100, 200))  # Darker purple shell
         self.health = 30
@@ -6346,13 +7925,14 @@ class ZombieNautilus(Mob):
     def die(self, all_mobs=None):
         """Drops nautilus shell and rotten flesh."""
         if 'DROPPED_ITEMS' in globals():
-            DROPPED_ITEMS.add(DroppedItem(self.rect.centerx - 5, self.rect.bottom - 10, 164, 1))  # Nautilus shell
-            DROPPED_ITEMS.add(DroppedItem(self.rect.centerx + 5, self.rect.bottom - 10, 13, random.randint(0, 2)))  # Rotten flesh
+            spawn_dropped_item(self.rect.centerx - 5, self.rect.bottom - 10, 164, 1)  # Nautilus shell
+            spawn_dropped_item(self.rect.centerx + 5, self.rect.bottom - 10, 13, random.randint(0, 2))  # Rotten flesh
         self.kill()
 
 
 class Rabbit(Mob):
     """A small, fast-hopping desert mob that drops rabbit meat."""
+    tags = frozenset({"passive", "meat"})
     def __init__(self, x, y):
         super().__init__(x, y, BLOCK_SIZE * 0.5, BLOCK_SIZE * 0.5, (200, 180, 150))  # Small like chickens
         self.health = 3
@@ -6422,15 +8002,17 @@ class Rabbit(Mob):
     def die(self, all_mobs=None):
         """Drops rabbit meat when killed."""
         if 'DROPPED_ITEMS' in globals():
-            DROPPED_ITEMS.add(DroppedItem(self.rect.centerx, self.rect.bottom - 10, 145, 1))  # Rabbit Meat
+            spawn_dropped_item(self.rect.centerx, self.rect.bottom - 10, 145, 1)  # Rabbit Meat
         self.kill()
 
 
 class Horse(Mob):
     """A rideable plains mob in black, brown, or white colors."""
-    def __init__(self, x, y):
-        # Random color variant
-        self.color_variant = random.choice(['black', 'brown', 'white'])
+    tags = frozenset({"passive"})
+    variant_fields = ("color_variant",)
+    def __init__(self, x, y, color_variant=None):
+        # Random color variant (restored saves pass the saved one)
+        self.color_variant = color_variant or random.choice(['black', 'brown', 'white'])
         if self.color_variant == 'black':
             color = (40, 40, 40)
         elif self.color_variant == 'brown':
@@ -6560,12 +8142,13 @@ class Horse(Mob):
         if self.rider:
             self.dismount()
         if 'DROPPED_ITEMS' in globals():
-            DROPPED_ITEMS.add(DroppedItem(self.rect.centerx, self.rect.bottom - 10, 14, random.randint(0, 2)))  # Leather
+            spawn_dropped_item(self.rect.centerx, self.rect.bottom - 10, 14, random.randint(0, 2))  # Leather
         self.kill()
 
 
 class ZombieHorse(Mob):
     """A hostile mob: green horse ridden by a zombie holding a spear. Spawns at night."""
+    tags = frozenset({"hostile"})
     def __init__(self, x, y):
         # Green horse color
         color = (100, 150, 80)
@@ -6670,9 +8253,13 @@ class ZombieHorse(Mob):
         if player.is_crouching:
             effective_aggro_range = self.aggro_range * 0.5
         
-        # Chase player
+        # Chase player (along the flow field when possible)
+        on_path = False
         if distance < effective_aggro_range:
-            if abs(player_dist_x) > BLOCK_SIZE * 0.1:
+            on_path = self.steer_with_flow_field(self.speed)
+            if on_path:
+                pass
+            elif abs(player_dist_x) > BLOCK_SIZE * 0.1:
                 if player_dist_x > 0:
                     self.vel_x = self.speed
                 else:
@@ -6690,7 +8277,7 @@ class ZombieHorse(Mob):
             self.vel_x = self.direction * (self.speed * 0.3)
         
         # Cliff avoidance
-        if self.vel_x != 0:
+        if self.vel_x != 0 and not on_path:
             direction = 1 if self.vel_x > 0 else -1
             check_col = int((self.rect.centerx + direction * BLOCK_SIZE) // BLOCK_SIZE)
             check_row = int(self.rect.bottom // BLOCK_SIZE)
@@ -6710,12 +8297,15 @@ class ZombieHorse(Mob):
     def die(self, all_mobs=None):
         """Drops leather and rotten flesh when killed."""
         if 'DROPPED_ITEMS' in globals():
-            DROPPED_ITEMS.add(DroppedItem(self.rect.centerx, self.rect.bottom - 10, 14, random.randint(1, 3)))  # Leather
-            DROPPED_ITEMS.add(DroppedItem(self.rect.centerx + 10, self.rect.bottom - 10, 13, random.randint(1, 2)))  # Rotten Flesh
+            spawn_dropped_item(self.rect.centerx, self.rect.bottom - 10, 14, random.randint(1, 3))  # Leather
+            spawn_dropped_item(self.rect.centerx + 10, self.rect.bottom - 10, 13, random.randint(1, 2))  # Rotten Flesh
         self.kill()
 
         
 class Penguin(pygame.sprite.Sprite):
+    tags = frozenset({"passive"})
+    variant_fields = ()
+    persistent_fields = ("health", "max_health")
     def __init__(self, x, y):
         super().__init__()
         # Slightly larger, rounder penguin (2023 mob vote style)
@@ -6778,56 +8368,19 @@ class Penguin(pygame.sprite.Sprite):
         return self.image
     
     def collide_x(self):
-        """Handle horizontal collisions with blocks"""
-        global WORLD_MAP
-        
-        left_col = self.rect.left // BLOCK_SIZE
-        right_col = self.rect.right // BLOCK_SIZE
-        top_row = self.rect.top // BLOCK_SIZE
-        bottom_row = self.rect.bottom // BLOCK_SIZE
-        
-        for row in range(max(0, top_row), min(GRID_HEIGHT, bottom_row + 1)):
-            for col in range(max(0, left_col), min(GRID_WIDTH, right_col + 1)):
-                block_id = WORLD_MAP[row][col]
-                # Only collide with solid blocks that are not water
-                if block_id != AIR_ID and block_id != WATER_ID and BLOCK_TYPES.get(block_id, {}).get("solid", False):
-                    block_rect = pygame.Rect(col * BLOCK_SIZE, row * BLOCK_SIZE, BLOCK_SIZE, BLOCK_SIZE)
-                    if self.rect.colliderect(block_rect):
-                        if self.vel_x > 0:
-                            self.rect.right = block_rect.left
-                        elif self.vel_x < 0:
-                            self.rect.left = block_rect.right
-                        self.vel_x = 0
-                        return
+        """Moves the penguin by vel_x, stopping at solid blocks."""
+        if sweep_x(WORLD_MAP, self.rect, self.vel_x) is not None:
+            self.vel_x = 0
     
     def collide_y(self):
-        """Handle vertical collisions with blocks"""
-        global WORLD_MAP
-        
-        left_col = self.rect.left // BLOCK_SIZE
-        right_col = self.rect.right // BLOCK_SIZE
-        top_row = self.rect.top // BLOCK_SIZE
-        bottom_row = self.rect.bottom // BLOCK_SIZE
-        
-        self.on_ground = False
+        """Moves the penguin by vel_y, landing on or bumping into solid blocks."""
+        is_falling = self.vel_y > 0
+        hit = sweep_y(WORLD_MAP, self.rect, self.vel_y) is not None
+        self.on_ground = hit and is_falling
+        if hit:
+            self.vel_y = 0
+            return
         
-        # Check blocks that the Penguin is currently occupying or about to enter
-        for row in range(max(0, top_row), min(GRID_HEIGHT, bottom_row + 1)):
-            for col in range(max(0, left_col), min(GRID_WIDTH, right_col + 1)):
-                block_id = WORLD_MAP[row][col]
-                # Only collide with solid blocks that are not water
-                if block_id != AIR_ID and block_id != WATER_ID and BLOCK_TYPES.get(block_id, {}).get("solid", False):
-                    block_rect = pygame.Rect(col * BLOCK_SIZE, row * BLOCK_SIZE, BLOCK_SIZE, BLOCK_SIZE)
-                    if self.rect.colliderect(block_rect):
-                        if self.vel_y > 0: # Falling
-                            self.rect.bottom = block_rect.top
-                            self.vel_y = 0
-                            self.on_ground = True
-                        elif self.vel_y < 0: # Jumping/hitting ceiling
-                            self.rect.top = block_rect.bottom
-                            self.vel_y = 0
-                        return
-                        
         # Check if in water (for different movement/gravity)
         is_in_water = False
         # Check the block the penguin's center is in or bottom is in
@@ -6872,10 +8425,7 @@ class Penguin(pygame.sprite.Sprite):
         if self.vel_y > 10:
             self.vel_y = 10
         
-        self.rect.x += self.vel_x
         self.collide_x()
-        
-        self.rect.y += self.vel_y
         self.collide_y()
 
         # Keep within world bounds
@@ -6885,12 +8435,15 @@ class Penguin(pygame.sprite.Sprite):
     def die(self, all_mobs=None):
         """Drops flipper when killed."""
         if 'DROPPED_ITEMS' in globals():
-            DROPPED_ITEMS.add(DroppedItem(self.rect.centerx, self.rect.bottom - 10, 59, 1))  # Flipper (ID 59)
+            spawn_dropped_item(self.rect.centerx, self.rect.bottom - 10, 59, 1)  # Flipper (ID 59)
         self.kill()
 
+register_mob(Penguin)
+
 import random # Ensure this is at the top of your file
 
 class Fox(Mob):
+    tags = frozenset({"passive"})
     def __init__(self, x, y):
         super().__init__(x, y, BLOCK_SIZE, BLOCK_SIZE * 0.8, (255, 100, 0)) 
         self.health = 4
@@ -6958,6 +8511,8 @@ class Fox(Mob):
         super().take_damage(damage, all_mobs)
 
 class Wolf(Mob):
+    tags = frozenset({"passive", "tameable"})
+    persistent_fields = Mob.persistent_fields + ("is_tamed", "provoked")
     def __init__(self, x, y):
         super().__init__(x, y, BLOCK_SIZE, BLOCK_SIZE * 1.2, (150, 150, 150)) 
         self.health = 8
@@ -7037,18 +8592,7 @@ class Wolf(Mob):
         
         if not self.is_tamed:
             # Check for taming item in hotbar and inventory
-            has_item = False
-            for item_id, count in player.hotbar_slots:
-                if item_id == TAMING_ITEM_ID and count > 0:
-                    has_item = True
-                    break
-            if not has_item:
-                for item_id, count in player.inventory:
-                    if item_id == TAMING_ITEM_ID and count > 0:
-                        has_item = True
-                        break
-            
-            if has_item:
+            if player.items.count(TAMING_ITEM_ID) > 0:
                 # Consume taming item
                 player.consume_item(TAMING_ITEM_ID, 1)
                     
@@ -7117,14 +8661,12 @@ class Wolf(Mob):
 
     def find_hostile_target(self, all_mobs):
         """Finds the nearest hostile mob within a 15-block radius."""
-        # Include all hostile mobs that wolves should attack
-        HOSTILE_TYPES = (Zombie, Skeleton, Creeper, Slime, Witch) 
         nearest_target = None
         min_dist_sq = (BLOCK_SIZE * 15) ** 2 # Search radius
         
-        for mob in all_mobs:
-            # Check if mob is alive, not the wolf itself, and is a hostile type
-            if mob.alive and mob != self and isinstance(mob, HOSTILE_TYPES):
+        for mob in mobs_with_tag(all_mobs, "hostile"):
+            # Check if mob is alive and not the wolf itself
+            if mob.alive and mob != self:
                 dist_sq = (mob.rect.centerx - self.rect.centerx)**2 + \
                           (mob.rect.centery - self.rect.centery)**2
                 
@@ -7179,6 +8721,9 @@ class Wolf(Mob):
             self.vel_x = 0
             
 class Frog(Mob):
+    tags = frozenset({"passive"})
+    batch_physics = False  # Jumps based on the ground state from this frame's physics
+    
     def __init__(self, x, y):
         super().__init__(x, y, BLOCK_SIZE * 0.7, BLOCK_SIZE * 0.6, (100, 150, 50)) 
         self.health = 2
@@ -7226,6 +8771,9 @@ class Frog(Mob):
             self.jump_timer = random.randint(30, 90)
 
 class Turtle(Mob):
+    tags = frozenset({"passive", "aquatic"})
+    batch_physics = False  # Swims based on its post-physics position
+    
     def __init__(self, x, y):
         super().__init__(x, y, BLOCK_SIZE * 1.2, BLOCK_SIZE * 0.9, (100, 180, 80))
         self.health = 4
@@ -7273,7 +8821,7 @@ class Turtle(Mob):
         in_water = False
         
         if 0 <= center_y < len(world_map) and 0 <= center_x < len(world_map[0]):
-            if world_map[center_y][center_x] in FLUID_BLOCKS:
+            if BLOCK_FLUID[world_map[center_y][center_x]]:
                 in_water = True
         
         # Random wandering behavior
@@ -7284,6 +8832,9 @@ class Turtle(Mob):
 
 class Monkey(Mob):
     """A passive mob that spawns on vines in jungle biomes, holds bananas."""
+    tags = frozenset({"passive"})
+    batch_physics = False  # Climbs based on its post-physics position
+    
     def __init__(self, x, y):
         super().__init__(x, y, BLOCK_SIZE * 0.8, BLOCK_SIZE * 1.2, (139, 69, 19))
         self.health = 8
@@ -7372,10 +8923,14 @@ class Monkey(Mob):
     def die(self, all_mobs=None):
         """Drops banana when killed."""
         if 'DROPPED_ITEMS' in globals():
-            DROPPED_ITEMS.add(DroppedItem(self.rect.centerx, self.rect.bottom - 10, 138, 1))  # Banana
+            spawn_dropped_item(self.rect.centerx, self.rect.bottom - 10, 138, 1)  # Banana
         self.kill()
 
 class Slime(Mob):
+    tags = frozenset({"hostile"})
+    variant_fields = ("size",)
+    batch_physics = False  # Hops based on the ground state from this frame's physics
+    
     def __init__(self, x, y, size=3): # Size: 1 (Small), 2 (Medium), 3 (Large)
         self.size = size
         width = BLOCK_SIZE * size * 0.5
@@ -7444,7 +8999,7 @@ class Slime(Mob):
                 if drop_count > 0:
                     drop_x = self.rect.centerx
                     drop_y = self.rect.centery
-                    DROPPED_ITEMS.add(DroppedItem(drop_x, drop_y, 130, drop_count))  # 130 = slimeball
+                    spawn_dropped_item(drop_x, drop_y, 130, drop_count)  # 130 = slimeball
         
         # Call the base class die method to remove itself from groups
         super().die(all_mobs)
@@ -7471,6 +9026,8 @@ class Slime(Mob):
 
 class Zombie(Mob):
     """A hostile mob that chases and damages the player."""
+    tags = frozenset({"hostile", "burns_in_sun"})
+    variant_fields = ("biome_type",)
     def __init__(self, x, y, biome_type=0):
         super().__init__(x, y, BLOCK_SIZE, BLOCK_SIZE * 2, (0, 100, 0)) # Green
         self.health = 20
@@ -7494,6 +9051,7 @@ class Zombie(Mob):
         self.image.set_colorkey((0, 0, 0))
         
         # Determine if this is a husk (desert zombie)
+        self.biome_type = biome_type
         is_husk = (biome_type == 1)  # 1 = NETHER_WASTES_BIOME
         self.is_husk = is_husk  # Store as attribute for sunlight immunity
         self.name = "Husk" if is_husk else "Zombie"  # Display name
@@ -7558,7 +9116,7 @@ class Zombie(Mob):
     def die(self, all_mobs=None):
         """Drops rotten flesh when killed."""
         if 'DROPPED_ITEMS' in globals():
-            DROPPED_ITEMS.add(DroppedItem(self.rect.centerx, self.rect.bottom - 10, 13, random.randint(0, 2)))  # Rotten Flesh (ID 13)
+            spawn_dropped_item(self.rect.centerx, self.rect.bottom - 10, 13, random.randint(0, 2))  # Rotten Flesh (ID 13)
         self.kill()
     
     def ai_move(self, player, WORLD_MAP, MOBS=None):
@@ -7609,8 +9167,10 @@ class Zombie(Mob):
         
         # Only chase if it's hostile time (night/evening) OR if this is a husk (always hostile)
         if is_aggressive and distance < effective_aggro_range:
-            # 1. Aggro Mode: Chase player
-            if abs(player_dist_x) > BLOCK_SIZE * 0.1:
+            # 1. Aggro Mode: Chase player (along the flow field when chasing the player)
+            if target is player and self.steer_with_flow_field(self.speed):
+                pass
+            elif abs(player_dist_x) > BLOCK_SIZE * 0.1:
                 if player_dist_x > 0:
                     self.vel_x = self.speed
                 else:
@@ -7635,7 +9195,7 @@ class Zombie(Mob):
             check_row = check_y // BLOCK_SIZE
             
             if (0 <= check_row < GRID_HEIGHT and 0 <= check_col < len(WORLD_MAP[0])):
-                if WORLD_MAP[check_row][check_col] in FLUID_BLOCKS:
+                if BLOCK_FLUID[WORLD_MAP[check_row][check_col]]:
                     self.vel_x = 0  # Stop before entering water
                     if not is_hostile_time:
                         self.direction *= -1  # Turn around when wandering
@@ -7663,7 +9223,7 @@ class Zombie(Mob):
         head_y = int((self.rect.top + 5) // BLOCK_SIZE)  # Check head position
         is_underwater = False
         if 0 <= head_y < GRID_HEIGHT and 0 <= center_x < GRID_WIDTH:
-            is_underwater = WORLD_MAP[head_y][center_x] in FLUID_BLOCKS
+            is_underwater = BLOCK_FLUID[WORLD_MAP[head_y][center_x]]
         
         # Check if near nautilus (instant conversion to drowned)
         near_nautilus = False
@@ -7719,6 +9279,8 @@ class Zombie(Mob):
 
 class Drowned(Mob):
     """An underwater zombie variant that spawns in water, with cyan skin and blue eyes. Can spawn with trident. Can spawn riding and controlling nautili."""
+    tags = frozenset({"hostile", "aquatic"})
+    persistent_fields = Mob.persistent_fields + ("converted_from_zombie",)
     def __init__(self, x, y, mount_nautilus=None):
         super().__init__(x, y, BLOCK_SIZE, BLOCK_SIZE * 2, (0, 140, 140)) # Cyan
         self.health = 20
@@ -7810,7 +9372,8 @@ class Drowned(Mob):
                 
                 # Throw trident if at range, jab if close
                 if distance > BLOCK_SIZE * 3 and distance < self.attack_range:  # Ranged attack
-                    TRIDENTS.add(Trident(
+                    TRIDENTS.add(acquire_projectile(
+                        Trident,
                         self.rect.centerx,
                         self.rect.centery,
                         player.rect.centerx,
@@ -7831,9 +9394,9 @@ class Drowned(Mob):
     def die(self, all_mobs=None):
         """Drops rotten flesh and trident if holding one."""
         if 'DROPPED_ITEMS' in globals():
-            DROPPED_ITEMS.add(DroppedItem(self.rect.centerx, self.rect.bottom - 10, 13, random.randint(0, 2)))  # Rotten Flesh
+            spawn_dropped_item(self.rect.centerx, self.rect.bottom - 10, 13, random.randint(0, 2))  # Rotten Flesh
             if self.has_trident:
-                DROPPED_ITEMS.add(DroppedItem(self.rect.centerx, self.rect.bottom - 10, 134, 1))  # Trident (ID 134)
+                spawn_dropped_item(self.rect.centerx, self.rect.bottom - 10, 134, 1)  # Trident (ID 134)
         self.kill()
     
     def ai_move(self, player, WORLD_MAP):
@@ -7859,7 +9422,7 @@ class Drowned(Mob):
         center_y = int(self.rect.centery // BLOCK_SIZE)
         in_water = False
         if 0 <= center_y < GRID_HEIGHT and 0 <= center_x < GRID_WIDTH:
-            in_water = WORLD_MAP[center_y][center_x] in FLUID_BLOCKS
+            in_water = BLOCK_FLUID[WORLD_MAP[center_y][center_x]]
         
         # Use swim speed in water, normal speed on land
         current_speed = self.swim_speed if in_water else self.speed
@@ -7875,8 +9438,12 @@ class Drowned(Mob):
             effective_aggro_range = self.aggro_range * 0.5
         
         # Drowned are always hostile - chase player all the time
+        on_path = False
         if distance < effective_aggro_range:
-            if abs(player_dist_x) > BLOCK_SIZE * 0.1:
+            on_path = self.steer_with_flow_field(current_speed)
+            if on_path:
+                pass
+            elif abs(player_dist_x) > BLOCK_SIZE * 0.1:
                 if player_dist_x > 0:
                     self.vel_x = current_speed
                 else:
@@ -7890,8 +9457,8 @@ class Drowned(Mob):
                 self.direction = random.choice([-1, 1])
                 self.vel_x = self.direction * (current_speed * 0.5)
         
-        # Cliff avoidance (only on land, not in water)
-        if self.vel_x != 0 and not in_water and self.is_on_ground:
+        # Cliff avoidance (only on land, not in water, and not while following the flow field)
+        if self.vel_x != 0 and not in_water and not on_path and self.is_on_ground:
             direction = 1 if self.vel_x > 0 else -1
             check_x = self.rect.centerx + direction * BLOCK_SIZE
             check_y = self.rect.bottom + 1
@@ -7913,6 +9480,7 @@ class Drowned(Mob):
 
 class Spider(Mob):
     """A hostile mob that is wide, short, and pounces."""
+    tags = frozenset({"hostile"})
     def __init__(self, x, y):
         # The correct super() call from earlier steps
         super().__init__(x, y, BLOCK_SIZE * 2, BLOCK_SIZE, (40, 40, 40)) # Dark Gray
@@ -8027,8 +9595,10 @@ class Spider(Mob):
         
         # Only chase if aggressive (night/evening or provoked)
         if is_aggressive and distance < effective_aggro_range:
-            # 1. Aggro Mode: Chase
-            if player_dist_x > 0:
+            # 1. Aggro Mode: Chase (along the flow field when possible)
+            if self.steer_with_flow_field(self.speed):
+                pass
+            elif player_dist_x > 0:
                 self.vel_x = self.speed
             else:
                 self.vel_x = -self.speed
@@ -8080,11 +9650,12 @@ class Spider(Mob):
     def die(self, all_mobs=None):
         """Drops string when killed."""
         if 'DROPPED_ITEMS' in globals():
-            DROPPED_ITEMS.add(DroppedItem(self.rect.centerx, self.rect.bottom - 10, 52, random.randint(0, 2)))  # String (ID 52)
+            spawn_dropped_item(self.rect.centerx, self.rect.bottom - 10, 52, random.randint(0, 2))  # String (ID 52)
         self.kill()
 
 class CaveSpider(Mob):
     """A smaller, poisonous spider variant found in caves."""
+    tags = frozenset({"hostile"})
     def __init__(self, x, y):
         super().__init__(x, y, BLOCK_SIZE * 1.2, BLOCK_SIZE * 0.8, (50, 30, 80))  # Smaller, dark purple/blue
         
@@ -8219,11 +9790,12 @@ class CaveSpider(Mob):
     def die(self, all_mobs=None):
         """Drops string when killed."""
         if 'DROPPED_ITEMS' in globals():
-            DROPPED_ITEMS.add(DroppedItem(self.rect.centerx, self.rect.bottom - 10, 52, random.randint(0, 2)))  # String (ID 52)
+            spawn_dropped_item(self.rect.centerx, self.rect.bottom - 10, 52, random.randint(0, 2))  # String (ID 52)
         self.kill()
 
 class Parched(Mob):
     """A desert skeleton variant with gray bones and yellow bandage wrappings."""
+    tags = frozenset({"hostile", "burns_in_sun"})
     def __init__(self, x, y):
         super().__init__(x, y, BLOCK_SIZE, BLOCK_SIZE * 2.5, (160, 160, 160))  # Gray bones
         
@@ -8306,7 +9878,8 @@ class Parched(Mob):
     def attack(self, target, arrows_group):
         """Shoots arrows like a skeleton."""
         if self.attack_timer <= 0:
-            arrow = Arrow(
+            arrow = acquire_projectile(
+                Arrow,
                 self.rect.centerx,
                 self.rect.centery,
                 target.rect.centerx,
@@ -8358,11 +9931,12 @@ class Parched(Mob):
     
     def die(self, all_mobs=None):
         if 'DROPPED_ITEMS' in globals():
-            DROPPED_ITEMS.add(DroppedItem(self.rect.centerx, self.rect.bottom - 10, 146, random.randint(0, 2)))  # Feather
+            spawn_dropped_item(self.rect.centerx, self.rect.bottom - 10, 146, random.randint(0, 2))  # Feather
         self.kill()
 
 class ZombieCamel(Mob):
     """A hostile brown zombie camel that attacks players."""
+    tags = frozenset({"hostile", "burns_in_sun"})
     def __init__(self, x, y):
         # Large camel size
         super().__init__(x, y, BLOCK_SIZE * 2, BLOCK_SIZE * 2, (140, 100, 60))
@@ -8453,7 +10027,7 @@ class ZombieCamel(Mob):
     def die(self, all_mobs=None):
         """Drops rotten flesh."""
         if 'DROPPED_ITEMS' in globals():
-            DROPPED_ITEMS.add(DroppedItem(self.rect.centerx, self.rect.bottom - 10, 13, random.randint(0, 2)))  # Rotten flesh
+            spawn_dropped_item(self.rect.centerx, self.rect.bottom - 10, 13, random.randint(0, 2))  # Rotten flesh
         self.kill()
     
     def ai_move(self, player, WORLD_MAP):
@@ -8489,6 +10063,7 @@ class ZombieCamel(Mob):
 
 class Creeper(Mob):
     """A hostile mob that chases the player and explodes."""
+    tags = frozenset({"hostile"})
     def __init__(self, x, y):
         # Use a very dark gray/black base color for max contrast
         CREEPER_COLOR = (10, 10, 10)
@@ -8614,6 +10189,7 @@ class Creeper(Mob):
         center_col = self.rect.centerx // BLOCK_SIZE
         center_row = self.rect.centery // BLOCK_SIZE
         radius_blocks = int(self.explosion_radius // BLOCK_SIZE)
+        destroyed_blocks = []
         
         for r in range(center_row - radius_blocks, center_row + radius_blocks + 1):
             for c in range(center_col - radius_blocks, center_col + radius_blocks + 1):
@@ -8627,8 +10203,11 @@ class Creeper(Mob):
                         # Drop the block as an item (except water blocks)
                         block_id = WORLD_MAP[r][c]
                         if 'DROPPED_ITEMS' in globals() and block_id not in ALL_WATER_BLOCKS:
-                            DROPPED_ITEMS.add(DroppedItem(c * BLOCK_SIZE, r * BLOCK_SIZE, block_id, 1))
-                        WORLD_MAP[r][c] = 0 # Set to Air        
+                            spawn_dropped_item(c * BLOCK_SIZE, r * BLOCK_SIZE, block_id, 1)
+                        destroyed_blocks.append((r, c, 0)) # Set to Air
+        
+        # Apply the whole explosion as one batch (one change event per section)
+        set_blocks(destroyed_blocks)
     
     def update(self, WORLD_MAP, player, MOBS): # <--- CORRECTED SIGNATURE
         # Ignore creative mode players
@@ -8677,26 +10256,155 @@ class Creeper(Mob):
     def die(self, all_mobs=None):
         """Drops gunpowder when killed."""
         if 'DROPPED_ITEMS' in globals():
-            DROPPED_ITEMS.add(DroppedItem(self.rect.centerx, self.rect.bottom - 10, 56, random.randint(0, 2)))  # Gunpowder (ID 56)
+            spawn_dropped_item(self.rect.centerx, self.rect.bottom - 10, 56, random.randint(0, 2))  # Gunpowder (ID 56)
         self.kill()
 
 # --- Arrow Projectile Class ---
-class Arrow(pygame.sprite.Sprite):
-    """Arrow projectile shot by skeletons with gravity and collision."""
-    def __init__(self, x, y, target_x, target_y, damage=3, is_from_stray=False, shooter=None):
+# --- Mob Spatial Index ---
+class SpatialHash:
+    """Uniform grid of sprites keyed by cell, rebuilt each frame for broad-phase collision queries."""
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self.cells = {}
+    
+    def rebuild(self, sprites):
+        """Re-buckets every sprite by its current rect."""
+        self.cells = {}
+        for sprite in sprites:
+            self.insert(sprite)
+    
+    def insert(self, sprite):
+        """Adds a sprite to every cell its rect overlaps."""
+        cell_size = self.cell_size
+        rect = sprite.rect
+        for cell_x in range(rect.left // cell_size, rect.right // cell_size + 1):
+            for cell_y in range(rect.top // cell_size, rect.bottom // cell_size + 1):
+                bucket = self.cells.get((cell_x, cell_y))
+                if bucket is None:
+                    self.cells[(cell_x, cell_y)] = [sprite]
+                else:
+                    bucket.append(sprite)
+    
+    def query_rect(self, rect):
+        """Returns the live sprites in cells overlapping rect (candidates, not exact hits)."""
+        cell_size = self.cell_size
+        found = []
+        seen = set()
+        for cell_x in range(rect.left // cell_size, rect.right // cell_size + 1):
+            for cell_y in range(rect.top // cell_size, rect.bottom // cell_size + 1):
+                for sprite in self.cells.get((cell_x, cell_y), ()):
+                    if sprite not in seen:
+                        seen.add(sprite)
+                        if sprite.alive():
+                            found.append(sprite)
+        return found
+    
+    def query_radius(self, x, y, radius):
+        """Returns the live sprites in cells overlapping the square around (x, y)."""
+        return self.query_rect(pygame.Rect(x - radius, y - radius, radius * 2, radius * 2))
+
+MOB_SPATIAL_INDEX = SpatialHash(BLOCK_SIZE * 4)
+
+# --- Projectile Pool ---
+PROJECTILE_POOLS = {}  # projectile class -> killed instances waiting to be reused
+PROJECTILE_POOL_SIZE = 64  # Per projectile class
+PROJECTILE_IMAGES = {}  # image key -> shared surface
+
+def get_projectile_image(key, builder):
+    """Returns the shared projectile surface for key, building it once with builder()."""
+    image = PROJECTILE_IMAGES.get(key)
+    if image is None:
+        image = builder()
+        PROJECTILE_IMAGES[key] = image
+    return image
+
+def acquire_projectile(projectile_class, *args, **kwargs):
+    """Returns a projectile of projectile_class, reusing a pooled one (reset with args) when available."""
+    pool = PROJECTILE_POOLS.get(projectile_class)
+    if pool:
+        projectile = pool.pop()
+        projectile.reset(*args, **kwargs)
+        return projectile
+    return projectile_class(*args, **kwargs)
+
+class PooledProjectile(pygame.sprite.Sprite):
+    """Base class for projectiles: __init__ defers to reset() and kill() returns the sprite to its pool."""
+    def __init__(self, *args, **kwargs):
         super().__init__()
+        self.reset(*args, **kwargs)
+    
+    def reset(self, *args, **kwargs):
+        """(Re)initializes the projectile. Subclasses set image, rect and velocity here."""
+        self.pooled = False
+    
+    def kill(self):
+        """Removes the projectile from all groups and returns it to the pool."""
+        super().kill()
+        pool = PROJECTILE_POOLS.setdefault(type(self), [])
+        if not self.pooled and len(pool) < PROJECTILE_POOL_SIZE:
+            self.pooled = True
+            pool.append(self)
+
+def build_arrow_image():
+    """Draws the shared arrow surface."""
+    # Make arrow larger and more visible
+    image = pygame.Surface([16, 6])
+    image.fill((0, 0, 0, 0))  # Transparent background
+    image.set_colorkey((0, 0, 0))
+    # Draw arrow shaft (brown)
+    pygame.draw.rect(image, (139, 69, 19), (4, 2, 12, 2))
+    # Draw arrow tip (gray/silver)
+    pygame.draw.polygon(image, (180, 180, 180), [(14, 1), (16, 3), (14, 5)])
+    # Draw fletching (white/gray)
+    pygame.draw.rect(image, (200, 200, 200), (4, 1, 2, 1))
+    pygame.draw.rect(image, (200, 200, 200), (4, 4, 2, 1))
+    return image
+
+def build_splash_potion_image(potion_color):
+    """Draws a splash potion surface in the potion's color."""
+    image = pygame.Surface([12, 12])
+    image.fill(potion_color)
+    return image
+
+def build_trident_image():
+    """Draws the shared trident surface."""
+    image = pygame.Surface([6, 20])
+    image.fill((0, 180, 200))  # Cyan trident
+    return image
+
+def build_ender_pearl_image():
+    """Loads the shared ender pearl surface."""
+    # Try to load ender pearl texture
+    try:
+        image = pygame.image.load(r"..\Textures\ender_pearl.png")
+        return pygame.transform.scale(image, (12, 12))
+    except:
+        # Fallback to purple circle if texture not found
+        image = pygame.Surface([12, 12])
+        image.fill((0, 0, 0, 0))
+        image.set_colorkey((0, 0, 0))
+        pygame.draw.circle(image, (128, 0, 128), (6, 6), 6)
+        return image
+
+def build_eye_of_ender_image():
+    """Loads the shared eye of ender surface."""
+    # Try to load eye of ender texture
+    try:
+        image = pygame.image.load(r"..\Textures\ender_eye.png")
+        return pygame.transform.scale(image, (16, 16))
+    except:
+        # Fallback to drawn eye if texture not found
+        image = pygame.Surface([12, 12])
+        image.fill((0, 255, 100))  # Green eye
+        pygame.draw.circle(image, (50, 50, 50), (6, 6), 4)  # Pupil
+        return image
+
+class Arrow(PooledProjectile):
+    """Arrow projectile shot by skeletons with gravity and collision."""
+    def reset(self, x, y, target_x, target_y, damage=3, is_from_stray=False, shooter=None):
+        super().reset()
         self.shooter = shooter  # Track who shot this arrow to prevent self-damage
-        # Make arrow larger and more visible
-        self.image = pygame.Surface([16, 6])
-        self.image.fill((0, 0, 0, 0))  # Transparent background
-        self.image.set_colorkey((0, 0, 0))
-        # Draw arrow shaft (brown)
-        pygame.draw.rect(self.image, (139, 69, 19), (4, 2, 12, 2))
-        # Draw arrow tip (gray/silver)
-        pygame.draw.polygon(self.image, (180, 180, 180), [(14, 1), (16, 3), (14, 5)])
-        # Draw fletching (white/gray)
-        pygame.draw.rect(self.image, (200, 200, 200), (4, 1, 2, 1))
-        pygame.draw.rect(self.image, (200, 200, 200), (4, 4, 2, 1))
+        self.image = get_projectile_image("arrow", build_arrow_image)
         self.rect = self.image.get_rect(center=(x, y))
         
         self.damage = damage
@@ -8735,9 +10443,9 @@ class Arrow(pygame.sprite.Sprite):
             self.kill()
             return
         
-        # Check collision with mobs
+        # Check collision with mobs (candidates from the spatial index)
         if all_mobs:
-            for mob in all_mobs:
+            for mob in MOB_SPATIAL_INDEX.query_rect(self.rect):
                 # Skip collision with the skeleton that shot this arrow
                 if mob == self.shooter:
                     continue
@@ -8752,7 +10460,7 @@ class Arrow(pygame.sprite.Sprite):
         
         if 0 <= center_row < GRID_HEIGHT and 0 <= center_col < GRID_WIDTH:
             block_id = WORLD_MAP[center_row][center_col]
-            if block_id != 0 and BLOCK_TYPES.get(block_id, {}).get("solid", False):
+            if BLOCK_SOLID[block_id]:
                 self.kill()
                 return
         
@@ -8761,13 +10469,12 @@ class Arrow(pygame.sprite.Sprite):
             self.rect.y < 0 or self.rect.y > GRID_HEIGHT * BLOCK_SIZE):
             self.kill()
 
-class SplashPotion(pygame.sprite.Sprite):
+class SplashPotion(PooledProjectile):
     """Splash potion projectile thrown by player or witch."""
-    def __init__(self, x, y, direction, potion_id):
-        super().__init__()
+    def reset(self, x, y, direction, potion_id):
+        super().reset()
         potion_color = BLOCK_TYPES[potion_id].get("color", (255, 100, 100))
-        self.image = pygame.Surface([12, 12])
-        self.image.fill(potion_color)
+        self.image = get_projectile_image(("splash_potion", potion_color), lambda: build_splash_potion_image(potion_color))
         self.rect = self.image.get_rect(center=(x, y))
         
         self.potion_id = potion_id
@@ -8792,12 +10499,12 @@ class SplashPotion(pygame.sprite.Sprite):
         hit_block = False
         if 0 <= center_row < GRID_HEIGHT and 0 <= center_col < GRID_WIDTH:
             block_id = WORLD_MAP[center_row][center_col]
-            if block_id != 0 and BLOCK_TYPES.get(block_id, {}).get("solid", False):
+            if BLOCK_SOLID[block_id]:
                 hit_block = True
         
         # Check collision with mobs
         hit_mob = False
-        for mob in all_mobs:
+        for mob in MOB_SPATIAL_INDEX.query_rect(self.rect):
             if self.rect.colliderect(mob.rect):
                 hit_mob = True
                 break
@@ -8832,7 +10539,7 @@ class SplashPotion(pygame.sprite.Sprite):
                 print(f"💥 Splash poisoned player {damage_amount} damage!")
         
         # Check mobs in radius
-        for mob in all_mobs:
+        for mob in MOB_SPATIAL_INDEX.query_radius(self.rect.centerx, self.rect.centery, self.splash_radius):
             mob_distance = math.sqrt(
                 (self.rect.centerx - mob.rect.centerx) ** 2 +
                 (self.rect.centery - mob.rect.centery) ** 2
@@ -8843,12 +10550,11 @@ class SplashPotion(pygame.sprite.Sprite):
                 elif damage_amount > 0:
                     mob.take_damage(damage_amount, all_mobs)
 
-class Trident(pygame.sprite.Sprite):
+class Trident(PooledProjectile):
     """Trident projectile thrown by drowned or player."""
-    def __init__(self, x, y, target_x, target_y, damage=17, thrown_by_player=False):
-        super().__init__()
-        self.image = pygame.Surface([6, 20])
-        self.image.fill((0, 180, 200))  # Cyan trident
+    def reset(self, x, y, target_x, target_y, damage=17, thrown_by_player=False):
+        super().reset()
+        self.image = get_projectile_image("trident", build_trident_image)
         self.rect = self.image.get_rect(center=(x, y))
         
         self.damage = damage
@@ -8883,20 +10589,20 @@ class Trident(pygame.sprite.Sprite):
             print(f"🔱 Trident hit player for {self.damage} damage!")
             # Drop trident as item when hitting player
             if 'DROPPED_ITEMS' in globals():
-                DROPPED_ITEMS.add(DroppedItem(self.rect.x, self.rect.y, 107, 1))
+                spawn_dropped_item(self.rect.x, self.rect.y, 107, 1)
             self.kill()
             return
         
-        # Check collision with mobs
+        # Check collision with mobs (candidates from the spatial index)
         if all_mobs:
-            for mob in all_mobs:
+            for mob in MOB_SPATIAL_INDEX.query_rect(self.rect):
                 # Player tridents hit all mobs, Drowned tridents only hit non-Drowned mobs
                 if self.rect.colliderect(mob.rect):
                     if self.thrown_by_player or not isinstance(mob, Drowned):
                         mob.take_damage(self.damage, all_mobs)
                         # Drop trident as item when hitting mob
                         if self.thrown_by_player and 'DROPPED_ITEMS' in globals():
-                            DROPPED_ITEMS.add(DroppedItem(self.rect.x, self.rect.y, 107, 1))
+                            spawn_dropped_item(self.rect.x, self.rect.y, 107, 1)
                         self.kill()
                         return
         
@@ -8906,10 +10612,10 @@ class Trident(pygame.sprite.Sprite):
         
         if 0 <= center_row < GRID_HEIGHT and 0 <= center_col < GRID_WIDTH:
             block_id = WORLD_MAP[center_row][center_col]
-            if block_id != 0 and BLOCK_TYPES.get(block_id, {}).get("solid", False):
+            if BLOCK_SOLID[block_id]:
                 # Drop trident as item when hitting block
                 if self.thrown_by_player and 'DROPPED_ITEMS' in globals():
-                    DROPPED_ITEMS.add(DroppedItem(self.rect.x, self.rect.y, 107, 1))
+                    spawn_dropped_item(self.rect.x, self.rect.y, 107, 1)
                 self.kill()
                 return
         
@@ -8918,28 +10624,18 @@ class Trident(pygame.sprite.Sprite):
             self.rect.y < 0 or self.rect.y > GRID_HEIGHT * BLOCK_SIZE):
             self.kill()
 
-class EnderPearl(pygame.sprite.Sprite):
+class EnderPearl(PooledProjectile):
     """Ender Pearl projectile that teleports the player on impact."""
-    def __init__(self, x, y, vel_x, vel_y, owner):
-        super().__init__()
-        # Try to load ender pearl texture
-        try:
-            self.image = pygame.image.load(r"..\Textures\ender_pearl.png")
-            self.image = pygame.transform.scale(self.image, (12, 12))
-        except:
-            # Fallback to purple circle if texture not found
-            self.image = pygame.Surface([12, 12])
-            self.image.fill((0, 0, 0, 0))
-            self.image.set_colorkey((0, 0, 0))
-            pygame.draw.circle(self.image, (128, 0, 128), (6, 6), 6)
-        
+    def reset(self, x, y, vel_x, vel_y, owner):
+        super().reset()
+        self.image = get_projectile_image("ender_pearl", build_ender_pearl_image)
         self.rect = self.image.get_rect(center=(x, y))
         self.vel_x = vel_x
         self.vel_y = vel_y
         self.owner = owner
         self.gravity = 0.3
     
-    def update(self):
+    def update(self, WORLD_MAP=None, player=None, all_mobs=None):
         """Update ender pearl position and check for collisions."""
         self.vel_y += self.gravity
         self.rect.x += self.vel_x
@@ -8951,7 +10647,7 @@ class EnderPearl(pygame.sprite.Sprite):
         if 0 <= row < GRID_HEIGHT and 0 <= col < GRID_WIDTH:
             block_id = WORLD_MAP[row][col]
             # Check if hit a solid block
-            if block_id != 0 and BLOCK_TYPES.get(block_id, {}).get("solid", False):
+            if BLOCK_SOLID[block_id]:
                 # Find safe landing spot (2 blocks of air space above ground)
                 safe_row = row
                 # Move up to find air blocks for player to stand in
@@ -8985,6 +10681,8 @@ class EnderPearl(pygame.sprite.Sprite):
 
 class Skeleton(Mob):
     """A hostile mob that shoots arrows at the player from a distance."""
+    tags = frozenset({"hostile", "burns_in_sun"})
+    variant_fields = ("is_stray",)
     def __init__(self, x, y, is_stray=False):
         # Bone white color, 1 block wide, 2 blocks high (same as Zombie/Player)
         super().__init__(x, y, BLOCK_SIZE, BLOCK_SIZE * 2, (200, 200, 200)) 
@@ -9091,7 +10789,8 @@ class Skeleton(Mob):
         """Shoots an actual arrow projectile."""
         if self.attack_timer <= 0:
             # Create and fire arrow
-            arrow = Arrow(
+            arrow = acquire_projectile(
+                Arrow,
                 self.rect.centerx, 
                 self.rect.centery,
                 target.rect.centerx,
@@ -9121,6 +10820,7 @@ class Skeleton(Mob):
         distance = math.sqrt(player_dist_x**2 + player_dist_y**2)
         
         self.vel_x = 0
+        on_path = False
         
         # Reduce aggro range if player is crouching
         effective_aggro_range = self.aggro_range
@@ -9135,9 +10835,12 @@ class Skeleton(Mob):
                 self.vel_x = 0
                 self.attack(player, arrows_group) # Attempt to attack every frame (cooldown controls rate)
             
-            # 2. Chase Mode: If outside shooting range, chase.
+            # 2. Chase Mode: If outside shooting range, chase (along the flow field when possible).
             else: 
-                if player_dist_x > 0:
+                on_path = self.steer_with_flow_field(self.speed)
+                if on_path:
+                    pass
+                elif player_dist_x > 0:
                     self.vel_x = self.speed
                 else:
                     self.vel_x = -self.speed
@@ -9152,11 +10855,11 @@ class Skeleton(Mob):
             check_row = check_y // BLOCK_SIZE
             
             if (0 <= check_row < GRID_HEIGHT and 0 <= check_col < len(WORLD_MAP[0])):
-                if WORLD_MAP[check_row][check_col] in FLUID_BLOCKS:
+                if BLOCK_FLUID[WORLD_MAP[check_row][check_col]]:
                     self.vel_x = 0  # Stop before entering water
         
-        # Apply standard wall/cliff avoidance logic
-        if self.vel_x != 0 and self.is_on_ground:
+        # Apply standard wall/cliff avoidance logic (the flow field already plans safe drops)
+        if self.vel_x != 0 and not on_path and self.is_on_ground:
             direction = 1 if self.vel_x > 0 else -1
             check_x = self.rect.centerx + direction * BLOCK_SIZE
             check_y = self.rect.bottom + 1
@@ -9181,15 +10884,17 @@ class Skeleton(Mob):
         """Drops arrows, bones, and rarely a bow."""
         if 'DROPPED_ITEMS' in globals():
             # Always drop arrows and bones
-            DROPPED_ITEMS.add(DroppedItem(self.rect.centerx - 5, self.rect.bottom - 10, 53, random.randint(0, 2)))  # Arrows (ID 53)
-            DROPPED_ITEMS.add(DroppedItem(self.rect.centerx + 5, self.rect.bottom - 10, 54, random.randint(0, 2)))  # Bones (ID 54)
+            spawn_dropped_item(self.rect.centerx - 5, self.rect.bottom - 10, 53, random.randint(0, 2))  # Arrows (ID 53)
+            spawn_dropped_item(self.rect.centerx + 5, self.rect.bottom - 10, 54, random.randint(0, 2))  # Bones (ID 54)
             # Rare bow drop (2.5% chance)
             if random.random() < 0.025:
-                DROPPED_ITEMS.add(DroppedItem(self.rect.centerx, self.rect.bottom - 10, 55, 1))  # Bow (ID 55)
+                spawn_dropped_item(self.rect.centerx, self.rect.bottom - 10, 55, 1)  # Bow (ID 55)
         self.kill()
 
 class Narwhal(Mob):
     """A peaceful aquatic mob that swims in water."""
+    tags = frozenset({"passive", "aquatic"})
+    ai_lod = False  # update() switches to swimming physics based on ai_move's result
     def __init__(self, x, y):
         # White/light gray color, long and thin
         super().__init__(x, y, BLOCK_SIZE * 1.5, BLOCK_SIZE * 0.5, (230, 230, 255)) 
@@ -9360,12 +11065,13 @@ class Narwhal(Mob):
     def die(self, all_mobs=None):
         """Drops narwhal horn when killed."""
         if 'DROPPED_ITEMS' in globals():
-            DROPPED_ITEMS.add(DroppedItem(self.rect.centerx, self.rect.bottom - 10, 58, 1))  # Narwhal Horn (ID 58)
+            spawn_dropped_item(self.rect.centerx, self.rect.bottom - 10, 58, 1)  # Narwhal Horn (ID 58)
         self.kill()
 
 # --- Mob Classes (Add this after Player, or near the other Mobs) ---
 class Deer(Mob):
     """A peaceful forest mob that wanders and drops leather."""
+    tags = frozenset({"passive"})
     def __init__(self, x, y):
         super().__init__(x, y, BLOCK_SIZE * 2, BLOCK_SIZE * 1.3, (139, 90, 43))
         self.health = 10
@@ -9477,11 +11183,12 @@ class Deer(Mob):
     def die(self, all_mobs=None):
         """Drops deer horn when killed."""
         if 'DROPPED_ITEMS' in globals():
-            DROPPED_ITEMS.add(DroppedItem(self.rect.centerx, self.rect.bottom - 10, 57, 1))  # Deer Horn (ID 57)
+            spawn_dropped_item(self.rect.centerx, self.rect.bottom - 10, 57, 1)  # Deer Horn (ID 57)
         self.kill()
 
 class Panda(Mob):
     """A peaceful jungle mob that sits and eats bamboo."""
+    tags = frozenset({"passive"})
     def __init__(self, x, y):
         super().__init__(x, y, BLOCK_SIZE * 1.5, BLOCK_SIZE * 1.5, (255, 255, 255))
         self.health = 20
@@ -9554,6 +11261,8 @@ class Panda(Mob):
 
 class Bear(Mob):
     """A neutral forest mob that only attacks when provoked."""
+    tags = frozenset({"hostile"})
+    variant_fields = ("is_polar",)
     def __init__(self, x, y, is_polar=False):
         # Bears are large (2x2 blocks)
         super().__init__(x, y, BLOCK_SIZE * 2, BLOCK_SIZE * 2, (101, 67, 33))
@@ -9704,11 +11413,12 @@ class Bear(Mob):
     def die(self, all_mobs=None):
         """Drops leather when killed."""
         if 'DROPPED_ITEMS' in globals():
-            DROPPED_ITEMS.add(DroppedItem(self.rect.centerx, self.rect.bottom - 10, 14, random.randint(0, 2)))  # Leather
+            spawn_dropped_item(self.rect.centerx, self.rect.bottom - 10, 14, random.randint(0, 2))  # Leather
         self.kill()
 
 class Lion(Mob):
     """A neutral savannah mob that charges when provoked or player gets too close."""
+    tags = frozenset({"passive"})
     def __init__(self, x, y):
         super().__init__(x, y, BLOCK_SIZE * 1.6, BLOCK_SIZE * 1.4, (210, 180, 140))
         self.health = 40
@@ -9878,6 +11588,7 @@ class Lion(Mob):
 
 class Rhino(Mob):
     """A neutral savannah mob that charges when provoked."""
+    tags = frozenset({"passive"})
     def __init__(self, x, y):
         super().__init__(x, y, BLOCK_SIZE * 2, BLOCK_SIZE * 1.6, (120, 120, 120))
         self.health = 40
@@ -10035,6 +11746,7 @@ class Rhino(Mob):
 
 class Ostrich(Mob):
     """A rideable savannah mob, similar to horse/camel."""
+    tags = frozenset({"passive"})
     def __init__(self, x, y):
         super().__init__(x, y, BLOCK_SIZE * 1.4, BLOCK_SIZE * 2.2, (220, 200, 180))
         self.health = 18
@@ -10151,6 +11863,7 @@ class Ostrich(Mob):
 
 class Elephant(Mob):
     """A massive passive savannah mob, 7 blocks wide and tall."""
+    tags = frozenset({"passive"})
     def __init__(self, x, y):
         super().__init__(x, y, BLOCK_SIZE * 7, BLOCK_SIZE * 7, (160, 160, 160))
         self.health = 100  # Very tanky
@@ -10257,10 +11970,13 @@ class Elephant(Mob):
     def die(self, all_mobs=None):
         """Drops lots of leather when killed."""
         if 'DROPPED_ITEMS' in globals():
-            DROPPED_ITEMS.add(DroppedItem(self.rect.centerx, self.rect.bottom - 10, 14, random.randint(4, 8)))  # Lots of leather
+            spawn_dropped_item(self.rect.centerx, self.rect.bottom - 10, 14, random.randint(4, 8))  # Lots of leather
         self.kill()
 
 class Villager(pygame.sprite.Sprite):
+    tags = frozenset({"passive"})
+    variant_fields = ("villager_type",)
+    persistent_fields = ("health", "max_health", "has_trade", "trade_cooldown")
     def __init__(self, x, y, villager_type="farmer"):
         super().__init__()
         # Villagers are slightly taller than the player (1.5 blocks)
@@ -10421,13 +12137,7 @@ class Villager(pygame.sprite.Sprite):
             # Trade 2: 1 Emerald → 3 Carrots (ID 94)
             WHEAT_ID = 93
             CARROT_ID = 94
-            emerald_count = 0
-            for item_id, count in player.hotbar_slots:
-                if item_id == EMERALD_ID:
-                    emerald_count += count
-            for item_id, count in player.inventory:
-                if item_id == EMERALD_ID:
-                    emerald_count += count
+            emerald_count = player.items.count(EMERALD_ID)
             
             if emerald_count >= 1:
                 # Consume 1 emerald
@@ -10451,13 +12161,7 @@ class Villager(pygame.sprite.Sprite):
             # Trade 2: 1 Emerald → 1 Glass (ID 86)
             BOOK_ID = 97
             GLASS_ID = 86
-            emerald_count = 0
-            for item_id, count in player.hotbar_slots:
-                if item_id == EMERALD_ID:
-                    emerald_count += count
-            for item_id, count in player.inventory:
-                if item_id == EMERALD_ID:
-                    emerald_count += count
+            emerald_count = player.items.count(EMERALD_ID)
             
             if emerald_count >= 1:
                 # Consume 1 emerald
@@ -10485,19 +12189,8 @@ class Villager(pygame.sprite.Sprite):
             PORK_ID = 82
             
             # Count player's items
-            emerald_count = 0
-            meat_counts = {BEEF_ID: 0, MUTTON_ID: 0, CHICKEN_ID: 0, PORK_ID: 0}
-            
-            for item_id, count in player.hotbar_slots:
-                if item_id == EMERALD_ID:
-                    emerald_count += count
-                elif item_id in meat_counts:
-                    meat_counts[item_id] += count
-            for item_id, count in player.inventory:
-                if item_id == EMERALD_ID:
-                    emerald_count += count
-                elif item_id in meat_counts:
-                    meat_counts[item_id] += count
+            emerald_count = player.items.count(EMERALD_ID)
+            meat_counts = {meat_id: player.items.count(meat_id) for meat_id in (BEEF_ID, MUTTON_ID, CHICKEN_ID, PORK_ID)}
             
             total_meat = sum(meat_counts.values())
             
@@ -10528,60 +12221,17 @@ class Villager(pygame.sprite.Sprite):
         
 
     def collide_x(self):
-        """Handle horizontal collisions with blocks"""
-        global WORLD_MAP
-        
-        # Calculate which grid cells the villager overlaps
-        left_col = self.rect.left // BLOCK_SIZE
-        right_col = self.rect.right // BLOCK_SIZE
-        top_row = self.rect.top // BLOCK_SIZE
-        bottom_row = self.rect.bottom // BLOCK_SIZE
-        
-        # Check collisions with solid blocks
-        for row in range(max(0, top_row), min(GRID_HEIGHT, bottom_row + 1)):
-            for col in range(max(0, left_col), min(GRID_WIDTH, right_col + 1)):
-                block_id = WORLD_MAP[row][col]
-                # Check if block is solid (not air or water)
-                if block_id not in [AIR_ID, WATER_ID]:
-                    block_rect = pygame.Rect(col * BLOCK_SIZE, row * BLOCK_SIZE, BLOCK_SIZE, BLOCK_SIZE)
-                    if self.rect.colliderect(block_rect):
-                        # Push villager out of the block
-                        if self.vel_x > 0:  # Moving right
-                            self.rect.right = block_rect.left
-                        elif self.vel_x < 0:  # Moving left
-                            self.rect.left = block_rect.right
-                        self.vel_x = 0
-                        return
+        """Moves the villager by vel_x, stopping at solid blocks."""
+        if sweep_x(WORLD_MAP, self.rect, self.vel_x) is not None:
+            self.vel_x = 0
         
     def collide_y(self):
-        """Handle vertical collisions with blocks"""
-        global WORLD_MAP
-        
-        # Calculate which grid cells the villager overlaps
-        left_col = self.rect.left // BLOCK_SIZE
-        right_col = self.rect.right // BLOCK_SIZE
-        top_row = self.rect.top // BLOCK_SIZE
-        bottom_row = self.rect.bottom // BLOCK_SIZE
-        
-        self.on_ground = False
-        
-        # Check collisions with solid blocks
-        for row in range(max(0, top_row), min(GRID_HEIGHT, bottom_row + 1)):
-            for col in range(max(0, left_col), min(GRID_WIDTH, right_col + 1)):
-                block_id = WORLD_MAP[row][col]
-                # Check if block is solid (not air or water)
-                if block_id not in [AIR_ID, WATER_ID]:
-                    block_rect = pygame.Rect(col * BLOCK_SIZE, row * BLOCK_SIZE, BLOCK_SIZE, BLOCK_SIZE)
-                    if self.rect.colliderect(block_rect):
-                        # Push villager out of the block
-                        if self.vel_y > 0:  # Falling
-                            self.rect.bottom = block_rect.top
-                            self.vel_y = 0
-                            self.on_ground = True
-                        elif self.vel_y < 0:  # Jumping/moving up
-                            self.rect.top = block_rect.bottom
-                            self.vel_y = 0
-                        return
+        """Moves the villager by vel_y, landing on or bumping into solid blocks."""
+        is_falling = self.vel_y > 0
+        hit = sweep_y(WORLD_MAP, self.rect, self.vel_y) is not None
+        self.on_ground = hit and is_falling
+        if hit:
+            self.vel_y = 0
 
     def update(self, WORLD_MAP, player, MOBS):
         # Update trade cooldown
@@ -10609,27 +12259,28 @@ class Villager(pygame.sprite.Sprite):
             if 0 <= check_col < len(WORLD_MAP[0]) and 0 <= check_row < GRID_HEIGHT:
                 if WORLD_MAP[check_row][check_col] == 91:  # Door block
                     # Open the door (set to air)
-                    WORLD_MAP[check_row][check_col] = 0
+                    door_edits = [(check_row, check_col, 0)]
                     # Also open the other half
                     if check_row - 1 >= 0 and WORLD_MAP[check_row - 1][check_col] == 91:
-                        WORLD_MAP[check_row - 1][check_col] = 0
+                        door_edits.append((check_row - 1, check_col, 0))
                     elif check_row + 1 < GRID_HEIGHT and WORLD_MAP[check_row + 1][check_col] == 91:
-                        WORLD_MAP[check_row + 1][check_col] = 0
+                        door_edits.append((check_row + 1, check_col, 0))
+                    set_blocks(door_edits)
 
         # Apply gravity (simple non-player version)
         self.vel_y += self.gravity
         if self.vel_y > 10:
             self.vel_y = 10
 
-        self.rect.x += self.vel_x
         self.collide_x()
-        
-        self.rect.y += self.vel_y
         self.collide_y()
 
+register_mob(Villager)
+
 import math # Make sure math is imported at the top of your file
 
 class Witch(Mob):
+    tags = frozenset({"hostile", "burns_in_sun"})
     def __init__(self, x, y):
         super().__init__(x, y, BLOCK_SIZE, BLOCK_SIZE * 2, (50, 20, 50)) 
         self.health = 26
@@ -10707,7 +12358,8 @@ class Witch(Mob):
                 if self.held_potion in [131, 132]:  # Has a splash healing potion
                     if 'SPLASH_POTIONS' in globals():
                         # Throw splash healing at own feet
-                        SPLASH_POTIONS.add(SplashPotion(
+                        SPLASH_POTIONS.add(acquire_projectile(
+                            SplashPotion,
                             self.rect.centerx,
                             self.rect.centery,
                             0,  # No horizontal direction, just drop
@@ -10729,7 +12381,8 @@ class Witch(Mob):
         direction = 1 if player.rect.centerx > self.rect.centerx else -1
         
         if 'SPLASH_POTIONS' in globals():
-            SPLASH_POTIONS.add(SplashPotion(
+            SPLASH_POTIONS.add(acquire_projectile(
+                SplashPotion,
                 self.rect.centerx,
                 self.rect.centery,
                 direction,
@@ -10754,11 +12407,11 @@ class Witch(Mob):
         if 'DROPPED_ITEMS' in globals():
             # If witch was drinking a potion, drop it
             if self.held_potion and self.drinking_timer > 0:
-                DROPPED_ITEMS.add(DroppedItem(
+                spawn_dropped_item(
                     self.rect.centerx,
                     self.rect.centery,
                     self.held_potion
-                ))
+                )
                 print(f"💀 Witch dropped {BLOCK_TYPES[self.held_potion]['name']} while drinking!")
             
             # Also drop some random witch materials (1-2 items)
@@ -10768,16 +12421,18 @@ class Witch(Mob):
             ]
             for _ in range(random.randint(1, 2)):
                 drop_id, _ = random.choice(possible_drops)
-                DROPPED_ITEMS.add(DroppedItem(
+                spawn_dropped_item(
                     self.rect.centerx + random.randint(-10, 10),
                     self.rect.bottom - 10,
                     drop_id,
                     random.randint(1, 2)
-                ))
+                )
         self.kill()
 
 class IronGolem(Mob):
     """Iron Golem - neutral village protector that attacks hostile mobs only."""
+    tags = frozenset({"passive"})
+    persistent_fields = Mob.persistent_fields + ("provoked",)
     def __init__(self, x, y):
         super().__init__(x, y, BLOCK_SIZE * 1.2, BLOCK_SIZE * 2.5, (180, 180, 180))
         self.health = 100
@@ -10914,13 +12569,12 @@ class IronGolem(Mob):
         closest_hostile = None
         closest_distance = self.detection_range
         
-        for mob in all_mobs:
-            # Target zombies, skeletons, creepers, spiders, witches
-            if isinstance(mob, (Zombie, Skeleton, Creeper, Spider, Witch)):
-                distance = abs(mob.rect.centerx - self.rect.centerx)
-                if distance < closest_distance:
-                    closest_hostile = mob
-                    closest_distance = distance
+        # Target hostile mobs only
+        for mob in mobs_with_tag(all_mobs, "hostile"):
+            distance = abs(mob.rect.centerx - self.rect.centerx)
+            if distance < closest_distance:
+                closest_hostile = mob
+                closest_distance = distance
         
         return closest_hostile
     
@@ -10934,12 +12588,12 @@ class IronGolem(Mob):
         if 'DROPPED_ITEMS' in globals():
             # Drop 3-5 iron ingots
             for _ in range(random.randint(3, 5)):
-                DROPPED_ITEMS.add(DroppedItem(
+                spawn_dropped_item(
                     self.rect.centerx + random.randint(-10, 10),
                     self.rect.bottom - 10,
                     108,  # Iron Ingot
                     1
-                ))
+                )
         self.kill()
 
 # --- World Drawing ---
@@ -11058,7 +12712,7 @@ def update_water_flow():
                 
                 if lava_touches_water:
                     # Turn lava into obsidian when it touches water
-                    WORLD_MAP[row][col] = OBSIDIAN_ID
+                    set_block(row, col, OBSIDIAN_ID)
                     print(f"🌋 Obsidian formed at ({col}, {row}) - Lava + Water!")
                     continue
                 
@@ -11070,13 +12724,13 @@ def update_water_flow():
                         changes.append((row + 1, col, LAVA_ID, 0))
                     elif block_below in ALL_WATER_BLOCKS:
                         # Lava flowing into water = obsidian
-                        WORLD_MAP[row + 1][col] = OBSIDIAN_ID
+                        set_block(row + 1, col, OBSIDIAN_ID)
                         print(f"🌋 Obsidian formed at ({col}, {row+1}) - Lava flow into Water!")
                 
                 # 2. Lava spreads HORIZONTALLY only if sitting on solid block
                 if row + 1 < GRID_HEIGHT:
                     block_below = WORLD_MAP[row + 1][col]
-                    is_solid_below = BLOCK_TYPES.get(block_below, {}).get("solid", False) or block_below == LAVA_ID
+                    is_solid_below = BLOCK_SOLID[block_below] or block_below == LAVA_ID
                     
                     if is_solid_below:
                         # Spread left
@@ -11085,7 +12739,7 @@ def update_water_flow():
                             if left_block == 0:  # Only spread to air
                                 changes.append((row, col - 1, LAVA_ID, 0))
                             elif left_block in ALL_WATER_BLOCKS:
-                                WORLD_MAP[row][col - 1] = OBSIDIAN_ID
+                                set_block(row, col - 1, OBSIDIAN_ID)
                                 print(f"🌋 Obsidian formed at ({col-1}, {row}) - Lava spread into Water!")
                         
                         # Spread right
@@ -11094,7 +12748,7 @@ def update_water_flow():
                             if right_block == 0:  # Only spread to air
                                 changes.append((row, col + 1, LAVA_ID, 0))
                             elif right_block in ALL_WATER_BLOCKS:
-                                WORLD_MAP[row][col + 1] = OBSIDIAN_ID
+                                set_block(row, col + 1, OBSIDIAN_ID)
                                 print(f"🌋 Obsidian formed at ({col+1}, {row}) - Lava spread into Water!")
                 continue
             
@@ -11142,7 +12796,7 @@ def update_water_flow():
             if row + 1 < GRID_HEIGHT:
                 block_below = WORLD_MAP[row + 1][col]
                 # Only spread horizontally if sitting on something solid or other water
-                is_solid_below = BLOCK_TYPES.get(block_below, {}).get("solid", False) or block_below in ALL_WATER_BLOCKS
+                is_solid_below = BLOCK_SOLID[block_below] or block_below in ALL_WATER_BLOCKS
                 
                 if is_solid_below:
                     next_level = current_level + 1
@@ -11171,31 +12825,32 @@ def update_water_flow():
                                 if next_level < right_level:
                                     changes.append((row, col + 1, next_block_id, next_level))
     
-    # Apply all changes (don't replace stronger water with weaker)
+    # Resolve all changes (don't replace stronger water with weaker), then apply them as one batch
+    resolved = {}
     for row, col, block_id, level in changes:
-        current = WORLD_MAP[row][col]
+        current = resolved.get((row, col), WORLD_MAP[row][col])
         # Only apply if target is air or weaker water
         if current == 0:
-            WORLD_MAP[row][col] = block_id
+            resolved[(row, col)] = block_id
         elif current in ALL_WATER_BLOCKS:
             # Get current water level
             for flow_list in WATER_FLOW_LEVELS.values():
                 if current in flow_list:
                     current_lvl = flow_list.index(current)
                     if level < current_lvl:  # Stronger water (lower level) can replace weaker
-                        WORLD_MAP[row][col] = block_id
+                        resolved[(row, col)] = block_id
                     break
+    set_blocks((row, col, block_id) for (row, col), block_id in resolved.items())
 
 def update_falling_blocks():
     """Makes sand and gravel fall down and suffocate players underneath."""
     global WORLD_MAP
     
     changes = []
-    FALLING_BLOCKS = [19, 26]  # Sand (19) and Gravel (26)
     
     for row in range(GRID_HEIGHT - 2, -1, -1):  # Start from bottom, go up
         for col in range(GRID_WIDTH):
-            if WORLD_MAP[row][col] in FALLING_BLOCKS:
+            if BLOCK_FALLS[WORLD_MAP[row][col]]:
                 # Check if there's air or water below
                 if row + 1 < GRID_HEIGHT:
                     block_below = WORLD_MAP[row + 1][col]
@@ -11203,16 +12858,15 @@ def update_falling_blocks():
                         changes.append((row, col, 0))  # Remove from current position
                         changes.append((row + 1, col, WORLD_MAP[row][col]))  # Place below
     
-    # Apply all changes
-    for row, col, block_id in changes:
-        WORLD_MAP[row][col] = block_id
+    # Apply all changes (in order, as one batch)
+    set_blocks(changes)
 
 def draw_world(camera_x, camera_y, player=None):
     """Draws only the visible portion of the world map to the screen."""
-    # Increase render distance when sprinting
+    # Increase render distance when sprinting (scaled by the quality governor)
     extra_distance = 0
     if player and player.is_sprinting:
-        extra_distance = BLOCK_SIZE * 10  # See 10 blocks further when sprinting
+        extra_distance = BLOCK_SIZE * QUALITY["sprint_render_blocks"]
     
     start_col = max(0, (camera_x - extra_distance) // BLOCK_SIZE)
     end_col = min(GRID_WIDTH, (camera_x + SCREEN_WIDTH + extra_distance) // BLOCK_SIZE + 1)
@@ -11232,7 +12886,7 @@ def draw_world(camera_x, camera_y, player=None):
                 if USE_EXPERIMENTAL_TEXTURES and block_id in BLOCK_TEXTURES:
                     screen.blit(BLOCK_TEXTURES[block_id], (screen_x, screen_y))
                 else:
-                    block_color = BLOCK_TYPES[block_id]["color"]
+                    block_color = BLOCK_COLOR[block_id]
                     pygame.draw.rect(screen, block_color, (screen_x, screen_y, BLOCK_SIZE, BLOCK_SIZE))
                 
                 # Draw destroy stage overlay if block is being mined
@@ -11262,8 +12916,8 @@ def draw_world(camera_x, camera_y, player=None):
                     # Draw multiple "spikes" of fire with random heights
                     fire_colors = [(255, 100, 0), (255, 150, 0), (255, 200, 0), (255, 50, 0)]
                     
-                    # Draw 5-7 spiky flames across the block
-                    num_spikes = random.randint(5, 7)
+                    # Draw 5-7 spiky flames across the block (fewer at lower quality)
+                    num_spikes = max(1, int(random.randint(5, 7) * QUALITY["particle_density"]))
                     spike_width = BLOCK_SIZE // num_spikes
                     
                     for i in range(num_spikes):
@@ -11281,7 +12935,7 @@ def draw_world(camera_x, camera_y, player=None):
                         pygame.draw.polygon(screen, spike_color, points)
                     
                     # Add some bright yellow/white center spots for intensity
-                    for _ in range(3):
+                    for _ in range(round(3 * QUALITY["particle_density"])):
                         bright_x = screen_x + random.randint(0, BLOCK_SIZE)
                         bright_y = screen_y + random.randint(BLOCK_SIZE // 2, BLOCK_SIZE)
                         bright_size = random.randint(2, 5)
@@ -11300,19 +12954,17 @@ def calculate_camera_offset(player_rect):
 # --- Interaction Handling ---
 def get_nearest_hostile_mob(player, mobs):
     """Returns the nearest hostile mob to the player, or None if none exist."""
-    hostile_types = (Zombie, Skeleton, Spider, Creeper, Witch, Slime, Drowned)
     nearest_mob = None
     nearest_distance = float('inf')
     
-    for mob in mobs:
-        if isinstance(mob, hostile_types):
-            dx = mob.rect.centerx - player.rect.centerx
-            dy = mob.rect.centery - player.rect.centery
-            distance = math.sqrt(dx**2 + dy**2)
-            
-            if distance < nearest_distance:
-                nearest_distance = distance
-                nearest_mob = mob
+    for mob in mobs_with_tag(mobs, "hostile"):
+        dx = mob.rect.centerx - player.rect.centerx
+        dy = mob.rect.centery - player.rect.centery
+        distance = math.sqrt(dx**2 + dy**2)
+        
+        if distance < nearest_distance:
+            nearest_distance = distance
+            nearest_mob = mob
     
     if nearest_mob:
         return nearest_mob, nearest_distance
@@ -11320,19 +12972,17 @@ def get_nearest_hostile_mob(player, mobs):
 
 def get_nearest_meat_mob(player, mobs):
     """Returns the nearest meat-dropping mob to the player, or None if none exist."""
-    meat_types = (Cow, Pig, Sheep, Chicken, Rabbit)
     nearest_mob = None
     nearest_distance = float('inf')
     
-    for mob in mobs:
-        if isinstance(mob, meat_types):
-            dx = mob.rect.centerx - player.rect.centerx
-            dy = mob.rect.centery - player.rect.centery
-            distance = math.sqrt(dx**2 + dy**2)
-            
-            if distance < nearest_distance:
-                nearest_distance = distance
-                nearest_mob = mob
+    for mob in mobs_with_tag(mobs, "meat"):
+        dx = mob.rect.centerx - player.rect.centerx
+        dy = mob.rect.centery - player.rect.centery
+        distance = math.sqrt(dx**2 + dy**2)
+        
+        if distance < nearest_distance:
+            nearest_distance = distance
+            nearest_mob = mob
     
     if nearest_mob:
         return nearest_mob, nearest_distance
@@ -11340,19 +12990,17 @@ def get_nearest_meat_mob(player, mobs):
 
 def get_nearest_aquatic_mob(player, mobs):
     """Returns the nearest aquatic mob to the player, or None if none exist."""
-    aquatic_types = (Dolphin, TropicalFish, Shark, Whale, Nautilus, Narwhal, Cod, Salmon, Drowned, Turtle)
     nearest_mob = None
     nearest_distance = float('inf')
     
-    for mob in mobs:
-        if isinstance(mob, aquatic_types):
-            dx = mob.rect.centerx - player.rect.centerx
-            dy = mob.rect.centery - player.rect.centery
-            distance = math.sqrt(dx**2 + dy**2)
-            
-            if distance < nearest_distance:
-                nearest_distance = distance
-                nearest_mob = mob
+    for mob in mobs_with_tag(mobs, "aquatic"):
+        dx = mob.rect.centerx - player.rect.centerx
+        dy = mob.rect.centery - player.rect.centery
+        distance = math.sqrt(dx**2 + dy**2)
+        
+        if distance < nearest_distance:
+            nearest_distance = distance
+            nearest_mob = mob
     
     if nearest_mob:
         return nearest_mob, nearest_distance
@@ -11482,12 +13130,9 @@ def handle_interaction(player, mobs, event, camera_x, camera_y, MOBS):
                     
                     # Check if player has max tool level cheat, creative mode, or sufficient tool level
                     if player.max_tool_level or player.creative_mode or tool_level >= required_level:
-                        # Remove from light sources if it emits light
-                        if BLOCK_TYPES.get(block_id, {}).get("emits_light", False):
-                            LIGHT_SOURCES.discard((target_col, target_row))
-                        
                         # Normal mining (instant for now, will add hold-to-mine later)
-                        WORLD_MAP[target_row][target_col] = 0
+                        # (light sources are updated by the block change listener)
+                        set_block(target_row, target_col, 0)
                         
                         # Achievement triggers
                         # Getting Wood - mine any log
@@ -11502,14 +13147,16 @@ def handle_interaction(player, mobs, event, camera_x, camera_y, MOBS):
                         if block_id == 127:  # BAMBOO_ID
                             # Break all bamboo blocks above this one
                             check_row = target_row - 1
+                            bamboo_edits = []
                             while check_row >= 0 and WORLD_MAP[check_row][target_col] == 127:
-                                WORLD_MAP[check_row][target_col] = 0
+                                bamboo_edits.append((check_row, target_col, 0))
                                 # Drop item for each bamboo broken
                                 if 'DROPPED_ITEMS' in globals():
                                     drop_x = target_col * BLOCK_SIZE + BLOCK_SIZE // 4
                                     drop_y = check_row * BLOCK_SIZE + BLOCK_SIZE // 4
-                                    DROPPED_ITEMS.add(DroppedItem(drop_x, drop_y, 127, 1))
+                                    spawn_dropped_item(drop_x, drop_y, 127, 1)
                                 check_row -= 1
+                            set_blocks(bamboo_edits)
                         
                         # Drop item
                         if 'DROPPED_ITEMS' in globals():
@@ -11524,40 +13171,40 @@ def handle_interaction(player, mobs, event, camera_x, camera_y, MOBS):
                                 # 15% chance for sapling
                                 if random.random() < 0.15:
                                     if block_id == 6:  # Oak leaves
-                                        DROPPED_ITEMS.add(DroppedItem(drop_x, drop_y, 139, 1))  # Oak Sapling
+                                        spawn_dropped_item(drop_x, drop_y, 139, 1)  # Oak Sapling
                                     elif block_id == 84:  # Birch leaves
-                                        DROPPED_ITEMS.add(DroppedItem(drop_x, drop_y, 140, 1))  # Birch Sapling
+                                        spawn_dropped_item(drop_x, drop_y, 140, 1)  # Birch Sapling
                                     elif block_id == 83:  # Spruce leaves
-                                        DROPPED_ITEMS.add(DroppedItem(drop_x, drop_y, 141, 1))  # Spruce Sapling
+                                        spawn_dropped_item(drop_x, drop_y, 141, 1)  # Spruce Sapling
                                     elif block_id == 126:  # Jungle leaves
-                                        DROPPED_ITEMS.add(DroppedItem(drop_x, drop_y, 142, 1))  # Jungle Sapling
+                                        spawn_dropped_item(drop_x, drop_y, 142, 1)  # Jungle Sapling
                                     elif block_id == 149:  # Acacia leaves
-                                        DROPPED_ITEMS.add(DroppedItem(drop_x, drop_y, 150, 1))  # Acacia Sapling
+                                        spawn_dropped_item(drop_x, drop_y, 150, 1)  # Acacia Sapling
                                 
                                 # 15% chance for sticks
                                 if random.random() < 0.15:
-                                    DROPPED_ITEMS.add(DroppedItem(drop_x, drop_y, 10, random.randint(1, 2)))  # 1-2 Sticks
+                                    spawn_dropped_item(drop_x, drop_y, 10, random.randint(1, 2))  # 1-2 Sticks
                                 
                                 # 15% chance for fruit (biome-dependent, not in taiga)
                                 if random.random() < 0.15 and biome_type != BASALT_DELTAS_BIOME:
                                     if block_id == 6:  # Oak leaves
-                                        DROPPED_ITEMS.add(DroppedItem(drop_x, drop_y, 136, 1))  # Apple
+                                        spawn_dropped_item(drop_x, drop_y, 136, 1)  # Apple
                                     elif block_id == 84:  # Birch leaves
-                                        DROPPED_ITEMS.add(DroppedItem(drop_x, drop_y, 137, 1))  # Orange
+                                        spawn_dropped_item(drop_x, drop_y, 137, 1)  # Orange
                                     elif block_id == 126:  # Jungle leaves
-                                        DROPPED_ITEMS.add(DroppedItem(drop_x, drop_y, 138, 1))  # Banana
+                                        spawn_dropped_item(drop_x, drop_y, 138, 1)  # Banana
                             elif block_id == 143:  # Berry Bush
-                                DROPPED_ITEMS.add(DroppedItem(drop_x, drop_y, 144, random.randint(1, 3)))  # 1-3 Berries
+                                spawn_dropped_item(drop_x, drop_y, 144, random.randint(1, 3))  # 1-3 Berries
                             elif block_id == 22:
-                                DROPPED_ITEMS.add(DroppedItem(drop_x, drop_y, 10, random.randint(0, 2)))
+                                spawn_dropped_item(drop_x, drop_y, 10, random.randint(0, 2))
                             elif block_id == 11:
-                                DROPPED_ITEMS.add(DroppedItem(drop_x, drop_y, 85, 1))
+                                spawn_dropped_item(drop_x, drop_y, 85, 1)
                             elif block_id == 95:
-                                DROPPED_ITEMS.add(DroppedItem(drop_x, drop_y, 93, 1))
+                                spawn_dropped_item(drop_x, drop_y, 93, 1)
                             elif block_id == 96:
-                                DROPPED_ITEMS.add(DroppedItem(drop_x, drop_y, 94, 1))
+                                spawn_dropped_item(drop_x, drop_y, 94, 1)
                             else:
-                                DROPPED_ITEMS.add(DroppedItem(drop_x, drop_y, block_id, 1))
+                                spawn_dropped_item(drop_x, drop_y, block_id, 1)
     
     # Right Click: Place Block OR Mount Camel OR Trade with Villager OR Open Door OR Throw Eye of Ender OR Use Spawn Egg
     elif event.button == 3:
@@ -11571,94 +13218,11 @@ def handle_interaction(player, mobs, event, camera_x, camera_y, MOBS):
             spawn_x = player.rect.centerx
             spawn_y = player.rect.centery
             
-            # Create the mob based on type
+            # Create the mob from the entity registry
             mob = None
-            if mob_type == "Zombie":
-                mob = Zombie(spawn_x, spawn_y)
-            elif mob_type == "Creeper":
-                mob = Creeper(spawn_x, spawn_y)
-            elif mob_type == "Skeleton":
-                mob = Skeleton(spawn_x, spawn_y)
-            elif mob_type == "Spider":
-                mob = Spider(spawn_x, spawn_y)
-            elif mob_type == "CaveSpider":
-                mob = CaveSpider(spawn_x, spawn_y)
-            elif mob_type == "Drowned":
-                mob = Drowned(spawn_x, spawn_y)
-            elif mob_type == "ZombieCamel":
-                mob = ZombieCamel(spawn_x, spawn_y)
-            elif mob_type == "Parched":
-                mob = Parched(spawn_x, spawn_y)
-            elif mob_type == "Slime":
-                mob = Slime(spawn_x, spawn_y)
-            elif mob_type == "Witch":
-                mob = Witch(spawn_x, spawn_y)
-            elif mob_type == "Sheep":
-                mob = Sheep(spawn_x, spawn_y)
-            elif mob_type == "Goat":
-                mob = Goat(spawn_x, spawn_y)
-            elif mob_type == "Cow":
-                mob = Cow(spawn_x, spawn_y)
-            elif mob_type == "Camel":
-                mob = Camel(spawn_x, spawn_y)
-            elif mob_type == "Chicken":
-                mob = Chicken(spawn_x, spawn_y)
-            elif mob_type == "Bird":
-                mob = Bird(spawn_x, spawn_y)
-            elif mob_type == "Pig":
-                mob = Pig(spawn_x, spawn_y)
-            elif mob_type == "Cod":
-                mob = Cod(spawn_x, spawn_y)
-            elif mob_type == "Salmon":
-                mob = Salmon(spawn_x, spawn_y)
-            elif mob_type == "TropicalFish":
-                mob = TropicalFish(spawn_x, spawn_y)
-            elif mob_type == "Dolphin":
-                mob = Dolphin(spawn_x, spawn_y)
-            elif mob_type == "Shark":
-                mob = Shark(spawn_x, spawn_y)
-            elif mob_type == "Whale":
-                mob = Whale(spawn_x, spawn_y)
-            elif mob_type == "Nautilus":
-                mob = Nautilus(spawn_x, spawn_y)
-            elif mob_type == "ZombieNautilus":
-                mob = ZombieNautilus(spawn_x, spawn_y)
-            elif mob_type == "Rabbit":
-                mob = Rabbit(spawn_x, spawn_y)
-            elif mob_type == "Horse":
-                mob = Horse(spawn_x, spawn_y)
-            elif mob_type == "ZombieHorse":
-                mob = ZombieHorse(spawn_x, spawn_y)
-            elif mob_type == "Fox":
-                mob = Fox(spawn_x, spawn_y)
-            elif mob_type == "Wolf":
-                mob = Wolf(spawn_x, spawn_y)
-            elif mob_type == "Frog":
-                mob = Frog(spawn_x, spawn_y)
-            elif mob_type == "Turtle":
-                mob = Turtle(spawn_x, spawn_y)
-            elif mob_type == "Monkey":
-                mob = Monkey(spawn_x, spawn_y)
-            elif mob_type == "Narwhal":
-                mob = Narwhal(spawn_x, spawn_y)
-            elif mob_type == "Deer":
-                mob = Deer(spawn_x, spawn_y)
-            elif mob_type == "Panda":
-                mob = Panda(spawn_x, spawn_y)
-            elif mob_type == "Bear":
-                mob = Bear(spawn_x, spawn_y)
-            elif mob_type == "Lion":
-                mob = Lion(spawn_x, spawn_y)
-            elif mob_type == "Rhino":
-                mob = Rhino(spawn_x, spawn_y)
-            elif mob_type == "Ostrich":
-                mob = Ostrich(spawn_x, spawn_y)
-            elif mob_type == "Elephant":
-                mob = Elephant(spawn_x, spawn_y)
-            elif mob_type == "IronGolem":
-                mob = IronGolem(spawn_x, spawn_y)
-            elif mob_type == "Villager":
-                mob = Villager(spawn_x, spawn_y)
+            mob_class = get_mob_class(mob_type)
+            if mob_class is not None:
+                mob = mob_class(spawn_x, spawn_y)
             
             # Add mob to the world
             if mob:
@@ -11674,7 +13238,7 @@ def handle_interaction(player, mobs, event, camera_x, camera_y, MOBS):
         # Check if holding Eye of Ender - throw it!
         elif held_item_id == EYE_OF_ENDER_ID and held_count > 0:
             # Throw Eye of Ender toward nearest stronghold
-            eye = EyeOfEnder(player.rect.centerx, player.rect.centery - 20, player.rect.x)
+            eye = acquire_projectile(EyeOfEnder, player.rect.centerx, player.rect.centery - 20, player.rect.x)
             EYE_OF_ENDER_PROJECTILES.add(eye)
             # Consume one eye of ender
             player.hotbar_slots[player.active_slot] = (held_item_id, held_count - 1)
@@ -11684,24 +13248,8 @@ def handle_interaction(player, mobs, event, camera_x, camera_y, MOBS):
         
         # Check if holding Bow - shoot arrow!
         elif held_item_id == 55 and held_count > 0:  # Bow ID is 55
-            # Check if player has arrows (ID 53)
-            arrow_count = 0
-            arrow_slot_index = -1
-            
-            # Search for arrows in hotbar
-            for i, (slot_id, slot_count) in enumerate(player.hotbar_slots):
-                if slot_id == 53:  # Arrow ID
-                    arrow_count = slot_count
-                    arrow_slot_index = i
-                    break
-            
-            # Search for arrows in inventory if not found in hotbar
-            if arrow_count == 0:
-                for i, (slot_id, slot_count) in enumerate(player.inventory):
-                    if slot_id == 53:  # Arrow ID
-                        arrow_count = slot_count
-                        arrow_slot_index = i + 9  # Offset for inventory slots
-                        break
+            # Check if player has arrows (ID 53) in hotbar or inventory
+            arrow_count = player.items.count(53)
             
             if arrow_count > 0:
                 # Shoot arrow toward mouse cursor
@@ -11709,7 +13257,8 @@ def handle_interaction(player, mobs, event, camera_x, camera_y, MOBS):
                 target_world_x = mouse_x + camera_x
                 target_world_y = mouse_y + camera_y
                 
-                arrow = Arrow(
+                arrow = acquire_projectile(
+                    Arrow,
                     player.rect.centerx,
                     player.rect.centery,
                     target_world_x,
@@ -11718,16 +13267,8 @@ def handle_interaction(player, mobs, event, camera_x, camera_y, MOBS):
                 )
                 ARROWS.add(arrow)
                 
-                # Consume one arrow
-                if arrow_slot_index < 9:  # Hotbar
-                    player.hotbar_slots[arrow_slot_index] = (53, arrow_count - 1)
-                    if arrow_count - 1 <= 0:
-                        player.hotbar_slots[arrow_slot_index] = (0, 0)
-                else:  # Inventory
-                    inv_index = arrow_slot_index - 9
-                    player.inventory[inv_index] = (53, arrow_count - 1)
-                    if arrow_count - 1 <= 0:
-                        player.inventory[inv_index] = (0, 0)
+                # Consume one arrow (from the first arrow stack, hotbar before inventory)
+                player.items.remove(53, 1)
                 
                 print(f"🏹 Arrow shot! ({arrow_count - 1} arrows remaining)")
             else:
@@ -11741,12 +13282,13 @@ def handle_interaction(player, mobs, event, camera_x, camera_y, MOBS):
                 # Open door (make it passable by setting solid to False, but keep the block)
                 # Instead of removing the door, we'll just change collision
                 # For now, swap to air but remember it's a door
-                WORLD_MAP[target_row][target_col] = 0  # Open (air)
+                door_edits = [(target_row, target_col, 0)]  # Open (air)
                 # Mark the other half too
                 if target_row - 1 >= 0 and WORLD_MAP[target_row - 1][target_col] == 91:
-                    WORLD_MAP[target_row - 1][target_col] = 0
+                    door_edits.append((target_row - 1, target_col, 0))
                 elif target_row + 1 < GRID_HEIGHT and WORLD_MAP[target_row + 1][target_col] == 91:
-                    WORLD_MAP[target_row + 1][target_col] = 0
+                    door_edits.append((target_row + 1, target_col, 0))
+                set_blocks(door_edits)
                 
                 # Set a timer to auto-close the door after 3 seconds
                 global OPEN_DOORS
@@ -11762,10 +13304,11 @@ def handle_interaction(player, mobs, event, camera_x, camera_y, MOBS):
                 
                 # If this looks like an open door position, close it
                 if (has_plank_left or has_plank_right) and has_stone_below:
-                    WORLD_MAP[target_row][target_col] = 91  # Close door
+                    door_edits = [(target_row, target_col, 91)]  # Close door
                     # Close the top half too
                     if target_row - 1 >= 0 and WORLD_MAP[target_row - 1][target_col] == 0:
-                        WORLD_MAP[target_row - 1][target_col] = 91
+                        door_edits.append((target_row - 1, target_col, 91))
+                    set_blocks(door_edits)
                     return
         
         # Check if holding ender pearl to throw it
@@ -11788,7 +13331,7 @@ def handle_interaction(player, mobs, event, camera_x, camera_y, MOBS):
                 vel_y = (dy / distance) * speed
                 
                 # Create ender pearl projectile
-                ENDER_PEARLS.add(EnderPearl(player.rect.centerx, player.rect.centery, vel_x, vel_y, player))
+                ENDER_PEARLS.add(acquire_projectile(EnderPearl, player.rect.centerx, player.rect.centery, vel_x, vel_y, player))
                 print(f"✨ Threw ender pearl!")
                 
                 # Consume ender pearl
@@ -11807,7 +13350,8 @@ def handle_interaction(player, mobs, event, camera_x, camera_y, MOBS):
             
             # Create trident projectile
             if 'TRIDENTS' in globals():
-                TRIDENTS.add(Trident(
+                TRIDENTS.add(acquire_projectile(
+                    Trident,
                     player.rect.centerx,
                     player.rect.centery,
                     target_world_x,
@@ -11886,6 +13430,7 @@ def handle_interaction(player, mobs, event, camera_x, camera_y, MOBS):
                 global FURNACE_OPEN, FURNACE_POS
                 FURNACE_OPEN = True
                 FURNACE_POS = (target_col, target_row)
+                get_block_entity(target_col, target_row)
                 return
             
             # Check if clicking on Bed
@@ -11915,40 +13460,37 @@ def handle_interaction(player, mobs, event, camera_x, camera_y, MOBS):
         if held_id == 181:  # Empty bucket
             # Try to pick up water
             if WORLD_MAP[target_row][target_col] in [5, 6] + list(range(170, 180)):  # Water or swamp water or flow levels
-                WORLD_MAP[target_row][target_col] = 0  # Remove water
+                set_block(target_row, target_col, 0)  # Remove water
                 # Replace bucket with water bucket
-                for i in range(9):
-                    if player.hotbar_slots[i][0] == 181:
-                        player.hotbar_slots[i] = (182, player.hotbar_slots[i][1])
-                        if i == player.active_slot:
-                            player.held_block = 182
-                        break
+                i = player.items.find(181)
+                if i is not None and i < 9:
+                    player.hotbar_slots[i] = (182, player.hotbar_slots[i][1])
+                    if i == player.active_slot:
+                        player.held_block = 182
                 print("💧 Picked up water!")
                 return
         elif held_id == 182:  # Water bucket
             # Place water
             if WORLD_MAP[target_row][target_col] == 0:  # Air block
-                WORLD_MAP[target_row][target_col] = 5  # Place water
+                set_block(target_row, target_col, 5)  # Place water
                 # Replace water bucket with empty bucket
-                for i in range(9):
-                    if player.hotbar_slots[i][0] == 182:
-                        player.hotbar_slots[i] = (181, player.hotbar_slots[i][1])
-                        if i == player.active_slot:
-                            player.held_block = 181
-                        break
+                i = player.items.find(182)
+                if i is not None and i < 9:
+                    player.hotbar_slots[i] = (181, player.hotbar_slots[i][1])
+                    if i == player.active_slot:
+                        player.held_block = 181
                 print("💧 Placed water!")
                 return
         elif held_id == 183:  # Lava bucket
             # Place lava
             if WORLD_MAP[target_row][target_col] == 0:  # Air block
-                WORLD_MAP[target_row][target_col] = LAVA_ID  # Place lava
+                set_block(target_row, target_col, LAVA_ID)  # Place lava
                 # Replace lava bucket with empty bucket
-                for i in range(9):
-                    if player.hotbar_slots[i][0] == 183:
-                        player.hotbar_slots[i] = (181, player.hotbar_slots[i][1])
-                        if i == player.active_slot:
-                            player.held_block = 181
-                        break
+                i = player.items.find(183)
+                if i is not None and i < 9:
+                    player.hotbar_slots[i] = (181, player.hotbar_slots[i][1])
+                    if i == player.active_slot:
+                        player.held_block = 181
                 print("🔥 Placed lava!")
                 return
         
@@ -11967,7 +13509,7 @@ def handle_interaction(player, mobs, event, camera_x, camera_y, MOBS):
                     if WORLD_MAP[target_row][target_col] == 5:
                         print("🔥 Fire can't be placed in water!")
                     elif player.consume_item(held_id, 1):
-                        WORLD_MAP[target_row][target_col] = FIRE_ID
+                        set_block(target_row, target_col, FIRE_ID)
                         print("🔥 Fire placed!")
                 else:
                     print("🔥 Fire needs solid ground below!")
@@ -11990,17 +13532,12 @@ def handle_interaction(player, mobs, event, camera_x, camera_y, MOBS):
                         if player.consume_item(held_id, 1):
                             pass  # Torch is consumed but not placed
                     elif player.consume_item(held_id, 1):
-                        WORLD_MAP[target_row][target_col] = held_id
-                        
                         # NETHER: Water evaporates immediately
+                        # (light sources are updated by the block change listener)
+                        set_block(target_row, target_col, 0 if held_id == 5 else held_id)
                         if held_id == 5:  # Water ID
-                            WORLD_MAP[target_row][target_col] = 0  # Remove water immediately
                             print("💨 Water evaporated in the Nether!")
                         
-                        # Add to light sources if it emits light
-                        if block_data.get("emits_light", False):
-                            LIGHT_SOURCES.add((target_col, target_row))
-                        
                         # Track sapling growth
                         if held_id in [139, 140, 141, 142, 150]:  # Saplings (added acacia)
                             SAPLING_GROWTH[(target_col, target_row)] = (held_id, TIME_OF_DAY)
@@ -12080,17 +13617,17 @@ def draw_achievement_popup():
         pygame.draw.rect(screen, (218, 165, 32), popup_rect, 3)
     
     # Draw "Achievement Get!" text
-    title_text = FONT.render("Achievement Get!", True, (139, 69, 19))
+    title_text = render_text(FONT, "Achievement Get!", True, (139, 69, 19))
     title_x = popup_x + (popup_width - title_text.get_width()) // 2
     screen.blit(title_text, (title_x, popup_y + 10))
     
     # Draw achievement name
-    name_text = FONT_SMALL.render(achievement["name"], True, (0, 0, 0))
+    name_text = render_text(FONT_SMALL, achievement["name"], True, (0, 0, 0))
     name_x = popup_x + (popup_width - name_text.get_width()) // 2
     screen.blit(name_text, (name_x, popup_y + 35))
     
     # Draw achievement description
-    desc_text = FONT_SMALL.render(achievement["desc"], True, (50, 50, 50))
+    desc_text = render_text(FONT_SMALL, achievement["desc"], True, (50, 50, 50))
     desc_x = popup_x + (popup_width - desc_text.get_width()) // 2
     screen.blit(desc_text, (desc_x, popup_y + 55))
 
@@ -12099,16 +13636,27 @@ if achievement_bg:
     draw_achievement_popup.background_image = achievement_bg
 
 # --- HUD Drawing ---
-def draw_hud(player):
-    """Draws the hotbar, health hearts, hunger bars, oxygen bubbles, and held item name."""
+# The hotbar, hearts, hunger, armor, oxygen and XP bar only change a few times per minute,
+# so they are drawn into an off-screen layer that is rebuilt only when its inputs change.
+HUD_LAYER = None
+HUD_LAYER_KEY = None
+
+def get_total_armor(player):
+    """Returns the total armor points of the player's equipped armor."""
+    total_armor = 0
+    for armor_slot in ['helmet', 'chestplate', 'leggings', 'boots']:
+        armor_id = player.armor_slots.get(armor_slot, 0)
+        if armor_id in BLOCK_TYPES:
+            total_armor += BLOCK_TYPES[armor_id].get('armor_points', 0)
+    return total_armor
+
+def build_hud_layer(player, total_armor, head_underwater):
+    """Renders the change-driven part of the HUD into a transparent screen-sized surface."""
+    layer = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
     SLOT_SIZE = 50
     HOTBAR_START_X = (SCREEN_WIDTH - (SLOT_SIZE * 9)) // 2
     HOTBAR_Y = SCREEN_HEIGHT - SLOT_SIZE - 10
     
-    # Track mouse position for tooltips
-    mouse_x, mouse_y = pygame.mouse.get_pos()
-    tooltip_item_id = None
-    
     # Draw Hotbar Slots
     for i in range(9):
         slot_x = HOTBAR_START_X + i * SLOT_SIZE
@@ -12116,9 +13664,9 @@ def draw_hud(player):
         
         # Highlight active slot
         if i == player.active_slot:
-            pygame.draw.rect(screen, (255, 255, 0), slot_rect, 3)
+            pygame.draw.rect(layer, (255, 255, 0), slot_rect, 3)
         else:
-            pygame.draw.rect(screen, (100, 100, 100), slot_rect, 2)
+            pygame.draw.rect(layer, (100, 100, 100), slot_rect, 2)
         
         # Draw item in slot (hotbar now stores tuples: (item_id, count))
         item_id, count = player.hotbar_slots[i]
@@ -12126,23 +13674,19 @@ def draw_hud(player):
             inner_rect = pygame.Rect(slot_x + 5, HOTBAR_Y + 5, SLOT_SIZE - 10, SLOT_SIZE - 10)
             # Use custom drawing for all items (tools get special icons, others get centered smaller sprites)
             if item_id in [9, 99, 100, 101, 102, 107, 109, 110, 111, 112, 113, 114, 115, 116, 117, 118]:  # Tool IDs with custom icons
-                draw_tool_icon(screen, inner_rect, item_id)
+                draw_tool_icon(layer, inner_rect, item_id)
             else:
                 # Draw as centered sprite (85% of slot size)
                 sprite_size = int((SLOT_SIZE - 10) * 0.85)
                 sprite_offset = ((SLOT_SIZE - 10) - sprite_size) // 2
                 sprite_rect = pygame.Rect(slot_x + 5 + sprite_offset, HOTBAR_Y + 5 + sprite_offset, sprite_size, sprite_size)
-                draw_block_sprite(screen, sprite_rect, item_id)
+                draw_block_sprite(layer, sprite_rect, item_id)
             
             # Draw item count
             if count > 1:
-                count_text = FONT_SMALL.render(str(count), True, (255, 255, 255))
-                screen.blit(count_text, (slot_x + SLOT_SIZE - count_text.get_width() - 2, 
+                count_text = render_text(FONT_SMALL, str(count), True, (255, 255, 255))
+                layer.blit(count_text, (slot_x + SLOT_SIZE - count_text.get_width() - 2, 
                                         HOTBAR_Y + SLOT_SIZE - count_text.get_height() - 2))
-            
-            # Check if mouse is hovering over this slot
-            if slot_rect.collidepoint(mouse_x, mouse_y):
-                tooltip_item_id = item_id
     
     # Draw Hearts (Health) on the LEFT
     heart_size = 18
@@ -12150,13 +13694,6 @@ def draw_hud(player):
     hearts_x = 10
     hearts_y = SCREEN_HEIGHT - 30
     
-    # Calculate total armor points
-    total_armor = 0
-    for armor_slot in ['helmet', 'chestplate', 'leggings', 'boots']:
-        armor_id = player.armor_slots.get(armor_slot, 0)
-        if armor_id in BLOCK_TYPES:
-            total_armor += BLOCK_TYPES[armor_id].get('armor_points', 0)
-    
     # Draw Armor icons above hearts
     if total_armor > 0:
         armor_icon_size = 16
@@ -12166,34 +13703,34 @@ def draw_hud(player):
         for i in range(10):  # Up to 10 armor points (20 total armor / 2)
             x = hearts_x + i * armor_icon_spacing
             # Draw armor background
-            pygame.draw.rect(screen, (50, 50, 50), (x, armor_y, armor_icon_size, armor_icon_size))
-            pygame.draw.rect(screen, (100, 100, 100), (x, armor_y, armor_icon_size, armor_icon_size), 1)
+            pygame.draw.rect(layer, (50, 50, 50), (x, armor_y, armor_icon_size, armor_icon_size))
+            pygame.draw.rect(layer, (100, 100, 100), (x, armor_y, armor_icon_size, armor_icon_size), 1)
             
             # Draw filled armor if player has armor points
             if total_armor > i * 2:
                 if total_armor >= (i + 1) * 2:
                     # Full armor icon - chestplate shape
-                    pygame.draw.rect(screen, (200, 200, 200), (x + 3, armor_y + 2, armor_icon_size - 6, armor_icon_size - 4))
-                    pygame.draw.rect(screen, (160, 160, 160), (x + 2, armor_y + 6, armor_icon_size - 4, 4))
-                    pygame.draw.rect(screen, (180, 180, 180), (x + 5, armor_y + 3, 2, 2))
-                    pygame.draw.rect(screen, (180, 180, 180), (x + armor_icon_size - 7, armor_y + 3, 2, 2))
+                    pygame.draw.rect(layer, (200, 200, 200), (x + 3, armor_y + 2, armor_icon_size - 6, armor_icon_size - 4))
+                    pygame.draw.rect(layer, (160, 160, 160), (x + 2, armor_y + 6, armor_icon_size - 4, 4))
+                    pygame.draw.rect(layer, (180, 180, 180), (x + 5, armor_y + 3, 2, 2))
+                    pygame.draw.rect(layer, (180, 180, 180), (x + armor_icon_size - 7, armor_y + 3, 2, 2))
                 else:
                     # Half armor icon
-                    pygame.draw.rect(screen, (200, 200, 200), (x + 3, armor_y + 2, (armor_icon_size - 6) // 2, armor_icon_size - 4))
-                    pygame.draw.rect(screen, (160, 160, 160), (x + 2, armor_y + 6, (armor_icon_size - 4) // 2, 4))
+                    pygame.draw.rect(layer, (200, 200, 200), (x + 3, armor_y + 2, (armor_icon_size - 6) // 2, armor_icon_size - 4))
+                    pygame.draw.rect(layer, (160, 160, 160), (x + 2, armor_y + 6, (armor_icon_size - 4) // 2, 4))
     
     for i in range(10):  # 10 hearts for 20 health
         x = hearts_x + i * heart_spacing
         # Draw heart background (empty)
-        pygame.draw.rect(screen, (50, 50, 50), (x, hearts_y, heart_size, heart_size))
-        pygame.draw.rect(screen, (100, 100, 100), (x, hearts_y, heart_size, heart_size), 1)
+        pygame.draw.rect(layer, (50, 50, 50), (x, hearts_y, heart_size, heart_size))
+        pygame.draw.rect(layer, (100, 100, 100), (x, hearts_y, heart_size, heart_size), 1)
         
         # Draw filled heart if player has health
         if player.health > i * 2:
             # Full or half heart
             if player.health >= (i + 1) * 2:
                 # Full heart - red with classic heart shape
-                pygame.draw.polygon(screen, (255, 0, 0), [
+                pygame.draw.polygon(layer, (255, 0, 0), [
                     (x + heart_size // 2, hearts_y + heart_size - 3),
                     (x + 2, hearts_y + 6),
                     (x + 2, hearts_y + 4),
@@ -12205,7 +13742,7 @@ def draw_hud(player):
                 ])
             else:
                 # Half heart
-                pygame.draw.polygon(screen, (255, 0, 0), [
+                pygame.draw.polygon(layer, (255, 0, 0), [
                     (x + heart_size // 2, hearts_y + heart_size - 3),
                     (x + 2, hearts_y + 6),
                     (x + 2, hearts_y + 4),
@@ -12222,31 +13759,23 @@ def draw_hud(player):
     for i in range(10):  # 10 hunger bars for 20 hunger
         x = hunger_x + i * hunger_spacing
         # Draw hunger background (empty)
-        pygame.draw.rect(screen, (50, 50, 50), (x, hunger_y, hunger_size, hunger_size))
-        pygame.draw.rect(screen, (100, 100, 100), (x, hunger_y, hunger_size, hunger_size), 1)
+        pygame.draw.rect(layer, (50, 50, 50), (x, hunger_y, hunger_size, hunger_size))
+        pygame.draw.rect(layer, (100, 100, 100), (x, hunger_y, hunger_size, hunger_size), 1)
         
         # Draw filled hunger if player has hunger
         if player.hunger > i * 2:
             # Full or half hunger (ham/meat icon)
             if player.hunger >= (i + 1) * 2:
                 # Full ham - pink/brown meat color
-                pygame.draw.rect(screen, (210, 105, 105), (x + 3, hunger_y + 3, hunger_size - 6, hunger_size - 9))
-                pygame.draw.rect(screen, (139, 69, 19), (x + 5, hunger_y + 8, hunger_size - 10, hunger_size - 11))
-                pygame.draw.rect(screen, (255, 255, 255), (x + 7, hunger_y + 5, 3, 3))  # Bone highlight
+                pygame.draw.rect(layer, (210, 105, 105), (x + 3, hunger_y + 3, hunger_size - 6, hunger_size - 9))
+                pygame.draw.rect(layer, (139, 69, 19), (x + 5, hunger_y + 8, hunger_size - 10, hunger_size - 11))
+                pygame.draw.rect(layer, (255, 255, 255), (x + 7, hunger_y + 5, 3, 3))  # Bone highlight
             else:
                 # Half ham
-                pygame.draw.rect(screen, (210, 105, 105), (x + 3, hunger_y + 3, (hunger_size - 6) // 2, hunger_size - 9))
-                pygame.draw.rect(screen, (139, 69, 19), (x + 5, hunger_y + 8, (hunger_size - 10) // 2, hunger_size - 11))
+                pygame.draw.rect(layer, (210, 105, 105), (x + 3, hunger_y + 3, (hunger_size - 6) // 2, hunger_size - 9))
+                pygame.draw.rect(layer, (139, 69, 19), (x + 5, hunger_y + 8, (hunger_size - 10) // 2, hunger_size - 11))
     
     # Draw Oxygen Bubbles (above hearts when underwater)
-    head_col = player.rect.centerx // BLOCK_SIZE
-    head_row = (player.rect.top + 5) // BLOCK_SIZE
-    head_underwater = False
-    
-    if 0 <= head_row < GRID_HEIGHT and 0 <= head_col < GRID_WIDTH:
-        if WORLD_MAP[head_row][head_col] == 5:  # Water
-            head_underwater = True
-    
     if head_underwater:
         bubble_size = 16
         bubble_spacing = 18
@@ -12256,36 +13785,22 @@ def draw_hud(player):
         for i in range(10):  # 10 bubbles for 10 oxygen
             x = bubbles_x + i * bubble_spacing
             # Draw bubble background
-            pygame.draw.rect(screen, (50, 50, 50), (x, bubbles_y, bubble_size, bubble_size))
-            pygame.draw.rect(screen, (100, 100, 100), (x, bubbles_y, bubble_size, bubble_size), 1)
+            pygame.draw.rect(layer, (50, 50, 50), (x, bubbles_y, bubble_size, bubble_size))
+            pygame.draw.rect(layer, (100, 100, 100), (x, bubbles_y, bubble_size, bubble_size), 1)
             
             # Draw filled bubble if player has oxygen
             if player.oxygen > i:
-                pygame.draw.circle(screen, (173, 216, 230), (x + bubble_size // 2, bubbles_y + bubble_size // 2), bubble_size // 2 - 2)
-                pygame.draw.circle(screen, (255, 255, 255), (x + bubble_size // 2 - 2, bubbles_y + bubble_size // 2 - 2), 2)  # Highlight
+                pygame.draw.circle(layer, (173, 216, 230), (x + bubble_size // 2, bubbles_y + bubble_size // 2), bubble_size // 2 - 2)
+                pygame.draw.circle(layer, (255, 255, 255), (x + bubble_size // 2 - 2, bubbles_y + bubble_size // 2 - 2), 2)  # Highlight
     
     # Draw Held Item Name
     held_id = player.held_block
     if held_id != 0 and held_id in BLOCK_TYPES:
         held_name = BLOCK_TYPES[held_id]["name"]
-        name_text = FONT_BIG.render(held_name, True, (255, 255, 255))
+        name_text = render_text(FONT_BIG, held_name, True, (255, 255, 255))
         name_x = SCREEN_WIDTH // 2 - name_text.get_width() // 2
         name_y = SCREEN_HEIGHT - SLOT_SIZE - 50
-        screen.blit(name_text, (name_x, name_y))
-    
-    # Draw Riding Status
-    if player.mounted_camel is not None:
-        riding_text = FONT_SMALL.render("Riding Camel - Press SHIFT to dismount", True, (255, 255, 255))
-        text_x = SCREEN_WIDTH // 2 - riding_text.get_width() // 2
-        text_y = 80
-        # Background for visibility
-        bg_rect = pygame.Rect(text_x - 5, text_y - 2, riding_text.get_width() + 10, riding_text.get_height() + 4)
-        pygame.draw.rect(screen, (0, 0, 0, 128), bg_rect)
-        screen.blit(riding_text, (text_x, text_y))
-    
-    # Draw tooltip for item on hover
-    if tooltip_item_id:
-        draw_item_tooltip(screen, tooltip_item_id, mouse_x, mouse_y)
+        layer.blit(name_text, (name_x, name_y))
     
     # Draw XP Bar (above hotbar)
     xp_bar_width = 360
@@ -12294,52 +13809,104 @@ def draw_hud(player):
     xp_bar_y = HOTBAR_Y - 20
     
     # Background
-    pygame.draw.rect(screen, (0, 0, 0), (xp_bar_x, xp_bar_y, xp_bar_width, xp_bar_height))
+    pygame.draw.rect(layer, (0, 0, 0), (xp_bar_x, xp_bar_y, xp_bar_width, xp_bar_height))
     
     # XP progress
     xp_for_next = (player.level + 1) * 10
     xp_progress = player.xp / xp_for_next if xp_for_next > 0 else 0
     xp_fill_width = int(xp_bar_width * xp_progress)
-    pygame.draw.rect(screen, (100, 255, 100), (xp_bar_x, xp_bar_y, xp_fill_width, xp_bar_height))
+    pygame.draw.rect(layer, (100, 255, 100), (xp_bar_x, xp_bar_y, xp_fill_width, xp_bar_height))
     
     # Border
-    pygame.draw.rect(screen, (255, 255, 255), (xp_bar_x, xp_bar_y, xp_bar_width, xp_bar_height), 2)
+    pygame.draw.rect(layer, (255, 255, 255), (xp_bar_x, xp_bar_y, xp_bar_width, xp_bar_height), 2)
     
     # Level text (centered on XP bar)
-    level_text = FONT_SMALL.render(f"Level {player.level}", True, (100, 255, 100))
+    level_text = render_text(FONT_SMALL, f"Level {player.level}", True, (100, 255, 100))
     level_x = xp_bar_x + (xp_bar_width - level_text.get_width()) // 2
     level_y = xp_bar_y - 15
-    screen.blit(level_text, (level_x, level_y))
+    layer.blit(level_text, (level_x, level_y))
+    
+    return layer
+
+def draw_hud(player):
+    """Draws the hotbar, health hearts, hunger bars, oxygen bubbles, and held item name."""
+    global HUD_LAYER, HUD_LAYER_KEY
+    SLOT_SIZE = 50
+    HOTBAR_START_X = (SCREEN_WIDTH - (SLOT_SIZE * 9)) // 2
+    HOTBAR_Y = SCREEN_HEIGHT - SLOT_SIZE - 10
+    
+    # Track mouse position for tooltips
+    mouse_x, mouse_y = pygame.mouse.get_pos()
+    tooltip_item_id = None
+    if HOTBAR_Y <= mouse_y < HOTBAR_Y + SLOT_SIZE and HOTBAR_START_X <= mouse_x < HOTBAR_START_X + SLOT_SIZE * 9:
+        item_id = player.hotbar_slots[(mouse_x - HOTBAR_START_X) // SLOT_SIZE][0]
+        if item_id != 0 and item_id in BLOCK_TYPES:
+            tooltip_item_id = item_id
+    
+    # Oxygen bubbles are only shown while the player's head is underwater
+    head_col = player.rect.centerx // BLOCK_SIZE
+    head_row = (player.rect.top + 5) // BLOCK_SIZE
+    head_underwater = False
+    
+    if 0 <= head_row < GRID_HEIGHT and 0 <= head_col < GRID_WIDTH:
+        if WORLD_MAP[head_row][head_col] == 5:  # Water
+            head_underwater = True
+    
+    # Rebuild the cached HUD layer only when one of its inputs changed
+    total_armor = get_total_armor(player)
+    hud_key = (SCREEN_WIDTH, SCREEN_HEIGHT, player.health, player.hunger, total_armor,
+               player.oxygen if head_underwater else None, player.hotbar_version,
+               player.active_slot, player.held_block, player.xp, player.level, USE_EXPERIMENTAL_TEXTURES)
+    if HUD_LAYER is None or hud_key != HUD_LAYER_KEY:
+        HUD_LAYER = build_hud_layer(player, total_armor, head_underwater)
+        HUD_LAYER_KEY = hud_key
+    # Everything on the layer sits in the bottom strip (held item name is the highest element)
+    hud_top = max(0, SCREEN_HEIGHT - SLOT_SIZE - 60)
+    screen.blit(HUD_LAYER, (0, hud_top), pygame.Rect(0, hud_top, SCREEN_WIDTH, SCREEN_HEIGHT - hud_top))
+    
+    # Draw Riding Status
+    if player.mounted_camel is not None:
+        riding_text = render_text(FONT_SMALL, "Riding Camel - Press SHIFT to dismount", True, (255, 255, 255))
+        text_x = SCREEN_WIDTH // 2 - riding_text.get_width() // 2
+        text_y = 80
+        # Background for visibility
+        bg_rect = pygame.Rect(text_x - 5, text_y - 2, riding_text.get_width() + 10, riding_text.get_height() + 4)
+        pygame.draw.rect(screen, (0, 0, 0, 128), bg_rect)
+        screen.blit(riding_text, (text_x, text_y))
+    
+    # Draw tooltip for item on hover
+    if tooltip_item_id:
+        draw_item_tooltip(screen, tooltip_item_id, mouse_x, mouse_y)
     
     # Draw Movement Status Indicators (top right)
     status_x = SCREEN_WIDTH - 150
     status_y = 10
     
     if player.is_sprinting:
-        sprint_text = FONT_SMALL.render("SPRINTING", True, (0, 255, 0))
+        sprint_text = render_text(FONT_SMALL, "SPRINTING", True, (0, 255, 0))
         screen.blit(sprint_text, (status_x, status_y))
         status_y += 20
     
     if player.is_crouching:
-        crouch_text = FONT_SMALL.render("CROUCHING", True, (255, 165, 0))
+        crouch_text = render_text(FONT_SMALL, "CROUCHING", True, (255, 165, 0))
         screen.blit(crouch_text, (status_x, status_y))
         status_y += 20
     
     # Draw Creative Mode indicator
     if player.creative_mode:
-        creative_text = FONT_SMALL.render("CREATIVE MODE", True, (100, 200, 255))
+        creative_text = render_text(FONT_SMALL, "CREATIVE MODE", True, (100, 200, 255))
         screen.blit(creative_text, (status_x, status_y))
         status_y += 20
     
     # Draw Flying indicator
     if player.is_flying:
-        flying_text = FONT_SMALL.render("FLYING", True, (255, 255, 100))
+        flying_text = render_text(FONT_SMALL, "FLYING", True, (255, 255, 100))
         screen.blit(flying_text, (status_x, status_y))
         status_y += 20
     
     # Draw Poison Status
     if player.poisoned and player.poison_timer > 0:
-        poison_text = FONT_SMALL.render("POISONED", True, (100, 255, 100))
+        poison_text = render_text(FONT_SMALL, "POISONED", True, (100, 255, 100))
         # Add background for visibility
         poison_bg = pygame.Rect(status_x - 5, status_y - 2, poison_text.get_width() + 10, poison_text.get_height() + 4)
         pygame.draw.rect(screen, (0, 100, 0, 128), poison_bg)
@@ -12382,8 +13949,9 @@ def draw_hud(player):
         biome_name = "Unknown"
     
     # Draw background for readability (show column instead of block position)
+    # Per-frame values (coordinates, counts, distances) use font.render: render_text is for stable labels
     coords_text = FONT_SMALL.render(f"X: {absolute_x}  Y: {player_block_y}", True, (255, 255, 255))
-    biome_text = FONT_SMALL.render(f"Biome: {biome_name}", True, (255, 255, 255))
+    biome_text = render_text(FONT_SMALL, f"Biome: {biome_name}", True, (255, 255, 255))
     
     # Get hovered block name
     mouse_x, mouse_y = pygame.mouse.get_pos()
@@ -12402,7 +13970,7 @@ def draw_hud(player):
             if hovered_block_id in BLOCK_TYPES:
                 hovered_block_name = BLOCK_TYPES[hovered_block_id]["name"]
     
-    block_text = FONT_SMALL.render(f"Block: {hovered_block_name}", True, (255, 255, 255))
+    block_text = render_text(FONT_SMALL, f"Block: {hovered_block_name}", True, (255, 255, 255))
     
     # Mob count info
     mob_count_text = FONT_SMALL.render(f"Mobs: {len(MOBS)}", True, (200, 200, 255))
@@ -12421,7 +13989,8 @@ def draw_hud(player):
     # Draw FPS Counter below coordinates panel
     fps_y = coords_y + coords_text.get_height() + biome_text.get_height() + block_text.get_height() + mob_count_text.get_height() + 10
     fps = int(clock.get_fps())
-    fps_text = FONT_SMALL.render(f"FPS: {fps}", True, (255, 255, 0))
+    # Changes nearly every frame, so it bypasses the text cache (it would only evict stable labels)
+    fps_text = FONT_SMALL.render(f"FPS: {fps}  Quality: {QUALITY['name']} ({FRAME_TIME_AVG_MS:.1f} ms)", True, (255, 255, 0))
     fps_bg_rect = pygame.Rect(coords_x - 5, fps_y - 2, fps_text.get_width() + 10, fps_text.get_height() + 4)
     pygame.draw.rect(screen, (0, 0, 0, 180), fps_bg_rect)
     screen.blit(fps_text, (coords_x, fps_y))
@@ -12528,7 +14097,7 @@ def draw_hud(player):
         mob_name = nearest_any.__class__.__name__
         any_color = (200, 200, 200)  # Gray
         
-        any_text = FONT_SMALL.render(f"Nearest: {mob_name}", True, any_color)
+        any_text = render_text(FONT_SMALL, f"Nearest: {mob_name}", True, any_color)
         
         # Draw background
         any_bg = pygame.Rect(coords_x - 5, tracker_y - 5, any_text.get_width() + 10, any_text.get_height() + 10)
@@ -12542,7 +14111,7 @@ def draw_hud(player):
     notification_y = coords_y + coords_text.get_height() + biome_text.get_height() + block_text.get_height() + 10
     for notification in STRUCTURE_NOTIFICATIONS[:]:
         struct_name, struct_col, timer = notification
-        notif_text = FONT_SMALL.render(f"{struct_name} at X: {struct_col}", True, (255, 255, 0))
+        notif_text = render_text(FONT_SMALL, f"{struct_name} at X: {struct_col}", True, (255, 255, 0))
         
         # Draw background
         notif_bg = pygame.Rect(coords_x - 5, notification_y - 5, notif_text.get_width() + 10, notif_text.get_height() + 10)
@@ -12575,26 +14144,13 @@ def get_craftable_item():
     if not grid_contents:
         return None
     
-    # Check each recipe to see if we have EXACT match
-    for recipe_ingredients, (output_id, output_count) in CRAFTING_RECIPES.items():
-        # Convert recipe to dict for easier comparison
-        recipe_dict = dict(recipe_ingredients)
-        
-        # Check if grid contents EXACTLY match recipe (same items and same amounts)
-        if len(grid_contents) != len(recipe_dict):
-            continue
-        
-        exact_match = True
-        for required_id, required_count in recipe_dict.items():
-            if required_id not in grid_contents or grid_contents[required_id] != required_count:
-                exact_match = False
-                break
-        
-        if exact_match:
-            # Return output without multiplier - exact recipe only
-            return (output_id, output_count)
-    
-    return None
+    return match_shapeless_recipe(CRAFTING_RECIPE_INDEX, grid_contents)
+
+def consume_crafting_grid():
+    """Uses up the 2x2 crafting grid after a craft (recipes match exact amounts, so every slot is consumed)."""
+    for i in range(4):
+        CRAFTING_GRID[i] = 0
+        CRAFTING_AMOUNTS[i] = 0
 
 def draw_crafting_menu(player):
     """Draws the crafting menu overlay with a 2x2 grid."""
@@ -12608,7 +14164,7 @@ def draw_crafting_menu(player):
     screen.blit(overlay, (0, 0))
     
     # 2. Draw Menu Title
-    title_text = FONT_BIG.render("Crafting", True, (255, 255, 255))
+    title_text = render_text(FONT_BIG, "Crafting", True, (255, 255, 255))
     title_x = SCREEN_WIDTH // 2 - title_text.get_width() // 2
     title_y = 50
     screen.blit(title_text, (title_x, title_y))
@@ -12641,7 +14197,7 @@ def draw_crafting_menu(player):
             
             # Draw amount if more than 1
             if amount > 1:
-                count_text = FONT_SMALL.render(str(amount), True, (255, 255, 255))
+                count_text = render_text(FONT_SMALL, str(amount), True, (255, 255, 255))
                 screen.blit(count_text, (slot_x + SLOT_SIZE - count_text.get_width() - 2, 
                                        slot_y + SLOT_SIZE - count_text.get_height() - 2))
 
@@ -12670,7 +14226,7 @@ def draw_crafting_menu(player):
             
             # Draw output count
             if output_count > 1:
-                count_text = FONT_SMALL.render(str(output_count), True, (255, 255, 255))
+                count_text = render_text(FONT_SMALL, str(output_count), True, (255, 255, 255))
                 screen.blit(count_text, (output_rect.x + SLOT_SIZE - count_text.get_width() - 2, 
                                        output_rect.y + SLOT_SIZE - count_text.get_height() - 2))
     else:
@@ -12686,7 +14242,7 @@ def draw_crafting_menu(player):
     
     inst_y = MENU_Y + 200
     for line in instructions:
-        inst_text = FONT_SMALL.render(line, True, (255, 255, 255))
+        inst_text = render_text(FONT_SMALL, line, True, (255, 255, 255))
         inst_x = SCREEN_WIDTH // 2 - inst_text.get_width() // 2
         screen.blit(inst_text, (inst_x, inst_y))
         inst_y += 20
@@ -12703,7 +14259,7 @@ def draw_creative_inventory(player):
     screen.blit(overlay, (0, 0))
     
     # Title
-    title_text = FONT_BIG.render("Creative Mode - Item Browser", True, (100, 200, 255))
+    title_text = render_text(FONT_BIG, "Creative Mode - Item Browser", True, (100, 200, 255))
     screen.blit(title_text, (SCREEN_WIDTH // 2 - title_text.get_width() // 2, 20))
     
     # Category tabs
@@ -12726,7 +14282,7 @@ def draw_creative_inventory(player):
             pygame.draw.rect(screen, (100, 100, 100), tab_rect, 2)
         
         # Tab text
-        tab_text = FONT_SMALL.render(cat_name, True, (255, 255, 255))
+        tab_text = render_text(FONT_SMALL, cat_name, True, (255, 255, 255))
         text_x = tab_x + tab_width // 2 - tab_text.get_width() // 2
         text_y = tab_y + tab_height // 2 - tab_text.get_height() // 2
         screen.blit(tab_text, (text_x, text_y))
@@ -12814,9 +14370,25 @@ def draw_creative_inventory(player):
         draw_item_tooltip(screen, tooltip_item_id, mouse_x, mouse_y)
     
     # Instructions
-    inst_text = FONT_SMALL.render("Click item to add to hotbar | Scroll to browse | Tab to close", True, (200, 200, 200))
+    inst_text = render_text(FONT_SMALL, "Click item to add to hotbar | Scroll to browse | Tab to close", True, (200, 200, 200))
     screen.blit(inst_text, (SCREEN_WIDTH // 2 - inst_text.get_width() // 2, SCREEN_HEIGHT - 70))
 
+def draw_recipe_book_panel(screen, outputs, x, y, width):
+    """Draws a "Can craft" list of recipe outputs as a wrapping row of item icons."""
+    title = render_text(FONT_SMALL, "Can craft:" if outputs else "Can craft: nothing yet", True, (255, 255, 255))
+    screen.blit(title, (x, y))
+    icon_size = 28
+    per_row = max(1, width // (icon_size + 4))
+    for i, (item_id, count) in enumerate(outputs):
+        icon_x = x + (i % per_row) * (icon_size + 4)
+        icon_y = y + 22 + (i // per_row) * (icon_size + 4)
+        pygame.draw.rect(screen, (80, 80, 80), (icon_x, icon_y, icon_size, icon_size))
+        if item_id in BLOCK_TYPES:
+            draw_block_sprite(screen, pygame.Rect(icon_x + 2, icon_y + 2, icon_size - 4, icon_size - 4), item_id)
+        if count > 1:
+            count_text = render_text(FONT_SMALL, str(count), True, (255, 255, 255))
+            screen.blit(count_text, (icon_x + icon_size - count_text.get_width(), icon_y + icon_size - count_text.get_height()))
+
 def draw_inventory_menu(player):
     """Draws a Minecraft-style inventory menu with crafting area and clickable slots."""
     global INVENTORY_SLOT_RECTS
@@ -12829,7 +14401,7 @@ def draw_inventory_menu(player):
     screen.blit(overlay, (0, 0))
     
     # 2. Draw Menu Title
-    title_text = FONT_BIG.render("Inventory", True, (255, 255, 255))
+    title_text = render_text(FONT_BIG, "Inventory", True, (255, 255, 255))
     title_x = SCREEN_WIDTH // 2 - title_text.get_width() // 2
     title_y = 30
     screen.blit(title_text, (title_x, title_y))
@@ -12837,7 +14409,7 @@ def draw_inventory_menu(player):
     SLOT_SIZE = max(35, min(45, SCREEN_HEIGHT // 15))  # Scale with screen size
     
     # 3. Draw Crafting Area (2x2 grid on the left)
-    craft_title = FONT_SMALL.render("Crafting:", True, (255, 255, 255))
+    craft_title = render_text(FONT_SMALL, "Crafting:", True, (255, 255, 255))
     craft_x = 100
     craft_y = 100
     screen.blit(craft_title, (craft_x, craft_y))
@@ -12863,7 +14435,7 @@ def draw_inventory_menu(player):
             inner_rect = pygame.Rect(slot_x + item_offset, slot_y + item_offset, item_size, item_size)
             draw_block_sprite(screen, inner_rect, item_id)
             if CRAFTING_AMOUNTS[i] > 1:
-                count_text = FONT_SMALL.render(str(CRAFTING_AMOUNTS[i]), True, (255, 255, 255))
+                count_text = render_text(FONT_SMALL, str(CRAFTING_AMOUNTS[i]), True, (255, 255, 255))
                 screen.blit(count_text, (slot_x + SLOT_SIZE - count_text.get_width() - 2, 
                                        slot_y + SLOT_SIZE - count_text.get_height() - 2))
     
@@ -12881,14 +14453,14 @@ def draw_inventory_menu(player):
             inner_rect = pygame.Rect(output_x + 3, output_y + 3, SLOT_SIZE - 6, SLOT_SIZE - 6)
             draw_block_sprite(screen, inner_rect, output_id)
             if output_count > 1:
-                count_text = FONT_SMALL.render(str(output_count), True, (255, 255, 255))
+                count_text = render_text(FONT_SMALL, str(output_count), True, (255, 255, 255))
                 screen.blit(count_text, (output_x + SLOT_SIZE - count_text.get_width() - 2, 
                                        output_y + SLOT_SIZE - count_text.get_height() - 2))
     else:
         pygame.draw.rect(screen, (100, 100, 100), output_rect, 2)
     
     # --- Armor Slots (below crafting grid) ---
-    armor_title = FONT_SMALL.render("Armor:", True, (255, 255, 255))
+    armor_title = render_text(FONT_SMALL, "Armor:", True, (255, 255, 255))
     armor_x = craft_x
     armor_y = craft_y + 135
     screen.blit(armor_title, (armor_x, armor_y))
@@ -12916,11 +14488,11 @@ def draw_inventory_menu(player):
             draw_block_sprite(screen, inner_rect, armor_id)
         
         # Draw label
-        label_text = FONT_SMALL.render(label, True, (200, 200, 200))
+        label_text = render_text(FONT_SMALL, label, True, (200, 200, 200))
         screen.blit(label_text, (slot_x + SLOT_SIZE + 5, slot_y + SLOT_SIZE // 2 - label_text.get_height() // 2))
     
     # 4. Draw Main Inventory Grid (9 columns x 3 rows on the right)
-    inv_title = FONT_SMALL.render("Inventory:", True, (255, 255, 255))
+    inv_title = render_text(FONT_SMALL, "Inventory:", True, (255, 255, 255))
     START_X = 300
     START_Y = 100
     screen.blit(inv_title, (START_X, START_Y))
@@ -12946,13 +14518,13 @@ def draw_inventory_menu(player):
                 inner_rect = pygame.Rect(slot_x + item_offset, slot_y + item_offset, item_size, item_size)
                 draw_block_sprite(screen, inner_rect, item_id)
                 if stack_amount > 1:
-                    count_text = FONT_SMALL.render(str(stack_amount), True, (255, 255, 255))
+                    count_text = render_text(FONT_SMALL, str(stack_amount), True, (255, 255, 255))
                     screen.blit(count_text, (slot_x + SLOT_SIZE - count_text.get_width() - 2, 
                                            slot_y + SLOT_SIZE - count_text.get_height() - 2))
     
     # 5. Draw Hotbar Section
     hotbar_y = START_Y + 3 * (SLOT_SIZE + 5) + 40
-    hotbar_text = FONT_SMALL.render("Hotbar (1-9):", True, (255, 255, 255))
+    hotbar_text = render_text(FONT_SMALL, "Hotbar (1-9):", True, (255, 255, 255))
     screen.blit(hotbar_text, (START_X, hotbar_y))
     
     hotbar_y += 25
@@ -12977,7 +14549,7 @@ def draw_inventory_menu(player):
             sprite_rect = pygame.Rect(slot_x + 3 + sprite_offset, slot_y + 3 + sprite_offset, sprite_size, sprite_size)
             draw_block_sprite(screen, sprite_rect, item_id)
             if stack_count > 1:
-                count_text = FONT_SMALL.render(str(stack_count), True, (255, 255, 255))
+                count_text = render_text(FONT_SMALL, str(stack_count), True, (255, 255, 255))
                 screen.blit(count_text, (slot_x + SLOT_SIZE - count_text.get_width() - 2, 
                                        slot_y + SLOT_SIZE - count_text.get_height() - 2))
     
@@ -12991,7 +14563,7 @@ def draw_inventory_menu(player):
             draw_block_sprite(screen, held_rect, held_id)
             pygame.draw.rect(screen, (255, 255, 255), held_rect, 2)
             if held_count > 1:
-                count_text = FONT_SMALL.render(str(held_count), True, (255, 255, 255))
+                count_text = render_text(FONT_SMALL, str(held_count), True, (255, 255, 255))
                 screen.blit(count_text, (mouse_x - 10, mouse_y + 15))
     
     # 7. Draw Instructions
@@ -13003,10 +14575,13 @@ def draw_inventory_menu(player):
     
     inst_y = hotbar_y + SLOT_SIZE + 20
     for line in instructions:
-        inst_text = FONT_SMALL.render(line, True, (200, 200, 200))
+        inst_text = render_text(FONT_SMALL, line, True, (200, 200, 200))
         inst_x = SCREEN_WIDTH // 2 - inst_text.get_width() // 2
         screen.blit(inst_text, (inst_x, inst_y))
         inst_y += 20
+    
+    # 8. Draw Recipe Book
+    draw_recipe_book_panel(screen, player.recipe_book.craftable_outputs("inventory"), craft_x, inst_y + 10, SCREEN_WIDTH - 2 * craft_x)
 
 def handle_crafting_interaction(player, event):
     """Handles clicks inside the crafting menu using drag-and-drop with HELD_ITEM."""
@@ -13069,21 +14644,8 @@ def handle_crafting_interaction(player, event):
             if output_id == 32:  # Crafting Table
                 unlock_achievement("benchmarking", player)
             
-            # Find the matching recipe to consume exact amounts
-            for recipe_ingredients, (recipe_output_id, recipe_output_count) in CRAFTING_RECIPES.items():
-                recipe_dict = dict(recipe_ingredients)
-                
-                if recipe_output_id == output_id:
-                    # Consume the exact recipe amounts
-                    for i in range(4):
-                        if CRAFTING_GRID[i] != 0:
-                            item_id = CRAFTING_GRID[i]
-                            if item_id in recipe_dict:
-                                CRAFTING_AMOUNTS[i] -= recipe_dict[item_id]
-                                if CRAFTING_AMOUNTS[i] <= 0:
-                                    CRAFTING_GRID[i] = 0
-                                    CRAFTING_AMOUNTS[i] = 0
-                    break
+            # Consume the exact recipe amounts
+            consume_crafting_grid()
             
             # Add the crafted item to the player's inventory
             player.add_to_inventory(output_id, output_count)
@@ -13146,32 +14708,8 @@ def handle_inventory_interaction(player, event):
                     if craftable:
                         output_id, output_count = craftable
                         
-                        # Find the matching recipe to consume ingredients
-                        grid_contents = {}
-                        for i in range(4):
-                            item_id = CRAFTING_GRID[i]
-                            amount = CRAFTING_AMOUNTS[i]
-                            if item_id != 0 and amount > 0:
-                                if item_id in grid_contents:
-                                    grid_contents[item_id] += amount
-                                else:
-                                    grid_contents[item_id] = amount
-                        
-                        # Find matching recipe and consume exact amounts
-                        for recipe_ingredients, (recipe_output_id, recipe_output_count) in CRAFTING_RECIPES.items():
-                            recipe_dict = dict(recipe_ingredients)
-                            
-                            if recipe_output_id == output_id:
-                                # Consume the exact recipe amounts
-                                for i in range(4):
-                                    if CRAFTING_GRID[i] != 0:
-                                        item_id = CRAFTING_GRID[i]
-                                        if item_id in recipe_dict:
-                                            CRAFTING_AMOUNTS[i] -= recipe_dict[item_id]
-                                            if CRAFTING_AMOUNTS[i] <= 0:
-                                                CRAFTING_GRID[i] = 0
-                                                CRAFTING_AMOUNTS[i] = 0
-                                break
+                        # Consume the exact recipe amounts
+                        consume_crafting_grid()
                         
                         player.add_to_inventory(output_id, output_count)
             
@@ -13299,16 +14837,16 @@ def draw_trading_menu(player):
     
     # Title
     villager_type_name = villager.villager_type.capitalize()
-    title_text = FONT_BIG.render(f"Trading with {villager_type_name}", True, (255, 255, 255))
+    title_text = render_text(FONT_BIG, f"Trading with {villager_type_name}", True, (255, 255, 255))
     screen.blit(title_text, (menu_x + (menu_width - title_text.get_width()) // 2, menu_y + 10))
     
     # Close instruction
-    close_text = FONT_SMALL.render("Press ESC to close", True, (200, 200, 200))
+    close_text = render_text(FONT_SMALL, "Press ESC to close", True, (200, 200, 200))
     screen.blit(close_text, (menu_x + (menu_width - close_text.get_width()) // 2, menu_y + menu_height - 30))
     
     # Trades
     if villager.villager_type == "nitwit":
-        no_trade_text = FONT_SMALL.render("This villager doesn't trade!", True, (255, 100, 100))
+        no_trade_text = render_text(FONT_SMALL, "This villager doesn't trade!", True, (255, 100, 100))
         screen.blit(no_trade_text, (menu_x + (menu_width - no_trade_text.get_width()) // 2, menu_y + 120))
     else:
         # Define trades based on type
@@ -13332,29 +14870,29 @@ def draw_trading_menu(player):
             pygame.draw.rect(screen, (150, 130, 100), (menu_x + 20, trade_box_y, menu_width - 40, trade_box_height), 2)
             
             # Trade text
-            trade_text = FONT_SMALL.render(trade["name"], True, (255, 255, 255))
+            trade_text = render_text(FONT_SMALL, trade["name"], True, (255, 255, 255))
             screen.blit(trade_text, (menu_x + 40, trade_box_y + 10))
             
             # Draw give item
             give_id, give_count = trade["give"]
             give_color = BLOCK_TYPES[give_id]["color"]
             pygame.draw.rect(screen, give_color, (menu_x + 50, trade_box_y + 35, 30, 30))
-            give_text = FONT_SMALL.render(f"x{give_count}", True, (255, 255, 255))
+            give_text = render_text(FONT_SMALL, f"x{give_count}", True, (255, 255, 255))
             screen.blit(give_text, (menu_x + 85, trade_box_y + 40))
             
             # Arrow
-            arrow_text = FONT_BIG.render("→", True, (255, 255, 255))
+            arrow_text = render_text(FONT_BIG, "→", True, (255, 255, 255))
             screen.blit(arrow_text, (menu_x + menu_width // 2 - 15, trade_box_y + 35))
             
             # Draw get item
             get_id, get_count = trade["get"]
             get_color = BLOCK_TYPES[get_id]["color"]
             pygame.draw.rect(screen, get_color, (menu_x + menu_width - 120, trade_box_y + 35, 30, 30))
-            get_text = FONT_SMALL.render(f"x{get_count}", True, (255, 255, 255))
+            get_text = render_text(FONT_SMALL, f"x{get_count}", True, (255, 255, 255))
             screen.blit(get_text, (menu_x + menu_width - 85, trade_box_y + 40))
             
             # Click to trade button
-            button_text = FONT_SMALL.render("CLICK TO TRADE", True, (0, 255, 0))
+            button_text = render_text(FONT_SMALL, "CLICK TO TRADE", True, (0, 255, 0))
             button_rect = button_text.get_rect(center=(menu_x + menu_width // 2, trade_box_y + trade_box_height - 15))
             screen.blit(button_text, button_rect)
 
@@ -13388,7 +14926,9 @@ def handle_trading_interaction(player, event):
 
 def draw_furnace_gui(screen, player):
     """Draws the furnace smelting GUI."""
-    global FURNACE_INPUT, FURNACE_FUEL, FURNACE_OUTPUT, FURNACE_PROGRESS
+    furnace = get_block_entity(*FURNACE_POS)
+    if furnace is None:
+        return
     
     menu_width = 300
     menu_height = 350
@@ -13400,11 +14940,11 @@ def draw_furnace_gui(screen, player):
     pygame.draw.rect(screen, (60, 60, 60), (menu_x, menu_y, menu_width, menu_height), 4)
     
     # Title
-    title_text = FONT_BIG.render("Furnace", True, (255, 255, 255))
+    title_text = render_text(FONT_BIG, "Furnace", True, (255, 255, 255))
     screen.blit(title_text, (menu_x + (menu_width - title_text.get_width()) // 2, menu_y + 10))
     
     # Close instruction
-    close_text = FONT_SMALL.render("Press E or ESC to close", True, (200, 200, 200))
+    close_text = render_text(FONT_SMALL, "Press E or ESC to close", True, (200, 200, 200))
     screen.blit(close_text, (menu_x + (menu_width - close_text.get_width()) // 2, menu_y + menu_height - 30))
     
     # Slot positions
@@ -13419,25 +14959,25 @@ def draw_furnace_gui(screen, player):
     # Draw Input slot (top)
     pygame.draw.rect(screen, (50, 50, 50), (input_x, input_y, slot_size, slot_size))
     pygame.draw.rect(screen, (150, 150, 150), (input_x, input_y, slot_size, slot_size), 2)
-    input_label = FONT_SMALL.render("Input", True, (255, 255, 255))
+    input_label = render_text(FONT_SMALL, "Input", True, (255, 255, 255))
     screen.blit(input_label, (input_x, input_y - 20))
-    if FURNACE_INPUT[0] != 0:
-        color = BLOCK_TYPES[FURNACE_INPUT[0]]["color"]
+    if furnace.input[0] != 0:
+        color = BLOCK_TYPES[furnace.input[0]]["color"]
         pygame.draw.rect(screen, color, (input_x + 5, input_y + 5, slot_size - 10, slot_size - 10))
-        if FURNACE_INPUT[1] > 1:
-            count_text = FONT_SMALL.render(str(FURNACE_INPUT[1]), True, (255, 255, 255))
+        if furnace.input[1] > 1:
+            count_text = render_text(FONT_SMALL, str(furnace.input[1]), True, (255, 255, 255))
             screen.blit(count_text, (input_x + slot_size - 15, input_y + slot_size - 15))
     
     # Draw Fuel slot (bottom)
     pygame.draw.rect(screen, (50, 50, 50), (fuel_x, fuel_y, slot_size, slot_size))
     pygame.draw.rect(screen, (150, 150, 150), (fuel_x, fuel_y, slot_size, slot_size), 2)
-    fuel_label = FONT_SMALL.render("Fuel", True, (255, 255, 255))
+    fuel_label = render_text(FONT_SMALL, "Fuel", True, (255, 255, 255))
     screen.blit(fuel_label, (fuel_x, fuel_y - 20))
-    if FURNACE_FUEL[0] != 0:
-        color = BLOCK_TYPES[FURNACE_FUEL[0]]["color"]
+    if furnace.fuel[0] != 0:
+        color = BLOCK_TYPES[furnace.fuel[0]]["color"]
         pygame.draw.rect(screen, color, (fuel_x + 5, fuel_y + 5, slot_size - 10, slot_size - 10))
-        if FURNACE_FUEL[1] > 1:
-            count_text = FONT_SMALL.render(str(FURNACE_FUEL[1]), True, (255, 255, 255))
+        if furnace.fuel[1] > 1:
+            count_text = render_text(FONT_SMALL, str(furnace.fuel[1]), True, (255, 255, 255))
             screen.blit(count_text, (fuel_x + slot_size - 15, fuel_y + slot_size - 15))
     
     # Draw arrow (progress indicator)
@@ -13447,8 +14987,8 @@ def draw_furnace_gui(screen, player):
         (arrow_x, arrow_y), (arrow_x + 40, arrow_y + 15), (arrow_x, arrow_y + 30)
     ])
     # Progress fill
-    if FURNACE_PROGRESS > 0:
-        progress_width = int(40 * (FURNACE_PROGRESS / 100))
+    if furnace.progress > 0:
+        progress_width = int(40 * (furnace.progress / 100))
         pygame.draw.polygon(screen, (255, 150, 0), [
             (arrow_x, arrow_y), (arrow_x + progress_width, arrow_y + 15 * (progress_width / 40)), 
             (arrow_x, arrow_y + 30 * (progress_width / 40))
@@ -13457,13 +14997,13 @@ def draw_furnace_gui(screen, player):
     # Draw Output slot (right)
     pygame.draw.rect(screen, (50, 50, 50), (output_x, output_y, slot_size, slot_size))
     pygame.draw.rect(screen, (150, 150, 150), (output_x, output_y, slot_size, slot_size), 2)
-    output_label = FONT_SMALL.render("Output", True, (255, 255, 255))
+    output_label = render_text(FONT_SMALL, "Output", True, (255, 255, 255))
     screen.blit(output_label, (output_x, output_y - 20))
-    if FURNACE_OUTPUT[0] != 0:
-        color = BLOCK_TYPES[FURNACE_OUTPUT[0]]["color"]
+    if furnace.output[0] != 0:
+        color = BLOCK_TYPES[furnace.output[0]]["color"]
         pygame.draw.rect(screen, color, (output_x + 5, output_y + 5, slot_size - 10, slot_size - 10))
-        if FURNACE_OUTPUT[1] > 1:
-            count_text = FONT_SMALL.render(str(FURNACE_OUTPUT[1]), True, (255, 255, 255))
+        if furnace.output[1] > 1:
+            count_text = render_text(FONT_SMALL, str(furnace.output[1]), True, (255, 255, 255))
             screen.blit(count_text, (output_x + slot_size - 15, output_y + slot_size - 15))
     
     # Draw dragged item if any
@@ -13472,59 +15012,18 @@ def draw_furnace_gui(screen, player):
         color = BLOCK_TYPES[HELD_ITEM[0]]["color"]
         pygame.draw.rect(screen, color, (mouse_x - 15, mouse_y - 15, 30, 30))
         if HELD_ITEM[1] > 1:
-            count_text = FONT_SMALL.render(str(HELD_ITEM[1]), True, (255, 255, 255))
+            count_text = render_text(FONT_SMALL, str(HELD_ITEM[1]), True, (255, 255, 255))
             screen.blit(count_text, (mouse_x, mouse_y))
 
-def update_furnace():
-    """Updates furnace smelting progress."""
-    global FURNACE_INPUT, FURNACE_FUEL, FURNACE_OUTPUT, FURNACE_PROGRESS, FURNACE_FUEL_TIME
-    
-    # Check if we have fuel burning
-    if FURNACE_FUEL_TIME > 0:
-        FURNACE_FUEL_TIME -= 1
-    
-    # Check if we can start smelting
-    if FURNACE_INPUT[0] != 0 and FURNACE_INPUT[0] in SMELTING_RECIPES:
-        # Need fuel to smelt
-        if FURNACE_FUEL_TIME <= 0 and FURNACE_FUEL[0] != 0 and FURNACE_FUEL[0] in FUEL_ITEMS:
-            # Consume 1 fuel
-            fuel_id = FURNACE_FUEL[0]
-            FURNACE_FUEL = (fuel_id, FURNACE_FUEL[1] - 1)
-            if FURNACE_FUEL[1] <= 0:
-                FURNACE_FUEL = (0, 0)
-            FURNACE_FUEL_TIME = FUEL_ITEMS[fuel_id]
-        
-        # Smelt if we have fuel burning
-        if FURNACE_FUEL_TIME > 0:
-            FURNACE_PROGRESS += 2  # Progress speed (100 / 50 = 2 per frame for ~1 second smelting)
-            
-            if FURNACE_PROGRESS >= 100:
-                # Smelting complete!
-                output_id = SMELTING_RECIPES[FURNACE_INPUT[0]]
-                FURNACE_INPUT = (FURNACE_INPUT[0], FURNACE_INPUT[1] - 1)
-                if FURNACE_INPUT[1] <= 0:
-                    FURNACE_INPUT = (0, 0)
-                
-                # Add to output
-                if FURNACE_OUTPUT[0] == 0 or FURNACE_OUTPUT[0] == output_id:
-                    FURNACE_OUTPUT = (output_id, FURNACE_OUTPUT[1] + 1)
-                
-                # Achievement trigger - smelted iron ore
-                if output_id == 108:  # Iron Ingot
-                    if 'player' in globals():
-                        unlock_achievement("acquire_hardware", player)
-                
-                FURNACE_PROGRESS = 0
-    else:
-        # No valid input, reset progress
-        FURNACE_PROGRESS = 0
-
 def handle_furnace_click(player, event):
     """Handles mouse clicks in the furnace GUI."""
-    global FURNACE_INPUT, FURNACE_FUEL, FURNACE_OUTPUT, HELD_ITEM
+    global HELD_ITEM
     
     if event.button != 1:  # Only left click
         return
+    furnace = get_block_entity(*FURNACE_POS)
+    if furnace is None:
+        return
     
     menu_width = 300
     menu_height = 350
@@ -13539,34 +15038,37 @@ def handle_furnace_click(player, event):
     
     # Input slot click
     if input_rect.collidepoint(mouse_x, mouse_y):
-        if HELD_ITEM[0] == 0 and FURNACE_INPUT[0] != 0:
+        if HELD_ITEM[0] == 0 and furnace.input[0] != 0:
             # Pick up from input
-            HELD_ITEM = FURNACE_INPUT
-            FURNACE_INPUT = (0, 0)
+            HELD_ITEM = furnace.input
+            furnace.input = (0, 0)
         elif HELD_ITEM[0] != 0:
             # Place in input
-            if FURNACE_INPUT[0] == 0 or FURNACE_INPUT[0] == HELD_ITEM[0]:
-                FURNACE_INPUT = (HELD_ITEM[0], FURNACE_INPUT[1] + HELD_ITEM[1])
+            if furnace.input[0] == 0 or furnace.input[0] == HELD_ITEM[0]:
+                furnace.input = (HELD_ITEM[0], furnace.input[1] + HELD_ITEM[1])
                 HELD_ITEM = (0, 0)
     
     # Fuel slot click
     elif fuel_rect.collidepoint(mouse_x, mouse_y):
-        if HELD_ITEM[0] == 0 and FURNACE_FUEL[0] != 0:
+        if HELD_ITEM[0] == 0 and furnace.fuel[0] != 0:
             # Pick up from fuel
-            HELD_ITEM = FURNACE_FUEL
-            FURNACE_FUEL = (0, 0)
+            HELD_ITEM = furnace.fuel
+            furnace.fuel = (0, 0)
         elif HELD_ITEM[0] != 0 and HELD_ITEM[0] in FUEL_ITEMS:
             # Place in fuel (only if it's a valid fuel)
-            if FURNACE_FUEL[0] == 0 or FURNACE_FUEL[0] == HELD_ITEM[0]:
-                FURNACE_FUEL = (HELD_ITEM[0], FURNACE_FUEL[1] + HELD_ITEM[1])
+            if furnace.fuel[0] == 0 or furnace.fuel[0] == HELD_ITEM[0]:
+                furnace.fuel = (HELD_ITEM[0], furnace.fuel[1] + HELD_ITEM[1])
                 HELD_ITEM = (0, 0)
     
     # Output slot click
     elif output_rect.collidepoint(mouse_x, mouse_y):
-        if HELD_ITEM[0] == 0 and FURNACE_OUTPUT[0] != 0:
+        if HELD_ITEM[0] == 0 and furnace.output[0] != 0:
             # Pick up from output
-            HELD_ITEM = FURNACE_OUTPUT
-            FURNACE_OUTPUT = (0, 0)
+            HELD_ITEM = furnace.output
+            furnace.output = (0, 0)
+    
+    # Slot changes can start or stop smelting
+    schedule_block_entity(furnace)
 
 def get_sky_color():
     """Returns NETHER sky color - always dark red/brown regardless of time."""
@@ -13585,7 +15087,7 @@ def draw_crafting_table_gui(screen, player):
     pygame.draw.rect(screen, (0, 0, 0), (menu_x, menu_y, menu_width, menu_height), 3)
     
     # Title
-    title = FONT_SMALL.render("Crafting Table", True, (255, 255, 255))
+    title = render_text(FONT_SMALL, "Crafting Table", True, (255, 255, 255))
     screen.blit(title, (menu_x + menu_width // 2 - title.get_width() // 2, menu_y + 10))
     
     # Draw 3x3 grid
@@ -13610,7 +15112,7 @@ def draw_crafting_table_gui(screen, player):
                 item_rect = pygame.Rect(slot_x + 5, slot_y + 5, slot_size - 10, slot_size - 10)
                 draw_block_sprite(screen, item_rect, item_id)
                 if count > 1:
-                    count_text = FONT_SMALL.render(str(count), True, (255, 255, 255))
+                    count_text = render_text(FONT_SMALL, str(count), True, (255, 255, 255))
                     screen.blit(count_text, (slot_x + slot_size - count_text.get_width() - 2, slot_y + slot_size - count_text.get_height() - 2))
     
     # Draw arrow pointing to output
@@ -13634,7 +15136,7 @@ def draw_crafting_table_gui(screen, player):
         output_rect = pygame.Rect(output_x + 5, output_y + 5, slot_size - 10, slot_size - 10)
         draw_block_sprite(screen, output_rect, item_id)
         if count > 1:
-            count_text = FONT_SMALL.render(str(count), True, (255, 255, 255))
+            count_text = render_text(FONT_SMALL, str(count), True, (255, 255, 255))
             screen.blit(count_text, (output_x + slot_size - count_text.get_width() - 2, output_y + slot_size - count_text.get_height() - 2))
     
     # Draw held item cursor
@@ -13643,11 +15145,11 @@ def draw_crafting_table_gui(screen, player):
         held_rect = pygame.Rect(mouse_x - 15, mouse_y - 15, 30, 30)
         draw_block_sprite(screen, held_rect, HELD_ITEM[0])
         if HELD_ITEM[1] > 1:
-            count_text = FONT_SMALL.render(str(HELD_ITEM[1]), True, (255, 255, 255))
+            count_text = render_text(FONT_SMALL, str(HELD_ITEM[1]), True, (255, 255, 255))
             screen.blit(count_text, (mouse_x + 10, mouse_y + 10))
     
     # ESC instruction
-    esc_text = FONT_SMALL.render("Press ESC to close", True, (255, 255, 255))
+    esc_text = render_text(FONT_SMALL, "Press ESC to close", True, (255, 255, 255))
     screen.blit(esc_text, (menu_x + menu_width // 2 - esc_text.get_width() // 2, menu_y + menu_height - 30))
     
     # Draw player's hotbar at bottom
@@ -13663,8 +15165,12 @@ def draw_crafting_table_gui(screen, player):
             hotbar_item_rect = pygame.Rect(slot_x + 5, hotbar_y + 5, slot_size - 10, slot_size - 10)
             draw_block_sprite(screen, hotbar_item_rect, item_id)
             if count > 1:
-                count_text = FONT_SMALL.render(str(count), True, (255, 255, 255))
+                count_text = render_text(FONT_SMALL, str(count), True, (255, 255, 255))
                 screen.blit(count_text, (slot_x + slot_size - count_text.get_width() - 2, hotbar_y + slot_size - count_text.get_height() - 2))
+    
+    # Recipe book to the right of the table
+    book_x = menu_x + menu_width + 10
+    draw_recipe_book_panel(screen, player.recipe_book.craftable_outputs("crafting_table"), book_x, menu_y, max(32, SCREEN_WIDTH - book_x - 10))
 
 def handle_crafting_table_click(player, event):
     """Handles mouse clicks in the crafting table GUI."""
@@ -13771,6 +15277,38 @@ def handle_crafting_table_click(player, event):
             CRAFTING_TABLE_OUTPUT = (0, 0)
         return
 
+def close_crafting_table_gui():
+    """Closes the crafting table GUI, leaving the grid in the table (or returning it to the player if the table is gone)."""
+    global CRAFTING_TABLE_OPEN, CRAFTING_TABLE_GRID, CRAFTING_TABLE_OUTPUT, HELD_ITEM
+    table = get_block_entity(*CRAFTING_TABLE_POS)
+    if table is not None:
+        table.grid = list(CRAFTING_TABLE_GRID)
+    else:
+        for item_id, count in CRAFTING_TABLE_GRID:
+            if item_id != 0:
+                player.add_to_inventory(item_id, count)
+    if HELD_ITEM[0] != 0:
+        player.add_to_inventory(HELD_ITEM[0], HELD_ITEM[1])
+    CRAFTING_TABLE_OPEN = False
+    CRAFTING_TABLE_GRID = [(0, 0) for _ in range(9)]
+    CRAFTING_TABLE_OUTPUT = (0, 0)
+    HELD_ITEM = (0, 0)
+
+def close_furnace_gui():
+    """Closes the furnace GUI. The furnace keeps its slots (and keeps smelting); the held item goes back to the player."""
+    global FURNACE_OPEN, HELD_ITEM
+    if HELD_ITEM[0] != 0:
+        player.add_to_inventory(HELD_ITEM[0], HELD_ITEM[1])
+    FURNACE_OPEN = False
+    HELD_ITEM = (0, 0)
+
+def close_block_guis():
+    """Closes the crafting table or furnace GUI if one is open (before pausing, saving or dying)."""
+    if CRAFTING_TABLE_OPEN:
+        close_crafting_table_gui()
+    if FURNACE_OPEN:
+        close_furnace_gui()
+
 def check_crafting_table_recipe():
     """Checks if items in the crafting table grid match any recipe."""
     global CRAFTING_TABLE_OUTPUT
@@ -13778,42 +15316,71 @@ def check_crafting_table_recipe():
     # Get the current grid as a 3x3 pattern
     grid = [CRAFTING_TABLE_GRID[i][0] for i in range(9)]  # Just IDs
     
-    # Check specific patterns
-    plank_types = [8, 105, 106, 125, 129]  # Oak, Birch, Spruce, Jungle, Bamboo planks
-    
-    # Sticks: 2 planks vertically = 4 sticks
-    if (grid[0] in plank_types and grid[3] in plank_types and grid[0] == grid[3] and
-        grid[1] == 0 and grid[2] == 0 and grid[4] == 0 and grid[5] == 0 and grid[6] == 0 and grid[7] == 0 and grid[8] == 0):
-        CRAFTING_TABLE_OUTPUT = (10, 4)
-        return
-    
-    # Wooden Pickaxe
-    if (grid[0] in plank_types and grid[1] in plank_types and grid[2] in plank_types and
-        grid[3] == 0 and grid[4] == 10 and grid[5] == 0 and grid[6] == 0 and grid[7] == 10 and grid[8] == 0 and
-        grid[0] == grid[1] == grid[2]):
-        CRAFTING_TABLE_OUTPUT = (9, 1)
-        return
-    
-    # Bucket: [I . I] [. I .] [. . .]
-    if (grid[0] == 108 and grid[1] == 0 and grid[2] == 108 and
-        grid[3] == 0 and grid[4] == 108 and grid[5] == 0 and
-        grid[6] == 0 and grid[7] == 0 and grid[8] == 0):
-        CRAFTING_TABLE_OUTPUT = (181, 1)
-        return
-    
-    # Bed: 3 planks on bottom row, 3 wool on middle row
-    # [0 0 0]
-    # [W W W]
-    # [P P P]
-    wool_types = [7, 65, 66, 67, 68, 69, 70, 71, 72, 73, 74, 75, 76, 77, 78, 79, 80]  # All wool colors
-    if (grid[3] in wool_types and grid[4] in wool_types and grid[5] in wool_types and
-        grid[6] in plank_types and grid[7] in plank_types and grid[8] in plank_types and
-        grid[0] == 0 and grid[1] == 0 and grid[2] == 0):
-        CRAFTING_TABLE_OUTPUT = (226, 1)
-        return
-    
-    # No match
-    CRAFTING_TABLE_OUTPUT = (0, 0)
+    CRAFTING_TABLE_OUTPUT = match_shaped_recipe(CRAFTING_TABLE_RECIPE_INDEX, grid, 3) or (0, 0)
+
+# --- Mob Caps and Despawning ---
+MOB_CAP = 500  # Total mobs; the despawn pass trims far mobs above this
+MOB_CATEGORY_CAPS = {"hostile": 300, "passive": 200, "aquatic": 120}  # Whole-world caps per category
+MOB_CHUNK_CAPS = {"hostile": 70, "passive": 40, "aquatic": 30}  # Caps per category within one chunk
+DESPAWN_SLICE_SIZE = 32  # Mobs examined per tick by the despawn pass
+HOSTILE_DESPAWN_DISTANCE_SQ = (BLOCK_SIZE * 30) ** 2  # Hostile mobs despawn beyond 30 blocks
+PASSIVE_DESPAWN_DISTANCE_SQ = (BLOCK_SIZE * 40) ** 2  # Passive mobs despawn beyond 40 blocks
+DESPAWN_CURSOR = 0
+DESPAWN_ROTATION = []  # Mobs the current rotation walks through, snapshotted when it starts
+DESPAWN_HOSTILE_CANDIDATES = 0  # Far hostile mobs seen during the current rotation
+DESPAWN_PASSIVE_ALLOWED = False  # Passive mobs are trimmed only after a rotation finds no far hostiles
+DESPAWNED_THIS_ROTATION = 0
+
+def can_spawn_mob(category, x):
+    """Returns True if a naturally spawned mob of a category fits under the caps at world x."""
+    return MOBS.has_room(category, x)
+
+def update_mob_despawn(mobs, player):
+    """Examines a rotating slice of mobs: updates their chunk census and despawns far mobs while over MOB_CAP."""
+    global DESPAWN_CURSOR, DESPAWN_ROTATION, DESPAWN_HOSTILE_CANDIDATES, DESPAWN_PASSIVE_ALLOWED, DESPAWNED_THIS_ROTATION
+    
+    # The member list is copied once per rotation, not per tick; mobs added meanwhile wait for the next one
+    if DESPAWN_CURSOR >= len(DESPAWN_ROTATION):
+        DESPAWN_ROTATION = mobs.sprites()
+        DESPAWN_CURSOR = 0
+        if not DESPAWN_ROTATION:
+            return
+    members = DESPAWN_ROTATION
+    
+    px = player.rect.centerx
+    py = player.rect.centery
+    end = min(DESPAWN_CURSOR + DESPAWN_SLICE_SIZE, len(members))
+    for mob in members[DESPAWN_CURSOR:end]:
+        if not mobs.has_internal(mob):
+            continue  # Died or despawned since the rotation started
+        mobs.rebin(mob)
+        if len(mobs) <= MOB_CAP:
+            continue
+        
+        dx = mob.rect.centerx - px
+        dy = mob.rect.centery - py
+        distance_sq = dx * dx + dy * dy
+        
+        # Far hostile mobs go first; passive mobs only once a full rotation found no far hostiles
+        if "hostile" in mob.tags:
+            if distance_sq > HOSTILE_DESPAWN_DISTANCE_SQ:
+                DESPAWN_HOSTILE_CANDIDATES += 1
+                mob.kill()
+                DESPAWNED_THIS_ROTATION += 1
+        elif DESPAWN_PASSIVE_ALLOWED and distance_sq > PASSIVE_DESPAWN_DISTANCE_SQ:
+            mob.kill()
+            DESPAWNED_THIS_ROTATION += 1
+    DESPAWN_CURSOR = end
+    
+    # End of a rotation through every mob
+    if DESPAWN_CURSOR >= len(members):
+        DESPAWN_CURSOR = 0
+        DESPAWN_ROTATION = []
+        DESPAWN_PASSIVE_ALLOWED = len(mobs) > MOB_CAP and DESPAWN_HOSTILE_CANDIDATES == 0
+        DESPAWN_HOSTILE_CANDIDATES = 0
+        if DESPAWNED_THIS_ROTATION > 0:
+            print(f"⚠️ LAG PREVENTION: Despawned {DESPAWNED_THIS_ROTATION} mobs (now {len(mobs)})")
+            DESPAWNED_THIS_ROTATION = 0
 
 def spawn_night_mobs():
     """Spawns hostile mobs 30 blocks above the player in a radius around them."""
@@ -13849,43 +15416,43 @@ def spawn_night_mobs():
         
         # Spawn hostile mobs based on biome
         if biome_type == NETHER_WASTES_BIOME:
-            if random.random() < 0.5:
+            if random.random() < 0.5 and can_spawn_mob("hostile", spawn_x):
                 MOBS.add(Zombie(spawn_x, spawn_y, biome_type=NETHER_WASTES_BIOME))
                 mobs_spawned += 1
-            if random.random() < 0.2:
+            if random.random() < 0.2 and can_spawn_mob("hostile", spawn_x):
                 MOBS.add(Spider(spawn_x, spawn_y))
                 mobs_spawned += 1
-            if random.random() < 0.15:
+            if random.random() < 0.15 and can_spawn_mob("hostile", spawn_x):
                 MOBS.add(Parched(spawn_x, spawn_y))
                 mobs_spawned += 1
-            if random.random() < 0.1:
+            if random.random() < 0.1 and can_spawn_mob("hostile", spawn_x):
                 MOBS.add(ZombieCamel(spawn_x, spawn_y))
                 mobs_spawned += 1
         elif biome_type == SOUL_SAND_VALLEY_BIOME:
-            if random.random() < 0.5:
+            if random.random() < 0.5 and can_spawn_mob("hostile", spawn_x):
                 MOBS.add(Skeleton(spawn_x, spawn_y, is_stray=True))
                 mobs_spawned += 1
         elif biome_type == WARPED_FOREST_BIOME:
-            if random.random() < 0.8:
+            if random.random() < 0.8 and can_spawn_mob("hostile", spawn_x):
                 MOBS.add(Zombie(spawn_x, spawn_y))
                 mobs_spawned += 1
-            if random.random() < 0.3:
+            if random.random() < 0.3 and can_spawn_mob("hostile", spawn_x):
                 MOBS.add(Witch(spawn_x, spawn_y))
                 mobs_spawned += 1
-            if random.random() < 0.15:
+            if random.random() < 0.15 and can_spawn_mob("hostile", spawn_x):
                 MOBS.add(Slime(spawn_x, spawn_y, size=random.randint(1, 3)))
                 mobs_spawned += 1
-            if random.random() < 0.35:
+            if random.random() < 0.35 and can_spawn_mob("hostile", spawn_x):
                 MOBS.add(Spider(spawn_x, spawn_y))
                 mobs_spawned += 1
         elif biome_type == CRIMSON_FOREST_BIOME_3 or biome_type == WARPED_FOREST_BIOME_2:
-            if random.random() < 0.6:
+            if random.random() < 0.6 and can_spawn_mob("hostile", spawn_x):
                 MOBS.add(Zombie(spawn_x, spawn_y))
                 mobs_spawned += 1
-            if random.random() < 0.4:
+            if random.random() < 0.4 and can_spawn_mob("hostile", spawn_x):
                 MOBS.add(Creeper(spawn_x, spawn_y))
                 mobs_spawned += 1
-            if random.random() < 0.4:
+            if random.random() < 0.4 and can_spawn_mob("hostile", spawn_x):
                 MOBS.add(Spider(spawn_x, spawn_y))
                 mobs_spawned += 1
         elif biome_type == LAVA_OCEAN_BIOME:
@@ -13893,25 +15460,25 @@ def spawn_night_mobs():
             # Find water level in ocean
             water_depth = spawn_row
             for check_row in range(spawn_row, GRID_HEIGHT):
-                if check_row < GRID_HEIGHT and WORLD_MAP[check_row][col] in FLUID_BLOCKS:
+                if check_row < GRID_HEIGHT and BLOCK_FLUID[WORLD_MAP[check_row][col]]:
                     water_depth = check_row + 5  # Spawn 5 blocks below water surface
                     break
             
-            if random.random() < 0.3:
+            if random.random() < 0.3 and can_spawn_mob("hostile", spawn_x):
                 MOBS.add(ZombieNautilus(col * BLOCK_SIZE, water_depth * BLOCK_SIZE))
                 mobs_spawned += 1
                 print(f"🐚 ZombieNautilus spawned in ocean at col {col}, depth {water_depth}")
         else:
-            if random.random() < 0.6:
+            if random.random() < 0.6 and can_spawn_mob("hostile", spawn_x):
                 MOBS.add(Zombie(spawn_x, spawn_y))
                 mobs_spawned += 1
-            if random.random() < 0.4:
+            if random.random() < 0.4 and can_spawn_mob("hostile", spawn_x):
                 MOBS.add(Skeleton(spawn_x, spawn_y))
                 mobs_spawned += 1
-            if random.random() < 0.3:
+            if random.random() < 0.3 and can_spawn_mob("hostile", spawn_x):
                 MOBS.add(Creeper(spawn_x, spawn_y))
                 mobs_spawned += 1
-            if random.random() < 0.3:
+            if random.random() < 0.3 and can_spawn_mob("hostile", spawn_x):
                 MOBS.add(Spider(spawn_x, spawn_y))
                 mobs_spawned += 1
     
@@ -13969,6 +15536,10 @@ def spawn_dark_area_mobs():
                         break
                 depth = row - ground_row
                 
+                # Respect the hostile caps for this chunk
+                if not can_spawn_mob("hostile", spawn_x):
+                    break
+                
                 # Spawn random hostile mob
                 r = random.random()
                 # Cave spiders in deep caves (40% chance if deep enough)
@@ -14024,8 +15595,12 @@ RESPAWN_INTERVAL = 18000  # 5 minutes
 # Structure spawn notifications
 STRUCTURE_NOTIFICATIONS = []
 
-# Initial World and Mob Generation
-WORLD_MAP, MOBS, BIOME_MAP = generate_world()
+# Initial World and Mob Generation (pregenerate_world makes its own, so start from an empty map there)
+if PREGENERATE_ARGS is None:
+    WORLD_MAP, MOBS, BIOME_MAP = generate_world()
+else:
+    WORLD_MAP, MOBS, BIOME_MAP = [[AIR_ID] * GRID_WIDTH for _ in range(GRID_HEIGHT)], MobGroup(), [NETHER_WASTES_BIOME] * GRID_WIDTH
+notify_world_replaced()
 
 # Find a safe spawn spot
 spawn_col = GRID_WIDTH // 2
@@ -14154,8 +15729,8 @@ def draw_articles_menu(screen, background):
     screen.blit(background, (0, 0))
     
     # Draw title
-    title_font = pygame.font.Font(None, 72)
-    title = title_font.render("Game News", True, (255, 255, 255))
+    title_font = get_font(72)
+    title = render_text(title_font, "Game News", True, (255, 255, 255))
     screen.blit(title, (SCREEN_WIDTH // 2 - title.get_width() // 2, 50))
     
     # Content area
@@ -14181,20 +15756,20 @@ def draw_articles_menu(screen, background):
             break
             
         # Draw article title
-        title_text = FONT_BIG.render(article["title"], True, (255, 215, 0))
+        title_text = render_text(FONT_BIG, article["title"], True, (255, 215, 0))
         if article_y + title_text.get_height() > content_y:
             screen.blit(title_text, (content_x + padding, max(article_y, content_y + 10)))
         article_y += title_text.get_height() + 5
         
         # Draw date
-        date_text = FONT_SMALL.render(article["date"], True, (180, 180, 180))
+        date_text = render_text(FONT_SMALL, article["date"], True, (180, 180, 180))
         if article_y + date_text.get_height() > content_y:
             screen.blit(date_text, (content_x + padding, max(article_y, content_y + 10)))
         article_y += date_text.get_height() + 10
         
         # Draw content lines
         for line in article["content"]:
-            line_text = FONT_SMALL.render(line, True, (220, 220, 220))
+            line_text = render_text(FONT_SMALL, line, True, (220, 220, 220))
             if article_y + line_text.get_height() > content_y:
                 if article_y < content_y + content_height:
                     screen.blit(line_text, (content_x + padding, max(article_y, content_y + 10)))
@@ -14212,12 +15787,12 @@ def draw_articles_menu(screen, background):
     
     # Draw scroll indicators
     if ARTICLES_SCROLL_OFFSET > 0:
-        scroll_up_text = FONT_SMALL.render("▲ Scroll Up", True, (255, 255, 255))
+        scroll_up_text = render_text(FONT_SMALL, "▲ Scroll Up", True, (255, 255, 255))
         screen.blit(scroll_up_text, (SCREEN_WIDTH // 2 - scroll_up_text.get_width() // 2, content_y - 25))
     
     max_scroll = max(0, article_y - content_y - content_height + 50)
     if ARTICLES_SCROLL_OFFSET < max_scroll:
-        scroll_down_text = FONT_SMALL.render("▼ Scroll Down", True, (255, 255, 255))
+        scroll_down_text = render_text(FONT_SMALL, "▼ Scroll Down", True, (255, 255, 255))
         screen.blit(scroll_down_text, (SCREEN_WIDTH // 2 - scroll_down_text.get_width() // 2, content_y + content_height + 5))
     
     # Draw back button
@@ -14234,20 +15809,11 @@ water_flow_timer = 0  # Timer to control water flow updates
 
 
 # --- EYE OF ENDER PROJECTILE CLASS ---
-class EyeOfEnder(pygame.sprite.Sprite):
+class EyeOfEnder(PooledProjectile):
     """Eye of Ender projectile that flies toward nearest stronghold when thrown."""
-    def __init__(self, x, y, player_x):
-        super().__init__()
-        # Try to load eye of ender texture
-        try:
-            self.image = pygame.image.load(r"..\Textures\ender_eye.png")
-            self.image = pygame.transform.scale(self.image, (16, 16))
-        except:
-            # Fallback to drawn eye if texture not found
-            self.image = pygame.Surface([12, 12])
-            self.image.fill((0, 255, 100))  # Green eye
-            pygame.draw.circle(self.image, (50, 50, 50), (6, 6), 4)  # Pupil
-        
+    def reset(self, x, y, player_x):
+        super().reset()
+        self.image = get_projectile_image("eye_of_ender", build_eye_of_ender_image)
         self.rect = self.image.get_rect(center=(x, y))
         
         self.lifetime = 360  # 6 seconds before dropping (doubled from 3 seconds)
@@ -14273,27 +15839,18 @@ class EyeOfEnder(pygame.sprite.Sprite):
     
     def find_nearest_stronghold(self, x):
         """Find the nearest stronghold location."""
-        if not STRONGHOLD_LOCATIONS:
+        stronghold = STRUCTURES.nearest("stronghold", to_absolute_col(x // BLOCK_SIZE))
+        if stronghold is None:
             # No strongholds, just fly straight ahead
             return x + 500, GRID_HEIGHT - 10
         
-        # Find closest stronghold
-        closest_dist = float('inf')
-        closest_loc = STRONGHOLD_LOCATIONS[0]
-        
-        for loc_col, loc_row in STRONGHOLD_LOCATIONS:
-            loc_x = loc_col * BLOCK_SIZE
-            loc_y = loc_row * BLOCK_SIZE
-            dist = abs(loc_x - x)
-            
-            if dist < closest_dist:
-                closest_dist = dist
-                closest_loc = (loc_x, loc_y)
+        center_col, center_row = stronghold['metadata']['center']
+        closest_loc = (from_absolute_col(center_col) * BLOCK_SIZE, center_row * BLOCK_SIZE)
         
         print(f"🎯 Eye of Ender points toward stronghold at ({closest_loc[0]//BLOCK_SIZE}, {closest_loc[1]//BLOCK_SIZE})")
         return closest_loc
     
-    def update(self):
+    def update(self, WORLD_MAP=None, player=None, all_mobs=None):
         """Update eye of ender movement."""
         self.vel_y += self.gravity
         self.rect.x += self.vel_x
@@ -14305,7 +15862,7 @@ class EyeOfEnder(pygame.sprite.Sprite):
         if self.lifetime <= 0:
             # 20% chance to break, 80% chance to drop
             if random.random() > 0.2:
-                DROPPED_ITEMS.add(DroppedItem(self.rect.x, self.rect.y, EYE_OF_ENDER_ID, 1))
+                spawn_dropped_item(self.rect.x, self.rect.y, EYE_OF_ENDER_ID, 1)
             self.kill()
             return
         
@@ -14315,14 +15872,107 @@ class EyeOfEnder(pygame.sprite.Sprite):
         
         if 0 <= center_row < GRID_HEIGHT and 0 <= center_col < GRID_WIDTH:
             block_id = WORLD_MAP[center_row][center_col]
-            if block_id != 0 and BLOCK_TYPES.get(block_id, {}).get("solid", False):
+            if BLOCK_SOLID[block_id]:
                 # Drop as item
                 if random.random() > 0.2:
-                    DROPPED_ITEMS.add(DroppedItem(self.rect.x, self.rect.y, EYE_OF_ENDER_ID, 1))
+                    spawn_dropped_item(self.rect.x, self.rect.y, EYE_OF_ENDER_ID, 1)
                 self.kill()
                 return
 
 
+# --- Projectile System ---
+PROJECTILE_GROUPS = (ARROWS, SPLASH_POTIONS, TRIDENTS, ENDER_PEARLS, EYE_OF_ENDER_PROJECTILES)
+
+def update_projectiles(world_map, player, mobs):
+    """Updates every projectile in one pass, using a freshly built mob spatial index for hit tests."""
+    if not any(PROJECTILE_GROUPS):
+        return
+    MOB_SPATIAL_INDEX.rebuild(mobs)
+    for group in PROJECTILE_GROUPS:
+        for projectile in group.sprites():
+            if projectile.alive():
+                projectile.update(world_map, player, mobs)
+
+def draw_projectiles(surface, camera_x, camera_y):
+    """Draws every projectile relative to the camera."""
+    for group in PROJECTILE_GROUPS:
+        for projectile in group:
+            surface.blit(projectile.image, (projectile.rect.x - camera_x, projectile.rect.y - camera_y))
+
+# --- Offline Pre-generation ---
+PREGENERATE_CHECKPOINT_INTERVAL = 5.0  # Seconds between checkpoints of the finished chunk jobs
+
+def write_pickle_atomically(path, data):
+    """Pickles data to path through a temporary file, so an interrupted write never leaves a broken file."""
+    temp_path = path.with_name(path.name + ".tmp")
+    with open(temp_path, 'wb') as f:
+        pickle.dump(data, f)
+    os.replace(temp_path, path)
+
+def pregenerate_world(world_name, seed, chunk_range, player):
+    """Generates a world for chunk_range with the live generator and writes it to saves/<world_name>.world.
+    Finished chunk jobs are checkpointed to saves/<world_name>.pregen, so an interrupted run resumes
+    where it stopped when started again with the same name and chunk range.
+    """
+    global WORLD_MAP, MOBS, BIOME_MAP, GRID_WIDTH
+    WORLDS_FOLDER.mkdir(exist_ok=True)
+    checkpoint_path = WORLDS_FOLDER / f"{world_name}.pregen"
+    chunk_range = [chunk_range[0], chunk_range[1]]
+    chunk_count = chunk_range[1] - chunk_range[0] + 1
+    
+    chunk_results = {}
+    if checkpoint_path.exists():
+        with open(checkpoint_path, 'rb') as f:
+            checkpoint = pickle.load(f)
+        if checkpoint['chunk_range'] == chunk_range and seed in (None, checkpoint['seed']):
+            seed = checkpoint['seed']
+            chunk_results = checkpoint['chunks']
+            print(f"⏯️ Resuming '{world_name}': {len(chunk_results)}/{chunk_count} chunks already generated")
+        else:
+            print(f"⚠️ Ignoring checkpoint for '{world_name}' (different seed or chunk range)")
+    if seed is None:
+        seed = random.getrandbits(32)
+    
+    started = time.perf_counter()
+    resumed_count = len(chunk_results)
+    last_checkpoint = [started]
+    
+    def report(done, total):
+        now = time.perf_counter()
+        rate = (done - resumed_count) / max(now - started, 1e-6)
+        print(f"\r⛏️ Chunks {done}/{total} ({rate:.1f} chunks/s)", end="", flush=True)
+        if now - last_checkpoint[0] >= PREGENERATE_CHECKPOINT_INTERVAL and len(chunk_results) < total:
+            write_pickle_atomically(checkpoint_path, {'seed': seed, 'chunk_range': chunk_range, 'chunks': dict(chunk_results)})
+            last_checkpoint[0] = now
+    
+    print(f"🌍 Pre-generating '{world_name}': seed {seed}, chunks {chunk_range[0]} to {chunk_range[1]}, {WORLDGEN_WORKERS} workers")
+    WORLD_MAP, MOBS, BIOME_MAP = generate_world(progress=report, seed=seed, chunk_range=chunk_range, chunk_results=chunk_results)
+    print()
+    GRID_WIDTH = len(WORLD_MAP[0])
+    set_chunk_range(chunk_range)
+    
+    # Spawn the player over the middle column, as for a world created from the menu
+    spawn_col = GRID_WIDTH // 2
+    spawn_row = GRID_HEIGHT // 2
+    for r in range(GRID_HEIGHT):
+        if WORLD_MAP[r][spawn_col] != 0:
+            spawn_row = r - 2
+            break
+    player.rect.x = spawn_col * BLOCK_SIZE
+    player.rect.y = spawn_row * BLOCK_SIZE
+    save_world(world_name, WORLD_MAP, player, MOBS, TIME_OF_DAY, LOADED_CHUNKS)
+    if checkpoint_path.exists():
+        checkpoint_path.unlink()
+    
+    elapsed = time.perf_counter() - started
+    generated_count = chunk_count - resumed_count
+    print(f"✅ Wrote {WORLDS_FOLDER / (world_name + '.world')}: {generated_count} chunks in {elapsed:.2f}s ({generated_count / max(elapsed, 1e-6):.1f} chunks/s)")
+
+if PREGENERATE_ARGS is not None:
+    pregenerate_world(PREGENERATE_ARGS.pregenerate, PREGENERATE_ARGS.seed, PREGENERATE_ARGS.chunks, player)
+    pygame.quit()
+    sys.exit(0)
+
 # --- Main Game Loop ---
 print(f"🎮 Starting main loop. Initial menu state: {CURRENT_MENU_STATE}")
 while running:
@@ -14331,9 +15981,11 @@ while running:
     # Handle different menu states
     if CURRENT_MENU_STATE == MENU_STATE_USERNAME:
         # Username Input Screen with Skin Selection
-        input_rect, continue_rect, skin_buttons = draw_username_input_menu(screen, menu_background, username_input, selected_skin)
+        menu_redraw = get_menu_redraw_mode(CURRENT_MENU_STATE)
+        if menu_redraw:
+            input_rect, continue_rect, skin_buttons = draw_username_input_menu(screen, menu_background, username_input, selected_skin)
         
-        for event in pygame.event.get():
+        for event in poll_menu_events():
             if event.type == pygame.QUIT:
                 running = False
             elif event.type == pygame.KEYDOWN:
@@ -14392,42 +16044,45 @@ while running:
                     CURRENT_MENU_STATE = MENU_STATE_MAIN
                     print(f"✅ Username set: {username_input}, Skin: {selected_skin}")
         
-        pygame.display.flip()
+        if menu_redraw:
+            present_menu(menu_redraw, [continue_rect] + list(skin_buttons.values()))
     
     elif CURRENT_MENU_STATE == MENU_STATE_MAIN:
         # Main Menu
-        screen.blit(menu_background, (0, 0))
-        
-        # Draw title
-        title_font = pygame.font.Font(None, 72)
-        title = title_font.render("PyCraft", True, (255, 255, 255))
-        screen.blit(title, (SCREEN_WIDTH // 2 - title.get_width() // 2, 100))
-        
-        # Draw version text in bottom right corner
-        version_font = pygame.font.Font(None, 24)
-        version_text = version_font.render("Version Alpha 4", True, (180, 180, 180))
-        screen.blit(version_text, (SCREEN_WIDTH - version_text.get_width() - 10, SCREEN_HEIGHT - version_text.get_height() - 10))
-        
-        # Draw buttons manually
-        singleplayer_btn, _ = draw_button(
-            screen, "Singleplayer",
-            SCREEN_WIDTH // 2 - 150, 230, 300, 60,
-            (70, 130, 70), (90, 170, 90)
-        )
-        
-        news_btn, _ = draw_button(
-            screen, "News",
-            SCREEN_WIDTH // 2 - 150, 310, 300, 60,
-            (70, 100, 130), (90, 120, 170)
-        )
-        
-        quit_btn, _ = draw_button(
-            screen, "Quit",
-            SCREEN_WIDTH // 2 - 150, 390, 300, 60,
-            (130, 70, 70), (170, 90, 90)
-        )
+        menu_redraw = get_menu_redraw_mode(CURRENT_MENU_STATE)
+        if menu_redraw:
+            screen.blit(menu_background, (0, 0))
+            
+            # Draw title
+            title_font = get_font(72)
+            title = render_text(title_font, "PyCraft", True, (255, 255, 255))
+            screen.blit(title, (SCREEN_WIDTH // 2 - title.get_width() // 2, 100))
+            
+            # Draw version text in bottom right corner
+            version_font = get_font(24)
+            version_text = render_text(version_font, "Version Alpha 4", True, (180, 180, 180))
+            screen.blit(version_text, (SCREEN_WIDTH - version_text.get_width() - 10, SCREEN_HEIGHT - version_text.get_height() - 10))
+            
+            # Draw buttons manually
+            singleplayer_btn, _ = draw_button(
+                screen, "Singleplayer",
+                SCREEN_WIDTH // 2 - 150, 230, 300, 60,
+                (70, 130, 70), (90, 170, 90)
+            )
+            
+            news_btn, _ = draw_button(
+                screen, "News",
+                SCREEN_WIDTH // 2 - 150, 310, 300, 60,
+                (70, 100, 130), (90, 120, 170)
+            )
+            
+            quit_btn, _ = draw_button(
+                screen, "Quit",
+                SCREEN_WIDTH // 2 - 150, 390, 300, 60,
+                (130, 70, 70), (170, 90, 90)
+            )
         
-        for event in pygame.event.get():
+        for event in poll_menu_events():
             if event.type == pygame.QUIT:
                 running = False
             elif event.type == pygame.MOUSEBUTTONDOWN:
@@ -14439,14 +16094,17 @@ while running:
                 elif quit_btn.collidepoint(event.pos):
                     running = False
         
-        pygame.display.flip()
+        if menu_redraw:
+            present_menu(menu_redraw, [singleplayer_btn, news_btn, quit_btn])
     
     elif CURRENT_MENU_STATE == MENU_STATE_WORLD_SELECT:
         # World Selection Menu
         # Draw menu first to get button rectangles
-        buttons = draw_world_select_menu(screen, menu_background)
+        menu_redraw = get_menu_redraw_mode(CURRENT_MENU_STATE)
+        if menu_redraw:
+            buttons = draw_world_select_menu(screen, menu_background)
         
-        for event in pygame.event.get():
+        for event in poll_menu_events():
             if event.type == pygame.QUIT:
                 running = False
             elif event.type == pygame.MOUSEBUTTONDOWN:
@@ -14462,6 +16120,7 @@ while running:
                                 print(f"📂 Loading world data...")
                                 WORLD_MAP = loaded_data['world_map']
                                 GRID_WIDTH = len(WORLD_MAP[0])
+                                notify_world_replaced()
                                 player.rect.x, player.rect.y = loaded_data['player_pos']
                                 player.health = loaded_data['player_health']
                                 player.hunger = loaded_data['player_hunger']
@@ -14482,10 +16141,14 @@ while running:
                                 print(f"🎮 Loaded game mode: {CURRENT_GAME_MODE}, Creative: {player.creative_mode}")
                                 # Reconstruct mob objects from saved data
                                 mob_data = loaded_data.get('mobs', [])
-                                MOBS = reconstruct_mobs(mob_data) if mob_data else pygame.sprite.Group()
+                                MOBS = reconstruct_mobs(mob_data) if mob_data else MobGroup()
                                 BIOME_MAP = loaded_data.get('biome_map', [])
-                                # Reset chunk tracking for loaded world
-                                CURRENT_CHUNK_RANGE = [-2, 2]
+                                # Older saves have no seed; chunks they load later get a fresh one
+                                set_world_seed(loaded_data.get('world_seed', random.getrandbits(32)))
+                                STRUCTURES.load(loaded_data.get('structures', []))
+                                load_block_entities(loaded_data.get('block_entities', {}))
+                                # Reset chunk tracking for loaded world (pre-generated worlds may span other chunks)
+                                set_chunk_range(loaded_data.get('chunk_range', [-2, 2]))
                                 LOADED_CHUNKS.clear()
                                 print(f"🔄 Switching from WORLD_SELECT to PLAYING mode...")
                                 print(f"📊 WORLD_MAP size: {len(WORLD_MAP)}x{len(WORLD_MAP[0]) if WORLD_MAP else 0}")
@@ -14503,14 +16166,17 @@ while running:
                         elif btn_type == 'back':
                             CURRENT_MENU_STATE = MENU_STATE_MAIN
         
-        pygame.display.flip()
+        if menu_redraw:
+            present_menu(menu_redraw, [btn_rect for _, _, btn_rect in buttons])
     
     elif CURRENT_MENU_STATE == MENU_STATE_CREATE_WORLD:
         # Create World Menu
         # Draw menu first to get button rectangles
-        create_btn, cancel_btn, survival_btn, creative_btn = draw_create_world_menu(screen, menu_background, world_name_input, CURRENT_GAME_MODE)
+        menu_redraw = get_menu_redraw_mode(CURRENT_MENU_STATE)
+        if menu_redraw:
+            create_btn, cancel_btn, survival_btn, creative_btn = draw_create_world_menu(screen, menu_background, world_name_input, CURRENT_GAME_MODE)
         
-        for event in pygame.event.get():
+        for event in poll_menu_events():
             if event.type == pygame.QUIT:
                 running = False
             elif event.type == pygame.KEYDOWN:
@@ -14520,10 +16186,11 @@ while running:
                     # Create new world
                     CURRENT_WORLD_NAME = world_name_input
                     # Generate new worlds            
-                    WORLD_MAP, MOBS, BIOME_MAP = generate_world()
+                    WORLD_MAP, MOBS, BIOME_MAP = generate_world(progress=show_world_creation_progress)
                     GRID_WIDTH = len(WORLD_MAP[0])
+                    notify_world_replaced()
                     # Reset chunk tracking
-                    CURRENT_CHUNK_RANGE = [-2, 2]
+                    set_chunk_range([-2, 2])
                     LOADED_CHUNKS.clear()
                     # Find a safe spawn spot
                     spawn_col = GRID_WIDTH // 2
@@ -14556,10 +16223,11 @@ while running:
                 elif create_btn.collidepoint(event.pos) and world_name_input:
                     CURRENT_WORLD_NAME = world_name_input
                     # Generate new world
-                    WORLD_MAP, MOBS, BIOME_MAP = generate_world()
+                    WORLD_MAP, MOBS, BIOME_MAP = generate_world(progress=show_world_creation_progress)
                     GRID_WIDTH = len(WORLD_MAP[0])
+                    notify_world_replaced()
                     # Reset chunk tracking
-                    CURRENT_CHUNK_RANGE = [-2, 2]
+                    set_chunk_range([-2, 2])
                     LOADED_CHUNKS.clear()
                     # Find a safe spawn spot
                     spawn_col = GRID_WIDTH // 2
@@ -14585,13 +16253,16 @@ while running:
                 elif cancel_btn.collidepoint(event.pos):
                     CURRENT_MENU_STATE = MENU_STATE_WORLD_SELECT
         
-        pygame.display.flip()
+        if menu_redraw:
+            present_menu(menu_redraw, [create_btn, cancel_btn, survival_btn, creative_btn])
     
     elif CURRENT_MENU_STATE == MENU_STATE_ARTICLES:
         # Articles/News Menu
-        back_btn = draw_articles_menu(screen, menu_background)
+        menu_redraw = get_menu_redraw_mode(CURRENT_MENU_STATE)
+        if menu_redraw:
+            back_btn = draw_articles_menu(screen, menu_background)
         
-        for event in pygame.event.get():
+        for event in poll_menu_events():
             if event.type == pygame.QUIT:
                 running = False
             elif event.type == pygame.MOUSEBUTTONDOWN:
@@ -14615,14 +16286,17 @@ while running:
                 elif event.key == pygame.K_DOWN:
                     ARTICLES_SCROLL_OFFSET += 30
         
-        pygame.display.flip()
+        if menu_redraw:
+            present_menu(menu_redraw, [back_btn])
     
     elif CURRENT_MENU_STATE == MENU_STATE_PAUSED:
         # Paused Menu
         # Draw menu first to get button rectangles
-        back_rect, username_rect, skin_rect, textures_rect, save_quit_rect = draw_pause_menu(screen)
+        menu_redraw = get_menu_redraw_mode(CURRENT_MENU_STATE)
+        if menu_redraw:
+            back_rect, username_rect, skin_rect, textures_rect, save_quit_rect = draw_pause_menu(screen)
         
-        for event in pygame.event.get():
+        for event in poll_menu_events():
             if event.type == pygame.QUIT:
                 # Save and quit
                 if CURRENT_WORLD_NAME:
@@ -14661,6 +16335,7 @@ while running:
                 elif textures_rect.collidepoint(event.pos):
                     # Toggle experimental textures
                     USE_EXPERIMENTAL_TEXTURES = not USE_EXPERIMENTAL_TEXTURES
+                    clear_sprite_cache()
                     status = "enabled" if USE_EXPERIMENTAL_TEXTURES else "disabled"
                     print(f"🎨 Experimental textures {status}!")
                     
@@ -14723,13 +16398,18 @@ while running:
         
         # Still draw the game in background
         # (Game rendering code will be here)
-        pygame.display.flip()
+        if menu_redraw:
+            present_menu(menu_redraw, [back_rect, username_rect, skin_rect, textures_rect, save_quit_rect])
     
     elif CURRENT_MENU_STATE == MENU_STATE_PLAYING:
+        MENU_REDRAW_KEY = None  # Menus opened from the game always start with a full redraw
+        update_quality_governor(clock.get_rawtime())
         # Actual game loop
+        profile_begin_frame()
         
         # Update day/night cycle
         update_time_of_day()
+        profile_lap("time of day")
         
         # Check and load chunks based on player position
         player_col = player.rect.centerx // BLOCK_SIZE
@@ -14739,17 +16419,20 @@ while running:
         if shift_player:
             player.rect.x += CHUNK_SIZE * BLOCK_SIZE
             print(f"🔀 Shifted player right by {CHUNK_SIZE} blocks to account for new left chunk")
+        profile_lap("chunks")
         
         # 1. EVENT HANDLING
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 # Save before quitting
+                close_block_guis()
                 if CURRENT_WORLD_NAME:
                     save_world(CURRENT_WORLD_NAME, WORLD_MAP, player, MOBS, TIME_OF_DAY, LOADED_CHUNKS)
                 running = False
             
             # ESC key to pause
             elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                close_block_guis()
                 CURRENT_MENU_STATE = MENU_STATE_PAUSED
                 continue  # Skip rest of game loop
             
@@ -14789,6 +16472,12 @@ while running:
                     else:
                         print("❄️ LAVA MODE DISABLED")
                 
+                # F3 toggles the frame profiler overlay, F4 exports its frame-time histogram
+                elif event.key == pygame.K_F3:
+                    set_profiler_enabled(not PROFILER_REQUESTED)
+                elif event.key == pygame.K_F4 and PROFILER_ENABLED:
+                    export_frame_histogram()
+                
                 # M key - Max tool level cheat (Creative mode only)
                 elif event.key == pygame.K_m and player.creative_mode:
                     player.max_tool_level = True
@@ -14797,34 +16486,9 @@ while running:
                 
                 elif event.key == pygame.K_ESCAPE:
                     if CRAFTING_TABLE_OPEN:
-                        # Return items from crafting table to player inventory
-                        for item_id, count in CRAFTING_TABLE_GRID:
-                            if item_id != 0:
-                                player.add_to_inventory(item_id, count)
-                        if CRAFTING_TABLE_OUTPUT[0] != 0:
-                            player.add_to_inventory(CRAFTING_TABLE_OUTPUT[0], CRAFTING_TABLE_OUTPUT[1])
-                        if HELD_ITEM[0] != 0:
-                            player.add_to_inventory(HELD_ITEM[0], HELD_ITEM[1])
-                        CRAFTING_TABLE_OPEN = False
-                        CRAFTING_TABLE_GRID = [(0, 0) for _ in range(9)]
-                        CRAFTING_TABLE_OUTPUT = (0, 0)
-                        HELD_ITEM = (0, 0)
+                        close_crafting_table_gui()
                     elif FURNACE_OPEN:
-                        # Return items from furnace to player inventory
-                        if FURNACE_INPUT[0] != 0:
-                            player.add_to_inventory(FURNACE_INPUT[0], FURNACE_INPUT[1])
-                        if FURNACE_FUEL[0] != 0:
-                            player.add_to_inventory(FURNACE_FUEL[0], FURNACE_FUEL[1])
-                        if FURNACE_OUTPUT[0] != 0:
-                            player.add_to_inventory(FURNACE_OUTPUT[0], FURNACE_OUTPUT[1])
-                        if HELD_ITEM[0] != 0:
-                            player.add_to_inventory(HELD_ITEM[0], HELD_ITEM[1])
-                        FURNACE_OPEN = False
-                        FURNACE_INPUT = (0, 0)
-                        FURNACE_FUEL = (0, 0)
-                        FURNACE_OUTPUT = (0, 0)
-                        FURNACE_PROGRESS = 0
-                        HELD_ITEM = (0, 0)
+                        close_furnace_gui()
                     elif player.creative_inventory_open:
                         player.creative_inventory_open = False
                     elif player.trading_open:
@@ -14846,34 +16510,9 @@ while running:
                 # E key to close furnace if it's open, otherwise open crafting table/inventory
                 elif event.key == pygame.K_e:
                     if CRAFTING_TABLE_OPEN:
-                        # Return items from crafting table to player inventory
-                        for item_id, count in CRAFTING_TABLE_GRID:
-                            if item_id != 0:
-                                player.add_to_inventory(item_id, count)
-                        if CRAFTING_TABLE_OUTPUT[0] != 0:
-                            player.add_to_inventory(CRAFTING_TABLE_OUTPUT[0], CRAFTING_TABLE_OUTPUT[1])
-                        if HELD_ITEM[0] != 0:
-                            player.add_to_inventory(HELD_ITEM[0], HELD_ITEM[1])
-                        CRAFTING_TABLE_OPEN = False
-                        CRAFTING_TABLE_GRID = [(0, 0) for _ in range(9)]
-                        CRAFTING_TABLE_OUTPUT = (0, 0)
-                        HELD_ITEM = (0, 0)
+                        close_crafting_table_gui()
                     elif FURNACE_OPEN:
-                        # Return items from furnace to player inventory
-                        if FURNACE_INPUT[0] != 0:
-                            player.add_to_inventory(FURNACE_INPUT[0], FURNACE_INPUT[1])
-                        if FURNACE_FUEL[0] != 0:
-                            player.add_to_inventory(FURNACE_FUEL[0], FURNACE_FUEL[1])
-                        if FURNACE_OUTPUT[0] != 0:
-                            player.add_to_inventory(FURNACE_OUTPUT[0], FURNACE_OUTPUT[1])
-                        if HELD_ITEM[0] != 0:
-                            player.add_to_inventory(HELD_ITEM[0], HELD_ITEM[1])
-                        FURNACE_OPEN = False
-                        FURNACE_INPUT = (0, 0)
-                        FURNACE_FUEL = (0, 0)
-                        FURNACE_OUTPUT = (0, 0)
-                        FURNACE_PROGRESS = 0
-                        HELD_ITEM = (0, 0)
+                        close_furnace_gui()
                     elif not player.inventory_open and not player.is_crafting:
                         # In creative mode, open creative inventory instead of regular inventory
                         if player.creative_mode:
@@ -14892,6 +16531,11 @@ while running:
                             if WORLD_MAP[target_row][target_col] == 92:  # Crafting table ID
                                 CRAFTING_TABLE_OPEN = True
                                 CRAFTING_TABLE_POS = (target_col, target_row)
+                                # The GUI holds the grid while open; close_crafting_table_gui puts it back
+                                table = get_block_entity(target_col, target_row)
+                                CRAFTING_TABLE_GRID = table.grid
+                                table.grid = [(0, 0) for _ in range(9)]
+                                check_crafting_table_recipe()
                 
                 # F key to toggle flying (Creative mode only)
                 elif event.key == pygame.K_f and player.can_fly and player.creative_mode:
@@ -14906,20 +16550,12 @@ while running:
                     # Drop the currently held item from hotbar
                     if player.held_block != 0:
                         # Find the item in hotbar
-                        for i in range(9):
-                            item_id, count = player.hotbar_slots[i]
-                            if item_id == player.held_block and count > 0:
-                                drop_x = player.rect.centerx
-                                drop_y = player.rect.centery
-                                DROPPED_ITEMS.add(DroppedItem(drop_x, drop_y, item_id, 1))
-                                # Remove one from hotbar slot
-                                new_count = count - 1
-                                if new_count <= 0:
-                                    player.hotbar_slots[i] = (0, 0)
-                                    player.held_block = 0
-                                else:
-                                    player.hotbar_slots[i] = (item_id, new_count)
-                                break
+                        i = player.items.find(player.held_block)
+                        if i is not None and i < 9:
+                            spawn_dropped_item(player.rect.centerx, player.rect.centery, player.held_block, 1)
+                            # Remove one from hotbar slot
+                            player.items.remove(player.held_block, 1)
+                            player.held_block = player.hotbar_slots[player.active_slot][0]
             
             # Mouse Interaction
             elif event.type == pygame.MOUSEBUTTONDOWN:
@@ -14999,25 +16635,18 @@ while running:
                 player.eating_timer += 1
                 if player.eating_timer >= player.eating_duration:
                     # Find and consume the item
-                    for i in range(9):
-                        item_id, count = player.hotbar_slots[i]
-                        if item_id == player.held_block and count > 0:
-                            # Eat the food
-                            hunger_gain = food_items[player.held_block]
-                            player.hunger = min(player.max_hunger, player.hunger + hunger_gain)
-                            print(f"🍖 Ate {BLOCK_TYPES[player.held_block]['name']}! +{hunger_gain} hunger")
-                            
-                            # Remove one from hotbar
-                            new_count = count - 1
-                            if new_count <= 0:
-                                player.hotbar_slots[i] = (0, 0)
-                                if i == player.active_slot:
-                                    player.held_block = 0
-                            else:
-                                player.hotbar_slots[i] = (item_id, new_count)
-                            
-                            player.eating_timer = 0
-                            break
+                    i = player.items.find(player.held_block)
+                    if i is not None and i < 9:
+                        # Eat the food
+                        hunger_gain = food_items[player.held_block]
+                        player.hunger = min(player.max_hunger, player.hunger + hunger_gain)
+                        print(f"🍖 Ate {BLOCK_TYPES[player.held_block]['name']}! +{hunger_gain} hunger")
+                        
+                        # Remove one from hotbar
+                        player.items.remove(player.held_block, 1)
+                        player.held_block = player.hotbar_slots[player.active_slot][0]
+                        
+                        player.eating_timer = 0
             
             elif player.held_block in potion_items:
                 player.eating_timer += 1
@@ -15031,7 +16660,8 @@ while running:
                         player.consume_item(player.held_block, 1)
                     
                     elif player.held_block in [132, 133]:  # Splash Potions (throw)
-                        SPLASH_POTIONS.add(SplashPotion(
+                        SPLASH_POTIONS.add(acquire_projectile(
+                            SplashPotion,
                             player.rect.centerx,
                             player.rect.centery - 10,
                             player.direction,
@@ -15107,23 +16737,21 @@ while running:
                             
                             # Block breaks when progress reaches 100
                             if player.mining_progress >= 100:
-                                # Remove from light sources if it emits light
-                                if BLOCK_TYPES.get(block_id, {}).get("emits_light", False):
-                                    LIGHT_SOURCES.discard((target_col, target_row))
-                                
-                                # Break the block
-                                WORLD_MAP[target_row][target_col] = 0
+                                # Break the block (light sources are updated by the block change listener)
+                                set_block(target_row, target_col, 0)
                                 
                                 # Special case: Breaking bamboo breaks all bamboo above it
                                 if block_id == 127:  # BAMBOO_ID
                                     check_row = target_row - 1
+                                    bamboo_edits = []
                                     while check_row >= 0 and WORLD_MAP[check_row][target_col] == 127:
-                                        WORLD_MAP[check_row][target_col] = 0
+                                        bamboo_edits.append((check_row, target_col, 0))
                                         if 'DROPPED_ITEMS' in globals():
                                             drop_x = target_col * BLOCK_SIZE + BLOCK_SIZE // 4
                                             drop_y = check_row * BLOCK_SIZE + BLOCK_SIZE // 4
-                                            DROPPED_ITEMS.add(DroppedItem(drop_x, drop_y, 127, 1))
+                                            spawn_dropped_item(drop_x, drop_y, 127, 1)
                                         check_row -= 1
+                                    set_blocks(bamboo_edits)
                                 
                                 # Drop item (using existing drop logic)
                                 if 'DROPPED_ITEMS' in globals():
@@ -15135,24 +16763,24 @@ while running:
                                         biome_type = BIOME_MAP[target_col] if target_col < len(BIOME_MAP) else CRIMSON_FOREST_BIOME
                                         if random.random() < 0.15:
                                             sapling_map = {6: 139, 84: 140, 83: 141, 126: 142, 149: 150}
-                                            DROPPED_ITEMS.add(DroppedItem(drop_x, drop_y, sapling_map[block_id], 1))
+                                            spawn_dropped_item(drop_x, drop_y, sapling_map[block_id], 1)
                                         if random.random() < 0.15:
-                                            DROPPED_ITEMS.add(DroppedItem(drop_x, drop_y, 10, random.randint(1, 2)))
+                                            spawn_dropped_item(drop_x, drop_y, 10, random.randint(1, 2))
                                         if random.random() < 0.15 and biome_type != BASALT_DELTAS_BIOME:
                                             fruit_map = {6: 136, 84: 137, 126: 138}
                                             if block_id in fruit_map:
-                                                DROPPED_ITEMS.add(DroppedItem(drop_x, drop_y, fruit_map[block_id], 1))
+                                                spawn_dropped_item(drop_x, drop_y, fruit_map[block_id], 1)
                                     elif block_id == 143:  # Berry Bush
-                                        DROPPED_ITEMS.add(DroppedItem(drop_x, drop_y, 144, random.randint(1, 3)))
+                                        spawn_dropped_item(drop_x, drop_y, 144, random.randint(1, 3))
                                     elif block_id == 22:  # Dead Bush
-                                        DROPPED_ITEMS.add(DroppedItem(drop_x, drop_y, 10, random.randint(0, 2)))
+                                        spawn_dropped_item(drop_x, drop_y, 10, random.randint(0, 2))
                                     elif block_id == 11:  # Coal Ore
-                                        DROPPED_ITEMS.add(DroppedItem(drop_x, drop_y, 85, 1))
+                                        spawn_dropped_item(drop_x, drop_y, 85, 1)
                                     elif "drops" in block_data:
                                         drop_id, drop_count = block_data["drops"]
-                                        DROPPED_ITEMS.add(DroppedItem(drop_x, drop_y, drop_id, drop_count))
+                                        spawn_dropped_item(drop_x, drop_y, drop_id, drop_count)
                                     else:
-                                        DROPPED_ITEMS.add(DroppedItem(drop_x, drop_y, block_id, 1))
+                                        spawn_dropped_item(drop_x, drop_y, block_id, 1)
                                 
                                 # Reset mining progress
                                 player.mining_progress = 0
@@ -15250,33 +16878,28 @@ while running:
                     # Decelerate charge over time
                     player.charge_velocity *= 0.95
         
+        profile_lap("input")
+        
         # 3. GAME LOGIC UPDATE
-        if not player.is_crafting and not player.inventory_open: 
+        game_logic_running = not player.is_crafting and not player.inventory_open
+        if game_logic_running:
             player.update()
-            
+        # Marked every frame, so the lap after it never absorbs the player's time
+        profile_lap("player")
+        
+        if game_logic_running:
             # Spawn mobs in dark enclosed areas (mob farms) - happens continuously
             if random.random() < 0.1:  # 10% chance each frame to attempt spawn
                 spawn_dark_area_mobs()
             
             # Sunlight damage for hostile mobs - ONLY during DAY_PHASE
             if TIME_PHASE == DAY_PHASE:
-                for mob in MOBS:
-                    # Skip passive/neutral mobs - these should NEVER burn
-                    if isinstance(mob, (Cow, Pig, Sheep, Chicken, Rabbit, Horse, Camel, Penguin, Fox, Wolf, Frog, 
-                                       Deer, Bear, Turtle, Panda, Monkey, Villager, IronGolem, Goat,
-                                       Lion, Rhino, Ostrich, Elephant, Bird, Cod, Salmon, TropicalFish, Whale, Dolphin, 
-                                       Shark, Nautilus, Narwhal, ZombieHorse)):
-                        continue
-                    
-                    # Skip specific mob types that don't burn (Drowned, Slime, Spider, Creeper)
-                    if isinstance(mob, (Drowned, Slime, Spider, Creeper, CaveSpider)):
-                        continue
-                    
+                # Only mobs tagged burns_in_sun are visited (Zombie, Skeleton, Witch, etc.)
+                for mob in MOBS.with_tag("burns_in_sun"):
                     # Skip husks (desert zombies)
-                    if isinstance(mob, Zombie) and hasattr(mob, 'is_husk') and mob.is_husk:
+                    if getattr(mob, 'is_husk', False):
                         continue
                     
-                    # At this point, only hostile mobs that SHOULD burn remain (Zombie, Skeleton, Witch, etc.)
                     # Check sunlight exposure ONLY during day
                     mob_col = mob.rect.centerx // BLOCK_SIZE
                     mob_row = mob.rect.top // BLOCK_SIZE
@@ -15323,73 +16946,26 @@ while running:
                 if hasattr(mob, 'on_fire'):
                     mob.on_fire = False
         
-        # --- LAG PREVENTION: Despawn mobs if count exceeds 500 ---
-        if len(MOBS) > 500:
-            # Calculate distance to player for all mobs
-            player_pos = (player.rect.centerx, player.rect.centery)
-            
-            # Separate mobs by type
-            hostile_mobs = []
-            passive_mobs = []
-
-            # Build hostile types list dynamically to avoid NameError if some mob classes
-            # (like Enderman or Wither) are defined in other modules or not present.
-            hostile_base = [Zombie, Skeleton, Creeper, Spider, Witch, Slime, 
-                            Parched, ZombieCamel, ZombieNautilus, CaveSpider,
-                            Drowned]
-            hostile_types = list(hostile_base)
-            if 'Enderman' in globals():
-                hostile_types.append(globals()['Enderman'])
-            if 'Wither' in globals():
-                hostile_types.append(globals()['Wither'])
-
-            for mob in MOBS:
-                distance = math.sqrt((mob.rect.centerx - player_pos[0])**2 + (mob.rect.centery - player_pos[1])**2)
-                mob_data = (mob, distance)
-                
-                # Check if hostile
-                try:
-                    is_hostile = isinstance(mob, tuple(hostile_types))
-                except Exception:
-                    is_hostile = False
-
-                if is_hostile:
-                    hostile_mobs.append(mob_data)
-                else:
-                    passive_mobs.append(mob_data)
-            
-            # Calculate how many to despawn
-            mobs_to_despawn = len(MOBS) - 500
-            despawned_count = 0
-            
-            # Priority 1: Despawn furthest hostile mobs first
-            hostile_mobs.sort(key=lambda x: x[1], reverse=True)  # Sort by distance, furthest first
-            for mob, distance in hostile_mobs:
-                if despawned_count >= mobs_to_despawn:
-                    break
-                if distance > BLOCK_SIZE * 30:  # Only despawn if far from player (30+ blocks)
-                    mob.kill()
-                    despawned_count += 1
-            
-            # Priority 2: If still over limit, despawn furthest passive mobs
-            if despawned_count < mobs_to_despawn:
-                passive_mobs.sort(key=lambda x: x[1], reverse=True)  # Sort by distance, furthest first
-                for mob, distance in passive_mobs:
-                    if despawned_count >= mobs_to_despawn:
-                        break
-                    if distance > BLOCK_SIZE * 40:  # Only despawn if very far (40+ blocks)
-                        mob.kill()
-                        despawned_count += 1
-            
-            if despawned_count > 0:
-                print(f"⚠️ LAG PREVENTION: Despawned {despawned_count} mobs (Total was {len(MOBS) + despawned_count}, now {len(MOBS)})")
+        profile_lap("mob spawning")
+        
+        # --- LAG PREVENTION: Trim far mobs above MOB_CAP, a small slice per tick ---
+        update_mob_despawn(MOBS, player)
         
-        # Update mobs
+        # Refresh the shared hostile-mob flow field toward the player
+        update_flow_field(WORLD_MAP, player)
+        
+        # Update mobs (distant mobs think less often, see AI Level of Detail; physics runs for all)
+        schedule_mob_ai(MOBS, player)
+        MOB_PHYSICS_DEFERRED = BATCH_MOB_PHYSICS
         for mob in MOBS:
             if isinstance(mob, Skeleton):
                 mob.update(WORLD_MAP, player, MOBS, ARROWS)
             else:
                 mob.update(WORLD_MAP, player, MOBS)
+        MOB_PHYSICS_DEFERRED = False
+        if BATCH_MOB_PHYSICS:
+            run_batched_mob_physics(WORLD_MAP)
+        profile_lap("mobs")
         
         # --- NETHER PORTAL DETECTION ---
         # Check if player is standing in obsidian portal
@@ -15415,19 +16991,15 @@ while running:
                     sys.exit(0)
                 print("🌀 Returned from Nether (in-process). Resuming Overworld.")
         
-        # Update projectiles
-        ARROWS.update(WORLD_MAP, player, MOBS)
-        SPLASH_POTIONS.update(WORLD_MAP, player, MOBS)
-        TRIDENTS.update(WORLD_MAP, player, MOBS)
-        ENDER_PEARLS.update()  # Update ender pearl projectiles
-        EYE_OF_ENDER_PROJECTILES.update()  # Eye of Ender flies toward stronghold
+        # Update projectiles (arrows, potions, tridents, ender pearls, eyes of ender)
+        update_projectiles(WORLD_MAP, player, MOBS)
         
-        # Update furnace
-        if FURNACE_OPEN:
-            update_furnace()
+        # Update furnaces and other block entities due this tick
+        tick_block_entities()
         
         # Update dropped items
         DROPPED_ITEMS.update()
+        profile_lap("projectiles & items")
         
         # Check if player has died
         if player.health <= 0 and not player.creative_mode:
@@ -15435,30 +17007,19 @@ while running:
             death_x = player.rect.centerx
             death_y = player.rect.centery
             
-            # Drop hotbar items
-            for i in range(9):
-                item_id, count = player.hotbar_slots[i]
-                if item_id != 0 and count > 0:
-                    # Create stacks of items (max 64 per drop)
-                    while count > 0:
-                        drop_count = min(count, 64)
-                        offset_x = random.randint(-10, 10)
-                        offset_y = random.randint(-10, 10)
-                        DROPPED_ITEMS.add(DroppedItem(death_x + offset_x, death_y + offset_y, item_id, drop_count))
-                        count -= drop_count
-                    player.hotbar_slots[i] = (0, 0)
-            
-            # Drop inventory items (27 slots in flat list)
-            for i in range(27):
-                item_id, count = player.inventory[i]
-                if item_id != 0 and count > 0:
-                    while count > 0:
-                        drop_count = min(count, 64)
-                        offset_x = random.randint(-80, 80)
-                        offset_y = random.randint(-80, 80)
-                        DROPPED_ITEMS.add(DroppedItem(death_x + offset_x, death_y + offset_y, item_id, drop_count))
-                        count -= drop_count
-                    player.inventory[i] = (0, 0)
+            # Close any block GUI first, so its grid and held item are dropped too
+            close_block_guis()
+            
+            # Drop hotbar items close by and inventory items (27 slots) spread wider
+            for slot, item_id, count in player.items.clear():
+                spread = 10 if slot < 9 else 80
+                # Create stacks of items (max 64 per drop)
+                while count > 0:
+                    drop_count = min(count, 64)
+                    offset_x = random.randint(-spread, spread)
+                    offset_y = random.randint(-spread, spread)
+                    spawn_dropped_item(death_x + offset_x, death_y + offset_y, item_id, drop_count)
+                    count -= drop_count
             
             # Drop armor (if any equipped)
             armor_slot_ids = [135, 136, 137, 138]  # Helmet, Chestplate, Leggings, Boots
@@ -15466,7 +17027,7 @@ while running:
                 if player.armor_slots[slot_name] != 0:
                     offset_x = random.randint(-80, 80)
                     offset_y = random.randint(-80, 80)
-                    DROPPED_ITEMS.add(DroppedItem(death_x + offset_x, death_y + offset_y, player.armor_slots[slot_name], 1))
+                    spawn_dropped_item(death_x + offset_x, death_y + offset_y, player.armor_slots[slot_name], 1)
                     player.armor_slots[slot_name] = 0
             
             print("💀 Dropped all items at death location!")
@@ -15482,7 +17043,7 @@ while running:
             if growth_time >= TOTAL_CYCLE_LENGTH:
                 if 0 <= row < GRID_HEIGHT and 0 <= col < GRID_WIDTH:
                     if WORLD_MAP[row][col] in [139, 140, 141, 142]:
-                        WORLD_MAP[row][col] = 0
+                        set_block(row, col, 0)
                         tree_type = BLOCK_TYPES[sapling_id].get("tree_type", "oak")
                         if tree_type == "oak":
                             generate_tree(WORLD_MAP, col, row - 1, CRIMSON_FOREST_BIOME)
@@ -15492,13 +17053,16 @@ while running:
                             generate_tree(WORLD_MAP, col, row - 1, BASALT_DELTAS_BIOME)
                         elif tree_type == "jungle":
                             generate_tree(WORLD_MAP, col, row - 1, CRIMSON_FOREST_BIOME_3)
+                        # generate_tree writes WORLD_MAP directly, so announce the area it covers
+                        notify_region_changed(row - 12, row + 1, col - 2, col + 2)
                         print(f"🌳 Sapling grew into {tree_type} tree!")
                 del SAPLING_GROWTH[(col, row)]
         
-        # Check player collision with dropped items
+        # Check player collision with dropped items (collected items go back to the pool)
         collected_items = pygame.sprite.spritecollide(player, DROPPED_ITEMS, True)
-        for dropped_item in collected_items:
-            player.add_to_inventory(dropped_item.item_id, dropped_item.amount)
+        if collected_items:
+            player.items.add_many((dropped_item.item_id, dropped_item.amount) for dropped_item in collected_items)
+            player.held_block = player.hotbar_slots[player.active_slot][0]
         
         # --- LAVA TOGGLE: Spawn lava above player head ---
         if hasattr(player, 'lava_toggle') and player.lava_toggle:
@@ -15508,7 +17072,7 @@ while running:
             if 0 <= player_col < GRID_WIDTH and 0 <= player_row < GRID_HEIGHT:
                 # Only place lava if block is air
                 if WORLD_MAP[player_row][player_col] == AIR_ID:
-                    WORLD_MAP[player_row][player_col] = LAVA_ID  # Lava block
+                    set_block(player_row, player_col, LAVA_ID)  # Lava block
         
         # Respawn timer (outside the crafting/inventory check)
         RESPAWN_TIMER += 1
@@ -15548,7 +17112,7 @@ while running:
                 biome_type = BIOME_MAP[col] if col < len(BIOME_MAP) else 0
                 
                 # Spawn various hostile mobs
-                if random.random() < 0.3:
+                if random.random() < 0.3 and can_spawn_mob("hostile", spawn_x):
                     r = random.random()
                     if r < 0.4:
                         MOBS.add(Zombie(spawn_x, spawn_y, biome_type))
@@ -15565,12 +17129,15 @@ while running:
                     mobs_spawned += 1
             print(f"👹 Respawn: Spawned {mobs_spawned} mobs 30 blocks above spawn! Total: {len(MOBS)}")
     
+        profile_lap("world events")
+        
         # Water flow update
         water_flow_timer += 1
-        if water_flow_timer >= 10:
+        if water_flow_timer >= QUALITY["fluid_tick_interval"]:
             update_water_flow()
             update_falling_blocks()
             water_flow_timer = 0
+        profile_lap("water flow")
     
         # --- OPTIMIZED LAVA FIRE MECHANICS ---
         # Initialize fire update timer if needed
@@ -15593,7 +17160,8 @@ while running:
             min_row = max(0, player_row - check_radius)
             max_row = min(GRID_HEIGHT, player_row + check_radius)
         
-            # Check for lava blocks near player only
+            # Check for lava blocks near player only (ignitions are applied as one batch)
+            ignited_blocks = []
             for row in range(min_row, max_row):
                 for col in range(min_col, max_col):
                     if WORLD_MAP[row][col] == LAVA_ID:
@@ -15628,9 +17196,10 @@ while running:
                                         if dist <= 5 and dist > 0:
                                             target_block = WORLD_MAP[fire_row][fire_col]
                                             # Only set flammable blocks on fire
-                                            flammable = target_block in [18, 6, 8, 83, 84, 34, 35, 105, 106, 124, 125, 129, 92]
+                                            flammable = BLOCK_FLAMMABLE[target_block]
                                             if flammable and random.random() < 0.5:
-                                                WORLD_MAP[fire_row][fire_col] = FIRE_ID
+                                                ignited_blocks.append((fire_row, fire_col, FIRE_ID))
+            set_blocks(ignited_blocks)
     
         # Update fire blocks - only check near player area
         fire_blocks_to_remove = []
@@ -15647,35 +17216,36 @@ while running:
         min_row = max(0, player_row - fire_check_radius)
         max_row = min(GRID_HEIGHT, player_row + fire_check_radius)
     
-        for row in range(min_row, max_row):
-            for col in range(min_col, max_col):
-                if WORLD_MAP[row][col] == FIRE_ID:
-                    fire_key = (row, col)
-                
-                    # Track fire lifetime
-                    if fire_key not in player.fire_block_timers:
-                        player.fire_block_timers[fire_key] = FPS * random.randint(3, 8)  # 3-8 seconds
-                
-                    player.fire_block_timers[fire_key] -= 1
-                
-                    # Fire burns out
-                    if player.fire_block_timers[fire_key] <= 0:
+        # Walk the fire index instead of scanning the whole area
+        for fire_key in sorted(FIRE_BLOCK_INDEX):
+            row, col = fire_key
+            if not (min_row <= row < max_row and min_col <= col < max_col):
+                continue
+            
+            # Track fire lifetime
+            if fire_key not in player.fire_block_timers:
+                player.fire_block_timers[fire_key] = FPS * random.randint(3, 8)  # 3-8 seconds
+            
+            player.fire_block_timers[fire_key] -= 1
+            
+            # Fire burns out
+            if player.fire_block_timers[fire_key] <= 0:
+                fire_blocks_to_remove.append((row, col))
+                del player.fire_block_timers[fire_key]
+            
+            # Water extinguishes fire
+            for dr, dc in [(-1,0), (1,0), (0,-1), (0,1)]:
+                adj_row, adj_col = row + dr, col + dc
+                if 0 <= adj_row < GRID_HEIGHT and 0 <= adj_col < GRID_WIDTH:
+                    if WORLD_MAP[adj_row][adj_col] in [WATER_ID, SWAMP_WATER_ID]:
                         fire_blocks_to_remove.append((row, col))
-                        del player.fire_block_timers[fire_key]
-                
-                    # Water extinguishes fire
-                    for dr, dc in [(-1,0), (1,0), (0,-1), (0,1)]:
-                        adj_row, adj_col = row + dr, col + dc
-                        if 0 <= adj_row < GRID_HEIGHT and 0 <= adj_col < GRID_WIDTH:
-                            if WORLD_MAP[adj_row][adj_col] in [WATER_ID, SWAMP_WATER_ID]:
-                                fire_blocks_to_remove.append((row, col))
-                                if fire_key in player.fire_block_timers:
-                                    del player.fire_block_timers[fire_key]
-                                break
+                        if fire_key in player.fire_block_timers:
+                            del player.fire_block_timers[fire_key]
+                        break
     
         # Remove burned out fire blocks (batched)
-        for row, col in fire_blocks_to_remove:
-            WORLD_MAP[row][col] = AIR_ID
+        set_blocks((row, col, AIR_ID) for row, col in fire_blocks_to_remove)
+        profile_lap("fire & lava")
         
         # Update mob fire status (all mobs need to be checked for fire damage)
         for mob in MOBS:
@@ -15700,12 +17270,15 @@ while running:
                 if hasattr(mob, 'attack') and player.damage_flash_timer <= 0 and not isinstance(mob, (Skeleton, Parched)):
                     mob.attack(player)
         
+        profile_lap("mob combat")
+        
         # Calculate camera offset 
         camera_x, camera_y = calculate_camera_offset(player.rect)
 
         # 4. DRAWING
         screen.fill(get_sky_color())
         draw_world(camera_x, camera_y, player)
+        profile_lap("draw world")
 
         # Draw block highlight 
         if not player.is_crafting and not player.inventory_open:
@@ -15733,15 +17306,14 @@ while running:
             # Fire animation for burning mobs (sunlight or lava fire)
             show_fire = False
             if (hasattr(mob, 'sunlight_timer') and mob.sunlight_timer > 0 and 
-                not isinstance(mob, (Spider, Creeper, Drowned)) and 
-                not (isinstance(mob, Zombie) and hasattr(mob, 'is_husk') and mob.is_husk)):
+                "burns_in_sun" in mob.tags and not getattr(mob, 'is_husk', False)):
                 show_fire = True
             if hasattr(mob, 'on_fire') and mob.on_fire:
                 show_fire = True
         
             if show_fire:
                 # Draw flickering fire particles above the mob
-                for i in range(3):
+                for i in range(round(3 * QUALITY["particle_density"])):
                     fire_x = mob_screen_pos[0] + random.randint(0, mob.rect.width)
                     fire_y = mob_screen_pos[1] + random.randint(-10, mob.rect.height // 2)
                     fire_color = random.choice([(255, 100, 0), (255, 150, 0), (255, 200, 0)])
@@ -15757,17 +17329,7 @@ while running:
                 pygame.draw.rect(screen, (255, 0, 0), (mob_screen_pos[0], mob_screen_pos[1] - 10, bar_width * health_ratio, bar_height))
         
         # Draw projectiles and items
-        for arrow in ARROWS:
-            screen.blit(arrow.image, (arrow.rect.x - camera_x, arrow.rect.y - camera_y))
-        for potion in SPLASH_POTIONS:
-            screen.blit(potion.image, (potion.rect.x - camera_x, potion.rect.y - camera_y))
-        for trident in TRIDENTS:
-            screen.blit(trident.image, (trident.rect.x - camera_x, trident.rect.y - camera_y))
-        for pearl in ENDER_PEARLS:
-            # Draw ender pearl with texture
-            screen.blit(pearl.image, (pearl.rect.x - camera_x, pearl.rect.y - camera_y))
-        for eye in EYE_OF_ENDER_PROJECTILES:
-            screen.blit(eye.image, (eye.rect.x - camera_x, eye.rect.y - camera_y))
+        draw_projectiles(screen, camera_x, camera_y)
         for dropped_item in DROPPED_ITEMS:
             screen.blit(dropped_item.image, (dropped_item.rect.x - camera_x, dropped_item.rect.y - camera_y))
         
@@ -15777,8 +17339,8 @@ while running:
         
         # Draw username above player
         if hasattr(player, 'username') and player.username:
-            username_text = FONT_SMALL.render(player.username, True, (255, 255, 255))
-            username_shadow = FONT_SMALL.render(player.username, True, (0, 0, 0))
+            username_text = render_text(FONT_SMALL, player.username, True, (255, 255, 255))
+            username_shadow = render_text(FONT_SMALL, player.username, True, (0, 0, 0))
             username_x = player_screen_x + player.rect.width // 2 - username_text.get_width() // 2
             username_y = player_screen_y - 20
             screen.blit(username_shadow, (username_x + 1, username_y + 1))
@@ -15813,8 +17375,11 @@ while running:
             darkness_surface.set_alpha(darkness_alpha)
             screen.blit(darkness_surface, (0, 0))
         
+        profile_lap("draw entities")
+        
         # Draw HUD
         draw_hud(player)
+        profile_lap("hud")
         
         # Draw GUI overlays
         if player.inventory_open and not player.is_crafting:
@@ -15832,11 +17397,17 @@ while running:
         
         # Draw achievement popup
         draw_achievement_popup()
+        profile_lap("gui")
+        draw_profiler_overlay(screen)
+        profile_lap("profiler")
 
         # 5. UPDATE DISPLAY & CLOCK
         pygame.display.flip()
+        profile_lap("flip")
+        profile_end_frame()
     
     elif CURRENT_MENU_STATE == MENU_STATE_DEATH:
+        MENU_REDRAW_KEY = None
         # Death Screen - show frozen game world with death overlay
         camera_x, camera_y = calculate_camera_offset(player.rect)
         screen.fill(get_sky_color())
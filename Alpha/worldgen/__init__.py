@@ -0,0 +1 @@
+"""World generation code that runs in worker processes, apart from the game scripts."""
@@ -0,0 +1,388 @@
+"""Nether chunk terrain: the per-chunk job of world generation.
+
+generate_chunk_terrain(seed, chunk_id) returns one chunk's height map, biome map and block grid.
+pycraft_nether.py runs these jobs on a process pool (see run_chunk_jobs there). This module
+only needs the standard library and, optionally, NumPy, so the worker processes import it
+without loading pygame or starting the game.
+"""
+import math
+import random
+import sys
+from contextlib import contextmanager
+
+# NumPy is optional - it enables the whole-array strata pass and batched noise
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    np = None
+    HAS_NUMPY = False
+
+# --- World Layout ---
+# The ids below are the game's own (they are stored in saves); see the block and biome tables
+# in pycraft_nether.py, which must agree with these.
+CHUNK_SIZE = 256  # Blocks per chunk width
+GRID_HEIGHT = 150
+
+# --- Block IDs ---
+AIR_ID = 0
+GRASS_ID = 1  # Netherrack
+STONE_ID = 3  # Basalt
+BEDROCK_ID = 4
+SAND_ID = 19  # Soul Sand
+ICE_ID = 25  # Magma Block
+COBBLESTONE_ID = 42  # Blackstone
+
+# --- Biome Type Constants ---
+CRIMSON_FOREST_BIOME = 0
+NETHER_WASTES_BIOME = 1
+SOUL_SAND_VALLEY_BIOME = 2
+BASALT_DELTAS_BIOME = 3
+WARPED_FOREST_BIOME = 4
+CRIMSON_FOREST_BIOME_2 = 5
+WARPED_FOREST_BIOME_2 = 6
+CRIMSON_FOREST_BIOME_3 = 8
+BASALT_DELTAS_BIOME_2 = 9
+NETHER_WASTES_BIOME_2 = 10
+LAVA_OCEAN_BIOME = 11
+BASALT_MOUNTAIN_BIOME = 12
+
+# --- Gradient Noise ---
+# Seeded 1D/2D gradient (Perlin) noise with fractal octaves. A sample depends only on the seed
+# and the coordinate, so the terrain of any column range can be computed on its own: a chunk
+# generated later lines up with its neighbours, and whole ranges are evaluated in one batch.
+# The scalar methods are pure Python; the *_many methods take a sequence of coordinates and
+# use NumPy for the batch when it is available.
+NOISE_TABLE_SIZE = 256  # Lattice hash table size (must be a power of two)
+NOISE_GRADIENTS_2D = ((1.0, 0.0), (-1.0, 0.0), (0.0, 1.0), (0.0, -1.0),
+                      (0.7071, 0.7071), (-0.7071, 0.7071), (0.7071, -0.7071), (-0.7071, -0.7071))
+
+def noise_fade(t):
+    """Perlin's smootherstep curve 6t^5 - 15t^4 + 10t^3 (works on floats and NumPy arrays)."""
+    return t * t * t * (t * (t * 6 - 15) + 10)
+
+class GradientNoise:
+    """Seeded gradient noise. noise1/noise2 return values in about [-1, 1]."""
+    def __init__(self, seed):
+        self.seed = seed
+        rng = random.Random(seed)
+        perm = list(range(NOISE_TABLE_SIZE))
+        rng.shuffle(perm)
+        self.perm = perm + perm
+        self.gradients = [rng.uniform(-1, 1) for _ in range(NOISE_TABLE_SIZE)]
+        if HAS_NUMPY:
+            self.perm_array = np.array(self.perm, dtype=np.int64)
+            self.gradient_array = np.array(self.gradients)
+            self.gradient_2d_array = np.array(NOISE_GRADIENTS_2D)
+    
+    def hash1(self, i):
+        """Hashes an integer lattice coordinate (int or NumPy int array) into the table."""
+        mask = NOISE_TABLE_SIZE - 1
+        perm = self.perm_array if HAS_NUMPY and not isinstance(i, int) else self.perm
+        return perm[perm[i & mask] + ((i >> 8) & mask)]
+    
+    def hash2(self, i, j):
+        """Hashes a 2D integer lattice coordinate (ints or NumPy int arrays) into the table."""
+        mask = NOISE_TABLE_SIZE - 1
+        perm = self.perm_array if HAS_NUMPY and not isinstance(i, int) else self.perm
+        return perm[perm[i & mask] + (j & mask)]
+    
+    def value01(self, i):
+        """Returns a repeatable pseudo-random value in [0, 1) for an integer coordinate."""
+        return (self.hash1(i) * NOISE_TABLE_SIZE + self.hash1(i + 0x9E37)) / (NOISE_TABLE_SIZE * NOISE_TABLE_SIZE)
+    
+    def noise1(self, x):
+        """1D gradient noise at x."""
+        i = math.floor(x)
+        t = x - i
+        g0 = self.gradients[self.hash1(i)] * t
+        g1 = self.gradients[self.hash1(i + 1)] * (t - 1)
+        return 2 * (g0 + noise_fade(t) * (g1 - g0))
+    
+    def noise2(self, x, y):
+        """2D gradient noise at (x, y)."""
+        i = math.floor(x)
+        j = math.floor(y)
+        tx = x - i
+        ty = y - j
+        
+        def corner(di, dj):
+            gx, gy = NOISE_GRADIENTS_2D[self.hash2(i + di, j + dj) & 7]
+            return gx * (tx - di) + gy * (ty - dj)
+        
+        u = noise_fade(tx)
+        v = noise_fade(ty)
+        bottom = corner(0, 0) + u * (corner(1, 0) - corner(0, 0))
+        top = corner(0, 1) + u * (corner(1, 1) - corner(0, 1))
+        return 1.4142 * (bottom + v * (top - bottom))
+    
+    def fractal1(self, x, octaves=4, persistence=0.5, lacunarity=2.0):
+        """Sum of `octaves` noise1 layers, each at lacunarity times the frequency and persistence
+        times the amplitude of the one before, normalized back to about [-1, 1]."""
+        total = 0.0
+        amplitude = 1.0
+        frequency = 1.0
+        for _ in range(octaves):
+            total += self.noise1(x * frequency) * amplitude
+            amplitude *= persistence
+            frequency *= lacunarity
+        return total / ((1 - persistence ** octaves) / (1 - persistence))
+    
+    def noise1_array(self, xs):
+        """Vectorized noise1 over a NumPy array of coordinates."""
+        i = np.floor(xs).astype(np.int64)
+        t = xs - i
+        g0 = self.gradient_array[self.hash1(i)] * t
+        g1 = self.gradient_array[self.hash1(i + 1)] * (t - 1)
+        return 2 * (g0 + noise_fade(t) * (g1 - g0))
+    
+    def noise2_array(self, xs, ys):
+        """Vectorized noise2 over NumPy arrays of coordinates."""
+        i = np.floor(xs).astype(np.int64)
+        j = np.floor(ys).astype(np.int64)
+        tx = xs - i
+        ty = ys - j
+        
+        def corner(di, dj):
+            gradient = self.gradient_2d_array[self.hash2(i + di, j + dj) & 7]
+            return gradient[..., 0] * (tx - di) + gradient[..., 1] * (ty - dj)
+        
+        u = noise_fade(tx)
+        v = noise_fade(ty)
+        bottom = corner(0, 0) + u * (corner(1, 0) - corner(0, 0))
+        top = corner(0, 1) + u * (corner(1, 1) - corner(0, 1))
+        return 1.4142 * (bottom + v * (top - bottom))
+    
+    def fractal1_many(self, xs, octaves=4, persistence=0.5, lacunarity=2.0):
+        """fractal1 for every coordinate in xs, returned as a list."""
+        if not HAS_NUMPY:
+            return [self.fractal1(x, octaves, persistence, lacunarity) for x in xs]
+        xs = np.asarray(xs, dtype=np.float64)
+        total = np.zeros_like(xs)
+        amplitude = 1.0
+        frequency = 1.0
+        for _ in range(octaves):
+            total += self.noise1_array(xs * frequency) * amplitude
+            amplitude *= persistence
+            frequency *= lacunarity
+        return (total / ((1 - persistence ** octaves) / (1 - persistence))).tolist()
+    
+    def noise2_many(self, xs, ys):
+        """noise2 for every (x, y) pair, returned as a list."""
+        if not HAS_NUMPY:
+            return [self.noise2(x, y) for x, y in zip(xs, ys)]
+        return self.noise2_array(np.asarray(xs, dtype=np.float64), np.asarray(ys, dtype=np.float64)).tolist()
+
+# --- Terrain Generation Passes ---
+# A chunk is built in stages: the height map and biome map come first, then the strata fill,
+# then the ore and pocket rolls. (The game's generate_world then carves caves and stamps
+# structures over the joined chunks.)
+# With NumPy the strata and ores are whole-array passes: each layer is a comparison of a row
+# index column against the ground-level row, and the ore rolls come from one vectorized RNG
+# draw. Without NumPy the same stages run cell by cell on lists. The NumPy RNG is seeded from
+# the chunk's RNG, so a chunk only depends on the world seed.
+# Heights and biomes are sampled by absolute column: chunk c covers columns
+# [c * CHUNK_SIZE, (c + 1) * CHUNK_SIZE).
+TERRAIN_BASE_LEVEL = GRID_HEIGHT // 2
+TERRAIN_AMPLITUDE = 8  # Rows the rolling terrain rises or falls around TERRAIN_BASE_LEVEL
+TERRAIN_FREQUENCY = 0.04
+MOUNTAIN_FREQUENCY = 0.05
+CAVE_POCKET_LAVA_ID = 31  # Lava used by the underground lava/air pockets
+
+# Biomes come in cells of about BIOME_CELL_WIDTH columns whose edges are pushed around by up to
+# BIOME_WARP columns of noise (sampled half a lattice step off the cell edges, where it is
+# never zero), so boundaries do not sit on a grid. Lava oceans are picked per
+# cell of LAVA_OCEAN_CELL_WIDTH columns instead, so they come out larger.
+BIOME_CELL_WIDTH = 128
+BIOME_WARP = 40
+LAVA_OCEAN_CELL_WIDTH = 320
+LAVA_OCEAN_CHANCE = 0.2
+# Land biomes and their relative weights (forests and wastes most common)
+LAND_BIOME_WEIGHTS = (
+    (CRIMSON_FOREST_BIOME, 1.5), (NETHER_WASTES_BIOME, 1.2), (SOUL_SAND_VALLEY_BIOME, 0.8),
+    (BASALT_DELTAS_BIOME, 1), (WARPED_FOREST_BIOME, 1.5), (CRIMSON_FOREST_BIOME_2, 1),
+    (WARPED_FOREST_BIOME_2, 1), (CRIMSON_FOREST_BIOME_3, 0.8), (BASALT_DELTAS_BIOME_2, 0.6),
+    (NETHER_WASTES_BIOME_2, 0.8), (BASALT_MOUNTAIN_BIOME, 0.7),
+)
+
+WORLD_SEED = None  # Seed the noise below was built for (set by set_world_seed)
+TERRAIN_NOISE = None  # Rolling ground height
+BIOME_NOISE = None  # Biome cell picks and boundary warp
+MOUNTAIN_NOISE = None  # Basalt mountain peaks
+
+def set_world_seed(seed):
+    """Sets the seed the terrain and biome noise is sampled from."""
+    global WORLD_SEED, TERRAIN_NOISE, BIOME_NOISE, MOUNTAIN_NOISE
+    WORLD_SEED = seed
+    TERRAIN_NOISE = GradientNoise(seed)
+    BIOME_NOISE = GradientNoise(seed + 1)
+    MOUNTAIN_NOISE = GradientNoise(seed + 2)
+
+# Ore rolls for cells more than 5 blocks below the surface, as
+# (roll threshold, minimum depth below the surface, block id). The first entry matching a
+# cell's roll wins. A block id of None is a pocket: lava or air with equal odds.
+NETHER_ORE_TABLE = (
+    (0.11, 12, 11),              # Nether Gold Ore
+    (0.125, 20, 12),             # Ancient Debris
+    (0.17, 10, ICE_ID),          # Magma Block
+    (0.20, 10, COBBLESTONE_ID),  # Blackstone
+    (0.24, 8, None),             # Lava or air pocket
+)
+
+def generate_height_map(first_col, width):
+    """Returns the rolling ground-level row of columns first_col .. first_col + width - 1."""
+    samples = TERRAIN_NOISE.fractal1_many([col * TERRAIN_FREQUENCY for col in range(first_col, first_col + width)], octaves=3)
+    return [max(1, min(GRID_HEIGHT - 3, TERRAIN_BASE_LEVEL + int(sample * TERRAIN_AMPLITUDE))) for sample in samples]
+
+def get_biome_at(col, warp=None):
+    """Returns the biome of an absolute column. warp is BIOME_NOISE's boundary offset there, if already sampled."""
+    if warp is None:
+        warp = BIOME_NOISE.noise1(col / BIOME_CELL_WIDTH + 0.5)
+    warped_col = col + warp * BIOME_WARP
+    if BIOME_NOISE.value01(math.floor(warped_col / LAVA_OCEAN_CELL_WIDTH) - 0x5000) < LAVA_OCEAN_CHANCE:
+        return LAVA_OCEAN_BIOME
+    pick = BIOME_NOISE.value01(math.floor(warped_col / BIOME_CELL_WIDTH)) * sum(weight for _, weight in LAND_BIOME_WEIGHTS)
+    for biome_type, weight in LAND_BIOME_WEIGHTS:
+        pick -= weight
+        if pick < 0:
+            return biome_type
+    return LAND_BIOME_WEIGHTS[-1][0]
+
+def generate_biome_map(first_col, width):
+    """Returns the biome of columns first_col .. first_col + width - 1."""
+    cols = range(first_col, first_col + width)
+    if HAS_NUMPY:
+        warps = BIOME_NOISE.noise1_array(np.arange(first_col, first_col + width) / BIOME_CELL_WIDTH + 0.5).tolist()
+    else:
+        warps = [None] * width
+    biome_map = [get_biome_at(col, warp) for col, warp in zip(cols, warps)]
+    
+    # Debug print for special biomes
+    for offset, biome_type in enumerate(biome_map):
+        if offset > 0 and biome_map[offset - 1] == biome_type:
+            continue
+        col = first_col + offset
+        if biome_type in [CRIMSON_FOREST_BIOME, CRIMSON_FOREST_BIOME_2, CRIMSON_FOREST_BIOME_3]:
+            print(f"🔴 CRIMSON FOREST starting at column {col}")
+        elif biome_type in [WARPED_FOREST_BIOME, WARPED_FOREST_BIOME_2]:
+            print(f"🔵 WARPED FOREST starting at column {col}")
+        elif biome_type == LAVA_OCEAN_BIOME:
+            print(f"🌋 LAVA OCEAN starting at column {col}")
+        elif biome_type == BASALT_MOUNTAIN_BIOME:
+            print(f"⛰️ BASALT MOUNTAINS starting at column {col}")
+    
+    return biome_map
+
+def get_biome_strata(biome_type):
+    """Returns the (surface, subsurface, shallow, rock) block ids of a nether biome's columns.
+    Subsurface fills the 2 rows under the surface, shallow the 3 under that, and rock the rest.
+    """
+    if biome_type in [NETHER_WASTES_BIOME, NETHER_WASTES_BIOME_2]:
+        return GRASS_ID, GRASS_ID, GRASS_ID, GRASS_ID  # Netherrack
+    if biome_type == SOUL_SAND_VALLEY_BIOME:
+        return SAND_ID, SAND_ID, SAND_ID, GRASS_ID  # Soul Sand over netherrack
+    if biome_type in [BASALT_DELTAS_BIOME, BASALT_DELTAS_BIOME_2, BASALT_MOUNTAIN_BIOME]:
+        return STONE_ID, STONE_ID, STONE_ID, STONE_ID  # Basalt
+    if biome_type in [CRIMSON_FOREST_BIOME, CRIMSON_FOREST_BIOME_2, CRIMSON_FOREST_BIOME_3]:
+        return 6, GRASS_ID, GRASS_ID, GRASS_ID  # Crimson Nylium
+    if biome_type in [WARPED_FOREST_BIOME, WARPED_FOREST_BIOME_2]:
+        return 30, GRASS_ID, GRASS_ID, GRASS_ID  # Warped Nylium (MUD_ID placeholder)
+    if biome_type == LAVA_OCEAN_BIOME:
+        return STONE_ID, STONE_ID, STONE_ID, GRASS_ID  # Basalt sea floor
+    return GRASS_ID, GRASS_ID, GRASS_ID, GRASS_ID
+
+def get_biome_ground_level(biome_type, col, height):
+    """Returns the surface row of an absolute column, applying the biome's own terrain shape to the height map."""
+    if biome_type == BASALT_MOUNTAIN_BIOME:
+        # Ridged noise: sharp peaks where the noise crosses zero, 20 to 57 rows tall
+        ridge = 1 - min(1.0, 2 * abs(MOUNTAIN_NOISE.fractal1(col * MOUNTAIN_FREQUENCY, octaves=3)))
+        mountain_height = int(20 + 37 * ridge)
+        return max(TERRAIN_BASE_LEVEL - mountain_height, 10)
+    if biome_type == LAVA_OCEAN_BIOME:
+        return min(TERRAIN_BASE_LEVEL + 20, GRID_HEIGHT - 10)
+    return height
+
+def fill_strata(height_map, biome_map, first_col, rng=random):
+    """Returns a new (GRID_HEIGHT, width) grid of air, surface layers, rock, ores and pockets
+    for the columns starting at absolute column first_col. Ore rolls are drawn from rng
+    (the random module or a random.Random).
+    The grid is a NumPy array when NumPy is available, otherwise a list of row lists.
+    """
+    width = len(height_map)
+    ground_levels = [get_biome_ground_level(biome_type, col, height)
+                     for col, height, biome_type in zip(range(first_col, first_col + width), height_map, biome_map)]
+    strata = [get_biome_strata(biome_type) for biome_type in biome_map]
+    
+    if not HAS_NUMPY:
+        grid = [[AIR_ID] * width for _ in range(GRID_HEIGHT)]
+        for col in range(width):
+            ground_level = ground_levels[col]
+            surface_block_id, subsurface_block_id, shallow_block_id, rock_block_id = strata[col]
+            for row in range(ground_level, GRID_HEIGHT - 1):
+                depth_below_surface = row - ground_level
+                if depth_below_surface == 0:
+                    block_id = surface_block_id
+                elif depth_below_surface <= 2:
+                    block_id = subsurface_block_id
+                elif depth_below_surface <= 5:
+                    block_id = shallow_block_id
+                else:
+                    block_id = rock_block_id
+                    r = rng.random()
+                    for threshold, min_depth, ore_id in NETHER_ORE_TABLE:
+                        if r < threshold and depth_below_surface >= min_depth:
+                            if ore_id is None:
+                                ore_id = CAVE_POCKET_LAVA_ID if rng.random() < 0.5 else AIR_ID
+                            block_id = ore_id
+                            break
+                grid[row][col] = block_id
+            grid[GRID_HEIGHT - 1][col] = BEDROCK_ID
+        return grid
+    
+    # Depth of every cell below its column's surface, by broadcasting rows against columns
+    depth = np.arange(GRID_HEIGHT)[:, None] - np.array(ground_levels)[None, :]
+    surface, subsurface, shallow, rock = np.array(strata, dtype=np.int32).T
+    generator = np.random.default_rng(rng.getrandbits(64))
+    roll = generator.random(depth.shape)
+    pocket = np.where(generator.random(depth.shape) < 0.5, CAVE_POCKET_LAVA_ID, AIR_ID)
+    
+    ore_conditions = [(roll < threshold) & (depth >= min_depth) for threshold, min_depth, _ in NETHER_ORE_TABLE]
+    ore_choices = [pocket if ore_id is None else ore_id for _, _, ore_id in NETHER_ORE_TABLE]
+    rock = np.select(ore_conditions, ore_choices, default=rock)
+    
+    grid = np.select([depth < 0, depth == 0, depth <= 2, depth <= 5],
+                     [AIR_ID, surface, subsurface, shallow], default=rock).astype(np.int32)
+    grid[GRID_HEIGHT - 1, :] = BEDROCK_ID
+    return grid
+
+# --- Chunk Jobs ---
+# A job depends only on the world seed and the chunk index (heights and biomes come from the
+# noise, ore rolls from a per-chunk RNG), so jobs run in any order, in any process, and always
+# give the same chunk.
+
+def get_chunk_rng(chunk_id):
+    """Returns the random.Random a chunk's terrain job draws from, derived from the world seed and chunk."""
+    return random.Random(WORLD_SEED * 1000003 + chunk_id)
+
+def generate_chunk_terrain(seed, chunk_id):
+    """Generates one chunk's terrain for a world seed. Returns (height_map, biome_map, grid) for its CHUNK_SIZE columns."""
+    if seed != WORLD_SEED:
+        set_world_seed(seed)
+    first_col = chunk_id * CHUNK_SIZE
+    height_map = generate_height_map(first_col, CHUNK_SIZE)
+    biome_map = generate_biome_map(first_col, CHUNK_SIZE)
+    grid = fill_strata(height_map, biome_map, first_col, get_chunk_rng(chunk_id))
+    return height_map, biome_map, grid
+
+@contextmanager
+def worker_main_module():
+    """Makes this module __main__ while worker processes are started.
+    A process started with the "spawn" method first re-runs the parent's __main__; for the
+    game script that would open a window and start the game, so the workers run this module instead.
+    """
+    main_module = sys.modules["__main__"]
+    sys.modules["__main__"] = sys.modules[__name__]
+    try:
+        yield
+    finally:
+        sys.modules["__main__"] = main_module